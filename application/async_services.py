@@ -0,0 +1,453 @@
+# application/async_services.py
+"""
+Servicios de aplicación asíncronos para envíos, centros y rutas.
+
+Son la variante con corrutinas de ShipmentService, CenterService y RouteService,
+sobre los contratos asíncronos de repositorio (domain/async_repository.py). Un
+único bucle de eventos puede atender miles de consultas concurrentes: mientras una
+espera al almacén, las demás avanzan.
+
+Cada caso de uso sigue el mismo esquema que su versión síncrona, con los mismos
+mensajes de error: se leen los agregados con await, las reglas de negocio se
+aplican en el dominio (código síncrono, sin esperas en medio) y se guardan los
+cambios con await. Las operaciones masivas (manifiestos, lotes) siguen en los
+servicios síncronos: son trabajo de CPU que no gana nada con asyncio.
+
+Como otra corrutina puede intercalarse en cada await, las operaciones que
+comprueban y modifican toman las franjas de un AsyncStripedLock compartido por los
+tres servicios (parámetro locks). Sin él no se sincroniza nada, lo que solo es
+seguro si los repositorios nunca suspenden la corrutina (p. ej. el adaptador sobre
+los repositorios en memoria sin executor).
+"""
+
+from contextlib import asynccontextmanager, nullcontext
+
+from logistica.application.shipment_service import _create_shipment
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+
+
+class AsyncShipmentService:
+    """Servicio asíncrono de envíos (ver ShipmentService)."""
+
+    def __init__(self, repo, locks=None):
+        """
+        Args:
+            repo (AsyncShipmentRepository): Repositorio asíncrono de envíos.
+            locks (AsyncStripedLock, opcional): Franjas compartidas con los otros
+                servicios asíncronos.
+        """
+        self._repo = repo
+        self._locks = locks
+
+    async def register_shipment(self, tracking_code, sender, recipient, priority=1, shipment_type="standard"):
+        """
+        Crea un nuevo envío según su tipo y lo persiste (UC-01, RN-001).
+
+        Raises:
+            ValueError: Si el código ya existe o el tipo de envío no es válido.
+        """
+        async with self._hold(shipments=[tracking_code]):
+            if await self._repo.get_by_tracking_code(tracking_code) is not None:
+                raise ValueError(f"Ya existe un envío con el código de seguimiento '{tracking_code}'.")
+
+            shipment = _create_shipment(tracking_code, sender, recipient, priority, shipment_type)
+            await self._repo.add(shipment)
+
+    async def get_shipment(self, tracking_code):
+        """
+        Recupera un envío por su código de seguimiento (UC-02).
+
+        Raises:
+            ValueError: Si el envío solicitado no existe.
+        """
+        shipment = await self._repo.get_by_tracking_code(tracking_code)
+        if shipment is None:
+            raise ValueError(f"No existe el envío con código de seguimiento '{tracking_code}'.")
+        return shipment
+
+    async def get_shipments(self, tracking_codes):
+        """
+        Recupera varios envíos con una sola consulta al repositorio.
+
+        Returns:
+            List[Shipment | None]: Alineada con tracking_codes; None si no existe.
+        """
+        return await self._repo.get_many(tracking_codes)
+
+    async def update_shipment_status(self, tracking_code, new_status):
+        """
+        Actualiza el estado de un envío (UC-04, RN-007 en el dominio).
+
+        Raises:
+            ValueError: Si el envío no existe o la transición no está permitida.
+        """
+        async with self._hold(shipments=[tracking_code]):
+            shipment = await self._existing(tracking_code)
+            shipment.update_status(new_status)
+            await self._repo.add(shipment)
+
+    async def increase_shipment_priority(self, tracking_code):
+        """
+        Incrementa la prioridad de un envío (UC-05).
+
+        Raises:
+            ValueError: Si el envío no existe o el dominio no permite el cambio.
+        """
+        async with self._hold(shipments=[tracking_code]):
+            shipment = await self._existing(tracking_code)
+            shipment.increase_priority()
+            await self._repo.add(shipment)
+
+    async def decrease_shipment_priority(self, tracking_code):
+        """
+        Reduce la prioridad de un envío (UC-05).
+
+        Raises:
+            ValueError: Si el envío no existe o el dominio no permite el cambio.
+        """
+        async with self._hold(shipments=[tracking_code]):
+            shipment = await self._existing(tracking_code)
+            shipment.decrease_priority()
+            await self._repo.add(shipment)
+
+    async def list_shipments(self, after=None, limit=None):
+        """
+        Lista ordenada de envíos con su información básica (UC-03, RN-022).
+
+        Returns:
+            List[Tuple]: (código, estado, prioridad, tipo, ruta) de cada envío.
+        """
+        return [
+            (s.tracking_code, s.current_status, s.priority, s.shipment_type, s.assigned_route)
+            async for s in self._repo.iter_sorted(after=after, limit=limit)
+        ]
+
+    async def _existing(self, tracking_code):
+        """Envío que debe existir para poder modificarlo."""
+        shipment = await self._repo.get_by_tracking_code(tracking_code)
+        if shipment is None:
+            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        return shipment
+
+    def _hold(self, shipments):
+        """Toma las franjas de los envíos indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments)
+
+
+class AsyncCenterService:
+    """Servicio asíncrono de centros (ver CenterService)."""
+
+    def __init__(self, center_repo, shipment_repo, locks=None):
+        """
+        Args:
+            center_repo (AsyncCenterRepository): Repositorio asíncrono de centros.
+            shipment_repo (AsyncShipmentRepository): Repositorio asíncrono de envíos.
+            locks (AsyncStripedLock, opcional): Franjas compartidas con los otros
+                servicios asíncronos.
+        """
+        self._center_repo = center_repo
+        self._shipment_repo = shipment_repo
+        self._locks = locks
+
+    async def register_center(self, center_id, name, location):
+        """
+        Registra un nuevo centro logístico (UC-06, RN-009, RN-010).
+
+        Raises:
+            ValueError: Si algún dato es inválido o el centro ya está registrado.
+        """
+        if not center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
+        if not name.strip():
+            raise ValueError("El nombre del centro no puede estar vacío.")
+        if not location.strip():
+            raise ValueError("La ubicación del centro no puede estar vacía.")
+
+        async with self._hold(centers=[center_id]):
+            if await self._center_repo.get_by_center_id(center_id) is not None:
+                raise ValueError(f"Ya hay registrado un centro con el identificador '{center_id}'.")
+            await self._center_repo.add(Center(center_id, name, location))
+
+    async def list_centers(self):
+        """
+        Información básica de todos los centros (UC-07).
+
+        Returns:
+            List[Tuple]: (center_id, name, location) de cada centro.
+        """
+        return [(c.center_id, c.name, c.location) for c in await self._center_repo.list_all()]
+
+    async def get_center(self, center_id):
+        """
+        Recupera un centro por su identificador.
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        if not center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
+
+        center = await self._center_repo.get_by_center_id(center_id)
+        if center is None:
+            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+        return center
+
+    async def receive_shipment(self, tracking_code, center_id):
+        """
+        Recepción física de un envío en un centro (RN-011 en el dominio).
+
+        Raises:
+            ValueError: Si los identificadores son inválidos o no se encuentran los registros.
+        """
+        async with self._hold_pair(tracking_code, center_id):
+            center, shipment = await self._resolve_pair(tracking_code, center_id)
+            center.receive_shipment(shipment)
+            await self._center_repo.add(center)
+
+    async def dispatch_shipment(self, tracking_code, center_id):
+        """
+        Salida de un envío desde un centro (RN-012 en el dominio; pasa a IN_TRANSIT).
+
+        Raises:
+            ValueError: Si el centro o el envío no existen o no se pueden procesar.
+        """
+        async with self._hold_pair(tracking_code, center_id):
+            center, shipment = await self._resolve_pair(tracking_code, center_id)
+            center.dispatch_shipment(shipment)
+            await self._center_repo.add(center)
+            await self._shipment_repo.add(shipment)
+
+    async def list_shipments_in_center(self, center_id):
+        """
+        Envíos presentes en un centro, en orden de llegada (UC-08).
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        center = await self.get_center(center_id)
+        return center.list_shipments()
+
+    def _hold_pair(self, tracking_code, center_id):
+        """Valida los identificadores y toma las franjas del envío y del centro."""
+        if not center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
+        if not tracking_code.strip():
+            raise ValueError("El código de seguimiento del envío no puede estar vacío.")
+        return self._hold(shipments=[tracking_code], centers=[center_id])
+
+    async def _resolve_pair(self, tracking_code, center_id):
+        """Centro y envío que deben existir para operar."""
+        center = await self._center_repo.get_by_center_id(center_id)
+        if center is None:
+            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+
+        shipment = await self._shipment_repo.get_by_tracking_code(tracking_code)
+        if shipment is None:
+            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        return center, shipment
+
+    def _hold(self, shipments=(), centers=()):
+        """Toma las franjas de los agregados indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments, centers=centers)
+
+
+class AsyncRouteService:
+    """Servicio asíncrono de rutas (ver RouteService)."""
+
+    def __init__(self, route_repo, shipment_repo, center_repo, locks=None):
+        """
+        Args:
+            route_repo (AsyncRouteRepository): Repositorio asíncrono de rutas.
+            shipment_repo (AsyncShipmentRepository): Repositorio asíncrono de envíos.
+            center_repo (AsyncCenterRepository): Repositorio asíncrono de centros.
+            locks (AsyncStripedLock, opcional): Franjas compartidas con los otros
+                servicios asíncronos.
+        """
+        self._route_repo = route_repo
+        self._shipment_repo = shipment_repo
+        self._center_repo = center_repo
+        self._locks = locks
+
+    async def create_route(self, route_id, origin_center_id, destination_center_id):
+        """
+        Crea una nueva ruta entre dos centros existentes (UC-09, RN-013).
+
+        Raises:
+            ValueError: Si los datos son inválidos, la ruta ya existe o algún centro no existe.
+        """
+        if not route_id.strip():
+            raise ValueError("El ID de la ruta no puede estar vacío.")
+
+        async with self._hold(routes=[route_id]):
+            if await self._route_repo.get_by_route_id(route_id) is not None:
+                raise ValueError(f"Ya existe una ruta con el identificador '{route_id}'.")
+
+            origin = await self._center_repo.get_by_center_id(origin_center_id)
+            if not origin:
+                raise ValueError("El centro de origen no existe.")
+            destination = await self._center_repo.get_by_center_id(destination_center_id)
+            if not destination:
+                raise ValueError("El centro de destino no existe.")
+
+            await self._route_repo.add(Route(route_id, origin, destination))
+
+    async def list_routes(self):
+        """
+        Resumen de todas las rutas (UC-10).
+
+        Returns:
+            List[Tuple]: (route_id, origin_id, destination_id, status) de cada ruta.
+        """
+        return [
+            (
+                route.route_id,
+                route.origin_center.center_id,
+                route.destination_center.center_id,
+                "Activa" if route.is_active else "Finalizada",
+            )
+            for route in await self._route_repo.list_all()
+        ]
+
+    async def get_route(self, route_id):
+        """
+        Recupera una ruta por su identificador.
+
+        Raises:
+            ValueError: Si el ID está vacío o la ruta no existe.
+        """
+        if not route_id.strip():
+            raise ValueError("El ID de la ruta no puede estar vacío.")
+
+        route = await self._route_repo.get_by_route_id(route_id)
+        if route is None:
+            raise ValueError(f"No existe una ruta con el identificador '{route_id}'.")
+        return route
+
+    async def assign_shipment_to_route(self, tracking_code, route_id):
+        """
+        Asigna un envío a una ruta activa (UC-11, RN-015, RN-016).
+
+        Raises:
+            ValueError: Si la ruta no existe o no está activa, o el envío no existe o ya tiene ruta.
+        """
+        if not tracking_code.strip():
+            raise ValueError("El código de seguimiento del envío no puede estar vacío.")
+        route = await self.get_route(route_id)
+
+        async with self._hold(shipments=[tracking_code], centers=[route.origin_center.center_id], routes=[route.route_id]):
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' no está activa.")
+
+            shipment = await self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+            if shipment.is_assigned_to_route():
+                raise ValueError(f"El envío '{tracking_code}' ya está asignado a una ruta.")
+
+            # Route.add_shipment() registra el envío en el centro de origen y le asigna la ruta
+            route.add_shipment(shipment)
+
+            await self._route_repo.add(route)
+            await self._shipment_repo.add(shipment)
+            await self._center_repo.add(route.origin_center)
+
+    async def remove_shipment_from_route(self, tracking_code, route_id):
+        """
+        Retira un envío de la ruta a la que está asignado (UC-13).
+
+        Raises:
+            ValueError: Si los identificadores son vacíos o el envío no pertenece a la ruta.
+        """
+        if not tracking_code.strip():
+            raise ValueError("El código de seguimiento del envío no puede estar vacío.")
+        route = await self.get_route(route_id)
+
+        async with self._hold(shipments=[tracking_code], routes=[route.route_id]):
+            shipment = await self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+            if shipment.assigned_route != route_id:
+                raise ValueError(f"El envío '{tracking_code}' no está asignado a la ruta '{route_id}'.")
+
+            route.remove_shipment(shipment)
+
+            await self._route_repo.add(route)
+            await self._shipment_repo.add(shipment)
+
+    async def dispatch_route(self, route_id):
+        """
+        Despacha todos los envíos de la ruta desde su centro de origen (UC-14).
+
+        Raises:
+            ValueError: Si la ruta no existe, está inactiva, ya fue despachada o algún
+            envío no puede salir del centro de origen.
+        """
+        route = await self.get_route(route_id)
+
+        async with self._hold_route(route):
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' ya ha sido completada y no se puede despachar.")
+
+            shipments = route.list_shipment()
+            if shipments and all(s.current_status == "IN_TRANSIT" for s in shipments):
+                raise ValueError(f"La ruta '{route_id}' ya ha sido despachada.")
+
+            # Todo o nada en el dominio: si algún envío no puede salir, la ruta queda intacta
+            _, rejected = route.origin_center.dispatch_many(shipments)
+            if rejected:
+                code, reason = rejected[0]
+                raise ValueError(f"No se puede despachar la ruta '{route_id}', envío '{code}': {reason}")
+
+            await self._center_repo.add(route.origin_center)
+            await self._shipment_repo.add_many(shipments)
+
+    async def complete_route(self, route_id):
+        """
+        Completa una ruta activa: entrega sus envíos en el centro de destino (UC-15).
+
+        Raises:
+            ValueError: Si la ruta no existe o ya se encontraba finalizada.
+        """
+        route = await self.get_route(route_id)
+
+        async with self._hold_route(route):
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' ya se encuentra finalizada.")
+
+            shipments = route.list_shipment()
+            route.complete_route()
+
+            await self._route_repo.add(route)
+            await self._center_repo.add(route.destination_center)
+            await self._shipment_repo.add_many(shipments)
+
+    def _hold(self, shipments=(), centers=(), routes=()):
+        """Toma las franjas de los agregados indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments, centers=centers, routes=routes)
+
+    @asynccontextmanager
+    async def _hold_route(self, route):
+        """
+        Toma las franjas de una ruta, sus dos centros y todos sus envíos.
+
+        Mismo esquema optimista que RouteService._hold_route(): se leen los envíos,
+        se toman las franjas en orden y se repite si la lista cambió mientras se esperaba.
+        """
+        if self._locks is None:
+            yield
+            return
+
+        centers = [route.origin_center.center_id, route.destination_center.center_id]
+        while True:
+            codes = [shipment.tracking_code for shipment in route.iter_shipments()]
+            async with self._hold(shipments=codes, centers=centers, routes=[route.route_id]):
+                if [shipment.tracking_code for shipment in route.iter_shipments()] == codes:
+                    yield
+                    return
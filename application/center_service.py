@@ -1,6 +1,9 @@
 # application/center_service.py
 
-from logistica.domain.center import Center
+from contextlib import nullcontext
+
+from logistica.application.unit_of_work import transactional
+from logistica.domain.center import Center, REJECT
 
 class CenterService:
     """
@@ -18,26 +21,34 @@ class CenterService:
     - Poco estado compartido entre métodos
     """
 
-    def __init__(self, center_repo, shipment_repo):
+    def __init__(self, center_repo, shipment_repo, uow=None, locks=None):
         """
         Inicializa el servicio con los repositorios necesarios.
 
         Dependencias:
         - center_repo: CRUD de centros
-        - shipment_repo: para consultar envíos (no modificarlos directamente)
+        - shipment_repo: para consultar envíos y guardar el estado que cambia el centro
 
         Nota: A diferencia de RouteService, este servicio no modifica envíos
         directamente. Las modificaciones se hacen a través de los centros.
 
         Args:
             center_repo: Repositorio de centros logísticos.
-            shipment_repo: Repositorio de envíos (solo para consulta).
+            shipment_repo: Repositorio de envíos (consulta y persistencia del estado tras un despacho).
+            uow (UnitOfWork, opcional): Unidad de trabajo compartida. Con ella, cada
+                operación que modifica agregados escribe una sola vez al terminar (los
+                repositorios deben ser los de seguimiento de la propia unidad de trabajo).
+            locks (StripedLock, opcional): Franjas de bloqueo compartidas para usar el
+                servicio desde varios hilos. Sin ellas, el servicio no se sincroniza.
         """
         self._center_repo = center_repo
         self._shipment_repo = shipment_repo
+        self._uow = uow
+        self._locks = locks
 
 
-    def register_center(self, center_id, name, location):
+    @transactional
+    def register_center(self, center_id, name, location, capacity=None, type_capacity=None, admission=REJECT):
         """
         Registra un nuevo centro logístico en el sistema.
 
@@ -50,6 +61,9 @@ class CenterService:
             center_id (str): ID único del centro.
             name (str): Nombre descriptivo del centro.
             location (str): Ubicación geográfica o dirección del centro.
+            capacity (int, opcional): Plazas totales (RN-036). Sin ella, no hay límite.
+            type_capacity (Dict[str, int], opcional): Plazas máximas por tipo de envío.
+            admission (str, opcional): "reject" (por defecto) o "queue" cuando no hay plaza.
 
         Raises:
             ValueError: Si algún dato es inválido o el centro ya está registrado.
@@ -65,17 +79,74 @@ class CenterService:
         if not location.strip():
             raise ValueError("La ubicación del centro no puede estar vacía.")
 
-        # Regla de negocio RN-009: verificar unicidad de center_id
-        # Consultar repositorio antes de crear
-        center = self._center_repo.get_by_center_id(center_id)
-        if center is not None:
-            raise ValueError(f"Ya hay registrado un centro con el identificador '{center_id}'.")
+        with self._hold(centers=[center_id]):
+            # Regla de negocio RN-009: verificar unicidad de center_id
+            # Consultar repositorio antes de crear
+            center = self._center_repo.get_by_center_id(center_id)
+            if center is not None:
+                raise ValueError(f"Ya hay registrado un centro con el identificador '{center_id}'.")
+
+            # Crear centro: delegar al dominio (valida RN-010 internamente)
+            # Center.__init__ valida que los parámetros sean strings no vacíos
+            center = Center(center_id, name, location, capacity, type_capacity, admission)
+
+            self._center_repo.add(center)
+
+    @transactional
+    def configure_center_capacity(self, center_id, capacity=None, type_capacity=None, admission=REJECT):
+        """
+        Cambia la capacidad y el modo de admisión de un centro (RN-036).
+
+        Si la nueva capacidad deja sitio, los envíos en cola entran al inventario.
+
+        Args:
+            center_id (str): ID del centro.
+            capacity (int, opcional): Plazas totales. None = sin límite.
+            type_capacity (Dict[str, int], opcional): Plazas máximas por tipo de envío.
+            admission (str, opcional): "reject" o "queue".
+
+        Raises:
+            ValueError: Si el centro no existe o la configuración no es válida.
+        """
+        center = self.get_center(center_id)
+        with self._hold(centers=[center.center_id]):
+            center.configure_capacity(capacity, type_capacity, admission)
+            self._center_repo.add(center)
+
+    def get_center_utilization(self, center_id):
+        """
+        Ocupación de un centro, para decidir a qué centro enviar la carga.
 
-        # Crear centro: delegar al dominio (valida RN-010 internamente)
-        # Center.__init__ valida que los parámetros sean strings no vacíos
-        center = Center(center_id, name, location)
+        Args:
+            center_id (str): ID del centro.
+
+        Returns:
+            Tuple: (center_id, ocupación, capacidad, utilización, en cola). Capacidad y
+            utilización son None si el centro no tiene límite.
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        return self._utilization(self.get_center(center_id))
 
-        self._center_repo.add(center)
+    def list_center_utilization(self):
+        """
+        Ocupación de todos los centros, de menos a más utilizado.
+
+        Los centros sin límite van al final: no tienen una utilización comparable.
+        Cada fila se calcula en O(1) con los contadores del centro.
+
+        Returns:
+            Lista de tuplas (center_id, ocupación, capacidad, utilización, en cola).
+        """
+        rows = [self._utilization(center) for center in self._center_repo.iter_all()]
+        rows.sort(key=lambda row: (row[3] is None, row[3] or 0, row[0]))
+        return rows
+
+    @staticmethod
+    def _utilization(center):
+        """Fila de ocupación de un centro (ver get_center_utilization())."""
+        return center.center_id, center.occupancy, center.capacity, center.utilization(), center.waiting
 
     def list_centers(self):
         """
@@ -86,15 +157,17 @@ class CenterService:
         Returns:
             Lista de tuplas conteniendo (center_id, name, location).
         """
-        centers = self._center_repo.list_all()
+        return list(self.iter_centers())
 
-        result = []
-        for center in centers:
-            center_id = center.center_id
-            name = center.name
-            location = center.location
-            result.append((center_id, name, location))
-        return result
+    def iter_centers(self):
+        """
+        Recorre los centros produciendo su información básica bajo demanda.
+
+        Yields:
+            Tuple: (center_id, name, location) de cada centro.
+        """
+        for center in self._center_repo.iter_all():
+            yield center.center_id, center.name, center.location
 
     def get_center(self, center_id):
         """
@@ -119,6 +192,7 @@ class CenterService:
             raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
         return center
 
+    @transactional
     def receive_shipment(self, tracking_code, center_id):
         """
         Procesa la recepción física de un envío en un centro determinado.
@@ -143,24 +217,26 @@ class CenterService:
         if not tracking_code.strip():
             raise ValueError("El código de seguimiento del envío no puede estar vacío.")
 
-        center = self._center_repo.get_by_center_id(center_id)
-        if center is None:
-            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+        with self._hold(shipments=[tracking_code], centers=[center_id]):
+            center = self._center_repo.get_by_center_id(center_id)
+            if center is None:
+                raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
 
-        shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+            shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
 
-        # Delegar al dominio: Centro maneja la recepción
-        # Center.receive_shipment() valida:
-        # 1. Que el parámetro sea un Shipment
-        # 2. RN-011: que el envío no esté ya en el centro
-        center.receive_shipment(shipment)
+            # Delegar al dominio: Centro maneja la recepción
+            # Center.receive_shipment() valida:
+            # 1. Que el parámetro sea un Shipment
+            # 2. RN-011: que el envío no esté ya en el centro
+            center.receive_shipment(shipment)
 
-        # Persistir cambios en el centro
-        # El envío no se modifica, solo se agrega a la lista del centro
-        self._center_repo.add(center)
+            # Persistir cambios en el centro
+            # El envío no se modifica, solo se agrega a la lista del centro
+            self._center_repo.add(center)
 
+    @transactional
     def dispatch_shipment(self, tracking_code, center_id):
         """
         Gestiona la salida de un envío desde un centro logístico.
@@ -184,24 +260,182 @@ class CenterService:
         if not tracking_code.strip():
             raise ValueError("El código de seguimiento del envío no puede estar vacío.")
 
-        center = self._center_repo.get_by_center_id(center_id)
-        if center is None:
-            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+        with self._hold(shipments=[tracking_code], centers=[center_id]):
+            center = self._center_repo.get_by_center_id(center_id)
+            if center is None:
+                raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+
+            shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
 
-        shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+            # Delegar al dominio: Centro maneja el despacho
+            # Center.dispatch_shipment() valida:
+            # 1. Que el parámetro sea un Shipment
+            # 2. RN-012: que el envío esté en el centro
+            # 3. Actualiza estado del envío a IN_TRANSIT
+            center.dispatch_shipment(shipment)
 
-        # Delegar al dominio: Centro maneja el despacho
-        # Center.dispatch_shipment() valida:
-        # 1. Que el parámetro sea un Shipment
-        # 2. RN-012: que el envío esté en el centro
-        # 3. Actualiza estado del envío a IN_TRANSIT
-        center.dispatch_shipment(shipment)
+            # Persistir cambios en el centro y el nuevo estado del envío
+            self._center_repo.add(center)
+            self._shipment_repo.add(shipment)
+
+    @transactional
+    def receive_shipments(self, tracking_codes, center_id):
+        """
+        Procesa la recepción física de un lote de envíos en un centro con una sola llamada.
 
-        # Persistir cambios en el centro
-        # El envío ya fue actualizado (estado) y persistido por el centro
-        self._center_repo.add(center)
+        Pensado para descargas completas (p. ej. un camión con miles de paquetes):
+        el lote se valida entero y se aplica todo o nada, devolviendo un informe por
+        envío en lugar de lanzar una excepción por cada paquete.
+
+        Reglas de negocio delegadas:
+        - RN-011: No duplicar envíos en el mismo centro (en dominio)
+        - Solo envíos registrados pueden recibirse (validación de aplicación)
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento de los envíos recibidos.
+            center_id (str): ID del centro que recibe los paquetes.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (aceptados, rechazados). Si hay
+            rechazos no se aplica ningún envío del lote.
+
+        Raises:
+            ValueError: Si el ID del centro está vacío o el centro no existe.
+        """
+        tracking_codes = list(tracking_codes)
+        with self._hold(shipments=tracking_codes, centers=[center_id]):
+            center = self.get_center(center_id)
+
+            shipments, rejected = self._resolve_shipments(tracking_codes)
+            if rejected:
+                return [], rejected
+
+            # Delegar al dominio: Center.receive_many() valida y aplica el lote
+            accepted, rejected = center.receive_many(shipments)
+            if accepted:
+                self._center_repo.add(center)
+            return accepted, rejected
+
+    @transactional
+    def dispatch_shipments(self, tracking_codes, center_id):
+        """
+        Gestiona la salida de un lote de envíos desde un centro con una sola llamada.
+
+        El lote se valida entero (presencia en el centro y transición a IN_TRANSIT)
+        y se aplica todo o nada, devolviendo un informe por envío.
+
+        Reglas de negocio delegadas:
+        - RN-012: Solo se pueden despachar envíos que están en el centro (en dominio)
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento de los envíos a despachar.
+            center_id (str): ID del centro desde donde salen los paquetes.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (despachados, rechazados). Si hay
+            rechazos no se aplica ningún envío del lote.
+
+        Raises:
+            ValueError: Si el ID del centro está vacío o el centro no existe.
+        """
+        tracking_codes = list(tracking_codes)
+        with self._hold(shipments=tracking_codes, centers=[center_id]):
+            center = self.get_center(center_id)
+
+            shipments, rejected = self._resolve_shipments(tracking_codes)
+            if rejected:
+                return [], rejected
+
+            accepted, rejected = center.dispatch_many(shipments)
+            if accepted:
+                self._center_repo.add(center)
+                self._shipment_repo.add_many(shipments)
+            return accepted, rejected
+
+    @transactional
+    def dispatch_next_shipment(self, center_id):
+        """
+        Despacha el envío más prioritario de un centro (el que llegó antes, entre iguales).
+
+        Reglas de negocio delegadas:
+        - RN-012 y RN-007: Center.pop_next() solo saca envíos del inventario que
+          pueden pasar a IN_TRANSIT
+
+        Args:
+            center_id (str): ID del centro.
+
+        Returns:
+            Shipment | None: El envío despachado, o None si el centro no tiene envíos por cargar.
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        while True:
+            # El código del siguiente envío no se conoce hasta consultar el muelle,
+            # y su franja debe tomarse a la vez que la del centro
+            with self._hold(centers=[center_id]):
+                head = self.get_center(center_id).peek_next()
+            if not head:
+                return None
+
+            tracking_code = head[0].tracking_code
+            with self._hold(shipments=[tracking_code], centers=[center_id]):
+                center = self.get_center(center_id)
+                head = center.peek_next()
+                if not head:
+                    return None
+                if head[0].tracking_code != tracking_code:
+                    continue  # Otro hilo cambió el muelle entretanto: reintentar
+
+                shipment = center.pop_next()
+                self._center_repo.add(center)
+                self._shipment_repo.add(shipment)
+                return shipment
+
+    def peek_next_shipments(self, center_id, k=1):
+        """
+        Próximos envíos que saldrían de un centro con dispatch_next_shipment(), sin despacharlos.
+
+        Args:
+            center_id (str): ID del centro.
+            k (int, opcional): Número máximo de envíos. Por defecto 1.
+
+        Returns:
+            List[Shipment]: Hasta k envíos, en orden de salida.
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        with self._hold(centers=[center_id]):
+            return self.get_center(center_id).peek_next(k)
+
+    def _hold(self, shipments=(), centers=()):
+        """Toma las franjas de los agregados indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments, centers=centers)
+
+    def _resolve_shipments(self, tracking_codes):
+        """
+        Busca en el repositorio los envíos de un lote.
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento a resolver.
+
+        Returns:
+            Tuple[List[Shipment], List[Tuple[str, str]]]: (envíos encontrados, rechazados).
+        """
+        shipments = []
+        rejected = []
+        for tracking_code in tracking_codes:
+            shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                rejected.append((tracking_code, f"No hay ningún envío con el código de seguimiento '{tracking_code}'."))
+            else:
+                shipments.append(shipment)
+        return shipments, rejected
 
     def list_shipments_in_center(self, center_id):
         """
@@ -218,13 +452,45 @@ class CenterService:
         Raises:
             ValueError: Si el ID está vacío o el centro no existe.
         """
-        if not center_id.strip():
-            raise ValueError("El ID del centro no puede estar vacío.")
+        return list(self.iter_shipments_in_center(center_id))
 
-        center = self._center_repo.get_by_center_id(center_id)
-        if center is None:
-            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+    def iter_shipments_in_center(self, center_id):
+        """
+        Recorre los envíos presentes en un centro sin copiar su inventario.
+
+        La validación del centro se hace al llamar (no al consumir el iterador), para
+        que los errores de entrada se detecten de inmediato. El recorrido ve el
+        instante de la llamada: el inventario y el estado de cada envío no cambian
+        aunque se sigan recibiendo, despachando o actualizando envíos mientras se
+        consume, y sin bloquear esas escrituras.
 
-        # Delegar al centro: devuelve su lista interna de envíos
-        # Center.list_shipments() devuelve copia para encapsulamiento
-        return center.list_shipments()
\ No newline at end of file
+        Args:
+            center_id (str): ID del centro a consultar.
+
+        Returns:
+            Iterator[Shipment]: Envíos del centro en orden de llegada.
+
+        Raises:
+            ValueError: Si el ID está vacío o el centro no existe.
+        """
+        center = self.get_center(center_id)
+
+        # Inventario copy-on-write del centro e instantánea versionada de los envíos,
+        # tomados en el mismo instante; ninguno copia el almacén
+        inventory = center.inventory_view()
+        snapshot = self._shipment_repo.snapshot()
+        return self._iter_snapshot(inventory, snapshot)
+
+    @staticmethod
+    def _iter_snapshot(inventory, snapshot):
+        """
+        Resuelve cada código del inventario en la instantánea y la cierra al terminar.
+
+        Un envío del inventario que no está en la instantánea (recibido sin guardarlo
+        en el repositorio de envíos, o eliminado de él) se entrega como el propio
+        objeto del centro.
+        """
+        with snapshot:
+            for tracking_code, shipment in inventory.items():
+                resolved = snapshot.get(tracking_code)
+                yield shipment if resolved is None else resolved
@@ -0,0 +1,197 @@
+# application/manifest.py
+"""
+Lectura de manifiestos de envíos (CSV o JSONL) y escritura de rechazos.
+
+Un manifiesto es un fichero con un envío por fila y los campos:
+tracking_code, sender, recipient, priority (opcional, por defecto 1) y
+shipment_type (opcional: standard, fragile o express; por defecto standard).
+
+- CSV: primera línea de cabecera con los nombres de los campos
+- JSONL: un objeto JSON por línea; las líneas en blanco se ignoran
+
+Los lectores son generadores: el fichero se recorre fila a fila sin cargarlo
+entero en memoria, de modo que manifiestos de cientos de miles de filas se
+procesan con memoria acotada.
+
+Para la validación en paralelo, split_manifest() divide el fichero en rangos de
+bytes alineados a inicio de línea y read_shard() lee uno de ellos de forma
+independiente (cada proceso abre el fichero por su cuenta). Esto exige un
+registro por línea: en modo paralelo no se admiten campos CSV entrecomillados
+con saltos de línea.
+"""
+
+import csv
+import io
+import json
+import os
+
+# Columnas del fichero de rechazos
+REJECT_FIELDS = ("line", "tracking_code", "reason")
+
+
+def iter_manifest(path):
+    """
+    Recorre un manifiesto fila a fila según su extensión (.csv o .jsonl).
+
+    Args:
+        path (str): Ruta del manifiesto.
+
+    Yields:
+        Tuple[int, dict | None, str | None]: (número de línea, campos, error). Si la
+        línea no se puede interpretar, campos es None y error explica el motivo.
+
+    Raises:
+        ValueError: Si la extensión del fichero no es .csv ni .jsonl.
+    """
+    if _manifest_format(path) == "csv":
+        return _iter_csv(path)
+    return _iter_jsonl(path)
+
+
+def split_manifest(path, rows_per_shard):
+    """
+    Divide un manifiesto en rangos de bytes de unas rows_per_shard filas cada uno.
+
+    El tamaño en bytes se estima a partir de la longitud media de las primeras
+    líneas; cada límite se desplaza hasta el siguiente inicio de línea, de modo que
+    ningún registro queda partido entre dos rangos.
+
+    Args:
+        path (str): Ruta del manifiesto (.csv o .jsonl).
+        rows_per_shard (int): Filas aproximadas por rango.
+
+    Returns:
+        Tuple[list | None, int, List[Tuple[int, int]]]: (cabecera CSV o None para
+        JSONL, número de la primera línea de datos, rangos (inicio, fin) en bytes).
+
+    Raises:
+        ValueError: Si la extensión del fichero no es .csv ni .jsonl.
+    """
+    is_csv = _manifest_format(path) == "csv"
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        fieldnames = None
+        first_line = 1
+        if is_csv:
+            header = f.readline().decode("utf-8")
+            fieldnames = next(csv.reader([header]), [])
+            first_line = 2
+        start = f.tell()
+
+        sample = f.read(1 << 16)
+        average = len(sample) / max(1, sample.count(b"\n"))
+        shard_bytes = max(1, int(average * rows_per_shard))
+
+        ranges = []
+        while start < size:
+            f.seek(min(start + shard_bytes, size) - 1)
+            f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+
+    return fieldnames, first_line, ranges
+
+
+def read_shard(path, start, end, fieldnames=None):
+    """
+    Lee las filas de un rango de bytes obtenido con split_manifest().
+
+    Args:
+        path (str): Ruta del manifiesto.
+        start (int): Byte de inicio (inicio de línea).
+        end (int): Byte final (excluido, inicio de línea o final del fichero).
+        fieldnames (list, opcional): Cabecera CSV; None para JSONL.
+
+    Returns:
+        Tuple[list, int]: (filas como en iter_manifest() con números de línea relativos
+        al rango, empezando en 1; número de líneas del rango).
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode("utf-8")
+
+    line_count = text.count("\n") + (1 if text and not text.endswith("\n") else 0)
+    lines = io.StringIO(text, newline="")
+    if fieldnames is not None:
+        rows = list(_csv_rows(lines, fieldnames))
+    else:
+        rows = list(_jsonl_rows(lines))
+    return rows, line_count
+
+
+def _manifest_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError("El manifiesto debe ser un fichero .csv o .jsonl.")
+
+
+def _iter_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from _csv_rows(f)
+
+
+def _iter_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        yield from _jsonl_rows(f)
+
+
+def _csv_rows(lines, fieldnames=None):
+    reader = csv.DictReader(lines, fieldnames=fieldnames)
+    for row in reader:
+        # line_num cuenta las líneas físicas leídas (admite campos con saltos de línea)
+        yield reader.line_num, row, None
+
+
+def _jsonl_rows(lines):
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, "Línea JSON no válida."
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Cada línea debe ser un objeto JSON."
+            continue
+        yield line_number, row, None
+
+
+class RejectFile:
+    """
+    Fichero CSV de rechazos, con una fila por línea del manifiesto no aceptada.
+
+    Se usa como gestor de contexto; con path=None no escribe nada (solo cuenta).
+
+    Attributes:
+        count (int): Rechazos escritos.
+    """
+
+    def __init__(self, path=None):
+        self._path = path
+        self._file = None
+        self._writer = None
+        self.count = 0
+
+    def __enter__(self):
+        if self._path is not None:
+            self._file = open(self._path, "w", newline="", encoding="utf-8")
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(REJECT_FIELDS)
+        return self
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+        return False
+
+    def write(self, line, tracking_code, reason):
+        """Registra el rechazo de una línea del manifiesto."""
+        self.count += 1
+        if self._writer is not None:
+            self._writer.writerow((line, tracking_code, reason))
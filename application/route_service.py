@@ -1,6 +1,12 @@
 # application/route_service.py
 
+import threading
+from contextlib import contextmanager, nullcontext
+
+from logistica.application.unit_of_work import transactional
+from logistica.domain.assignment_planner import plan_assignments
 from logistica.domain.route import Route
+from logistica.domain.route_network import RouteNetwork
 
 class RouteService:
     """
@@ -15,10 +21,11 @@ class RouteService:
     Complejidad: Este es el servicio más complejo porque:
     1. Coordina tres repositorios diferentes
     2. Maneja relaciones bidireccionales
-    3. Implementa operaciones transaccionales sin mecanismo explícito
+    3. Implementa operaciones transaccionales: sin mecanismo explícito por defecto,
+       o agrupadas por una UnitOfWork (ver application/unit_of_work.py)
     """
 
-    def __init__(self, route_repo, shipment_repo, center_repo):
+    def __init__(self, route_repo, shipment_repo, center_repo, uow=None, locks=None, route_cost=None):
         """
         Inicializa el servicio con los repositorios necesarios.
 
@@ -35,12 +42,27 @@ class RouteService:
             route_repo: Instancia del repositorio de rutas.
             shipment_repo: Instancia del repositorio de envíos.
             center_repo: Instancia del repositorio de centros logísticos.
+            uow (UnitOfWork, opcional): Unidad de trabajo compartida. Con ella, cada
+                operación que modifica agregados escribe una sola vez al terminar (los
+                repositorios deben ser los de seguimiento de la propia unidad de trabajo).
+            locks (StripedLock, opcional): Franjas de bloqueo compartidas para usar el
+                servicio desde varios hilos. Sin ellas, el servicio no se sincroniza.
+            route_cost (Callable, opcional): route_cost(ruta) -> coste del tramo para
+                find_path(). Por defecto cada ruta cuesta 1 (camino con menos tramos).
         """
         self._route_repo = route_repo
         self._shipment_repo = shipment_repo
         self._center_repo = center_repo
+        self._uow = uow
+        self._locks = locks
+        self._route_cost = route_cost
+        # Red de rutas activas para find_path(): se construye en la primera búsqueda y
+        # después la mantienen create_route() y complete_route()
+        self._network = None
+        self._network_lock = threading.Lock()
 
 
+    @transactional
     def create_route(self, route_id, origin_center_id, destination_center_id):
         """
         Crea una nueva ruta y la persiste en el sistema.
@@ -68,28 +90,30 @@ class RouteService:
         if not route_id.strip():
             raise ValueError("El ID de la ruta no puede estar vacío.")
 
-        # Validación de aplicación: unicidad de route_id
-        # Consultar antes de crear para evitar duplicados
-        route = self._route_repo.get_by_route_id(route_id)
-        if route is not None:
-            raise ValueError(f"Ya existe una ruta con el identificador '{route_id}'.")
+        with self._hold(routes=[route_id]):
+            # Validación de aplicación: unicidad de route_id
+            # Consultar antes de crear para evitar duplicados
+            route = self._route_repo.get_by_route_id(route_id)
+            if route is not None:
+                raise ValueError(f"Ya existe una ruta con el identificador '{route_id}'.")
 
-        # Validación de aplicación: centros deben existir
-        # El servicio valida esto porque requiere coordinación entre repositorios
-        origin = self._center_repo.get_by_center_id(origin_center_id)
-        if not origin:
-            raise ValueError("El centro de origen no existe.")
+            # Validación de aplicación: centros deben existir
+            # El servicio valida esto porque requiere coordinación entre repositorios
+            origin = self._center_repo.get_by_center_id(origin_center_id)
+            if not origin:
+                raise ValueError("El centro de origen no existe.")
 
-        destination = self._center_repo.get_by_center_id(destination_center_id)
-        if not destination:
-            raise ValueError("El centro de destino no existe.")
+            destination = self._center_repo.get_by_center_id(destination_center_id)
+            if not destination:
+                raise ValueError("El centro de destino no existe.")
 
-        # Crear ruta: delegar al dominio (constructor valida RN-013)
-        # Route.__init__ valida que origen ≠ destino
-        route = Route(route_id, origin, destination)
+            # Crear ruta: delegar al dominio (constructor valida RN-013)
+            # Route.__init__ valida que origen ≠ destino
+            route = Route(route_id, origin, destination)
 
-        # Persistir: guardar en repositorio
-        self._route_repo.add(route)
+            # Persistir: guardar en repositorio
+            self._route_repo.add(route)
+            self._update_network(route)
 
 
     def list_routes(self):
@@ -104,17 +128,28 @@ class RouteService:
         Returns:
             Lista de tuplas conteniendo (route_id, origin_id, destination_id, status).
         """
-        routes = self._route_repo.list_all()
+        return list(self.iter_routes())
 
-        result = []
-        for route in routes:
-            route_id = route.route_id
-            origin_center = route.origin_center
-            destination_center = route.destination_center
+    def iter_routes(self):
+        """
+        Recorre las rutas produciendo su resumen bajo demanda.
+
+        El resumen sale de una instantánea del repositorio tomada al empezar: aunque
+        se creen o completen rutas mientras se consume, todas las tuplas reflejan el
+        mismo instante.
 
-            # Crear tupla con datos mínimos necesarios
-            result.append((route_id, origin_center.center_id, destination_center.center_id, "Activa" if route.is_active else "Finalizada"))
-        return result
+        Yields:
+            Tuple: (route_id, origin_id, destination_id, status) de cada ruta.
+        """
+        with self._route_repo.snapshot() as snapshot:
+            for route in snapshot.iter_all():
+                # Crear tupla con datos mínimos necesarios
+                yield (
+                    route.route_id,
+                    route.origin_id,
+                    route.destination_id,
+                    "Activa" if route.is_active else "Finalizada",
+                )
 
 
     def get_route(self, route_id):
@@ -143,6 +178,7 @@ class RouteService:
         return route
 
 
+    @transactional
     def assign_shipment_to_route(self, tracking_code, route_id):
         """
         Asigna un envío específico a una ruta de transporte.
@@ -173,34 +209,161 @@ class RouteService:
         if route is None:
             raise ValueError(f"No existe una ruta con el identificador '{route_id}'.")
 
-        # Regla de negocio RN-015: solo rutas activas aceptan envíos
-        if not route.is_active:
-            raise ValueError(f"La ruta '{route_id}' no está activa.")
+        with self._hold(shipments=[tracking_code], centers=[route.origin_center.center_id], routes=[route.route_id]):
+            # Regla de negocio RN-015: solo rutas activas aceptan envíos
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' no está activa.")
+
+            shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+
+            # Regla de negocio RN-016: verificar que el envío no esté ya asignado
+            # Esta validación podría estar en el dominio, pero requiere acceso al repositorio
+            # Por eficiencia, se hace aquí a nivel de aplicación
+            if shipment.is_assigned_to_route():
+                raise ValueError(f"El envío '{tracking_code}' ya está asignado a una ruta.")
+
+            # Operación bidireccional: actualizar ambos lados de la relación
+            route.add_shipment(shipment)
+
+            # Esta línea es redundante pero se mantiene por claridad (route.add_shipment(shipment)
+            # ya llama a shipment.assign_route() internamente)
+            shipment.assign_route(route_id)
+
+            # Persistir cambios en las entidades afectadas
+            # Orden: primero route (contiene la lista), luego shipment y el centro de origen,
+            # que ha registrado el envío en su inventario
+            # En transacción real, esto sería atómico (o se guarda todo, o no se guarda nada)
+            self._route_repo.add(route)
+            self._shipment_repo.add(shipment)
+            self._center_repo.add(route.origin_center)
+
+    @transactional
+    def assign_shipments_to_route(self, route_id, tracking_codes):
+        """
+        Asigna un lote de envíos a una ruta con una sola llamada.
 
-        shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        Caso de uso: UC-11 en lote (opción 14 del menú)
 
-        # Regla de negocio RN-016: verificar que el envío no esté ya asignado
-        # Esta validación podría estar en el dominio, pero requiere acceso al repositorio
-        # Por eficiencia, se hace aquí a nivel de aplicación
-        if shipment.is_assigned_to_route():
-            raise ValueError(f"El envío '{tracking_code}' ya está asignado a una ruta.")
+        La ruta se resuelve y valida una sola vez, los envíos se buscan en una sola
+        consulta (get_many) y los cambios se persisten una vez por repositorio. Los
+        envíos válidos se asignan aunque otros del lote sean rechazados; ningún
+        error se comunica con excepciones, todo queda en el informe.
 
-        # Operación bidireccional: actualizar ambos lados de la relación
-        route.add_shipment(shipment)
+        Args:
+            route_id (str): ID de la ruta a la que se desea asignar.
+            tracking_codes (Iterable[str]): Códigos de seguimiento de los envíos.
 
-        # Esta línea es redundante pero se mantiene por claridad (route.add_shipment(shipment)
-        # ya llama a shipment.assign_route() internamente)
-        shipment.assign_route(route_id)
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (asignados, rechazados). Rechazados
+            contiene pares (código, motivo); si la ruta no existe o no está activa,
+            todos los envíos se rechazan con ese motivo.
+        """
+        tracking_codes = [code.strip() for code in tracking_codes]
 
-        # Persistir cambios en ambas entidades
-        # Orden: primero route (contiene la lista), luego shipment
-        # En transacción real, esto sería atómico (o se guarda todo, o no se guarda nada)
-        self._route_repo.add(route)
-        self._shipment_repo.add(shipment)
+        route = None
+        if not route_id.strip():
+            reason = "El ID de la ruta no puede estar vacío."
+        else:
+            route = self._route_repo.get_by_route_id(route_id)
+            reason = None if route is not None else f"No existe una ruta con el identificador '{route_id}'."
+        if reason is not None:
+            return [], [(code, reason) for code in tracking_codes]
+
+        with self._hold(shipments=tracking_codes, centers=[route.origin_center.center_id], routes=[route.route_id]):
+            # Regla de negocio RN-015: solo rutas activas aceptan envíos
+            if not route.is_active:
+                return [], [(code, f"La ruta '{route_id}' no está activa.") for code in tracking_codes]
+            return self._assign_batch(route, tracking_codes)
+
+    def _assign_batch(self, route, tracking_codes):
+        """Asigna a una ruta activa los envíos de un lote (ver assign_shipments_to_route())."""
+        # Una sola consulta para todo el lote
+        codes = [code for code in tracking_codes if code]
+        found = dict(zip(codes, self._shipment_repo.get_many(codes)))
+
+        shipments = []
+        rejected = []
+        for code in tracking_codes:
+            shipment = found.get(code)
+            if not code:
+                rejected.append((code, "El código de seguimiento del envío no puede estar vacío."))
+            elif shipment is None:
+                rejected.append((code, f"No hay ningún envío con el código de seguimiento '{code}'."))
+            else:
+                shipments.append(shipment)
+
+        # Delegar al dominio: Route.add_many() aplica RN-016 y registra los envíos en el
+        # centro de origen
+        assigned, domain_rejected = route.add_many(shipments)
+        rejected.extend(domain_rejected)
+
+        if assigned:
+            self._route_repo.add(route)
+            assigned_codes = set(assigned)
+            self._shipment_repo.add_many([s for s in shipments if s.tracking_code in assigned_codes])
+            self._center_repo.add(route.origin_center)
+        return assigned, rejected
+
+
+    @transactional
+    def assign_center_shipments(self, center_id, capacity=None):
+        """
+        Reparte entre las rutas de salida activas los envíos sin ruta que esperan en un centro.
+
+        Cada envío va a una ruta de su clase de carga (express en EXP, frágil en FRG,
+        estándar en STD), los de mayor prioridad primero y repartidos de forma
+        equilibrada entre las rutas compatibles (ver domain/assignment_planner.py).
+        Solo se reparten los envíos en estado REGISTERED; los entregados en el centro
+        ya han terminado su recorrido.
 
+        Args:
+            center_id (str): ID del centro cuyos envíos se reparten.
+            capacity (int, opcional): Máximo de envíos por ruta, contando los que ya lleva.
+
+        Returns:
+            Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]: (asignados, rechazados).
+            Asignados contiene pares (código, ID de ruta) y rechazados pares (código, motivo).
 
+        Raises:
+            ValueError: Si el ID está vacío, el centro no existe o la capacidad no es válida.
+        """
+        if not center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
+
+        center = self._center_repo.get_by_center_id(center_id)
+        if center is None:
+            raise ValueError(f"No existe un centro con el identificador '{center_id}'.")
+
+        # Rutas de salida activas desde el índice por origen del repositorio
+        routes = self._route_repo.find(origin_id=center.center_id, active=True)
+        codes = list(center.inventory_view())
+        with self._hold(shipments=codes, centers=[center.center_id], routes=[r.route_id for r in routes]):
+            # Bajo las franjas: solo los envíos ya leídos y las rutas que siguen activas
+            locked = set(codes)
+            waiting = [
+                shipment for code, shipment in center.inventory_view().items()
+                if code in locked and shipment.current_status == "REGISTERED"
+                and not shipment.is_assigned_to_route()
+            ]
+            active = {route.route_id: route for route in routes if route.is_active}
+            plan, rejected = plan_assignments(waiting, active.values(), capacity)
+
+            assigned = []
+            for route_id, shipments in plan.items():
+                route = active[route_id]
+                loaded, _ = route.load_from_origin(shipments)
+                assigned.extend((code, route_id) for code in loaded)
+                self._route_repo.add(route)
+
+            if assigned:
+                loaded = set(code for code, _ in assigned)
+                self._shipment_repo.add_many([s for s in waiting if s.tracking_code in loaded])
+            return assigned, rejected
+
+
+    @transactional
     def remove_shipment_from_route(self, tracking_code, route_id):
         """
         Elimina la vinculación entre un envío y su ruta asignada.
@@ -227,22 +390,24 @@ class RouteService:
         if route is None:
             raise ValueError(f"No existe una ruta con el identificador '{route_id}'.")
 
-        shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        with self._hold(shipments=[tracking_code], routes=[route.route_id]):
+            shipment = self._shipment_repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
 
-        # Validación crítica: el envío debe estar asignado a ESTA ruta
-        # Previene retirar un envío de una ruta a la que no pertenece
-        if shipment.assigned_route != route_id:
-            raise ValueError(f"El envío '{tracking_code}' no está asignado a la ruta '{route_id}'.")
+            # Validación crítica: el envío debe estar asignado a ESTA ruta
+            # Previene retirar un envío de una ruta a la que no pertenece
+            if shipment.assigned_route != route_id:
+                raise ValueError(f"El envío '{tracking_code}' no está asignado a la ruta '{route_id}'.")
 
-        # Operación bidireccional: actualizar ambos lados
-        route.remove_shipment(shipment)  # ya llama a shipment.remove_route() internamente
+            # Operación bidireccional: actualizar ambos lados
+            route.remove_shipment(shipment)  # ya llama a shipment.remove_route() internamente
 
-        self._route_repo.add(route)
-        self._shipment_repo.add(shipment)
+            self._route_repo.add(route)
+            self._shipment_repo.add(shipment)
 
 
+    @transactional
     def dispatch_route(self, route_id):
         """
         Coordina el despacho de todos los envíos asociados a la ruta.
@@ -252,18 +417,19 @@ class RouteService:
 
         Flujo:
         1. Validar ruta activa y no despachada previamente
-        2. Para cada envío en la ruta:
-           a. Centro origen despacha envío (actualiza estado a IN_TRANSIT)
-           b. Envío se remueve del inventario del centro origen
+        2. Centro origen despacha el lote completo de envíos de la ruta:
+           a. Actualiza el estado de cada envío a IN_TRANSIT
+           b. Remueve los envíos del inventario del centro origen
 
-        Nota: No persiste cambios en centros porque Center.dispatch_shipment()
-        ya actualiza el estado del envío, y ShipmentRepository persiste ese cambio.
+        Persiste el centro de origen (inventario reducido) y los envíos (nuevo estado),
+        para que los repositorios persistentes reflejen el despacho.
 
         Args:
             route_id (str): ID de la ruta a despachar.
 
         Raises:
-            ValueError: Si la ruta no existe, está inactiva o ya fue despachada.
+            ValueError: Si la ruta no existe, está inactiva, ya fue despachada o algún
+            envío no puede salir del centro de origen.
         """
         if not route_id.strip():
             raise ValueError("El ID de la ruta no puede estar vacío.")
@@ -272,29 +438,34 @@ class RouteService:
         if route is None:
             raise ValueError(f"No existe una ruta con el identificador '{route_id}'.")
 
-        if not route.is_active:
-            raise ValueError(f"La ruta '{route_id}' ya ha sido completada y no se puede despachar.")
+        with self._hold_route(route):
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' ya ha sido completada y no se puede despachar.")
+
+            # Validar que no esté ya despachada (todos los envíos en IN_TRANSIT)
+            # Esto es una optimización, no una regla de negocio estricta
+            shipments = route.list_shipment()
+            if shipments and all(s.current_status == "IN_TRANSIT" for s in shipments):
+                raise ValueError(f"La ruta '{route_id}' ya ha sido despachada.")
 
-        # Validar que no esté ya despachada (todos los envíos en IN_TRANSIT)
-        # Esto es una optimización, no una regla de negocio estricta
-        shipments = route.list_shipment()
-        if shipments and all(s.current_status == "IN_TRANSIT" for s in shipments):
-            raise ValueError(f"La ruta '{route_id}' ya ha sido despachada.")
+            origin_center = route.origin_center
 
-        origin_center = route.origin_center
+            # Despachar todos los envíos en una sola operación del dominio
+            # Center.dispatch_many():
+            # 1. Valida el lote completo (presencia en el centro RN-012 y transición a IN_TRANSIT)
+            # 2. Actualiza el estado de cada envío a IN_TRANSIT
+            # 3. Remueve los envíos del inventario del centro
+            # Es todo o nada: si algún envío no puede salir, la ruta queda intacta
+            _, rejected = origin_center.dispatch_many(shipments)
+            if rejected:
+                code, reason = rejected[0]
+                raise ValueError(f"No se puede despachar la ruta '{route_id}', envío '{code}': {reason}")
 
-        # Despachar cada envío
-        # Nota: No usamos for-each directo porque route.list_shipment() devuelve copia
-        # Necesitamos los objetos reales para modificarlos
-        for shipment in shipments:
-            # Delegar al dominio: Centro maneja el despacho físico
-            # Center.dispatch_shipment():
-            # 1. Valida que el envío esté en el centro (RN-012)
-            # 2. Actualiza estado del envío a IN_TRANSIT
-            # 3. Remueve del inventario del centro
-            origin_center.dispatch_shipment(shipment)
+            self._center_repo.add(origin_center)
+            self._shipment_repo.add_many(shipments)
 
 
+    @transactional
     def complete_route(self, route_id):
         """
         Finaliza una ruta activa, procesando la entrega de todos los paquetes.
@@ -324,17 +495,108 @@ class RouteService:
         if route is None:
             raise ValueError(f"No existe una ruta con el identificador '{route_id}'.")
 
-        if not route.is_active:
-            raise ValueError(f"La ruta '{route_id}' ya se encuentra finalizada.")
+        with self._hold_route(route):
+            if not route.is_active:
+                raise ValueError(f"La ruta '{route_id}' ya se encuentra finalizada.")
+
+            # Delegar al dominio: Route maneja toda la lógica de completado
+            # Route.complete_route() implementa:
+            # 1. Validación de estado activo
+            # 2. Transferencia de envíos a centro destino
+            # 3. Actualización de estados a DELIVERED
+            # 4. Cambio de estado de la ruta a inactiva
+            shipments = route.list_shipment()
+            route.complete_route()
+
+            # Persistir cambios en la ruta, el inventario del centro destino y el nuevo
+            # estado de los envíos entregados
+            self._route_repo.add(route)
+            self._center_repo.add(route.destination_center)
+            self._shipment_repo.add_many(shipments)
+            self._update_network(route)
+
+    def find_path(self, origin_center_id, destination_center_id):
+        """
+        Busca cómo llevar un envío de un centro a otro encadenando rutas activas.
+
+        El camino es el de menor coste según route_cost (por defecto, el de menos
+        tramos). Las búsquedas desde un mismo centro de origen se sirven de la caché
+        de la red; crear o completar rutas la actualiza sin reconstruirla.
+
+        Args:
+            origin_center_id (str): ID del centro de partida.
+            destination_center_id (str): ID del centro de llegada.
+
+        Returns:
+            Tuple[float, List[str]]: (coste total, IDs de las rutas en orden de recorrido).
+            Del centro a sí mismo: (0, []).
+
+        Raises:
+            ValueError: Si algún ID está vacío, algún centro no existe o no hay camino.
+        """
+        if not origin_center_id.strip() or not destination_center_id.strip():
+            raise ValueError("El ID del centro no puede estar vacío.")
 
-        # Delegar al dominio: Route maneja toda la lógica de completado
-        # Route.complete_route() implementa:
-        # 1. Validación de estado activo
-        # 2. Transferencia de envíos a centro destino
-        # 3. Actualización de estados a DELIVERED
-        # 4. Cambio de estado de la ruta a inactiva
-        route.complete_route()
+        origin = self._center_repo.get_by_center_id(origin_center_id)
+        if not origin:
+            raise ValueError("El centro de origen no existe.")
+        destination = self._center_repo.get_by_center_id(destination_center_id)
+        if not destination:
+            raise ValueError("El centro de destino no existe.")
 
-        # Persistir cambios en la ruta
-        # Los envíos ya fueron actualizados y persistidos por el centro destino
-        self._route_repo.add(route)
\ No newline at end of file
+        with self._network_lock:
+            if self._network is None:
+                self._network = RouteNetwork.from_routes(self._route_repo.iter_all(), self._route_cost)
+            path = self._network.shortest_path(origin.center_id, destination.center_id)
+
+        if path is None:
+            raise ValueError(
+                f"No hay ningún camino de '{origin.center_id}' a '{destination.center_id}' con las rutas activas."
+            )
+        return path
+
+    def _update_network(self, route):
+        """Refleja en la red de find_path() una ruta recién creada o completada."""
+        with self._network_lock:
+            network = self._network
+            if network is None:
+                # Aún no se ha buscado ningún camino: la red se construirá con el estado actual
+                return
+            if not route.is_active:
+                network.remove_route(route.route_id)
+            elif route.route_id not in network:
+                # La red pudo construirse con la ruta ya guardada en el repositorio
+                network.add_route(
+                    route.route_id,
+                    route.origin_center.center_id,
+                    route.destination_center.center_id,
+                    1 if self._route_cost is None else self._route_cost(route),
+                )
+
+    def _hold(self, shipments=(), centers=(), routes=()):
+        """Toma las franjas de los agregados indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments, centers=centers, routes=routes)
+
+    @contextmanager
+    def _hold_route(self, route):
+        """
+        Toma las franjas de una ruta, sus dos centros y todos sus envíos.
+
+        Los envíos de la ruta solo se conocen leyéndola, y leerla ya bajo la franja
+        de la ruta obligaría a tomar después las de los envíos fuera de orden. Por
+        eso se leen sin bloqueo, se toman todas las franjas en orden y se comprueba
+        que la lista no cambió entretanto; si cambió, se repite.
+        """
+        if self._locks is None:
+            yield
+            return
+
+        centers = [route.origin_center.center_id, route.destination_center.center_id]
+        while True:
+            codes = [shipment.tracking_code for shipment in route.iter_shipments()]
+            with self._hold(shipments=codes, centers=centers, routes=[route.route_id]):
+                if [shipment.tracking_code for shipment in route.iter_shipments()] == codes:
+                    yield
+                    return
@@ -1,10 +1,112 @@
 # application/services.py
 
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
+
+from logistica.application.manifest import iter_manifest, read_shard, split_manifest, RejectFile
+from logistica.application.unit_of_work import transactional
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_lifecycle import STATUS_CODES, check_transitions
 from logistica.domain.fragile_shipment import FragileShipment
 from logistica.domain.express_shipment import ExpressShipment
 from logistica.domain.shipment_repository import ShipmentRepository
 
+_TYPE_CLASSES = {
+    "STANDARD": Shipment,
+    "FRAGILE": FragileShipment,
+    "EXPRESS": ExpressShipment,
+}
+
+
+def _create_shipment(tracking_code, sender, recipient, priority, shipment_type):
+    """
+    Crea la instancia de envío adecuada según su tipo (Factory Method).
+
+    Raises:
+        ValueError: Si el tipo no es válido o el dominio rechaza los datos.
+    """
+    # Normalizar tipo de envío para comparación case-insensitive
+    shipment_type = shipment_type.lower()
+
+    # Factory pattern: crea la instancia adecuada según el tipo
+    # Cada constructor valida sus propias reglas de negocio
+    if shipment_type == "standard":
+        return Shipment(tracking_code, sender, recipient, priority)
+    elif shipment_type == "fragile":
+        # FragileShipment valida internamente que priority ≥ 2 (RN-004)
+        return FragileShipment(tracking_code, sender, recipient, priority)
+    elif shipment_type == "express":
+        # ExpressShipment ignora el parámetro priority, siempre usa 3
+        # Esto implementa RN-005 (prioridad fija para express)
+        return ExpressShipment(tracking_code, sender, recipient)
+    else:
+        raise ValueError("Tipo de envío no válido.")
+
+
+def _shipment_from_row(row):
+    """
+    Crea el envío descrito por una fila del manifiesto.
+
+    Raises:
+        ValueError: Si algún campo no es válido (mismos mensajes que register_shipment()).
+    """
+    priority = row.get("priority")
+    if priority is None or priority == "":
+        priority = 1
+    elif isinstance(priority, str) and priority.strip().isascii() and priority.strip().isdigit():
+        priority = int(priority)
+    elif type(priority) is not int:
+        # Sin int() a ciegas: truncaría 2.7 a 2 y aceptaría true (JSON) como 1
+        raise ValueError("La prioridad debe ser 1, 2 o 3.")
+
+    shipment_type = row.get("shipment_type") or "standard"
+    if not isinstance(shipment_type, str):
+        raise ValueError("Tipo de envío no válido.")
+
+    return _create_shipment(row.get("tracking_code"), row.get("sender"), row.get("recipient"), priority, shipment_type)
+
+
+def _validate_rows(rows):
+    """
+    Crea los envíos de unas filas del manifiesto, separando las inválidas.
+
+    Returns:
+        Tuple[list, list]: ([(línea, envío)], [(línea, código, motivo)]).
+    """
+    candidates = []
+    rejected = []
+    for line, row, error in rows:
+        if error is not None:
+            rejected.append((line, "", error))
+            continue
+        try:
+            candidates.append((line, _shipment_from_row(row)))
+        except ValueError as e:
+            rejected.append((line, row.get("tracking_code") or "", str(e)))
+    return candidates, rejected
+
+
+def _validate_shard(path, start, end, fieldnames):
+    """
+    Valida un rango del manifiesto en un proceso de trabajo.
+
+    Devuelve resultados compactos (tuplas de valores simples en lugar de objetos)
+    para que el envío de vuelta al proceso padre sea barato.
+
+    Returns:
+        Tuple[int, list, list]: (líneas del rango, envíos válidos como
+        (línea, código, remitente, destinatario, prioridad, tipo, historial), rechazos).
+    """
+    rows, line_count = read_shard(path, start, end, fieldnames)
+    candidates, rejected = _validate_rows(rows)
+    valid = [
+        (line, s.tracking_code, s.sender, s.recipient, s.priority, s.shipment_type, s.export_status_log())
+        for line, s in candidates
+    ]
+    return line_count, valid, rejected
+
 class ShipmentService:
     """
     Servicio de aplicación para la gestión de envíos.
@@ -16,7 +118,7 @@ class ShipmentService:
     - Actuar como punto único de entrada para operaciones de envío
     """
 
-    def __init__(self, repo):
+    def __init__(self, repo, uow=None, locks=None):
         """
         Inicializa el servicio con el repositorio de envíos.
 
@@ -29,13 +131,21 @@ class ShipmentService:
 
         Args:
             repo (ShipmentRepository): Instancia del repositorio de envíos que implementa ShipmentRepository.
+            uow (UnitOfWork, opcional): Unidad de trabajo compartida. Con ella, cada
+                operación que modifica agregados escribe una sola vez al terminar (los
+                repositorios deben ser los de seguimiento de la propia unidad de trabajo).
+            locks (StripedLock, opcional): Franjas de bloqueo compartidas para usar el
+                servicio desde varios hilos. Sin ellas, el servicio no se sincroniza.
         """
         # Almacenar referencia al repositorio para todas las operaciones
         # Nota: No se valida tipo en tiempo de ejecución por simplicidad,
         # pero en producción se podría usar isinstance(repo, ShipmentRepository)
         self._repo = repo
+        self._uow = uow
+        self._locks = locks
 
 
+    @transactional
     def register_shipment(self, tracking_code, sender, recipient, priority=1, shipment_type="standard"):
         """
         Crea un nuevo envío en el sistema según su tipo y lo persiste.
@@ -65,34 +175,170 @@ class ShipmentService:
             ValueError: Si el código ya existe o el tipo de envío no es válido.
         """
 
-        # Regla de negocio RN-001: unicidad del código de seguimiento
-        # Consulta al repositorio antes de crear para evitar duplicados
-        # Esto es validación a nivel de aplicación, no del dominio
-        if self._repo.get_by_tracking_code(tracking_code) is not None:
-            raise ValueError(f"Ya existe un envío con el código de seguimiento '{tracking_code}'.")
+        with self._hold(shipments=[tracking_code]):
+            # Regla de negocio RN-001: unicidad del código de seguimiento
+            # Consulta al repositorio antes de crear para evitar duplicados
+            # Esto es validación a nivel de aplicación, no del dominio
+            if self._repo.get_by_tracking_code(tracking_code) is not None:
+                raise ValueError(f"Ya existe un envío con el código de seguimiento '{tracking_code}'.")
+
+            shipment = _create_shipment(tracking_code, sender, recipient, priority, shipment_type)
+
+            # Persistir el envío creado en el repositorio
+            # El repositorio es responsable del almacenamiento, no el servicio
+            self._repo.add(shipment)
+
+    def ingest_manifest(self, path, reject_path=None, chunk_size=5000, workers=1):
+        """
+        Registra en bloque los envíos de un manifiesto CSV o JSONL.
+
+        Caso de uso: UC-01 en lote (carga nocturna de manifiestos)
+
+        A diferencia de register_shipment(), una fila inválida no interrumpe la carga:
+        se anota en el fichero de rechazos (línea, código, motivo) y se sigue con la
+        siguiente. El manifiesto se lee en streaming y se procesa por bloques de
+        chunk_size filas, así que la memoria no depende del tamaño del fichero.
+
+        Por cada bloque (una operación de la unidad de trabajo, si la hay):
+        1. Crear cada envío con su tipo (el dominio valida campos y prioridad)
+        2. Rechazar códigos repetidos dentro del bloque o ya existentes (RN-001),
+           consultando el repositorio una sola vez por bloque
+        3. Insertar los envíos válidos en una sola operación (add_many)
+
+        Con workers > 1 el paso 1, que es puro cálculo, se reparte entre procesos:
+        el fichero se divide en rangos de bytes de unas chunk_size filas y cada
+        proceso valida los suyos. El proceso padre solo hace los pasos 2 y 3, en el
+        orden del fichero, por lo que el resultado es el mismo que en secuencial.
+        En este modo cada registro debe ocupar una sola línea.
+
+        Args:
+            path (str): Ruta del manifiesto (.csv o .jsonl, ver application/manifest.py).
+            reject_path (str, opcional): Ruta del CSV de rechazos. Sin ella, los rechazos solo se cuentan.
+            chunk_size (int, opcional): Filas por bloque. Por defecto 5000.
+            workers (int, opcional): Procesos de validación. Por defecto 1 (sin procesos).
+
+        Returns:
+            Tuple[int, int]: (envíos registrados, filas rechazadas).
+
+        Raises:
+            ValueError: Si la extensión del manifiesto no es válida o chunk_size o workers no son positivos.
+        """
+        if chunk_size < 1:
+            raise ValueError("El tamaño de bloque debe ser al menos 1.")
+        if workers < 1:
+            raise ValueError("Debe haber al menos un proceso de validación.")
+
+        with RejectFile(reject_path) as rejects:
+            if workers > 1:
+                accepted = self._ingest_parallel(path, rejects, chunk_size, workers)
+            else:
+                accepted = self._ingest_sequential(path, rejects, chunk_size)
+        return accepted, rejects.count
+
+    def _ingest_sequential(self, path, rejects, chunk_size):
+        """
+        Lee y valida el manifiesto en este proceso, bloque a bloque.
+
+        Returns:
+            int: Envíos insertados.
+        """
+        rows = iter_manifest(path)
+        accepted = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            accepted += self._ingest_chunk(chunk, rejects)
+        return accepted
+
+    def _ingest_chunk(self, chunk, rejects):
+        """
+        Valida e inserta un bloque de filas del manifiesto.
 
-        # Normalizar tipo de envío para comparación case-insensitive
-        shipment_type = shipment_type.lower()
+        Returns:
+            int: Envíos insertados.
+        """
+        candidates, rejected = _validate_rows(chunk)
+        return self._store_chunk(candidates, rejected, rejects)
 
-        # Factory pattern: crea la instancia adecuada según el tipo
-        # Cada constructor valida sus propias reglas de negocio
-        if shipment_type == "standard":
-            shipment = Shipment(tracking_code, sender, recipient, priority)
-        elif shipment_type == "fragile":
-            # FragileShipment valida internamente que priority ≥ 2 (RN-004)
-            shipment = FragileShipment(tracking_code, sender, recipient, priority)
-        elif shipment_type == "express":
-            # ExpressShipment ignora el parámetro priority, siempre usa 3
-            # Esto implementa RN-005 (prioridad fija para express)
-            shipment = ExpressShipment(tracking_code, sender, recipient)
-        else:
-            raise ValueError("Tipo de envío no válido.")
+    def _ingest_parallel(self, path, rejects, chunk_size, workers):
+        """
+        Valida el manifiesto en varios procesos e inserta los resultados en orden.
 
-        # Persistir el envío creado en el repositorio
-        # El repositorio es responsable del almacenamiento, no el servicio
-        self._repo.add(shipment)
+        Los rangos se envían a los procesos con una ventana de 2 * workers rangos en
+        vuelo, así la memoria sigue acotada aunque el proceso padre vaya más lento.
 
+        Returns:
+            int: Envíos insertados.
+        """
+        fieldnames, first_line, ranges = split_manifest(path, chunk_size)
+        shards = iter(ranges)
+        line_offset = first_line - 1
+        accepted = 0
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque(
+                pool.submit(_validate_shard, path, start, end, fieldnames)
+                for start, end in islice(shards, 2 * workers)
+            )
+            while pending:
+                line_count, valid, rejected = pending.popleft().result()
+                shard = next(shards, None)
+                if shard is not None:
+                    pending.append(pool.submit(_validate_shard, path, shard[0], shard[1], fieldnames))
+
+                # Los procesos ya validaron: reconstruir sin repetir las validaciones
+                candidates = [
+                    (line + line_offset, _TYPE_CLASSES[shipment_type].restore(code, sender, recipient, priority, status_log))
+                    for line, code, sender, recipient, priority, shipment_type, status_log in valid
+                ]
+                rejected = [(line + line_offset, code, reason) for line, code, reason in rejected]
+                accepted += self._store_chunk(candidates, rejected, rejects)
+                line_offset += line_count
+
+        return accepted
+
+    @transactional
+    def _store_chunk(self, candidates, rejected, rejects):
+        """
+        Descarta duplicados e inserta en bloque los envíos ya validados de un bloque.
 
+        Args:
+            candidates (List[Tuple[int, Shipment]]): (línea, envío) válidos, en orden.
+            rejected (List[Tuple[int, str, str]]): Rechazos ya detectados en el bloque.
+            rejects (RejectFile): Destino de los rechazos.
+
+        Returns:
+            int: Envíos insertados.
+        """
+        # Un código repetido dentro del bloque se rechaza igual que uno ya registrado
+        unique = {}
+        for line, shipment in candidates:
+            key = shipment.tracking_code.lower()
+            if key in unique:
+                rejected.append((line, shipment.tracking_code, f"Ya existe un envío con el código de seguimiento '{shipment.tracking_code}'."))
+            else:
+                unique[key] = (line, shipment)
+
+        # Regla de negocio RN-001 contra el repositorio: una sola consulta por bloque
+        accepted = []
+        codes = [shipment.tracking_code for _, shipment in unique.values()]
+        with self._hold(shipments=codes):
+            existing = self._repo.get_many(codes)
+            for (line, shipment), found in zip(unique.values(), existing):
+                if found is not None:
+                    rejected.append((line, shipment.tracking_code, f"Ya existe un envío con el código de seguimiento '{shipment.tracking_code}'."))
+                else:
+                    accepted.append(shipment)
+
+            self._repo.add_many(accepted)
+
+        # Rechazos en el orden del manifiesto
+        for line, tracking_code, reason in sorted(rejected):
+            rejects.write(line, tracking_code, reason)
+        return len(accepted)
+
+    @transactional
     def update_shipment_status(self, tracking_code, new_status):
         """
         Actualiza el estado logístico de un envío específico.
@@ -116,20 +362,82 @@ class ShipmentService:
             ValueError: Si no se encuentra un envío con ese código.
         """
 
-        # Validación de aplicación: el envío debe existir
-        shipment = self._repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        with self._hold(shipments=[tracking_code]):
+            # Validación de aplicación: el envío debe existir
+            shipment = self._repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+
+            # Delegar al dominio: El servicio no valida la transición
+            # Shipment.update_status() valida RN-007 internamente
+            # Esto mantiene las reglas de negocio en el dominio donde pertenecen
+            shipment.update_status(new_status)
+
+            # Persistir cambios (el envío ya fue modificado)
+            self._repo.add(shipment)
+
+
+    @transactional
+    def update_shipments_status(self, tracking_codes, new_status):
+        """
+        Actualiza el estado de un lote de envíos con una sola llamada.
 
-        # Delegar al dominio: El servicio no valida la transición
-        # Shipment.update_status() valida RN-007 internamente
-        # Esto mantiene las reglas de negocio en el dominio donde pertenecen
-        shipment.update_status(new_status)
+        Caso de uso: UC-04 en lote (p. ej. conciliación de un lector de códigos)
 
-        # Persistir cambios (el envío ya fue modificado)
-        self._repo.add(shipment)
+        El lote se valida entero con una sola consulta al repositorio y una sola
+        llamada a check_transitions() sobre la matriz de transiciones del dominio
+        (RN-007), y se aplica todo o nada: si algún envío es rechazado, ningún
+        estado cambia.
 
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento de los envíos.
+            new_status (str): Nuevo estado para todos ellos.
 
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (actualizados, rechazados). Si hay
+            rechazos no se aplica ningún envío del lote.
+
+        Raises:
+            ValueError: Si el estado indicado no existe.
+        """
+        new_status = new_status.upper()
+        if new_status not in STATUS_CODES:
+            raise ValueError(f"Estado no válido: {new_status}")
+
+        tracking_codes = list(tracking_codes)
+        with self._hold(shipments=tracking_codes):
+            batch = {}
+            rejected = []
+            for tracking_code, shipment in zip(tracking_codes, self._repo.get_many(tracking_codes)):
+                if shipment is None:
+                    rejected.append((tracking_code, f"No hay ningún envío con el código de seguimiento '{tracking_code}'."))
+                    continue
+
+                code = shipment.tracking_code
+                # Un envío repetido solo puede cambiar de estado una vez
+                if code in batch:
+                    rejected.append((code, "El envío está repetido en el lote."))
+                    continue
+
+                batch[code] = shipment
+
+            # Regla de negocio RN-007 para todo el lote de una vez
+            origins = bytes(STATUS_CODES[s.current_status] for s in batch.values())
+            valid = check_transitions(origins, STATUS_CODES[new_status])
+            for ok, (code, shipment) in zip(valid, batch.items()):
+                if not ok:
+                    rejected.append((code, f"Transición no permitida: de {shipment.current_status} a {new_status}"))
+
+            if rejected:
+                return [], rejected
+
+            shipments = list(batch.values())
+            for shipment in shipments:
+                shipment.update_status(new_status)
+            self._repo.add_many(shipments)
+            return list(batch), []
+
+    @transactional
     def increase_shipment_priority(self, tracking_code):
         """
         Incrementa el nivel de prioridad de un envío existente.
@@ -148,20 +456,22 @@ class ShipmentService:
             ValueError: Si el envío no existe en el sistema.
         """
 
-        # Validación de aplicación: existencia del envío
-        shipment = self._repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        with self._hold(shipments=[tracking_code]):
+            # Validación de aplicación: existencia del envío
+            shipment = self._repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
 
-        # Delegar al dominio: Polimorfismo en acción
-        # Cada tipo de envío (Shipment, FragileShipment, ExpressShipment)
-        # implementa su propia lógica para increase_priority()
-        # ExpressShipment lanzará ValueError (RN-005)
-        shipment.increase_priority()
+            # Delegar al dominio: Polimorfismo en acción
+            # Cada tipo de envío (Shipment, FragileShipment, ExpressShipment)
+            # implementa su propia lógica para increase_priority()
+            # ExpressShipment lanzará ValueError (RN-005)
+            shipment.increase_priority()
 
-        self._repo.add(shipment)
+            self._repo.add(shipment)
 
 
+    @transactional
     def decrease_shipment_priority(self, tracking_code):
         """
         Reduce el nivel de prioridad de un envío existente.
@@ -179,49 +489,70 @@ class ShipmentService:
             ValueError: Si el envío no existe en el sistema.
         """
 
-        # Validación de aplicación: existencia del envío
-        shipment = self._repo.get_by_tracking_code(tracking_code)
-        if shipment is None:
-            raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
+        with self._hold(shipments=[tracking_code]):
+            # Validación de aplicación: existencia del envío
+            shipment = self._repo.get_by_tracking_code(tracking_code)
+            if shipment is None:
+                raise ValueError(f"No hay ningún envío con el código de seguimiento '{tracking_code}'.")
 
-        # DELEGAR AL DOMINIO: Polimorfismo
-        # FragileShipment.decrease_priority() valida RN-006
-        shipment.decrease_priority()
+            # DELEGAR AL DOMINIO: Polimorfismo
+            # FragileShipment.decrease_priority() valida RN-006
+            shipment.decrease_priority()
 
-        self._repo.add(shipment)
+            self._repo.add(shipment)
 
 
-    def list_shipments(self):
+    def _hold(self, shipments):
+        """Toma las franjas de los envíos indicados (sin franjas, no bloquea nada)."""
+        if self._locks is None:
+            return nullcontext()
+        return self._locks.hold(shipments=shipments)
+
+    def list_shipments(self, after=None, limit=None):
         """
-        Obtiene una lista ordenada de todos los envíos con su información básica.
+        Obtiene una lista ordenada de los envíos con su información básica.
 
         Caso de uso: UC-03 (Listar Todos los Envíos)
         Regla de aplicación: RN-022 (Ordenación alfabética case-insensitive)
 
+        Materializa iter_shipments(); para recorrer listados grandes sin construir la
+        lista completa, usar iter_shipments() directamente.
+
+        Args:
+            after (str, opcional): Último código de la página anterior; el listado empieza justo después.
+            limit (int, opcional): Tamaño máximo de la página. Sin límite, se listan todos.
+
         Returns:
             List[Tuple]: Lista de tuplas conteniendo (código, estado, prioridad, tipo, ruta),
             ordenada alfabéticamente por código de seguimiento.
         """
+        return list(self.iter_shipments(after=after, limit=limit))
 
-        # Obtener todos los envíos del repositorio
-        shipments = self._repo.list_all()
+    def iter_shipments(self, after=None, limit=None):
+        """
+        Recorre los envíos en orden alfabético produciendo su información básica bajo demanda.
 
-        result = []
-        for shipment in shipments:
+        El orden lo sirve el repositorio (índice ordenado), por lo que no se reordena
+        ni se copia la colección: cada tupla se construye cuando se consume.
+
+        Args:
+            after (str, opcional): Último código ya servido; se empieza justo después.
+            limit (int, opcional): Número máximo de envíos a producir.
+
+        Yields:
+            Tuple: (código, estado, prioridad, tipo, ruta) de cada envío.
+        """
+        for shipment in self._repo.iter_sorted(after=after, limit=limit):
             # Extraer información básica para presentación
             # Nota: No exponemos objetos de dominio directamente a la presentación
             # Esto sigue el principio de mínima exposición
-            tracking_code = shipment.tracking_code
-            current_status = shipment.current_status
-            priority = shipment.priority
-            shipment_type = shipment.shipment_type
-            assigned_route = shipment.assigned_route
-            result.append((tracking_code, current_status, priority, shipment_type, assigned_route))
-
-        # Regla de aplicación RN-022: Ordenar alfabéticamente case-insensitive
-        # Esto es una preferencia de UI, no una regla de negocio del dominio
-        result.sort(key=lambda item: item[0].lower())
-        return result
+            yield (
+                shipment.tracking_code,
+                shipment.current_status,
+                shipment.priority,
+                shipment.shipment_type,
+                shipment.assigned_route,
+            )
 
     def get_shipment(self, tracking_code):
         """
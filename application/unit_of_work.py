@@ -0,0 +1,294 @@
+# application/unit_of_work.py
+"""
+Unidad de trabajo (Unit of Work) compartida por los tres servicios.
+
+Los servicios guardan cada agregado que modifican llamando a add() de su
+repositorio, a veces varias veces por operación (la ruta, el envío y el centro
+de origen al asignar un envío). En memoria es gratis, pero en un almacén real
+cada llamada es una escritura.
+
+La unidad de trabajo ofrece repositorios de seguimiento (shipments, centers,
+routes) con el mismo contrato que los reales: dentro de una operación de negocio
+add() solo anota el agregado como modificado, y al terminar la operación se
+escriben todos de una vez, con un add_many() por repositorio, dentro de una
+única transacción si el almacén la ofrece. Si la operación falla, los cambios
+pendientes se descartan y la transacción se deshace.
+
+Deshacer afecta solo al almacén, no a los objetos del dominio: los agregados que
+la operación llegó a modificar en memoria siguen modificados y ya no coinciden con
+lo persistido. Las operaciones del dominio validan antes de modificar, así que un
+error de negocio no deja cambios; los deja un fallo posterior (al escribir, o en
+una validación de la aplicación tras modificar). Por eso, con un almacén
+persistente hay que pasar on_rollback (p. ej. SqliteStore.clear_identity): olvida
+los objetos cargados y la siguiente lectura los reconstruye tal como están
+guardados. Las referencias obtenidas antes del fallo deben descartarse y volver a
+pedirse al repositorio. Con repositorios en memoria los objetos son el propio
+almacén y no hay estado anterior que recuperar.
+
+Las lecturas ven siempre lo escrito en la propia operación: antes de consultar
+un repositorio, los cambios pendientes se vuelcan (dentro de la misma
+transacción, así que siguen pudiendo deshacerse). Las operaciones de los
+servicios leen primero y escriben al final, de modo que lo normal es un único
+volcado por operación.
+
+Uso:
+    uow = UnitOfWork(shipment_repo, center_repo, route_repo)
+    shipment_service = ShipmentService(uow.shipments, uow=uow)
+
+Los métodos de servicio que modifican agregados se marcan con @transactional:
+cada llamada es una operación, y las llamadas anidadas se unen a la exterior.
+"""
+
+import functools
+import threading
+from contextlib import nullcontext
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.center_repository import CenterRepository
+from logistica.domain.route_repository import RouteRepository
+
+
+def transactional(method):
+    """
+    Ejecuta un método de servicio como una operación de la unidad de trabajo.
+
+    Si el servicio no tiene unidad de trabajo (atributo _uow a None), el método
+    se ejecuta tal cual y cada add() escribe inmediatamente.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._uow is None:
+            return method(self, *args, **kwargs)
+        with self._uow:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+class UnitOfWork:
+    """
+    Agrupa las escrituras de una operación de negocio sobre los tres repositorios.
+
+    Se usa como gestor de contexto; los bloques anidados en el mismo hilo forman
+    parte de la operación exterior. Cada hilo tiene su propia operación en curso.
+
+    Attributes:
+        shipments, centers, routes: Repositorios de seguimiento para los servicios.
+        flushes (int): Volcados realizados (uno por operación con cambios, salvo
+            lecturas intermedias que obliguen a volcar antes). Se actualiza bajo
+            cerrojo: es exacto aunque varios hilos compartan la unidad de trabajo.
+
+    Al deshacer una operación no se restauran los agregados modificados en memoria
+    (ver el docstring del módulo y on_rollback).
+    """
+
+    def __init__(self, shipment_repo, center_repo, route_repo, transaction=None, on_rollback=None):
+        """
+        Args:
+            shipment_repo, center_repo, route_repo: Repositorios reales.
+            transaction (Callable, opcional): Fábrica de gestores de contexto que abre
+                una transacción del almacén (p. ej. SqliteStore.transaction). Sin ella,
+                los volcados no son atómicos.
+            on_rollback (Callable, opcional): Se invoca sin argumentos al deshacer una
+                operación, para que el almacén olvide los objetos en memoria que ya no
+                coinciden con lo persistido (p. ej. SqliteStore.clear_identity). Es la
+                única forma de volver a leer el estado guardado: la unidad de trabajo no
+                deshace los cambios de los objetos del dominio.
+        """
+        self.shipments = _TrackingShipmentRepository(self, shipment_repo)
+        self.centers = _TrackingCenterRepository(self, center_repo)
+        self.routes = _TrackingRouteRepository(self, route_repo)
+        self._transaction = transaction or nullcontext
+        self._on_rollback = on_rollback
+        self._local = threading.local()
+        # Protege los contadores compartidos entre los hilos que usan la unidad de trabajo
+        self._lock = threading.Lock()
+        self.flushes = 0
+
+    def __enter__(self):
+        local = self._local
+        depth = getattr(local, "depth", 0)
+        if depth == 0:
+            # Agregados modificados por repositorio, sin duplicados y en orden de llegada
+            local.dirty = {self.shipments: {}, self.centers: {}, self.routes: {}}
+            local.transaction = self._transaction()
+            local.transaction.__enter__()
+        local.depth = depth + 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        local = self._local
+        local.depth -= 1
+        if local.depth > 0:
+            return False
+
+        transaction = local.transaction
+        try:
+            if exc_type is None:
+                self.flush()
+        except BaseException as e:
+            exc_type, exc, tb = type(e), e, e.__traceback__
+            raise
+        finally:
+            local.dirty = None
+            local.transaction = None
+            # Cerrar la transacción: confirma, o la deshace si hubo un error
+            transaction.__exit__(exc_type, exc, tb)
+            if exc_type is not None and self._on_rollback is not None:
+                self._on_rollback()
+        return False
+
+    def flush(self):
+        """
+        Escribe los agregados pendientes con un add_many() por repositorio.
+
+        Se vuelcan los tres repositorios a la vez (envíos, centros y rutas, en ese
+        orden) porque cargar un agregado puede leer de los otros: una ruta persistida
+        se reconstruye con sus centros y envíos.
+        """
+        dirty = getattr(self._local, "dirty", None)
+        if not dirty:
+            return
+
+        wrote = False
+        for tracking, pending in dirty.items():
+            if pending:
+                aggregates = list(pending.values())
+                pending.clear()
+                tracking._inner.add_many(aggregates)
+                wrote = True
+        if wrote:
+            with self._lock:
+                self.flushes += 1
+
+    def _register(self, repo, aggregates):
+        """Anota agregados modificados; fuera de una operación los escribe ya."""
+        dirty = getattr(self._local, "dirty", None)
+        if dirty is None:
+            repo._inner.add_many(aggregates)
+            return
+
+        pending = dirty[repo]
+        for aggregate in aggregates:
+            pending[id(aggregate)] = aggregate
+
+
+class _TrackingShipmentRepository(ShipmentRepository):
+    """Repositorio de envíos que difiere las escrituras a la unidad de trabajo."""
+
+    def __init__(self, uow, inner):
+        self._uow = uow
+        self._inner = inner
+
+    def add(self, shipment):
+        self._uow._register(self, (shipment,))
+
+    def add_many(self, shipments):
+        self._uow._register(self, shipments)
+
+    def remove(self, tracking_code):
+        self._uow.flush()
+        return self._inner.remove(tracking_code)
+
+    def get_by_tracking_code(self, tracking_code):
+        self._uow.flush()
+        return self._inner.get_by_tracking_code(tracking_code)
+
+    def get_many(self, tracking_codes):
+        self._uow.flush()
+        return self._inner.get_many(tracking_codes)
+
+    def list_all(self):
+        self._uow.flush()
+        return self._inner.list_all()
+
+    def iter_all(self):
+        self._uow.flush()
+        return self._inner.iter_all()
+
+    def snapshot(self):
+        self._uow.flush()
+        return self._inner.snapshot()
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        self._uow.flush()
+        return self._inner.find(status, route_id, priority, shipment_type)
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        self._uow.flush()
+        return self._inner.count(status, route_id, priority, shipment_type)
+
+    def iter_sorted(self, after=None, limit=None):
+        self._uow.flush()
+        return self._inner.iter_sorted(after, limit)
+
+
+class _TrackingCenterRepository(CenterRepository):
+    """Repositorio de centros que difiere las escrituras a la unidad de trabajo."""
+
+    def __init__(self, uow, inner):
+        self._uow = uow
+        self._inner = inner
+
+    def add(self, center):
+        self._uow._register(self, (center,))
+
+    def add_many(self, centers):
+        self._uow._register(self, centers)
+
+    def remove(self, center_id):
+        self._uow.flush()
+        return self._inner.remove(center_id)
+
+    def get_by_center_id(self, center_id):
+        self._uow.flush()
+        return self._inner.get_by_center_id(center_id)
+
+    def list_all(self):
+        self._uow.flush()
+        return self._inner.list_all()
+
+    def iter_all(self):
+        self._uow.flush()
+        return self._inner.iter_all()
+
+    def snapshot(self):
+        self._uow.flush()
+        return self._inner.snapshot()
+
+
+class _TrackingRouteRepository(RouteRepository):
+    """Repositorio de rutas que difiere las escrituras a la unidad de trabajo."""
+
+    def __init__(self, uow, inner):
+        self._uow = uow
+        self._inner = inner
+
+    def add(self, route):
+        self._uow._register(self, (route,))
+
+    def add_many(self, routes):
+        self._uow._register(self, routes)
+
+    def remove(self, route_id):
+        self._uow.flush()
+        return self._inner.remove(route_id)
+
+    def get_by_route_id(self, route_id):
+        self._uow.flush()
+        return self._inner.get_by_route_id(route_id)
+
+    def list_all(self):
+        self._uow.flush()
+        return self._inner.list_all()
+
+    def iter_all(self):
+        self._uow.flush()
+        return self._inner.iter_all()
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        self._uow.flush()
+        return self._inner.find(origin_id, destination_id, cargo_class, active)
+
+    def snapshot(self):
+        self._uow.flush()
+        return self._inner.snapshot()
@@ -0,0 +1,75 @@
+# benchmarks/bench_assignment.py
+"""
+Medición: reparto automático de los envíos de un centro entre sus rutas de salida.
+
+Recibe N envíos sin ruta (tipos y prioridades mezclados) en un centro con varias
+rutas de salida de cada clase y mide el plan solo (domain/assignment_planner.py)
+y el reparto completo del servicio, que además aplica y persiste las asignaciones.
+
+Uso:
+    python -m logistica.benchmarks.bench_assignment [N]
+"""
+
+import random
+import sys
+import time
+
+from logistica.application.route_service import RouteService
+from logistica.domain.assignment_planner import plan_assignments
+from logistica.domain.center import Center
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.route import Route
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.benchmarks.bench_shipment_memory import _codes
+
+
+def _setup(n, routes_per_class):
+    rng = random.Random(7)
+    shipment_repo = ShipmentRepositoryMemory()
+    center_repo = CenterRepositoryMemory()
+    route_repo = RouteRepositoryMemory()
+
+    origin = Center("MAD01", "Madrid", "Calle A")
+    destination = Center("BCN02", "Barcelona", "Calle B")
+    center_repo.add_many([origin, destination])
+    route_repo.add_many(
+        Route(f"MAD01-BCN02-{cargo}-{i:03d}", origin, destination)
+        for cargo in ("STD", "FRG", "EXP") for i in range(routes_per_class)
+    )
+
+    shipments = []
+    for code in _codes(n):
+        kind = rng.random()
+        if kind < 0.1:
+            shipments.append(ExpressShipment(code, "Remitente", "Destinatario"))
+        elif kind < 0.3:
+            shipments.append(FragileShipment(code, "Remitente", "Destinatario", rng.choice((2, 3))))
+        else:
+            shipments.append(Shipment(code, "Remitente", "Destinatario", rng.choice((1, 2, 3))))
+    shipment_repo.add_many(shipments)
+    origin.receive_many(shipments)
+    return RouteService(route_repo, shipment_repo, center_repo), origin, route_repo
+
+
+def main(n=100_000, routes_per_class=10):
+    service, origin, route_repo = _setup(n, routes_per_class)
+    print(f"Envíos en el centro: {n}  Rutas de salida: {3 * routes_per_class}")
+
+    start = time.perf_counter()
+    plan, _ = plan_assignments(origin.list_shipments(), route_repo.list_all(), capacity=n // 20)
+    elapsed = time.perf_counter() - start
+    planned = sum(len(shipments) for shipments in plan.values())
+    print(f"  {'plan (capacidad ' + str(n // 20) + ' por ruta)':<34} {elapsed * 1000:10.1f} ms  {planned:,} asignados")
+
+    start = time.perf_counter()
+    assigned, rejected = service.assign_center_shipments("MAD01")
+    elapsed = time.perf_counter() - start
+    print(f"  {'reparto completo del servicio':<34} {elapsed * 1000:10.1f} ms  {len(assigned):,} asignados, {len(rejected)} rechazados")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
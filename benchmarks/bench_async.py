@@ -0,0 +1,88 @@
+# benchmarks/bench_async.py
+"""
+Medición: consultas de seguimiento concurrentes con los servicios asíncronos.
+
+Simula un almacén remoto añadiendo una latencia fija a cada lectura (un await de
+asyncio.sleep, como una consulta de red) y mide cuántas consultas por segundo
+atiende un único bucle de eventos según cuántas haya en vuelo a la vez. Como
+referencia, mide también el servicio síncrono sobre el repositorio en memoria sin
+latencia y el coste añadido del adaptador asíncrono en el mismo caso.
+
+Uso:
+    python -m logistica.benchmarks.bench_async [N] [LATENCIA_MS]
+"""
+
+import asyncio
+import random
+import sys
+import time
+
+from logistica.application.async_services import AsyncShipmentService
+from logistica.application.shipment_service import ShipmentService
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.async_memory import AsyncShipmentRepositoryAdapter
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.benchmarks.bench_shipment_memory import _codes
+
+
+class _RemoteShipments(AsyncShipmentRepositoryAdapter):
+    """Adaptador en memoria con la latencia de un almacén remoto en cada lectura."""
+
+    def __init__(self, repo, latency):
+        super().__init__(repo)
+        self._latency = latency
+
+    async def get_by_tracking_code(self, tracking_code):
+        await asyncio.sleep(self._latency)
+        return await super().get_by_tracking_code(tracking_code)
+
+
+def _report(label, n, elapsed):
+    print(f"  {label:<34} {n / elapsed:12,.0f} consultas/s")
+
+
+async def _lookups(service, codes, in_flight):
+    """Resuelve todas las consultas con como mucho in_flight a la vez."""
+    pending = iter(codes)
+
+    async def worker():
+        for code in pending:
+            await service.get_shipment(code)
+
+    await asyncio.gather(*(worker() for _ in range(in_flight)))
+
+
+def main(n=20_000, latency_ms=1.0):
+    codes = _codes(n)
+    repo = ShipmentRepositoryMemory()
+    repo.add_many(Shipment(code, "Remitente", "Destinatario") for code in codes)
+    lookups = random.Random(7).choices(codes, k=n)
+    print(f"Envíos: {n}  Consultas: {n}  Latencia simulada: {latency_ms} ms")
+
+    print("Sin latencia (memoria)")
+    sync_service = ShipmentService(repo)
+    start = time.perf_counter()
+    for code in lookups:
+        sync_service.get_shipment(code)
+    _report("síncrono", n, time.perf_counter() - start)
+
+    async_service = AsyncShipmentService(AsyncShipmentRepositoryAdapter(repo))
+    start = time.perf_counter()
+    asyncio.run(_lookups(async_service, lookups, 1))
+    _report("asíncrono, 1 en vuelo", n, time.perf_counter() - start)
+
+    print("Con latencia (almacén remoto simulado)")
+    remote_service = AsyncShipmentService(_RemoteShipments(repo, latency_ms / 1000))
+    for in_flight in (1, 10, 100, 1000):
+        # Con una sola consulta en vuelo se mide una muestra: cada una tarda la latencia completa
+        sample = lookups if in_flight > 1 else lookups[:max(1, min(n, int(200 / max(latency_ms, 0.01))))]
+        start = time.perf_counter()
+        asyncio.run(_lookups(remote_service, sample, in_flight))
+        _report(f"asíncrono, {in_flight} en vuelo", len(sample), time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        float(sys.argv[2]) if len(sys.argv) > 2 else 1.0,
+    )
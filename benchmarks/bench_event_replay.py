@@ -0,0 +1,97 @@
+# benchmarks/bench_event_replay.py
+"""
+Medición: velocidad de reproducción del registro de eventos (eventos/s).
+
+Genera un log realista pasando N envíos por el ciclo completo a través de los
+servicios (alta, asignación a ruta, despacho y entrega) y mide:
+
+- La escritura de eventos durante la carga de trabajo
+- El arranque sin instantánea, reproduciendo el log completo
+- El arranque desde una instantánea tomada al final, sin cola que reproducir
+
+Sirve para dimensionar cuánto tarda un reinicio tras una caída.
+
+Uso:
+    python -m logistica.benchmarks.bench_event_replay [N]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+from logistica.infrastructure.event_log import EventSourcedStore
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.benchmarks.bench_shipment_memory import _codes
+
+# Envíos por ruta en la carga de trabajo
+_ROUTE_SIZE = 500
+
+
+def _open(directory):
+    return EventSourcedStore(
+        directory,
+        ShipmentRepositoryMemory(),
+        CenterRepositoryMemory(),
+        RouteRepositoryMemory(),
+        snapshot_every=0,
+    )
+
+
+def _workload(store, n):
+    """Ejecuta el ciclo de vida completo de n envíos sobre los repositorios del store."""
+    shipment_service = ShipmentService(store.shipments)
+    center_service = CenterService(store.centers, store.shipments)
+    route_service = RouteService(store.routes, store.shipments, store.centers)
+
+    center_service.register_center("MAD01", "Madrid", "Calle A")
+    center_service.register_center("BCN02", "Barcelona", "Calle B")
+
+    codes = _codes(n)
+    for start in range(0, n, _ROUTE_SIZE):
+        # Como máximo 1000 rutas (sufijo de 3 dígitos): basta para 500.000 envíos
+        route_id = f"MAD01-BCN02-STD-{start // _ROUTE_SIZE:03d}"
+        route_service.create_route(route_id, "MAD01", "BCN02")
+        for code in codes[start:start + _ROUTE_SIZE]:
+            shipment_service.register_shipment(code, "Remitente", "Destinatario")
+            route_service.assign_shipment_to_route(code, route_id)
+        route_service.dispatch_route(route_id)
+        route_service.complete_route(route_id)
+
+
+def main(n=50_000):
+    with tempfile.TemporaryDirectory() as directory:
+        store = _open(directory)
+        start = time.perf_counter()
+        _workload(store, n)
+        elapsed = time.perf_counter() - start
+        store.close()
+
+        log_size = os.path.getsize(os.path.join(directory, "events.log"))
+        store = _open(directory)
+        events = store.replayed
+        print(f"Envíos: {n}  Eventos: {events}  Log: {log_size / 1e6:.1f} MB")
+        print(f"  Carga de trabajo con registro   {events / elapsed:12,.0f} eventos/s")
+
+        store.close()
+        start = time.perf_counter()
+        store = _open(directory)
+        elapsed = time.perf_counter() - start
+        print(f"  Arranque reproduciendo el log   {store.replayed / elapsed:12,.0f} eventos/s ({elapsed:.2f} s)")
+
+        store.snapshot()
+        store.close()
+        start = time.perf_counter()
+        store = _open(directory)
+        elapsed = time.perf_counter() - start
+        print(f"  Arranque desde instantánea      {elapsed:12.2f} s (cola: {store.replayed} eventos)")
+        store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
@@ -0,0 +1,105 @@
+# benchmarks/bench_ingest.py
+"""
+Medición: carga masiva de manifiestos (filas por segundo).
+
+Genera un manifiesto CSV y otro JSONL de N filas con un 2 % de filas
+inválidas y duplicadas, y mide ShipmentService.ingest_manifest() sobre el
+repositorio en memoria, el columnar y el SQLite. También muestra el pico de
+memoria de la carga (sin contar los envíos retenidos por el repositorio), que
+no debe crecer con N, y el escalado de la validación en paralelo con 1, 2 y 4
+procesos (solo se aprecia en máquinas con varios núcleos).
+
+Uso:
+    python -m logistica.benchmarks.bench_ingest [N]
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from logistica.application.shipment_service import ShipmentService
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.columnar_shipment import ShipmentRepositoryColumnar
+from logistica.infrastructure.sqlite_store import SqliteStore
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySqlite
+from logistica.benchmarks.bench_shipment_memory import _codes
+
+_FIELDS = ("tracking_code", "sender", "recipient", "priority", "shipment_type")
+_TYPES = ("standard", "standard", "fragile", "express")
+
+
+def _rows(n):
+    """Filas del manifiesto; una de cada 50 es inválida o repite un código anterior."""
+    codes = _codes(n)
+    for i, code in enumerate(codes):
+        shipment_type = _TYPES[i % len(_TYPES)]
+        priority = 2 if shipment_type == "fragile" else i % 3 + 1
+        if i % 100 == 49:
+            priority = 9
+        elif i % 100 == 99:
+            code = codes[i - 1]
+        yield code, f"Remitente {i % 1000}", f"Destinatario {i % 5000}", priority, shipment_type
+
+
+def _write_manifests(directory, n):
+    csv_path = os.path.join(directory, "manifest.csv")
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(_FIELDS)
+        writer.writerows(_rows(n))
+
+    jsonl_path = os.path.join(directory, "manifest.jsonl")
+    with open(jsonl_path, "w", encoding="utf-8") as f:
+        for row in _rows(n):
+            f.write(json.dumps(dict(zip(_FIELDS, row))) + "\n")
+    return csv_path, jsonl_path
+
+
+def _measure(label, repo, path, reject_path, rows, workers=1):
+    service = ShipmentService(repo)
+    start = time.perf_counter()
+    accepted, rejected = service.ingest_manifest(path, reject_path, workers=workers)
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<24} {rows / elapsed:10,.0f} filas/s  ({accepted} aceptadas, {rejected} rechazadas)")
+
+
+def _peak_memory(path, reject_path):
+    """Pico de memoria de la carga con un repositorio que descarta los envíos."""
+    class _Discard(ShipmentRepositoryMemory):
+        def add_many(self, shipments):
+            pass
+
+    tracemalloc.start()
+    ShipmentService(_Discard()).ingest_manifest(path, reject_path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main(n=200_000):
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path, jsonl_path = _write_manifests(directory, n)
+        reject_path = os.path.join(directory, "rejects.csv")
+        print(f"Filas: {n}")
+
+        for name, path in (("CSV", csv_path), ("JSONL", jsonl_path)):
+            _measure(f"{name} -> memoria", ShipmentRepositoryMemory(), path, reject_path, n)
+            _measure(f"{name} -> columnar", ShipmentRepositoryColumnar(), path, reject_path, n)
+
+            store = SqliteStore(os.path.join(directory, f"{name}.db"))
+            _measure(f"{name} -> SQLite", ShipmentRepositorySqlite(store), path, reject_path, n)
+            store.close()
+
+        print(f"  Núcleos disponibles: {os.cpu_count()}")
+        for workers in (1, 2, 4):
+            _measure(f"CSV -> memoria, {workers} proc.", ShipmentRepositoryMemory(), csv_path, reject_path, n, workers)
+
+        print(f"  Pico de memoria de la carga (CSV): {_peak_memory(csv_path, reject_path) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,92 @@
+# benchmarks/bench_repositories.py
+"""
+Medición: repositorio de envíos en memoria frente a SQLite.
+
+Para cada implementación mide el alta de N envíos (en lote con add_many y uno a
+uno con add), las lecturas por código con y sin el objeto vivo en memoria, los
+filtros (find/count) y la paginación ordenada (iter_sorted).
+
+La base SQLite se crea en un directorio temporal en disco, con WAL activado.
+
+Uso:
+    python -m logistica.benchmarks.bench_repositories [N]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.sqlite_store import SqliteStore
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySqlite
+from logistica.benchmarks.bench_shipment_memory import _codes
+
+
+def _timed(label, n, action):
+    """Ejecuta action() y muestra operaciones por segundo."""
+    start = time.perf_counter()
+    action()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<28} {n / elapsed:12,.0f} ops/s")
+
+
+def _shipments(codes):
+    """Crea envíos con estados, prioridades y rutas variados."""
+    shipments = []
+    for i, code in enumerate(codes):
+        shipment = Shipment(code, "Remitente", "Destinatario", i % 3 + 1)
+        if i % 4 == 0:
+            shipment.assign_route(f"MAD01-BCN02-STD-{i % 50:03d}")
+        if i % 2 == 0:
+            shipment.update_status("IN_TRANSIT")
+        shipments.append(shipment)
+    return shipments
+
+
+def run(name, make_repo, codes, single):
+    """Ejecuta la batería de mediciones sobre un repositorio creado por make_repo."""
+    print(name)
+    repo = make_repo()
+    shipments = _shipments(codes)
+    lookups = random.Random(7).sample(codes, min(len(codes), 10_000))
+
+    _timed("add_many (lote)", len(codes), lambda: repo.add_many(shipments))
+    _timed("add (uno a uno)", len(single), lambda: [repo.add(Shipment(code, "R", "D")) for code in single])
+    _timed("get (objeto vivo)", len(lookups), lambda: [repo.get_by_tracking_code(code) for code in lookups])
+
+    # Sin referencias vivas, el repositorio persistente tiene que leer de disco
+    del shipments
+    repo = make_repo(reuse=True)
+    _timed("get (en frío)", len(lookups), lambda: [repo.get_by_tracking_code(code) for code in lookups])
+    _timed("count (estado+prioridad)", 100, lambda: [repo.count(status="IN_TRANSIT", priority=2) for _ in range(100)])
+    _timed("find (ruta)", 100, lambda: [repo.find(route_id="MAD01-BCN02-STD-010") for _ in range(100)])
+    _timed("iter_sorted (página de 50)", 1000, lambda: [list(repo.iter_sorted(after=code, limit=50)) for code in lookups[:1000]])
+
+
+def main(n=50_000):
+    codes = _codes(n + 1000)
+    codes, single = codes[:n], codes[n:]
+    print(f"Envíos: {n}")
+
+    memory = ShipmentRepositoryMemory()
+    run("Memoria", lambda reuse=False: memory, codes, single)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        stores = []
+
+        def make_sqlite(reuse=False):
+            # reuse: almacén nuevo sobre el mismo fichero, sin mapa de identidad caliente
+            stores.append(SqliteStore(path))
+            return ShipmentRepositorySqlite(stores[-1])
+
+        run("SQLite (WAL)", make_sqlite, codes, single)
+        for store in stores:
+            store.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50_000)
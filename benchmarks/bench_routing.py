@@ -0,0 +1,65 @@
+# benchmarks/bench_routing.py
+"""
+Medición: búsqueda de caminos de varios tramos en una red grande de centros.
+
+Genera una red aleatoria de N centros con unas pocas rutas salientes por centro y
+mide la primera búsqueda desde cada origen (Dijkstra completo), las búsquedas
+repetidas servidas desde la caché de árboles, y el coste de crear y completar
+rutas con la caché llena (actualización incremental frente a recalcular).
+
+Uso:
+    python -m logistica.benchmarks.bench_routing [N]
+"""
+
+import random
+import sys
+import time
+
+from logistica.domain.route_network import RouteNetwork
+
+
+def _report(label, count, elapsed, unit):
+    print(f"  {label:<34} {count / elapsed:12,.0f} {unit}/s")
+
+
+def main(n=5_000, out_degree=4, sources=200):
+    rng = random.Random(7)
+    centers = [f"C{i:05d}" for i in range(n)]
+    network = RouteNetwork(max_sources=sources)
+    for i, origin in enumerate(centers):
+        for j, destination in enumerate(rng.sample(centers, out_degree)):
+            if destination != origin:
+                network.add_route(f"R{i}-{j}", origin, destination, rng.randint(1, 20))
+    print(f"Centros: {n}  Rutas: {len(network)}  Orígenes en caché: {sources}")
+
+    origins = rng.sample(centers, sources)
+    start = time.perf_counter()
+    for origin in origins:
+        network.shortest_path(origin, rng.choice(centers))
+    _report("primera búsqueda por origen", sources, time.perf_counter() - start, "búsquedas")
+
+    queries = [(rng.choice(origins), rng.choice(centers)) for _ in range(100_000)]
+    start = time.perf_counter()
+    for origin, destination in queries:
+        network.shortest_path(origin, destination)
+    _report("búsquedas con caché", len(queries), time.perf_counter() - start, "búsquedas")
+
+    changes = 200
+    start = time.perf_counter()
+    for k in range(changes):
+        network.add_route(f"NEW{k}", rng.choice(centers), rng.choice(centers), rng.randint(1, 20))
+    _report("crear ruta (caché llena)", changes, time.perf_counter() - start, "rutas")
+
+    start = time.perf_counter()
+    for k in range(changes):
+        network.remove_route(f"NEW{k}")
+    _report("completar ruta (caché llena)", changes, time.perf_counter() - start, "rutas")
+
+    start = time.perf_counter()
+    for origin in origins:
+        network.shortest_path(origin, rng.choice(centers))
+    _report("búsqueda tras invalidar", sources, time.perf_counter() - start, "búsquedas")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,62 @@
+# benchmarks/bench_shipment_memory.py
+"""
+Medición: bytes por envío vivo para cada tipo de la jerarquía Shipment.
+
+Crea N envíos de cada tipo y mide con tracemalloc la memoria retenida,
+incluyendo el propio objeto, su historial de estados y cualquier atributo
+por instancia. Los textos (códigos, remitentes...) se comparten entre
+envíos para medir solo el coste de la representación.
+
+Uso:
+    python -m logistica.benchmarks.bench_shipment_memory [N]
+"""
+
+import sys
+import tracemalloc
+
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+
+def _codes(n):
+    """Genera n códigos de seguimiento válidos y distintos (AAA000, AAA001...)."""
+    letters = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    codes = []
+    for i in range(n):
+        block, number = divmod(i, 1000)
+        prefix = letters[block // 676 % 26] + letters[block // 26 % 26] + letters[block % 26]
+        codes.append(f"{prefix}{number:03d}")
+    return codes
+
+
+def measure(factory, codes):
+    """Devuelve los bytes retenidos por envío al crear len(codes) envíos con factory."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    shipments = [factory(code) for code in codes]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    # Descontar la lista contenedora, que no forma parte del envío
+    retained -= sys.getsizeof(shipments)
+    return retained / len(codes)
+
+
+def main(n=100_000):
+    # Códigos normalizados de antemano: el constructor no crea cadenas nuevas
+    codes = _codes(n)
+    factories = {
+        "STANDARD": lambda code: Shipment(code, "Remitente", "Destinatario", 1),
+        "FRAGILE": lambda code: FragileShipment(code, "Remitente", "Destinatario", 2),
+        "EXPRESS": lambda code: ExpressShipment(code, "Remitente", "Destinatario"),
+    }
+
+    print(f"Envíos por tipo: {n}")
+    for name, factory in factories.items():
+        print(f"  {name:<9} {measure(factory, codes):8.1f} bytes/envío")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
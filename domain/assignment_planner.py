@@ -0,0 +1,83 @@
+# domain/assignment_planner.py
+"""
+Dominio: reparto automático de los envíos de un centro entre sus rutas de salida.
+
+Cada envío solo puede viajar en rutas de su clase de carga (Route.cargo_class, la
+que codifica el ID ORIGEN-DESTINO-CLASE-999):
+- STANDARD -> STD
+- FRAGILE  -> FRG
+- EXPRESS  -> EXP
+
+Algoritmo (O(n log r) para n envíos y r rutas de salida):
+- Los envíos se agrupan por clase y prioridad en una sola pasada. Las prioridades
+  son pocas (1-3), así que recorrer los grupos de mayor a menor equivale a ordenar
+  sin ordenar, y dentro de cada grupo se respeta el orden de llegada al centro.
+- Cada envío va a la ruta compatible menos cargada (montículo por carga actual).
+  Con envíos de tamaño unitario, este voraz deja las rutas equilibradas y, con una
+  capacidad máxima por ruta, llena todas las plazas disponibles empezando por los
+  envíos más prioritarios: los que no caben son siempre los de menor prioridad.
+"""
+
+import heapq
+
+# Clase de carga de las rutas que acepta cada tipo de envío
+ROUTE_CLASSES = {"STANDARD": "STD", "FRAGILE": "FRG", "EXPRESS": "EXP"}
+
+
+def plan_assignments(shipments, routes, capacity=None):
+    """
+    Decide a qué ruta va cada envío, sin modificar nada.
+
+    Args:
+        shipments (Iterable[Shipment]): Envíos por asignar, en orden de llegada.
+        routes (Iterable[Route]): Rutas activas candidatas.
+        capacity (int, opcional): Máximo de envíos por ruta, contando los que ya lleva.
+            Sin ella, las rutas no tienen límite.
+
+    Returns:
+        Tuple[Dict[str, List[Shipment]], List[Tuple[str, str]]]: (plan, rechazados).
+        El plan asocia cada ID de ruta a los envíos que recibe, de mayor a menor
+        prioridad; rechazados contiene pares (código, motivo).
+
+    Raises:
+        ValueError: Si la capacidad es menor que 1.
+    """
+    if capacity is not None and capacity < 1:
+        raise ValueError("La capacidad de una ruta debe ser al menos 1.")
+
+    # Rutas de cada clase como montículo de (carga, ID): la cima es la menos cargada
+    heaps = {}
+    for route in routes:
+        load = route.shipment_count
+        heap = heaps.setdefault(route.cargo_class, [])
+        if capacity is None or load < capacity:
+            heap.append((load, route.route_id))
+    for heap in heaps.values():
+        heapq.heapify(heap)
+
+    # Una sola pasada: grupos por (clase, prioridad) en orden de llegada
+    groups = {}
+    for shipment in shipments:
+        cargo = ROUTE_CLASSES[shipment.shipment_type]
+        groups.setdefault((cargo, shipment.priority), []).append(shipment)
+
+    plan = {}
+    rejected = []
+    for cargo, priority in sorted(groups, key=lambda group: -group[1]):
+        heap = heaps.get(cargo)
+        for shipment in groups[cargo, priority]:
+            if not heap:
+                reason = (
+                    f"No hay rutas {cargo} activas con plazas libres en el centro."
+                    if cargo in heaps else f"No hay rutas {cargo} activas desde el centro."
+                )
+                rejected.append((shipment.tracking_code, reason))
+                continue
+            load, route_id = heap[0]
+            plan.setdefault(route_id, []).append(shipment)
+            load += 1
+            if capacity is None or load < capacity:
+                heapq.heapreplace(heap, (load, route_id))
+            else:
+                heapq.heappop(heap)
+    return plan, rejected
@@ -0,0 +1,146 @@
+# domain/async_repository.py
+"""
+Contratos asíncronos de los repositorios de envíos, centros y rutas.
+
+Son la versión con corrutinas de ShipmentRepository, CenterRepository y
+RouteRepository, para almacenes cuya E/S no debe bloquear el bucle de eventos
+(una base de datos remota, un servicio HTTP). Los métodos tienen los mismos
+nombres, argumentos y resultados que los síncronos, pero hay que esperarlos con
+await; iter_sorted() es un iterador asíncrono.
+
+Las implementaciones por defecto siguen el mismo criterio que en los contratos
+síncronos: se apoyan en los métodos básicos y las implementaciones concretas
+pueden sobrescribirlas con algo mejor.
+"""
+
+
+class AsyncShipmentRepository:
+    async def add(self, shipment):
+        raise NotImplementedError
+
+    async def add_many(self, shipments):
+        """
+        Almacena o actualiza varios envíos en una sola operación.
+
+        Implementación por defecto: espera add() por cada elemento.
+        """
+        for shipment in shipments:
+            await self.add(shipment)
+
+    async def remove(self, tracking_code):
+        raise NotImplementedError
+
+    async def get_by_tracking_code(self, tracking_code):
+        raise NotImplementedError
+
+    async def list_all(self):
+        raise NotImplementedError
+
+    async def get_many(self, tracking_codes):
+        """
+        Recupera varios envíos por su código de seguimiento en una sola operación.
+
+        Devuelve una lista alineada con tracking_codes: el envío encontrado o None.
+
+        Implementación por defecto: espera get_by_tracking_code() por cada código.
+        """
+        return [await self.get_by_tracking_code(code) for code in tracking_codes]
+
+    async def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Devuelve los envíos que cumplen todos los filtros indicados (None = sin filtro).
+
+        Implementación por defecto: recorrido completo de list_all().
+        """
+        status = status.upper() if status is not None else None
+        shipment_type = shipment_type.upper() if shipment_type is not None else None
+        return [
+            s for s in await self.list_all()
+            if (status is None or s.current_status == status)
+            and (route_id is None or s.assigned_route == route_id)
+            and (priority is None or s.priority == priority)
+            and (shipment_type is None or s.shipment_type == shipment_type)
+        ]
+
+    async def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """Cuenta los envíos que cumplen los filtros (ver find())."""
+        return len(await self.find(status, route_id, priority, shipment_type))
+
+    async def iter_sorted(self, after=None, limit=None):
+        """
+        Itera de forma asíncrona los envíos en orden alfabético de código (RN-022).
+
+        Implementación por defecto: ordena list_all() en cada llamada.
+        """
+        last = (after or "").strip().lower()
+        shipments = sorted(await self.list_all(), key=lambda s: s.tracking_code.lower())
+        served = 0
+        for shipment in shipments:
+            if limit is not None and served >= limit:
+                break
+            if shipment.tracking_code.lower() > last:
+                yield shipment
+                served += 1
+
+
+class AsyncCenterRepository:
+    async def add(self, center):
+        raise NotImplementedError
+
+    async def add_many(self, centers):
+        """
+        Almacena o actualiza varios centros en una sola operación.
+
+        Implementación por defecto: espera add() por cada elemento.
+        """
+        for center in centers:
+            await self.add(center)
+
+    async def remove(self, center_id):
+        raise NotImplementedError
+
+    async def get_by_center_id(self, center_id):
+        raise NotImplementedError
+
+    async def list_all(self):
+        raise NotImplementedError
+
+
+class AsyncRouteRepository:
+    async def add(self, route):
+        raise NotImplementedError
+
+    async def add_many(self, routes):
+        """
+        Almacena o actualiza varias rutas en una sola operación.
+
+        Implementación por defecto: espera add() por cada elemento.
+        """
+        for route in routes:
+            await self.add(route)
+
+    async def remove(self, route_id):
+        raise NotImplementedError
+
+    async def get_by_route_id(self, route_id):
+        raise NotImplementedError
+
+    async def list_all(self):
+        raise NotImplementedError
+
+    async def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        """
+        Devuelve las rutas que cumplen todos los filtros indicados (None = sin filtro).
+
+        Implementación por defecto: recorrido completo de list_all().
+        """
+        origin_id = origin_id.strip().upper() if origin_id is not None else None
+        destination_id = destination_id.strip().upper() if destination_id is not None else None
+        cargo_class = cargo_class.strip().upper() if cargo_class is not None else None
+        return [
+            r for r in await self.list_all()
+            if (origin_id is None or r.origin_center.center_id == origin_id)
+            and (destination_id is None or r.destination_center.center_id == destination_id)
+            and (cargo_class is None or r.cargo_class == cargo_class)
+            and (active is None or r.is_active == active)
+        ]
@@ -2,8 +2,19 @@
 
 """Dominio: Representa un nodo en la red logística con capacidad de almacenamiento."""
 
+import heapq
 import re
+from collections import deque
+from types import MappingProxyType
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_lifecycle import STATUS_CODES, IN_TRANSIT, can_transition
+
+# Tipos de envío que ocupan plazas de un centro (ver Shipment.shipment_type)
+SHIPMENT_TYPES = ("STANDARD", "FRAGILE", "EXPRESS")
+
+# Modos de admisión cuando el centro está lleno
+REJECT = "reject"  # La entrada se rechaza con ValueError (o como rechazo en los lotes)
+QUEUE = "queue"    # La entrada espera en cola y ocupa plaza al liberarse una
 
 class Center:
     """
@@ -18,9 +29,19 @@ class Center:
     1. Un envío no puede estar en dos centros simultáneamente
     2. Solo se pueden despachar envíos que están físicamente en el centro
     3. Los atributos básicos (ID, nombre, ubicación) son inmutables
+    4. Con capacidad configurada, el inventario no supera las plazas (en total ni por
+       tipo) salvo que se reduzca la capacidad de un centro ya ocupado
+
+    Muelle de carga: una cola de prioridad (prioridad y después orden de llegada)
+    sobre el inventario decide qué envío sale a continuación (ver pop_next()).
+
+    Capacidad (RN-036): opcional, en plazas totales y/o por tipo de envío. Cuando no
+    hay plaza, la entrada se rechaza o espera en una cola FIFO según el modo de
+    admisión; los envíos en cola no están en el inventario y entran solos, por
+    orden de llegada, en cuanto un despacho libera plaza.
     """
 
-    def __init__(self, center_id, name, location):
+    def __init__(self, center_id, name, location, capacity=None, type_capacity=None, admission=REJECT):
         """
         Inicializa una nueva instancia de Center.
 
@@ -33,9 +54,13 @@ class Center:
             center_id (str): ID único del centro.
             name (str): Nombre del centro.
             location (str): Ubicación física.
+            capacity (int, opcional): Plazas totales. Sin ella, el centro no tiene límite.
+            type_capacity (Dict[str, int], opcional): Plazas máximas por tipo de envío.
+            admission (str, opcional): REJECT (por defecto) o QUEUE, ver configure_capacity().
 
         Raises:
-            ValueError: Si alguno de los argumentos está vacío, no es una cadena o no cumple con el patrón de forma.
+            ValueError: Si alguno de los argumentos está vacío, no es una cadena o no cumple con el patrón de forma,
+            o si la capacidad no es válida.
         """
 
         # Reglas de negocio: validación de datos obligatorios
@@ -57,9 +82,41 @@ class Center:
         self.__location = location
 
         # Inventario de envíos almacenados físicamente en este centro
-        # Se usa lista en lugar de dict porque el orden de inserción puede ser relevante
-        # y el acceso por código se hace mediante búsqueda lineal (válido por ahora)
-        self._shipments = []
+        # Se indexa por código de seguimiento: el dict conserva el orden de llegada
+        # y ofrece pertenencia, inserción y borrado en O(1) incluso con decenas de
+        # miles de envíos en el centro
+        self._shipments = {}
+
+        # Copy-on-write del inventario: iter_shipments() lo marca como compartido y la
+        # siguiente recepción/despacho trabaja sobre una copia
+        self._shared = False
+
+        # Observadores de cambios en el inventario (ver add_observer)
+        self._observers = ()
+
+        # Ocupación por tipo de envío, mantenida en cada entrada y salida: O(1) por
+        # consulta (la ocupación total es el tamaño del inventario)
+        self._occupancy = dict.fromkeys(SHIPMENT_TYPES, 0)
+
+        # Cola de espera por tipo: código -> (orden de llegada, envío). Una cola por
+        # tipo permite admitir al primero que cabe sin recorrer los bloqueados
+        self._waiting = {shipment_type: {} for shipment_type in SHIPMENT_TYPES}
+        self._arrivals = 0
+
+        # Muelle de carga: montículo de (-prioridad, orden de llegada, código) con
+        # borrado perezoso. Una entrada vale mientras el envío siga en el inventario
+        # con ese orden de llegada (_dock_arrivals) y esa prioridad; las salidas fuera
+        # de orden y los cambios de prioridad solo dejan entradas obsoletas que se
+        # descartan al llegar a la cima
+        self._dock = []
+        self._dock_arrivals = {}
+        # Códigos con cambios de prioridad aún no aplicados al muelle. El observador de
+        # los envíos corre con la franja del envío, no con la del centro, así que no toca
+        # el montículo: solo anota el código (deque es seguro entre hilos) y el centro
+        # aplica los cambios en sus propias operaciones (_dock_sync)
+        self._dock_pending = deque()
+
+        self.configure_capacity(capacity, type_capacity, admission)
 
     @property
     def center_id(self):
@@ -76,7 +133,136 @@ class Center:
         """Devuelve la ubicación del centro. Propiedad de solo lectura."""
         return self.__location
 
-    def receive_shipment(self, shipment):
+    @property
+    def capacity(self):
+        """Plazas totales del centro, o None si no tiene límite. Propiedad de solo lectura."""
+        return self._capacity
+
+    @property
+    def type_capacity(self):
+        """Plazas máximas por tipo de envío (solo los tipos limitados). Propiedad de solo lectura."""
+        return MappingProxyType(self._type_capacity)
+
+    @property
+    def admission(self):
+        """Modo de admisión cuando no hay plaza: REJECT o QUEUE. Propiedad de solo lectura."""
+        return self._admission
+
+    @property
+    def occupancy(self):
+        """Número de envíos en el inventario. O(1)."""
+        return len(self._shipments)
+
+    @property
+    def waiting(self):
+        """Número de envíos en la cola de espera. O(1)."""
+        return sum(len(queue) for queue in self._waiting.values())
+
+    def configure_capacity(self, capacity=None, type_capacity=None, admission=REJECT):
+        """
+        Establece la capacidad del centro y el modo de admisión.
+
+        Reducir la capacidad por debajo de la ocupación no expulsa envíos: el centro
+        deja de admitir hasta que los despachos lo devuelvan al límite. Ampliarla
+        admite a los envíos en cola que ahora caben.
+
+        Args:
+            capacity (int, opcional): Plazas totales (al menos 1). None = sin límite.
+            type_capacity (Dict[str, int], opcional): Plazas máximas por tipo de envío
+                (STANDARD, FRAGILE, EXPRESS); 0 impide admitir ese tipo.
+            admission (str, opcional): REJECT rechaza las entradas sin plaza; QUEUE
+                las deja en cola hasta que se libere una.
+
+        Raises:
+            ValueError: Si la capacidad, algún tipo o el modo de admisión no son válidos.
+        """
+        if capacity is not None and (not isinstance(capacity, int) or capacity < 1):
+            raise ValueError("La capacidad del centro debe ser un entero mayor o igual que 1.")
+
+        limits = {}
+        for shipment_type, slots in (type_capacity or {}).items():
+            shipment_type = str(shipment_type).strip().upper()
+            if shipment_type not in SHIPMENT_TYPES:
+                raise ValueError("Tipo de envío no válido.")
+            if not isinstance(slots, int) or slots < 0:
+                raise ValueError("La capacidad por tipo de envío debe ser un entero mayor o igual que 0.")
+            limits[shipment_type] = slots
+
+        if admission not in (REJECT, QUEUE):
+            raise ValueError(f"El modo de admisión debe ser '{REJECT}' o '{QUEUE}'.")
+        if admission == REJECT and self.waiting:
+            raise ValueError("No se puede pasar a rechazar entradas con envíos en la cola de espera.")
+
+        self._capacity = capacity
+        self._type_capacity = limits
+        self._admission = admission
+        self._admit_waiting()
+
+    def occupancy_by_type(self):
+        """
+        Ocupación del inventario por tipo de envío. O(1).
+
+        Returns:
+            Dict[str, int]: Tipo de envío -> número de envíos en el centro.
+        """
+        return dict(self._occupancy)
+
+    def free_slots(self, shipment_type=None):
+        """
+        Plazas libres del centro, en total o para un tipo de envío.
+
+        Args:
+            shipment_type (str, opcional): Tipo de envío; con él se aplica también su límite.
+
+        Returns:
+            int | None: Plazas libres (0 si está lleno), o None si no hay límite.
+        """
+        free = None if self._capacity is None else max(0, self._capacity - len(self._shipments))
+        if shipment_type is not None:
+            shipment_type = shipment_type.upper()
+            limit = self._type_capacity.get(shipment_type)
+            if limit is not None:
+                type_free = max(0, limit - self._occupancy[shipment_type])
+                free = type_free if free is None else min(free, type_free)
+        return free
+
+    def utilization(self, shipment_type=None):
+        """
+        Fracción de plazas ocupadas, en total o de un tipo de envío con límite propio.
+
+        Args:
+            shipment_type (str, opcional): Tipo de envío.
+
+        Returns:
+            float | None: Ocupación / capacidad (puede superar 1 si se redujo la
+            capacidad), o None si no hay límite.
+        """
+        if shipment_type is None:
+            capacity, occupied = self._capacity, len(self._shipments)
+        else:
+            shipment_type = shipment_type.upper()
+            capacity, occupied = self._type_capacity.get(shipment_type), self._occupancy[shipment_type]
+        if capacity is None:
+            return None
+        if capacity == 0:
+            return 1.0
+        return occupied / capacity
+
+    def list_waiting(self):
+        """
+        Envíos en la cola de espera, en orden de llegada.
+
+        Returns:
+            List[Shipment]: Copia de la cola.
+        """
+        entries = [entry for queue in self._waiting.values() for entry in queue.values()]
+        return [shipment for _, shipment in sorted(entries, key=lambda entry: entry[0])]
+
+    def is_waiting(self, tracking_code):
+        """True si el envío espera plaza en la cola del centro."""
+        return any(tracking_code in queue for queue in self._waiting.values())
+
+    def receive_shipment(self, shipment, allow_queue=True):
         """
         Registra la entrada de un envío en el centro logístico.
 
@@ -90,9 +276,14 @@ class Center:
 
         Args:
             shipment (Shipment): El objeto envío que se va a recibir.
+            allow_queue (bool, opcional): Con False, un envío sin plaza se rechaza aunque
+                la admisión sea QUEUE (p. ej. si debe salir en una ruta). Por defecto True.
+
+        Con el centro lleno y admisión QUEUE, el envío queda en la cola de espera.
 
         Raises:
-            ValueError: Si el objeto no es una instancia de Shipment o si el envío ya está registrado en este centro.
+            ValueError: Si el objeto no es una instancia de Shipment, si el envío ya está registrado en este centro
+            o si no hay plaza y la admisión es REJECT (o no se permite la cola).
         """
 
         # Validación de tipo: solo se pueden recibir objetos Shipment
@@ -102,11 +293,22 @@ class Center:
 
         # Regla de negocio: no duplicar envíos en el mismo centro
         # Un envío físico no puede estar en dos lugares a la vez
-        if self.has_shipment(shipment.tracking_code):
+        if self.has_shipment(shipment.tracking_code) or self.is_waiting(shipment.tracking_code):
             raise ValueError("El envío ya se encuentra en el centro.")
 
-        # Agregar al inventario
-        self._shipments.append(shipment)
+        # Regla de negocio RN-036: sin plaza, la entrada se rechaza o espera en cola
+        shipment_type = shipment.shipment_type
+        if not self._fits(shipment_type):
+            if self._admission == REJECT or not allow_queue:
+                raise ValueError(self._full_reason(shipment_type))
+            self._enqueue(shipment)
+            return
+
+        # Agregar al inventario (al final, respetando el orden de llegada)
+        self._writable_inventory()[shipment.tracking_code] = shipment
+        self._occupancy[shipment_type] += 1
+        self._dock_push(shipment)
+        self._notify("inventory", None, shipment.tracking_code)
 
     def dispatch_shipment(self, shipment):
         """
@@ -143,21 +345,220 @@ class Center:
         shipment.update_status("IN_TRANSIT")
 
         # Remover del inventario (ya no está físicamente en el centro)
-        self._shipments.remove(shipment)
+        del self._writable_inventory()[shipment.tracking_code]
+        self._occupancy[shipment.shipment_type] -= 1
+        self._dock_discard(shipment)
+        self._notify("inventory", shipment.tracking_code, None)
 
+        # La plaza liberada es para el primero de la cola que quepa
+        self._admit_waiting()
         return shipment
 
+    def receive_many(self, shipments, allow_queue=True):
+        """
+        Registra la entrada de un lote de envíos en una sola operación.
+
+        Valida el lote completo en una única pasada (tipo, duplicados en el centro y
+        duplicados dentro del propio lote) y lo aplica todo o nada: si algún envío es
+        rechazado, el inventario no se modifica.
+
+        Reglas de negocio aplicadas:
+        - RN-011: No permite duplicados (mismo envío dos veces en el mismo centro)
+        - RN-036: Los envíos que no caben se rechazan o esperan en cola según la admisión
+        - Solo acepta objetos Shipment (o subtipos) válidos
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos que llegan al centro.
+            allow_queue (bool, opcional): Con False, los envíos sin plaza se rechazan
+                aunque la admisión sea QUEUE. Por defecto True.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (aceptados, rechazados). Aceptados
+            contiene los códigos registrados (incluidos los que quedan en cola);
+            rechazados contiene pares (código, motivo). Si hay rechazos, la lista de
+            aceptados está vacía porque no se aplica nada; por falta de plaza solo se
+            rechazan los envíos que no caben, así que el resto del lote sí cabe.
+        """
+        batch = {}
+        queued = {}
+        rejected = []
+        # Plazas que el lote va ocupando: total y por tipo
+        total = len(self._shipments)
+        occupancy = dict(self._occupancy)
+        # Sin cola de espera no hace falta buscar cada código en ella
+        any_waiting = self.waiting > 0
+
+        for shipment in shipments:
+            if not isinstance(shipment, Shipment):
+                rejected.append((repr(shipment), "No es un envío, no se puede añadir al centro."))
+                continue
+
+            code = shipment.tracking_code
+            # Un mismo envío repetido en el lote cuenta como duplicado: físicamente
+            # no puede llegar dos veces en la misma descarga
+            if (
+                code in self._shipments or code in batch or code in queued
+                or (any_waiting and self.is_waiting(code))
+            ):
+                rejected.append((code, "El envío ya se encuentra en el centro."))
+                continue
+
+            shipment_type = shipment.shipment_type
+            if not self._fits(shipment_type, total, occupancy[shipment_type]):
+                if self._admission == REJECT or not allow_queue:
+                    rejected.append((code, self._full_reason(shipment_type)))
+                else:
+                    queued[code] = shipment
+                continue
+
+            batch[code] = shipment
+            total += 1
+            occupancy[shipment_type] += 1
+
+        if rejected:
+            return [], rejected
+
+        # Aplicar el lote completo; dict.update respeta el orden de llegada del lote
+        self._writable_inventory().update(batch)
+        self._occupancy = occupancy
+        self._dock_push_many(batch.values())
+        for code in batch:
+            self._notify("inventory", None, code)
+        for shipment in queued.values():
+            self._enqueue(shipment)
+        return list(batch) + list(queued), []
+
+    def dispatch_many(self, shipments):
+        """
+        Gestiona la salida de un lote de envíos en una sola operación.
+
+        Valida el lote completo en una única pasada (tipo, presencia en el inventario,
+        duplicados en el lote y transición a IN_TRANSIT) y lo aplica todo o nada: si
+        algún envío es rechazado, ni el inventario ni los estados se modifican.
+
+        Reglas de negocio aplicadas:
+        - RN-012: Solo se pueden despachar envíos que están en el inventario
+        - RN-007: Cada envío debe poder pasar a IN_TRANSIT
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos que salen del centro.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (despachados, rechazados) con el mismo
+            formato que receive_many().
+        """
+        batch = {}
+        rejected = []
+
+        for shipment in shipments:
+            if not isinstance(shipment, Shipment):
+                rejected.append((repr(shipment), "No es un envío, no se puede eliminar del centro."))
+                continue
+
+            code = shipment.tracking_code
+            if code not in self._shipments or code in batch:
+                rejected.append((code, "El envío no se encuentra en el centro."))
+                continue
+
+            # Validar la transición antes de tocar nada para poder garantizar el todo o nada
+            try:
+                shipment.can_change_to("IN_TRANSIT")
+            except ValueError as e:
+                rejected.append((code, str(e)))
+                continue
+
+            batch[code] = shipment
+
+        if rejected:
+            return [], rejected
+
+        inventory = self._writable_inventory()
+        for code, shipment in batch.items():
+            shipment.update_status("IN_TRANSIT")
+            del inventory[code]
+            self._occupancy[shipment.shipment_type] -= 1
+            self._dock_discard(shipment)
+            self._notify("inventory", code, None)
+
+        self._admit_waiting()
+        return list(batch), []
+
+    def pop_next(self):
+        """
+        Despacha el siguiente envío del muelle de carga: el de mayor prioridad y,
+        entre iguales, el que llegó antes. O(log n) amortizado.
+
+        Solo salen envíos que pueden pasar a IN_TRANSIT (los entregados en el centro
+        ya han terminado su recorrido y no entran en el muelle).
+
+        Returns:
+            Shipment | None: El envío despachado (ya en IN_TRANSIT y fuera del
+            inventario), o None si no queda ninguno por cargar.
+        """
+        entry = self._dock_pop()
+        if entry is None:
+            return None
+        return self.dispatch_shipment(self._shipments[entry[2]])
+
+    def peek_next(self, k=1):
+        """
+        Consulta, sin despacharlos, los próximos envíos del muelle de carga.
+
+        Args:
+            k (int, opcional): Número máximo de envíos. Por defecto 1.
+
+        Returns:
+            List[Shipment]: Hasta k envíos en el orden en que saldrían con pop_next().
+            Cuesta O(k log n).
+        """
+        entries = []
+        seen = set()
+        while len(entries) < k:
+            entry = self._dock_pop()
+            if entry is None:
+                break
+            # Una prioridad que sube y vuelve a bajar deja dos entradas válidas iguales
+            if entry[2] not in seen:
+                seen.add(entry[2])
+                entries.append(entry)
+        # Las entradas válidas vuelven al montículo; las obsoletas ya se descartaron
+        for entry in entries:
+            heapq.heappush(self._dock, entry)
+        return [self._shipments[code] for _, _, code in entries]
+
     def list_shipments(self):
         """
         Proporciona una lista de todos los envíos almacenados en el centro.
 
         Returns:
-            Una copia de la lista de envíos actuales.
+            Una copia de la lista de envíos actuales, en orden de llegada.
 
         Nota: Devuelve copia para mantener encapsulamiento. Las modificaciones
         a la lista devuelta no afectan el inventario interno.
         """
-        return self._shipments.copy()
+        return list(self._shipments.values())
+
+    def iter_shipments(self):
+        """
+        Itera los envíos almacenados en el centro sin copiar el inventario.
+
+        Returns:
+            Iterador en orden de llegada sobre una instantánea del inventario: las
+            recepciones y despachos posteriores no le afectan ni lo invalidan.
+        """
+        self._shared = True
+        return iter(self._shipments.values())
+
+    def inventory_view(self):
+        """
+        Vista de solo lectura del inventario (código -> envío) sin copiarlo.
+
+        Returns:
+            Mapping en orden de llegada sobre una instantánea del inventario: las
+            recepciones y despachos posteriores trabajan sobre una copia y no la alteran.
+        """
+        self._shared = True
+        return MappingProxyType(self._shipments)
 
     def has_shipment(self, tracking_code):
         """
@@ -170,6 +571,160 @@ class Center:
             True si el envío está presente, False en caso contrario.
         """
 
-        # Búsqueda lineal: adecuado para inventarios pequeños
-        # Para grandes volúmenes, se podrá optimizar con dict indexado
-        return any(s.tracking_code == tracking_code for s in self._shipments)
+        # Búsqueda por clave en el índice hash: O(1) sea cual sea el tamaño del inventario
+        return tracking_code in self._shipments
+
+    def add_observer(self, observer):
+        """
+        Suscribe un observador a los cambios del inventario del centro.
+
+        El observador se invoca como observer(centro, "inventory", anterior, nuevo)
+        después de cada entrada (anterior=None, nuevo=código) o salida (anterior=código,
+        nuevo=None) de un envío. Permite a otras capas (p. ej. un registro de eventos)
+        seguir los cambios sin que el dominio dependa de ellas.
+
+        Args:
+            observer (Callable): Función a invocar en cada cambio.
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """
+        Cancela la suscripción de un observador. No hace nada si no estaba suscrito.
+
+        Args:
+            observer (Callable): Función suscrita previamente con add_observer().
+        """
+        self._observers = tuple(o for o in self._observers if o != observer)
+
+    def _notify(self, attribute, old, new):
+        """Informa a los observadores de un cambio ya aplicado."""
+        for observer in self._observers:
+            observer(self, attribute, old, new)
+
+    def _fits(self, shipment_type, total=None, occupied=None):
+        """True si cabe un envío más del tipo dado (con la ocupación indicada o la actual)."""
+        if total is None:
+            total, occupied = len(self._shipments), self._occupancy[shipment_type]
+        if self._capacity is not None and total >= self._capacity:
+            return False
+        limit = self._type_capacity.get(shipment_type)
+        return limit is None or occupied < limit
+
+    def _full_reason(self, shipment_type):
+        """Motivo de rechazo por falta de plaza."""
+        return f"El centro '{self.center_id}' no tiene plazas libres para envíos {shipment_type}."
+
+    def _enqueue(self, shipment):
+        """Deja el envío en la cola de espera de su tipo, en orden de llegada."""
+        self._arrivals += 1
+        self._waiting[shipment.shipment_type][shipment.tracking_code] = (self._arrivals, shipment)
+
+    def _admit_waiting(self):
+        """
+        Admite en el inventario a los envíos en cola que caben, por orden de llegada.
+
+        Solo mira la cabeza de la cola de cada tipo: un tipo sin plaza no bloquea a
+        los demás, y cada admisión cuesta O(número de tipos).
+        """
+        while True:
+            best = None
+            for shipment_type, queue in self._waiting.items():
+                if queue and self._fits(shipment_type):
+                    code, (arrival, shipment) = next(iter(queue.items()))
+                    if best is None or arrival < best[0]:
+                        best = (arrival, shipment_type, code, shipment)
+            if best is None:
+                return
+
+            _, shipment_type, code, shipment = best
+            del self._waiting[shipment_type][code]
+            self._writable_inventory()[code] = shipment
+            self._occupancy[shipment_type] += 1
+            self._dock_push(shipment)
+            self._notify("inventory", None, code)
+
+    def _dock_push(self, shipment):
+        """Pone en el muelle un envío que acaba de entrar en el inventario."""
+        self._arrivals += 1
+        code = shipment.tracking_code
+        self._dock_arrivals[code] = self._arrivals
+        heapq.heappush(self._dock, (-shipment.priority, self._arrivals, code))
+        # Un cambio de prioridad mientras está en el centro debe reordenar el muelle
+        shipment.add_observer(self._on_shipment_changed)
+
+    def _dock_push_many(self, shipments):
+        """Pone en el muelle un lote recién recibido (ver _dock_push())."""
+        entries = []
+        observer = self._on_shipment_changed
+        for shipment in shipments:
+            self._arrivals += 1
+            code = shipment.tracking_code
+            self._dock_arrivals[code] = self._arrivals
+            entries.append((-shipment.priority, self._arrivals, code))
+            shipment.add_observer(observer)
+        if len(entries) > len(self._dock):
+            # Lote grande: reconstruir el montículo es O(n) frente a O(k log n)
+            self._dock.extend(entries)
+            heapq.heapify(self._dock)
+        else:
+            for entry in entries:
+                heapq.heappush(self._dock, entry)
+
+    def _dock_discard(self, shipment):
+        """Saca del muelle un envío que deja el inventario: su entrada queda obsoleta."""
+        shipment.remove_observer(self._on_shipment_changed)
+        self._dock_arrivals.pop(shipment.tracking_code, None)
+        # Compactar cuando las entradas obsoletas dominan, para acotar la memoria. Los
+        # cambios pendientes quedan recogidos: la compactación lee la prioridad actual
+        if len(self._dock) > 2 * len(self._dock_arrivals) + 64:
+            self._dock_pending.clear()
+            self._dock = [
+                (-self._shipments[code].priority, arrival, code)
+                for code, arrival in self._dock_arrivals.items()
+            ]
+            heapq.heapify(self._dock)
+
+    def _dock_pop(self):
+        """
+        Saca del muelle la primera entrada válida, descartando las obsoletas.
+
+        Returns:
+            Tuple | None: (-prioridad, orden de llegada, código), o None si está vacío.
+        """
+        self._dock_sync()
+        dock = self._dock
+        while dock:
+            entry = heapq.heappop(dock)
+            negative_priority, arrival, code = entry
+            if self._dock_arrivals.get(code) != arrival:
+                continue  # Ya salió del centro (o salió y volvió a entrar)
+            shipment = self._shipments[code]
+            if shipment.priority != -negative_priority:
+                continue  # Cambió de prioridad: vale la entrada que se añadió entonces
+            if not can_transition(STATUS_CODES[shipment.current_status], IN_TRANSIT):
+                continue  # Entregado en este centro: no vuelve a salir
+            return entry
+        return None
+
+    def _dock_sync(self):
+        """Aplica al muelle los cambios de prioridad anotados por _on_shipment_changed()."""
+        pending = self._dock_pending
+        while pending:
+            code = pending.popleft()
+            arrival = self._dock_arrivals.get(code)
+            if arrival is not None:
+                # Conserva el orden de llegada; la entrada anterior queda obsoleta
+                heapq.heappush(self._dock, (-self._shipments[code].priority, arrival, code))
+
+    def _on_shipment_changed(self, shipment, attribute, old, new):
+        """Observador de los envíos del inventario: anota los cambios de prioridad (ver _dock_sync())."""
+        if attribute == "priority":
+            self._dock_pending.append(shipment.tracking_code)
+
+    def _writable_inventory(self):
+        """Devuelve el inventario listo para escribir, copiándolo si hay iteradores que lo comparten."""
+        if self._shared:
+            self._shipments = dict(self._shipments)
+            self._shared = False
+        return self._shipments
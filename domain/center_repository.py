@@ -1,9 +1,21 @@
 # domain/center_repository.py
 
+from logistica.domain.snapshot import CenterState, Snapshot
+
 class CenterRepository:
     def add(self, center):
         raise NotImplementedError
 
+    def add_many(self, centers):
+        """
+        Almacena o actualiza varios centros en una sola operación.
+
+        Implementación por defecto: llama a add() por cada elemento. Las
+        implementaciones persistentes pueden escribir el lote de una vez.
+        """
+        for center in centers:
+            self.add(center)
+
     def remove(self, center_id):
         raise NotImplementedError
 
@@ -12,3 +24,23 @@ class CenterRepository:
 
     def list_all(self):
         raise NotImplementedError
+
+    def iter_all(self):
+        """
+        Itera todos los elementos sin exigir una copia completa.
+
+        Implementación por defecto: itera sobre list_all(). Las implementaciones
+        concretas pueden devolver un iterador sobre una instantánea sin copiar.
+        """
+        return iter(self.list_all())
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de los centros en este instante (ver domain/snapshot.py).
+
+        Los centros se entregan como CenterState: registros inmutables del momento de la captura.
+
+        Implementación por defecto: un registro por elemento desde iter_all(), sin
+        versión. Las implementaciones en memoria añaden su contador de versión.
+        """
+        return Snapshot(None, {center.center_id.lower(): CenterState.of(center) for center in self.iter_all()})
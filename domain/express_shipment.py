@@ -17,6 +17,9 @@ class ExpressShipment(Shipment):
     - Prioridad fija garantiza tratamiento consistente como máxima urgencia
     - Elimina confusión sobre niveles de prioridad dentro de express
     """
+
+    __slots__ = ()
+
     def __init__(self, tracking_code, sender, recipient):
         """
         Inicializa un envío express con prioridad automática de 3.
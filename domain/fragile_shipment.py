@@ -17,6 +17,9 @@ class FragileShipment(Shipment):
     - Previene degradación accidental a prioridad 1 que podría causar daños
     """
 
+    # Sin atributos propios: el tipo frágil se identifica por la clase (shipment_type, is_fragile)
+    __slots__ = ()
+
     def __init__(self, tracking_code, sender, recipient, priority=2):
         """
         Inicializa un envío frágil con validación de prioridad mínima.
@@ -38,10 +41,6 @@ class FragileShipment(Shipment):
 
         super().__init__(tracking_code, sender, recipient, priority)
 
-        # Marcar como frágil para identificación rápida
-        # Atributo privado para mantener encapsulamiento
-        self._fragile = True
-
 
     @property
     def shipment_type(self):
@@ -75,6 +74,7 @@ class FragileShipment(Shipment):
 
         # Si pasa la validación, delegar al método padre para el decremento real
         self._priority -= 1
+        self._notify("priority", self._priority + 1, self._priority)
 
 
     def is_fragile(self):
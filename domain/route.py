@@ -4,6 +4,12 @@
 
 import re
 from logistica.domain.shipment import Shipment
+from logistica.domain.shipment_lifecycle import STATUS_CODES, DELIVERED, check_transitions
+
+# Patrón: origen (ej. MAD01) - destino (ej. BCN02) - clase de carga (STD/FRG/EXP) - 3 dígitos
+_ROUTE_ID = re.compile(
+    r'^(?P<origin>[A-Z]{3,4}\d{2})-(?P<destination>[A-Z]{3,4}\d{2})-(?P<cargo>STD|FRG|EXP)-(?P<sequence>\d{3})$'
+)
 
 class Route:
     """
@@ -42,8 +48,8 @@ class Route:
         if not isinstance(route_id, str) or not route_id.strip():
             raise ValueError("El ID de la ruta no puede estar vacío.")
         route_id = route_id.upper().strip()
-        # Patrón: origen (ej. MAD01) - destino (ej. BCN02) - tipo (STD/FRG/EXP) - 3 dígitos
-        if not re.match(r'^[A-Z]{3,4}\d{2}-[A-Z]{3,4}\d{2}-(STD|FRG|EXP)-\d{3}$', route_id):
+        parts = _ROUTE_ID.match(route_id)
+        if parts is None:
             raise ValueError("El ID de la ruta debe tener el formato ORIGEN-DESTINO-TIPO-999 (ej. MAD01-BCN02-FRG-001).")
 
         # Validación: ambos centros deben existir
@@ -61,14 +67,50 @@ class Route:
         self.__origin_center = origin_center
         self.__destination_center = destination_center
 
+        # Componentes del ID, analizados una sola vez (consultas e índices por clase de carga)
+        self.__origin_code = parts["origin"]
+        self.__destination_code = parts["destination"]
+        self.__cargo_class = parts["cargo"]
+        self.__sequence = int(parts["sequence"])
+
         # Lista de envíos asignados a esta ruta
         # Se mantiene como lista para preservar orden de asignación
         self._shipments = []
 
+        # Copy-on-write de la lista: iter_shipments() la marca como compartida y la
+        # siguiente modificación trabaja sobre una copia
+        self._shared = False
+
         # Estado de la ruta: True = activa (puede recibir envíos), False = completada
         # Inicialmente todas las rutas están activas
         self._active = True
 
+        # Observadores de cambios en la ruta (ver add_observer)
+        self._observers = ()
+
+    @classmethod
+    def restore(cls, route_id, origin_center, destination_center, shipments, active):
+        """
+        Reconstruye una ruta persistida sin repetir los efectos de add_shipment().
+
+        Uso exclusivo de la capa de infraestructura: los envíos ya tienen la ruta
+        asignada y ya constan en el inventario de los centros.
+
+        Args:
+            route_id (str): Identificador de la ruta.
+            origin_center (Center): Centro de origen.
+            destination_center (Center): Centro de destino.
+            shipments (Iterable[Shipment]): Envíos asociados, en orden de asignación.
+            active (bool): Estado de la ruta.
+
+        Returns:
+            Route: Ruta con el estado indicado.
+        """
+        route = cls(route_id, origin_center, destination_center)
+        route._shipments = list(shipments)
+        route._active = active
+        return route
+
     @property
     def route_id(self):
         """Devuelve el identificador único de la ruta. Propiedad de solo lectura."""
@@ -84,6 +126,26 @@ class Route:
         """Devuelve el objeto del centro de destino. Propiedad de solo lectura."""
         return self.__destination_center
 
+    @property
+    def origin_code(self):
+        """Código del centro de origen según el ID de la ruta (ej. MAD01). Propiedad de solo lectura."""
+        return self.__origin_code
+
+    @property
+    def destination_code(self):
+        """Código del centro de destino según el ID de la ruta (ej. BCN02). Propiedad de solo lectura."""
+        return self.__destination_code
+
+    @property
+    def cargo_class(self):
+        """Clase de carga de la ruta: STD, FRG o EXP. Propiedad de solo lectura."""
+        return self.__cargo_class
+
+    @property
+    def sequence(self):
+        """Número de secuencia de la ruta entre los mismos centros y clase (ej. 1). Propiedad de solo lectura."""
+        return self.__sequence
+
     @property
     def is_active(self):
         """
@@ -107,7 +169,8 @@ class Route:
             shipment (Shipment): El objeto envío a transportar.
 
         Raises:
-            ValueError: Si la ruta ya ha sido completada (inactiva).
+            ValueError: Si la ruta ya ha sido completada (inactiva) o el centro de origen
+            no admite el envío.
         """
 
         # Regla de negocio RN-015: solo rutas activas pueden recibir envíos
@@ -115,15 +178,122 @@ class Route:
         if not self.is_active:
             raise ValueError("La ruta no está activa.")
 
+        # Registrar el envío físicamente en el centro de origen
+        # Esto sincroniza el estado lógico (asignación) con el físico (ubicación)
+        # Va primero: si el centro lo rechaza (duplicado o sin plaza), la ruta no cambia.
+        # Sin plaza no puede esperar en la cola: la ruta solo lleva envíos del inventario,
+        # que son los únicos que el centro puede despachar
+        self.origin_center.receive_shipment(shipment, allow_queue=False)
+
         # Agregar a la lista interna de envíos de esta ruta
-        self._shipments.append(shipment)
+        self._writable_shipments().append(shipment)
 
         # Establecer relación bidireccional: envío conoce su ruta asignada
         shipment.assign_route(self.route_id)
+        self._notify("shipments", None, shipment.tracking_code)
 
-        # Registrar el envío físicamente en el centro de origen
-        # Esto sincroniza el estado lógico (asignación) con el físico (ubicación)
-        self.origin_center.receive_shipment(shipment)
+    def add_many(self, shipments):
+        """
+        Añade un lote de envíos a la ruta en una sola operación.
+
+        Valida el lote completo en una única pasada y aplica los envíos válidos:
+        a diferencia de Center.receive_many(), un envío rechazado no impide asignar
+        el resto, igual que si se llamara a add_shipment() uno a uno.
+
+        Reglas de negocio aplicadas:
+        - RN-015: Solo rutas activas pueden recibir envíos
+        - RN-016: Un envío solo puede estar en una ruta a la vez
+        - RN-011: Un envío no puede entrar dos veces en el centro de origen
+        - RN-036: Los envíos que no caben en el centro de origen se rechazan, aunque
+          su admisión sea QUEUE (la ruta no puede despachar envíos en cola)
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos a transportar, en orden de asignación.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (asignados, rechazados) con el mismo
+            formato que Center.receive_many().
+
+        Raises:
+            ValueError: Si la ruta ya ha sido completada (inactiva).
+        """
+        if not self.is_active:
+            raise ValueError("La ruta no está activa.")
+
+        batch = {}
+        rejected = []
+        for shipment in shipments:
+            if not isinstance(shipment, Shipment):
+                rejected.append((repr(shipment), "No es un envío, no se puede añadir a la ruta."))
+                continue
+
+            code = shipment.tracking_code
+            # Un envío repetido en el lote ya queda asignado con su primera aparición
+            if shipment.is_assigned_to_route() or code in batch:
+                rejected.append((code, f"El envío '{code}' ya está asignado a una ruta."))
+                continue
+            if self.origin_center.has_shipment(code):
+                rejected.append((code, "El envío ya se encuentra en el centro."))
+                continue
+
+            batch[code] = shipment
+
+        # El lote ya está validado salvo lo que solo sabe el centro de origen (plazas,
+        # cola de espera). Si rechaza algún envío no aplica nada, así que se repite
+        # sin los rechazados hasta que el resto entra en el inventario
+        while batch:
+            _, refused = self.origin_center.receive_many(batch.values(), allow_queue=False)
+            if not refused:
+                break
+            rejected.extend(refused)
+            for code, _ in refused:
+                batch.pop(code, None)
+        self._writable_shipments().extend(batch.values())
+        for code, shipment in batch.items():
+            shipment.assign_route(self.route_id)
+            self._notify("shipments", None, code)
+        return list(batch), rejected
+
+    def load_from_origin(self, shipments):
+        """
+        Asigna a la ruta envíos que ya esperan en el inventario del centro de origen.
+
+        A diferencia de add_many(), los envíos no vuelven a entrar en el centro: ya
+        están físicamente en él (recibidos sin ruta o retirados de otra ruta).
+
+        Reglas de negocio aplicadas:
+        - RN-015: Solo rutas activas pueden recibir envíos
+        - RN-016: Un envío solo puede estar en una ruta a la vez
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos a transportar, en orden de asignación.
+
+        Returns:
+            Tuple[List[str], List[Tuple[str, str]]]: (asignados, rechazados) con el mismo
+            formato que add_many().
+
+        Raises:
+            ValueError: Si la ruta ya ha sido completada (inactiva).
+        """
+        if not self.is_active:
+            raise ValueError("La ruta no está activa.")
+
+        batch = {}
+        rejected = []
+        for shipment in shipments:
+            code = shipment.tracking_code
+            if shipment.is_assigned_to_route() or code in batch:
+                rejected.append((code, f"El envío '{code}' ya está asignado a una ruta."))
+            elif not self.origin_center.has_shipment(code):
+                rejected.append((code, "El envío no se encuentra en el centro de origen."))
+            else:
+                batch[code] = shipment
+
+        self._writable_shipments().extend(batch.values())
+        for code, shipment in batch.items():
+            shipment.assign_route(self.route_id)
+            self._notify("shipments", None, code)
+        return list(batch), rejected
 
     def remove_shipment(self, shipment):
         """
@@ -138,20 +308,22 @@ class Route:
         """
 
         # Remover de la lista interna
-        self._shipments.remove(shipment)
+        self._writable_shipments().remove(shipment)
 
         # Desvincular la relación bidireccional
         shipment.remove_route()
+        self._notify("shipments", shipment.tracking_code, None)
 
     def complete_route(self):
         """
         Finaliza el trayecto, transfiere los paquetes al centro de destino y los marca como entregados.
 
         Flujo de operaciones:
-        1. Marcar ruta como inactiva (no puede recibir más envíos)
-        2. Transferir cada envío al centro de destino
-        3. Actualizar estado de cada envío a DELIVERED
-        4. Limpiar la lista de envíos (ya no están en tránsito)
+        1. Validar que todos los envíos pueden pasar a DELIVERED
+        2. Transferir el lote completo al centro de destino
+        3. Marcar ruta como inactiva (no puede recibir más envíos)
+        4. Actualizar estado de cada envío a DELIVERED
+        5. Limpiar la lista de envíos (ya no están en tránsito)
 
         Reglas de negocio:
         - Solo rutas activas pueden completarse
@@ -159,28 +331,44 @@ class Route:
         - Los envíos se registran físicamente en el centro destino
 
         Raises:
-            ValueError: Si la ruta ya estaba inactiva.
+            ValueError: Si la ruta ya estaba inactiva o algún envío no puede entregarse
+            (en ese caso la ruta y los envíos quedan sin modificar).
         """
 
         # Validar que la ruta esté activa
         if not self._active:
             raise ValueError("La ruta no está activa.")
 
+        # Validar antes de modificar nada que todos los envíos pueden entregarse
+        # Así un envío no despachado no deja la ruta a medio completar
+        # Un solo chequeo vectorizado sobre la matriz de transiciones para todo el lote
+        origins = bytes(STATUS_CODES[s.current_status] for s in self._shipments)
+        valid = check_transitions(origins, DELIVERED)
+        if 0 in valid:
+            shipment = self._shipments[valid.index(0)]
+            raise ValueError(f"Transición no permitida: de {shipment.current_status} a DELIVERED")
+
+        # Registrar todos los envíos en el centro de destino en una sola operación
+        # (llegan físicamente juntos); el centro aplica el lote todo o nada
+        _, rejected = self.__destination_center.receive_many(self._shipments)
+        if rejected:
+            code, reason = rejected[0]
+            raise ValueError(f"No se puede completar la ruta, envío '{code}': {reason}")
+
         # Cambiar estado de la ruta a inactiva
         # A partir de este punto, no se pueden añadir más envíos
         self._active = False
 
-        # Procesar cada envío en la ruta
+        # Actualizar estado de cada envío a DELIVERED (ciclo de vida completo)
         for shipment in self._shipments:
-            # 1. Registrar el envío en el centro de destino (llega físicamente)
-            self.__destination_center.receive_shipment(shipment)
-
-            # 2. Actualizar estado del envío a DELIVERED (ciclo de vida completo)
             shipment.update_status("DELIVERED")
 
         # Limpiar la lista de envíos
         # Los envíos ya no están "en la ruta", están en el centro destino
-        self._shipments.clear()
+        # Se sustituye la lista en lugar de vaciarla: los iteradores abiertos conservan la suya
+        self._shipments = []
+        self._shared = False
+        self._notify("active", True, False)
 
     def list_shipment(self):
         """
@@ -192,4 +380,59 @@ class Route:
         Nota: Devuelve copia para mantener encapsulamiento. Las modificaciones
         a la lista devuelta no afectan la lista interna de la ruta.
         """
-        return self._shipments.copy()
\ No newline at end of file
+        return self._shipments.copy()
+
+    @property
+    def shipment_count(self):
+        """Número de envíos asociados a la ruta. O(1), sin copiar la lista."""
+        return len(self._shipments)
+
+    def iter_shipments(self):
+        """
+        Itera los envíos asociados a la ruta sin copiar la lista.
+
+        Returns:
+            Iterador en orden de asignación sobre una instantánea de la lista: las
+            asignaciones y retiradas posteriores no le afectan ni lo invalidan.
+        """
+        self._shared = True
+        return iter(self._shipments)
+
+    def add_observer(self, observer):
+        """
+        Suscribe un observador a los cambios de la ruta.
+
+        El observador se invoca como observer(ruta, atributo, anterior, nuevo) después de
+        cada cambio:
+        - "shipments": asignación (anterior=None, nuevo=código) o retirada (anterior=código,
+          nuevo=None) de un envío
+        - "active": la ruta se completa (anterior=True, nuevo=False); la lista de envíos
+          ya está vacía
+        Permite a otras capas (p. ej. un registro de eventos) seguir los cambios sin que
+        el dominio dependa de ellas.
+
+        Args:
+            observer (Callable): Función a invocar en cada cambio.
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """
+        Cancela la suscripción de un observador. No hace nada si no estaba suscrito.
+
+        Args:
+            observer (Callable): Función suscrita previamente con add_observer().
+        """
+        self._observers = tuple(o for o in self._observers if o != observer)
+
+    def _notify(self, attribute, old, new):
+        """Informa a los observadores de un cambio ya aplicado."""
+        for observer in self._observers:
+            observer(self, attribute, old, new)
+
+    def _writable_shipments(self):
+        """Devuelve la lista de envíos preparada para escribir, copiándola si hay iteradores que la comparten."""
+        if self._shared:
+            self._shipments = list(self._shipments)
+            self._shared = False
+        return self._shipments
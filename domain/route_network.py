@@ -0,0 +1,217 @@
+# domain/route_network.py
+"""
+Dominio: red de transporte para buscar caminos de varios tramos entre centros.
+
+Cada ruta modela un único tramo directo. La red ve los centros como nodos y las
+rutas activas como aristas dirigidas (origen -> destino) con un coste, y responde
+a "cómo llevo un envío de LPA06 a BCN03" con el camino de menor coste: la lista
+de rutas a encadenar.
+
+Rendimiento (pensado para miles de centros):
+- Dijkstra con montículo (heapq): O((V + E) log V) por origen.
+- Cada búsqueda calcula el árbol de caminos mínimos completo de su origen y lo
+  guarda en una caché LRU de árboles: las consultas siguientes desde ese origen,
+  hacia cualquier destino, cuestan lo que mide el camino. Es la tabla de todos los
+  pares, rellenada bajo demanda y acotada en memoria.
+- Invalidación incremental:
+  - Ruta nueva: en cada árbol guardado solo pueden mejorar distancias, así que se
+    relaja la arista nueva y se propaga la mejora con Dijkstra desde su destino;
+    los nodos no afectados no se tocan.
+  - Ruta retirada (completada): solo se descartan los árboles que la usaban.
+"""
+
+import heapq
+from collections import OrderedDict
+
+_INFINITY = float("inf")
+
+
+class _Tree:
+    """Árbol de caminos mínimos desde un origen: distancias y tramo de llegada a cada nodo."""
+
+    __slots__ = ("dist", "parent")
+
+    def __init__(self, source):
+        self.dist = {source: 0}
+        # Nodo -> (nodo anterior, ID de la ruta usada para llegar)
+        self.parent = {}
+
+
+class RouteNetwork:
+    """
+    Grafo dirigido de centros y rutas con búsqueda de caminos de menor coste.
+
+    El coste de cada ruta lo decide quien la añade: 1 por tramo da el camino con
+    menos transbordos, y otros costes (tiempo, precio) dan el más barato. Los costes
+    no pueden ser negativos.
+
+    No es seguro para varios hilos: quien la comparta debe serializar el acceso.
+    """
+
+    def __init__(self, max_sources=1024):
+        """
+        Args:
+            max_sources (int, opcional): Máximo de árboles de origen en caché. Por defecto 1024.
+        """
+        # Centro -> {ID de ruta: (centro destino, coste)}
+        self._adjacency = {}
+        # ID de ruta -> (origen, destino, coste)
+        self._routes = {}
+        self._trees = OrderedDict()
+        self._max_sources = max_sources
+
+    @classmethod
+    def from_routes(cls, routes, cost=None, max_sources=1024):
+        """
+        Construye la red con las rutas activas de un iterable de Route.
+
+        Args:
+            routes (Iterable[Route]): Rutas (las completadas se ignoran).
+            cost (Callable, opcional): cost(ruta) -> coste del tramo. Por defecto, 1.
+            max_sources (int, opcional): Ver __init__.
+
+        Returns:
+            RouteNetwork: Red con una arista por ruta activa.
+        """
+        network = cls(max_sources)
+        for route in routes:
+            if route.is_active:
+                network.add_route(
+                    route.route_id,
+                    route.origin_center.center_id,
+                    route.destination_center.center_id,
+                    1 if cost is None else cost(route),
+                )
+        return network
+
+    def __len__(self):
+        """Número de rutas (aristas) de la red."""
+        return len(self._routes)
+
+    def __contains__(self, route_id):
+        return route_id in self._routes
+
+    def add_route(self, route_id, origin_id, destination_id, cost=1):
+        """
+        Añade una ruta como arista y actualiza los árboles en caché sin recalcularlos.
+
+        Args:
+            route_id (str): ID de la ruta.
+            origin_id (str): ID del centro de origen.
+            destination_id (str): ID del centro de destino.
+            cost (float, opcional): Coste del tramo. Por defecto 1.
+
+        Raises:
+            ValueError: Si el coste es negativo o la ruta ya está en la red.
+        """
+        if cost < 0:
+            raise ValueError("El coste de una ruta no puede ser negativo.")
+        if route_id in self._routes:
+            raise ValueError(f"La ruta '{route_id}' ya está en la red.")
+
+        self._routes[route_id] = (origin_id, destination_id, cost)
+        self._adjacency.setdefault(origin_id, {})[route_id] = (destination_id, cost)
+        self._adjacency.setdefault(destination_id, {})
+
+        for tree in self._trees.values():
+            self._relax(tree, origin_id, destination_id, cost, route_id)
+
+    def remove_route(self, route_id):
+        """
+        Retira una ruta de la red, descartando solo los árboles en caché que la usaban.
+
+        Args:
+            route_id (str): ID de la ruta.
+
+        Returns:
+            bool: True si la ruta estaba en la red.
+        """
+        edge = self._routes.pop(route_id, None)
+        if edge is None:
+            return False
+
+        origin_id, destination_id, _ = edge
+        del self._adjacency[origin_id][route_id]
+
+        used = (origin_id, route_id)
+        stale = [source for source, tree in self._trees.items() if tree.parent.get(destination_id) == used]
+        for source in stale:
+            del self._trees[source]
+        return True
+
+    def shortest_path(self, origin_id, destination_id):
+        """
+        Camino de menor coste entre dos centros.
+
+        Args:
+            origin_id (str): ID del centro de partida.
+            destination_id (str): ID del centro de llegada.
+
+        Returns:
+            Tuple[float, List[str]] | None: (coste total, IDs de las rutas en orden), o
+            None si no hay camino. Del centro a sí mismo: (0, []).
+        """
+        if origin_id == destination_id:
+            return 0, []
+
+        tree = self._tree(origin_id)
+        cost = tree.dist.get(destination_id)
+        if cost is None:
+            return None
+
+        legs = []
+        node = destination_id
+        while node != origin_id:
+            node, route_id = tree.parent[node]
+            legs.append(route_id)
+        legs.reverse()
+        return cost, legs
+
+    def _tree(self, source):
+        """Árbol de caminos mínimos del origen, desde la caché o calculado con Dijkstra."""
+        tree = self._trees.get(source)
+        if tree is not None:
+            self._trees.move_to_end(source)
+            return tree
+
+        tree = _Tree(source)
+        self._dijkstra(tree, [(0, source)])
+        self._trees[source] = tree
+        if len(self._trees) > self._max_sources:
+            self._trees.popitem(last=False)
+        return tree
+
+    def _relax(self, tree, origin_id, destination_id, cost, route_id):
+        """Aplica una arista nueva a un árbol ya calculado y propaga la mejora si la hay."""
+        base = tree.dist.get(origin_id)
+        if base is None:
+            # El origen de la ruta no es alcanzable: la arista no cambia nada
+            return
+        candidate = base + cost
+        if candidate >= tree.dist.get(destination_id, _INFINITY):
+            return
+        tree.dist[destination_id] = candidate
+        tree.parent[destination_id] = (origin_id, route_id)
+        self._dijkstra(tree, [(candidate, destination_id)])
+
+    def _dijkstra(self, tree, heap):
+        """
+        Dijkstra con montículo a partir de las etiquetas actuales del árbol.
+
+        Con costes no negativos, continuar desde etiquetas ya correctas y unos nodos
+        recién mejorados da el mismo resultado que recalcular desde cero.
+        """
+        dist = tree.dist
+        parent = tree.parent
+        adjacency = self._adjacency
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > dist.get(node, _INFINITY):
+                # Entrada obsoleta: el nodo ya se alcanzó por un camino mejor
+                continue
+            for route_id, (neighbor, cost) in adjacency.get(node, {}).items():
+                candidate = d + cost
+                if candidate < dist.get(neighbor, _INFINITY):
+                    dist[neighbor] = candidate
+                    parent[neighbor] = (node, route_id)
+                    heapq.heappush(heap, (candidate, neighbor))
@@ -1,9 +1,21 @@
 # domain/route_repository.py
 
+from logistica.domain.snapshot import RouteState, Snapshot
+
 class RouteRepository:
     def add(self, route):
         raise NotImplementedError
 
+    def add_many(self, routes):
+        """
+        Almacena o actualiza varias rutas en una sola operación.
+
+        Implementación por defecto: llama a add() por cada elemento. Las
+        implementaciones persistentes pueden escribir el lote de una vez.
+        """
+        for route in routes:
+            self.add(route)
+
     def remove(self, route_id):
         raise NotImplementedError
 
@@ -11,4 +23,51 @@ class RouteRepository:
         raise NotImplementedError
 
     def list_all(self):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def iter_all(self):
+        """
+        Itera todos los elementos sin exigir una copia completa.
+
+        Implementación por defecto: itera sobre list_all(). Las implementaciones
+        concretas pueden devolver un iterador sobre una instantánea sin copiar.
+        """
+        return iter(self.list_all())
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        """
+        Devuelve las rutas que cumplen todos los filtros indicados.
+
+        Implementación por defecto: recorre iter_all() comprobando cada ruta. Las
+        implementaciones concretas pueden resolverlo con índices.
+
+        Args:
+            origin_id (str, opcional): ID del centro de origen.
+            destination_id (str, opcional): ID del centro de destino.
+            cargo_class (str, opcional): Clase de carga (STD, FRG, EXP).
+            active (bool, opcional): True para solo activas, False para solo completadas.
+
+        Returns:
+            Lista de rutas que cumplen los filtros. Sin filtros, todas las rutas.
+        """
+        origin_id = origin_id.strip().upper() if origin_id is not None else None
+        destination_id = destination_id.strip().upper() if destination_id is not None else None
+        cargo_class = cargo_class.strip().upper() if cargo_class is not None else None
+        return [
+            route for route in self.iter_all()
+            if (origin_id is None or route.origin_center.center_id == origin_id)
+            and (destination_id is None or route.destination_center.center_id == destination_id)
+            and (cargo_class is None or route.cargo_class == cargo_class)
+            and (active is None or route.is_active == active)
+        ]
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de los rutas en este instante (ver domain/snapshot.py).
+
+        Los rutas se entregan como RouteState: registros inmutables del momento de la captura.
+
+        Implementación por defecto: un registro por elemento desde iter_all(), sin
+        versión. Las implementaciones en memoria añaden su contador de versión.
+        """
+        return Snapshot(None, {route.route_id.lower(): RouteState.of(route) for route in self.iter_all()})
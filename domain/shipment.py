@@ -2,6 +2,15 @@
 """Dominio: Entidad base que representa un envío en el sistema logístico."""
 
 import re
+import struct
+import time
+
+from logistica.domain.shipment_lifecycle import STATUS_NAMES, STATUS_CODES, transition_error
+
+# Registro empaquetado del historial: código de estado (uint8) + instante epoch en segundos (double)
+# El historial guarda el código entero del estado (ver shipment_lifecycle), no la cadena completa
+_STATUS_RECORD = struct.Struct("<Bd")
+
 
 class Shipment:
     """
@@ -18,8 +27,25 @@ class Shipment:
     2. La prioridad siempre está en el rango {1, 2, 3}
     3. Las transiciones de estado siguen una secuencia estricta
     4. El historial de estados es completo e inmutable para consulta
+
+    Representación compacta: la jerarquía usa __slots__ (sin __dict__ por instancia)
+    porque el sistema mantiene millones de envíos vivos en memoria. Las subclases
+    declaran __slots__ vacíos para no reintroducir el diccionario.
     """
 
+    __slots__ = (
+        "__tracking_code",
+        "__sender",
+        "__recipient",
+        "_current_status",
+        "_status_log",
+        "_priority",
+        "_assigned_route",
+        "_observers",
+        # Permite mapas de identidad débiles en los repositorios persistentes
+        "__weakref__",
+    )
+
     def __init__(self, tracking_code, sender, recipient, priority=1):
         """
         Inicializa una nueva instancia de Shipment con validaciones de negocio.
@@ -63,9 +89,12 @@ class Shipment:
         # Regla de negocio: estado inicial siempre REGISTERED (RN-008)
         self._current_status = "REGISTERED"
 
-        # Historial de estados para trazabilidad completa
+        # Historial de estados para trazabilidad completa (y SLA, por eso lleva marca de tiempo)
+        # Se guarda como bytes empaquetados (código + instante) en lugar de una lista de
+        # cadenas: ocupa menos por envío y el historial nunca pasa de unos pocos registros
         # Se inicializa con el primer estado para mantener registro desde la creación
-        self._status_history = [self._current_status]
+        self._status_log = b""
+        self._record_status()
 
         # Prioridad mutable pero con validaciones en métodos específicos
         self._priority = priority
@@ -74,6 +103,42 @@ class Shipment:
         # Se mantiene como string (ID de ruta) para evitar acoplamiento circular
         self._assigned_route = None
 
+        # Observadores de cambios (p. ej. índices secundarios de un repositorio)
+        # Tupla vacía compartida por defecto: no cuesta memoria extra por envío
+        self._observers = ()
+
+    @classmethod
+    def restore(cls, tracking_code, sender, recipient, priority, status_log, assigned_route=None):
+        """
+        Reconstruye un envío persistido sin repetir las validaciones de creación.
+
+        Uso exclusivo de la capa de infraestructura: los datos provienen de un
+        almacenamiento que solo contiene envíos creados por el propio dominio, y el
+        historial ya registrado no debe volver a empezar en REGISTERED.
+
+        Args:
+            tracking_code (str): Código de seguimiento ya normalizado.
+            sender (str): Remitente.
+            recipient (str): Destinatario.
+            priority (int): Prioridad actual.
+            status_log (bytes): Historial empaquetado tal como lo generó el dominio.
+            assigned_route (str, opcional): ID de la ruta asignada.
+
+        Returns:
+            Shipment: Instancia de cls con el estado indicado.
+        """
+        shipment = cls.__new__(cls)
+        shipment.__tracking_code = tracking_code
+        shipment.__sender = sender
+        shipment.__recipient = recipient
+        shipment._priority = priority
+        shipment._status_log = status_log
+        last_code, _ = _STATUS_RECORD.unpack_from(status_log, len(status_log) - _STATUS_RECORD.size)
+        shipment._current_status = STATUS_NAMES[last_code]
+        shipment._assigned_route = assigned_route
+        shipment._observers = ()
+        return shipment
+
     @property
     def tracking_code(self):
         """Devuelve el código de seguimiento único."""
@@ -142,13 +207,50 @@ class Shipment:
         new_status_format = new_status.upper()
 
         # Validar que la transición sea permitida antes de modificar estado
-        self.can_change_to(new_status_format)
+        # (consulta directa a la matriz de transiciones, sin volver a normalizar)
+        error = transition_error(self._current_status, new_status_format)
+        if error is not None:
+            raise ValueError(error)
 
+        old_status = self._current_status
         self._current_status = new_status_format
 
         # Registrar en historial para trazabilidad completa
         # El historial es de solo consulta, no se puede modificar externamente
-        self._status_history.append(self._current_status)
+        self._record_status()
+        self._notify("current_status", old_status, new_status_format)
+
+    def _record_status(self):
+        """Añade el estado actual al historial con la marca de tiempo del momento."""
+        self._status_log += _STATUS_RECORD.pack(STATUS_CODES[self._current_status], time.time())
+
+    def copy_before(self, attribute, old):
+        """
+        Copia desvinculada del envío tal como era antes de un cambio ya notificado.
+
+        Uso de la capa de infraestructura: un observador recibe el cambio después de
+        aplicarlo y, con el valor anterior, puede conservar el estado previo para las
+        instantáneas abiertas (ver ShipmentRepositoryMemory.snapshot).
+
+        Args:
+            attribute (str): Atributo notificado (current_status, assigned_route o priority).
+            old: Valor anterior notificado.
+
+        Returns:
+            Shipment: Instancia del mismo tipo, sin observadores.
+        """
+        status_log = self._status_log
+        if attribute == "current_status":
+            # El cambio de estado añadió un registro al historial: se descarta
+            status_log = status_log[:-_STATUS_RECORD.size]
+        return type(self).restore(
+            self.__tracking_code,
+            self.__sender,
+            self.__recipient,
+            old if attribute == "priority" else self._priority,
+            status_log,
+            old if attribute == "assigned_route" else self._assigned_route,
+        )
 
     def can_change_to(self, new_status):
         """
@@ -163,16 +265,11 @@ class Shipment:
         Raises:
             ValueError: Si la transición no es permitida.
         """
-        new_status_format = new_status.upper()
-        valid_transitions = {
-            "REGISTERED": "IN_TRANSIT",
-            "IN_TRANSIT": "DELIVERED"
-        }
-
-        # Regla de negocio: solo transiciones definidas en valid_transitions son permitidas
+        # Regla de negocio: solo transiciones de la matriz precalculada son permitidas
         # Esto asegura un flujo de trabajo lógico y predecible
-        if valid_transitions.get(self._current_status) != new_status_format:
-            raise ValueError(f"Transición no permitida: de {self._current_status} a {new_status_format}")
+        error = transition_error(self._current_status, new_status.upper())
+        if error is not None:
+            raise ValueError(error)
 
     def assign_route(self, new_assigned_route):
         """
@@ -190,7 +287,9 @@ class Shipment:
         if new_assigned_route is None:
             raise ValueError("La ruta asignada no puede ser None.")
 
+        old_route = self._assigned_route
         self._assigned_route = new_assigned_route
+        self._notify("assigned_route", old_route, new_assigned_route)
 
     def remove_route(self):
         """
@@ -204,7 +303,9 @@ class Shipment:
         """
         if not self.is_assigned_to_route():
             raise ValueError("No hay ruta asignada para eliminar.")
+        old_route = self._assigned_route
         self._assigned_route = None
+        self._notify("assigned_route", old_route, None)
 
     def is_assigned_to_route(self):
         """
@@ -234,7 +335,28 @@ class Shipment:
         Nota: Devuelve copia para mantener encapsulamiento. El historial es
         inmutable desde fuera de la clase para garantizar trazabilidad confiable.
         """
-        return self._status_history.copy()
+        return [STATUS_NAMES[code] for code, _ in _STATUS_RECORD.iter_unpack(self._status_log)]
+
+    def get_status_timeline(self):
+        """
+        Devuelve el historial de estados junto con el instante de cada transición.
+
+        Pensado para el cálculo de SLA (tiempo en cada estado, tiempo hasta la entrega).
+
+        Returns:
+            List[Tuple[str, float]]: Pares (estado, instante epoch en segundos) en orden cronológico.
+        """
+        return [(STATUS_NAMES[code], timestamp) for code, timestamp in _STATUS_RECORD.iter_unpack(self._status_log)]
+
+    def export_status_log(self):
+        """
+        Exporta el historial de estados para reconstruir el envío con restore().
+
+        Returns:
+            bytes: Historial serializado. Su formato es interno del dominio: quien lo
+            guarda o lo transmite no debe interpretarlo, solo devolverlo a restore().
+        """
+        return self._status_log
 
     def increase_priority(self):
         """
@@ -251,6 +373,7 @@ class Shipment:
         if self._priority > 2:
             raise ValueError("No se puede aumentar la prioridad del envío.")
         self._priority += 1
+        self._notify("priority", self._priority - 1, self._priority)
 
     def decrease_priority(self):
         """
@@ -265,4 +388,33 @@ class Shipment:
         """
         if self._priority < 2:
             raise ValueError("No se puede disminuir la prioridad del envío.")
-        self._priority -= 1
\ No newline at end of file
+        self._priority -= 1
+        self._notify("priority", self._priority + 1, self._priority)
+
+    def add_observer(self, observer):
+        """
+        Suscribe un observador a los cambios del envío.
+
+        El observador se invoca como observer(envío, atributo, valor_anterior, valor_nuevo)
+        después de cada cambio de current_status, assigned_route o priority. Permite a
+        otras capas (p. ej. índices de un repositorio) mantenerse sincronizadas sin que
+        el dominio dependa de ellas.
+
+        Args:
+            observer (Callable): Función a invocar en cada cambio.
+        """
+        self._observers = self._observers + (observer,)
+
+    def remove_observer(self, observer):
+        """
+        Cancela la suscripción de un observador. No hace nada si no estaba suscrito.
+
+        Args:
+            observer (Callable): Función suscrita previamente con add_observer().
+        """
+        self._observers = tuple(o for o in self._observers if o != observer)
+
+    def _notify(self, attribute, old, new):
+        """Informa a los observadores de un cambio ya aplicado."""
+        for observer in self._observers:
+            observer(self, attribute, old, new)
@@ -0,0 +1,92 @@
+# domain/shipment_lifecycle.py
+"""
+Dominio: Máquina de estados del ciclo de vida de un envío.
+
+Los estados se identifican por códigos enteros pequeños (los mismos que guarda
+el historial empaquetado y las columnas de los repositorios) y las transiciones
+válidas (RN-007) se precalculan una sola vez en una matriz plana de bytes:
+TRANSITION_MATRIX[origen * STATUS_COUNT + destino] vale 1 si la transición está
+permitida. Añadir un estado consiste en añadir su nombre a STATUS_NAMES y sus
+aristas a _TRANSITIONS.
+
+check_transitions() valida de una vez un lote completo de pares (origen, destino)
+para las operaciones en bloque, con los bucles resueltos en C (map sobre la matriz).
+"""
+
+from itertools import repeat
+from operator import add, mul
+
+# Estados en orden de código; el código es la posición en la tupla
+STATUS_NAMES = ("REGISTERED", "IN_TRANSIT", "DELIVERED")
+STATUS_CODES = {name: code for code, name in enumerate(STATUS_NAMES)}
+STATUS_COUNT = len(STATUS_NAMES)
+
+REGISTERED = STATUS_CODES["REGISTERED"]
+IN_TRANSIT = STATUS_CODES["IN_TRANSIT"]
+DELIVERED = STATUS_CODES["DELIVERED"]
+
+# Regla de negocio RN-007: REGISTERED → IN_TRANSIT → DELIVERED
+_TRANSITIONS = (
+    (REGISTERED, IN_TRANSIT),
+    (IN_TRANSIT, DELIVERED),
+)
+
+
+def _build_matrix(transitions):
+    """Construye la matriz plana de transiciones a partir de las aristas."""
+    matrix = bytearray(STATUS_COUNT * STATUS_COUNT)
+    for origin, destination in transitions:
+        matrix[origin * STATUS_COUNT + destination] = 1
+    return bytes(matrix)
+
+
+TRANSITION_MATRIX = _build_matrix(_TRANSITIONS)
+
+
+def can_transition(origin, destination):
+    """
+    Indica si la transición entre dos códigos de estado está permitida.
+
+    Args:
+        origin (int): Código del estado actual.
+        destination (int): Código del estado destino.
+
+    Returns:
+        bool: True si la transición es válida.
+    """
+    return TRANSITION_MATRIX[origin * STATUS_COUNT + destination] == 1
+
+
+def transition_error(current_status, new_status):
+    """
+    Comprueba una transición de estado expresada con nombres.
+
+    Args:
+        current_status (str): Estado actual, en mayúsculas.
+        new_status (str): Estado destino, en mayúsculas.
+
+    Returns:
+        str | None: Motivo del rechazo, o None si la transición está permitida.
+    """
+    destination = STATUS_CODES.get(new_status)
+    if destination is None or not can_transition(STATUS_CODES[current_status], destination):
+        return f"Transición no permitida: de {current_status} a {new_status}"
+    return None
+
+
+def check_transitions(origins, destinations):
+    """
+    Valida un lote de transiciones (origen[i], destino[i]) en una sola pasada.
+
+    Args:
+        origins (Iterable[int]): Códigos de los estados actuales (p. ej. un array o bytes).
+        destinations (Iterable[int] | int): Códigos de destino alineados con origins,
+            o un único código común a todo el lote.
+
+    Returns:
+        bytes: Máscara alineada con origins: 1 si la transición es válida, 0 si no.
+    """
+    if isinstance(destinations, int):
+        destinations = repeat(destinations)
+    cells = map(add, map(mul, origins, repeat(STATUS_COUNT)), destinations)
+    return bytes(map(TRANSITION_MATRIX.__getitem__, cells))
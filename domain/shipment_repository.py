@@ -1,9 +1,23 @@
 # domain/repository.py
 
+from itertools import islice
+
+from logistica.domain.snapshot import Snapshot
+
 class ShipmentRepository:
     def add(self, shipment):
         raise NotImplementedError
 
+    def add_many(self, shipments):
+        """
+        Almacena o actualiza varios envíos en una sola operación.
+
+        Implementación por defecto: llama a add() por cada elemento. Las
+        implementaciones persistentes pueden escribir el lote de una vez.
+        """
+        for shipment in shipments:
+            self.add(shipment)
+
     def remove(self, tracking_code):
         raise NotImplementedError
 
@@ -11,4 +25,71 @@ class ShipmentRepository:
         raise NotImplementedError
 
     def list_all(self):
-        raise NotImplementedError
\ No newline at end of file
+        raise NotImplementedError
+
+    def get_many(self, tracking_codes):
+        """
+        Recupera varios envíos por su código de seguimiento en una sola operación.
+
+        Devuelve una lista alineada con tracking_codes: el envío encontrado o None.
+
+        Implementación por defecto: llama a get_by_tracking_code() por cada código.
+        Las implementaciones persistentes pueden resolver el lote en una consulta.
+        """
+        return [self.get_by_tracking_code(code) for code in tracking_codes]
+
+    def iter_all(self):
+        """
+        Itera todos los envíos sin exigir una copia completa.
+
+        Implementación por defecto: itera sobre list_all(). Las implementaciones
+        concretas pueden devolver un iterador sobre una instantánea sin copiar.
+        """
+        return iter(self.list_all())
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Devuelve los envíos que cumplen todos los filtros indicados (None = sin filtro).
+
+        Implementación por defecto: recorrido completo de list_all(). Las
+        implementaciones concretas pueden sobrescribirla con índices.
+        """
+        status = status.upper() if status is not None else None
+        shipment_type = shipment_type.upper() if shipment_type is not None else None
+        return [
+            s for s in self.list_all()
+            if (status is None or s.current_status == status)
+            and (route_id is None or s.assigned_route == route_id)
+            and (priority is None or s.priority == priority)
+            and (shipment_type is None or s.shipment_type == shipment_type)
+        ]
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """Cuenta los envíos que cumplen todos los filtros indicados (ver find())."""
+        return len(self.find(status, route_id, priority, shipment_type))
+
+    def iter_sorted(self, after=None, limit=None):
+        """
+        Itera los envíos en orden alfabético (case-insensitive) de código de seguimiento.
+
+        Paginación por cursor: `after` es el último código ya servido (se empieza justo
+        después) y `limit` el número máximo de envíos a devolver.
+
+        Implementación por defecto: ordena list_all() en cada llamada. Las
+        implementaciones concretas pueden mantener un índice ordenado.
+        """
+        shipments = sorted(self.list_all(), key=lambda s: s.tracking_code.lower())
+        if after is not None:
+            after = after.strip().lower()
+            shipments = [s for s in shipments if s.tracking_code.lower() > after]
+        return islice(shipments, limit)
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de los envíos en este instante (ver domain/snapshot.py).
+
+        Implementación por defecto: copia el índice de claves desde iter_all(), sin
+        versión, y entrega los envíos vivos. ShipmentRepositoryMemory la sirve sin
+        copiar y conserva el estado de la versión capturada.
+        """
+        return Snapshot(None, {shipment.tracking_code.lower(): shipment for shipment in self.iter_all()})
@@ -0,0 +1,122 @@
+# domain/snapshot.py
+"""
+Instantáneas versionadas de solo lectura de los repositorios.
+
+Un informe largo (listar el inventario de un centro, el resumen de rutas) debe ver
+el estado de un único instante aunque otras operaciones sigan escribiendo. Copiar
+el almacén en cada consulta es O(n); bloquear a los escritores mientras dura el
+informe tampoco es aceptable.
+
+Los repositorios entregan con snapshot() una vista por versión que no copia el
+almacén: las implementaciones en memoria comparten sus estructuras copy-on-write
+con la instantánea y conservan el estado anterior de los agregados que cambian
+mientras la instantánea siga abierta (ver ShipmentRepositoryMemory).
+
+Los centros y las rutas se capturan como registros inmutables (CenterState,
+RouteState): hay pocos y capturar cada uno es O(1), porque el inventario del
+centro también es copy-on-write.
+"""
+
+from collections import namedtuple
+
+
+class CenterState(namedtuple("CenterState", "center_id name location inventory")):
+    """
+    Estado de un centro en una instantánea.
+
+    Attributes:
+        inventory (Mapping[str, Shipment]): Código -> envío, de solo lectura y en
+            orden de llegada. Los envíos se resuelven a su estado en la versión de la
+            instantánea con la instantánea de envíos.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, center):
+        """Captura el estado actual de un centro sin copiar su inventario."""
+        return cls(center.center_id, center.name, center.location, center.inventory_view())
+
+
+class RouteState(namedtuple("RouteState", "route_id origin_id destination_id is_active")):
+    """Estado de una ruta en una instantánea."""
+    __slots__ = ()
+
+    @classmethod
+    def of(cls, route):
+        """Captura el estado actual de una ruta."""
+        return cls(route.route_id, route.origin_center.center_id, route.destination_center.center_id, route.is_active)
+
+
+class Snapshot:
+    """
+    Vista de solo lectura de un repositorio en una versión concreta.
+
+    Se usa como gestor de contexto (o llamando a close()) para que el repositorio
+    pueda descartar el estado anterior que guardaba para ella. Las claves se buscan
+    sin distinguir mayúsculas, igual que en los repositorios.
+
+    Attributes:
+        version (int | None): Versión del repositorio en el momento de la captura;
+            None si la implementación no lleva versiones.
+    """
+
+    def __init__(self, version, items, resolve=None, release=None):
+        """
+        Args:
+            version (int | None): Versión capturada.
+            items (Mapping): Clave en minúsculas -> objeto. No debe modificarse después.
+            resolve (Callable, opcional): resolve(clave, objeto) devuelve el objeto tal
+                como era en la versión capturada. Sin él, los objetos se devuelven tal cual.
+            release (Callable, opcional): Se invoca con la instantánea al cerrarla.
+        """
+        self.version = version
+        self._items = items
+        self._resolve = resolve
+        self._release = release
+
+    def get(self, key):
+        """
+        Devuelve el objeto con esa clave en la versión capturada, o None.
+
+        Args:
+            key (str): Código de seguimiento o ID de centro/ruta.
+        """
+        key = (key or "").strip().lower()
+        item = self._items.get(key) if key else None
+        if item is None or self._resolve is None:
+            return item
+        return self._resolve(key, item)
+
+    def get_many(self, keys):
+        """Lista alineada con keys: el objeto en la versión capturada o None."""
+        return [self.get(key) for key in keys]
+
+    def iter_all(self):
+        """Itera los objetos de la instantánea en el orden del repositorio."""
+        if self._resolve is None:
+            return iter(self._items.values())
+        resolve = self._resolve
+        return (resolve(key, item) for key, item in self._items.items())
+
+    def list_all(self):
+        """Lista con los objetos de la instantánea."""
+        return list(self.iter_all())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, key):
+        return (key or "").strip().lower() in self._items
+
+    def close(self):
+        """Libera el estado anterior que el repositorio guardaba para esta instantánea."""
+        release, self._release = self._release, None
+        if release is not None:
+            release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
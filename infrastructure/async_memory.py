@@ -0,0 +1,115 @@
+# infrastructure/async_memory.py
+"""
+Adaptadores asíncronos sobre los repositorios síncronos.
+
+Permiten usar los repositorios existentes (en memoria, SQLite) con los servicios
+asíncronos. Cada adaptador cumple el contrato asíncrono correspondiente delegando
+en el repositorio envuelto:
+
+- Sin executor (lo adecuado para los repositorios en memoria), la llamada se hace
+  directamente en el bucle de eventos: son operaciones en O(1) que no bloquean, y
+  pasarlas a otro hilo costaría más que ejecutarlas.
+- Con executor, cada llamada se ejecuta en él con run_in_executor, para que un
+  repositorio con E/S bloqueante no detenga el bucle. El repositorio envuelto debe
+  admitir llamadas desde los hilos del executor.
+"""
+
+import asyncio
+import functools
+
+from logistica.domain.async_repository import AsyncShipmentRepository, AsyncCenterRepository, AsyncRouteRepository
+
+
+class _AsyncAdapter:
+    """Base común: guarda el repositorio envuelto y decide dónde se ejecuta cada llamada."""
+
+    def __init__(self, repo, executor=None):
+        """
+        Args:
+            repo: Repositorio síncrono que se envuelve.
+            executor (concurrent.futures.Executor, opcional): Executor para las
+                llamadas bloqueantes. Sin él, se llama directamente.
+        """
+        self._repo = repo
+        self._executor = executor
+
+    async def _call(self, method, *args):
+        if self._executor is None:
+            return method(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args))
+
+
+class AsyncShipmentRepositoryAdapter(_AsyncAdapter, AsyncShipmentRepository):
+    """Repositorio de envíos asíncrono sobre un ShipmentRepository."""
+
+    async def add(self, shipment):
+        await self._call(self._repo.add, shipment)
+
+    async def add_many(self, shipments):
+        await self._call(self._repo.add_many, list(shipments))
+
+    async def remove(self, tracking_code):
+        return await self._call(self._repo.remove, tracking_code)
+
+    async def get_by_tracking_code(self, tracking_code):
+        return await self._call(self._repo.get_by_tracking_code, tracking_code)
+
+    async def get_many(self, tracking_codes):
+        return await self._call(self._repo.get_many, list(tracking_codes))
+
+    async def list_all(self):
+        return await self._call(self._repo.list_all)
+
+    async def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return await self._call(self._repo.find, status, route_id, priority, shipment_type)
+
+    async def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return await self._call(self._repo.count, status, route_id, priority, shipment_type)
+
+    async def iter_sorted(self, after=None, limit=None):
+        # Se materializa la página de una vez: el índice ordenado la sirve en O(log n + limit)
+        page = await self._call(lambda: list(self._repo.iter_sorted(after, limit)))
+        for shipment in page:
+            yield shipment
+
+
+class AsyncCenterRepositoryAdapter(_AsyncAdapter, AsyncCenterRepository):
+    """Repositorio de centros asíncrono sobre un CenterRepository."""
+
+    async def add(self, center):
+        await self._call(self._repo.add, center)
+
+    async def add_many(self, centers):
+        await self._call(self._repo.add_many, list(centers))
+
+    async def remove(self, center_id):
+        return await self._call(self._repo.remove, center_id)
+
+    async def get_by_center_id(self, center_id):
+        return await self._call(self._repo.get_by_center_id, center_id)
+
+    async def list_all(self):
+        return await self._call(self._repo.list_all)
+
+
+class AsyncRouteRepositoryAdapter(_AsyncAdapter, AsyncRouteRepository):
+    """Repositorio de rutas asíncrono sobre un RouteRepository."""
+
+    async def add(self, route):
+        await self._call(self._repo.add, route)
+
+    async def add_many(self, routes):
+        await self._call(self._repo.add_many, list(routes))
+
+    async def remove(self, route_id):
+        return await self._call(self._repo.remove, route_id)
+
+    async def get_by_route_id(self, route_id):
+        return await self._call(self._repo.get_by_route_id, route_id)
+
+    async def list_all(self):
+        return await self._call(self._repo.list_all)
+
+    async def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        return await self._call(self._repo.find, origin_id, destination_id, cargo_class, active)
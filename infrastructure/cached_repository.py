@@ -0,0 +1,282 @@
+# infrastructure/cached_repository.py
+"""
+Caché de lectura (read-through) delante de cualquier repositorio.
+
+Las consultas por clave de un almacén en disco son lo que más pesa cuando los
+clientes consultan el mismo envío una y otra vez. Estos decoradores envuelven un
+repositorio cualquiera (en memoria, SQLite...) cumpliendo su mismo contrato:
+
+- get_by_* se sirve desde una caché LRU acotada; si falla, se lee del repositorio
+  envuelto y el resultado queda en caché.
+- Caché negativa: los códigos que no existen también se recuerdan (como None), para
+  que los reintentos de un código mal escrito no lleguen al almacén.
+- TTL opcional: las entradas caducan pasado un tiempo, por si otro proceso escribe
+  en el mismo almacén. Las negativas pueden tener un TTL propio, más corto.
+- Escritura a través (write-through): add() y add_many() escriben en el repositorio
+  y actualizan la caché; remove() invalida la entrada.
+- Contadores de aciertos, fallos y expulsiones para medir la eficacia.
+
+El resto de consultas (listados, filtros, instantáneas) se delegan sin caché: ya
+las sirven los índices del repositorio envuelto.
+
+Si el almacén deshace una transacción (ver UnitOfWork), hay que vaciar la caché con
+clear(), igual que el mapa de identidad del almacén.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.center_repository import CenterRepository
+from logistica.domain.route_repository import RouteRepository
+
+# Marca de "no está en caché" (None es un valor válido: la clave no existe)
+_MISS = object()
+
+
+class _ReadThroughCache:
+    """
+    Núcleo común: LRU con TTL, caché negativa y contadores.
+
+    Los aciertos no toman cerrojo (es el camino caliente); las inserciones,
+    invalidaciones y expulsiones sí.
+
+    Attributes:
+        hits (int): Consultas servidas desde la caché (incluidas las negativas).
+        misses (int): Consultas que tuvieron que ir al repositorio envuelto.
+        evictions (int): Entradas expulsadas por falta de espacio.
+
+    Con varios hilos consultando a la vez, los contadores son aproximados.
+    """
+
+    def __init__(self, repo, maxsize=10_000, ttl=None, negative_ttl=None, clock=time.monotonic):
+        """
+        Args:
+            repo: Repositorio envuelto.
+            maxsize (int, opcional): Número máximo de entradas. Por defecto 10 000.
+            ttl (float, opcional): Segundos de vida de cada entrada. Sin él, no caducan.
+            negative_ttl (float, opcional): Segundos de vida de las entradas negativas.
+                Por defecto, el mismo que ttl; 0 desactiva la caché negativa.
+            clock (Callable, opcional): Reloj en segundos (inyectable en pruebas).
+
+        Raises:
+            ValueError: Si maxsize es menor que 1.
+        """
+        if maxsize < 1:
+            raise ValueError("El tamaño de la caché debe ser al menos 1.")
+        self._repo = repo
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._negative_ttl = ttl if negative_ttl is None else negative_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        # Escrituras vistas: una lectura que se cruza con una escritura no rellena la caché
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """Vacía la caché (los contadores se conservan)."""
+        with self._lock:
+            self._entries.clear()
+            self._writes += 1
+
+    def _lookup(self, key):
+        """
+        Valor de la clave en caché, o _MISS si no está o ha caducado.
+
+        Sin cerrojo: las operaciones del OrderedDict son atómicas y una entrada
+        expulsada a la vez por otro hilo solo convierte el acierto en fallo.
+        """
+        entry = self._entries.get(key) if key else None
+        if entry is not None:
+            value, expires = entry
+            if expires is None or self._clock() < expires:
+                try:
+                    self._entries.move_to_end(key)
+                except KeyError:
+                    pass
+                self.hits += 1
+                return value
+            self._entries.pop(key, None)
+        self.misses += 1
+        return _MISS
+
+    def _fill(self, key, value, writes):
+        """Guarda un valor leído del repositorio, salvo que se haya escrito algo entretanto."""
+        if not key:
+            return
+        with self._lock:
+            # Si alguien escribió mientras se leía, el valor leído puede estar obsoleto
+            if writes == self._writes:
+                self._put(key, value)
+
+    def _write(self, pairs):
+        """Write-through: guarda en caché los valores recién escritos en el repositorio."""
+        with self._lock:
+            self._writes += 1
+            for key, value in pairs:
+                self._put(key, value)
+
+    def _invalidate(self, key):
+        """Olvida una clave (p. ej. tras borrarla del repositorio)."""
+        with self._lock:
+            self._writes += 1
+            self._entries.pop(key, None)
+
+    def _put(self, key, value):
+        """Inserta una entrada como la más reciente, expulsando la más antigua si no cabe."""
+        ttl = self._ttl if value is not None else self._negative_ttl
+        if ttl == 0:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (value, None if ttl is None else self._clock() + ttl)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+
+def _key(value):
+    """Clave de caché: como en los repositorios, sin espacios y sin distinguir mayúsculas."""
+    return (value or "").strip().lower()
+
+
+class CachedShipmentRepository(_ReadThroughCache, ShipmentRepository):
+    """Repositorio de envíos con caché de lectura por código de seguimiento."""
+
+    def add(self, shipment):
+        self._repo.add(shipment)
+        self._write([(_key(shipment.tracking_code), shipment)])
+
+    def add_many(self, shipments):
+        shipments = list(shipments)
+        self._repo.add_many(shipments)
+        self._write([(_key(s.tracking_code), s) for s in shipments])
+
+    def remove(self, tracking_code):
+        removed = self._repo.remove(tracking_code)
+        self._invalidate(_key(tracking_code))
+        return removed
+
+    def get_by_tracking_code(self, tracking_code):
+        key = _key(tracking_code)
+        writes = self._writes
+        shipment = self._lookup(key)
+        if shipment is _MISS:
+            shipment = self._repo.get_by_tracking_code(tracking_code)
+            self._fill(key, shipment, writes)
+        return shipment
+
+    def get_many(self, tracking_codes):
+        tracking_codes = list(tracking_codes)
+        writes = self._writes
+        found = [self._lookup(_key(code)) for code in tracking_codes]
+
+        # Una sola llamada al repositorio para los códigos que faltan
+        missing = [i for i, shipment in enumerate(found) if shipment is _MISS]
+        if missing:
+            loaded = self._repo.get_many([tracking_codes[i] for i in missing])
+            for i, shipment in zip(missing, loaded):
+                found[i] = shipment
+                self._fill(_key(tracking_codes[i]), shipment, writes)
+        return found
+
+    def list_all(self):
+        return self._repo.list_all()
+
+    def iter_all(self):
+        return self._repo.iter_all()
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return self._repo.find(status, route_id, priority, shipment_type)
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return self._repo.count(status, route_id, priority, shipment_type)
+
+    def iter_sorted(self, after=None, limit=None):
+        return self._repo.iter_sorted(after, limit)
+
+    def snapshot(self):
+        return self._repo.snapshot()
+
+
+class CachedCenterRepository(_ReadThroughCache, CenterRepository):
+    """Repositorio de centros con caché de lectura por ID."""
+
+    def add(self, center):
+        self._repo.add(center)
+        self._write([(_key(center.center_id), center)])
+
+    def add_many(self, centers):
+        centers = list(centers)
+        self._repo.add_many(centers)
+        self._write([(_key(c.center_id), c) for c in centers])
+
+    def remove(self, center_id):
+        removed = self._repo.remove(center_id)
+        self._invalidate(_key(center_id))
+        return removed
+
+    def get_by_center_id(self, center_id):
+        key = _key(center_id)
+        writes = self._writes
+        center = self._lookup(key)
+        if center is _MISS:
+            center = self._repo.get_by_center_id(center_id)
+            self._fill(key, center, writes)
+        return center
+
+    def list_all(self):
+        return self._repo.list_all()
+
+    def iter_all(self):
+        return self._repo.iter_all()
+
+    def snapshot(self):
+        return self._repo.snapshot()
+
+
+class CachedRouteRepository(_ReadThroughCache, RouteRepository):
+    """Repositorio de rutas con caché de lectura por ID."""
+
+    def add(self, route):
+        self._repo.add(route)
+        self._write([(_key(route.route_id), route)])
+
+    def add_many(self, routes):
+        routes = list(routes)
+        self._repo.add_many(routes)
+        self._write([(_key(r.route_id), r) for r in routes])
+
+    def remove(self, route_id):
+        removed = self._repo.remove(route_id)
+        self._invalidate(_key(route_id))
+        return removed
+
+    def get_by_route_id(self, route_id):
+        key = _key(route_id)
+        writes = self._writes
+        route = self._lookup(key)
+        if route is _MISS:
+            route = self._repo.get_by_route_id(route_id)
+            self._fill(key, route, writes)
+        return route
+
+    def list_all(self):
+        return self._repo.list_all()
+
+    def iter_all(self):
+        return self._repo.iter_all()
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        return self._repo.find(origin_id, destination_id, cargo_class, active)
+
+    def snapshot(self):
+        return self._repo.snapshot()
@@ -0,0 +1,350 @@
+# infrastructure/columnar_shipment.py
+"""
+Repositorio en memoria de envíos con almacenamiento columnar (struct-of-arrays).
+
+En lugar de guardar un objeto Python por envío, cada atributo se guarda en su
+propia columna compacta:
+
+- Códigos de seguimiento, remitentes y destinatarios: listas de cadenas internadas
+- Estado, prioridad y tipo: arrays de int8 con códigos pequeños
+- Historial de estados: el registro empaquetado (bytes) de cada envío
+- Ruta asignada: array de int32 con referencias a una tabla de IDs de ruta
+
+Los objetos Shipment que se devuelven son vistas ligeras creadas bajo demanda:
+leen y escriben directamente sobre las columnas, así que los servicios y el
+dominio funcionan sin cambios. Mientras una vista siga viva (p. ej. dentro de una
+ruta o un centro) se devuelve siempre el mismo objeto para esa fila.
+
+Las consultas de filtrado y conteo (find/count) se resuelven sobre las columnas
+completas con operaciones de bytes en C (translate, AND de máscaras, count), sin
+materializar un objeto por envío.
+
+Attributes:
+    _index (dict): Mapea códigos de seguimiento (en minúsculas) a números de fila.
+"""
+
+import sys
+import weakref
+from array import array
+from itertools import compress
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.shipment import Shipment, STATUS_NAMES, STATUS_CODES
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+# Tablas de códigos compartidas por todas las filas
+# Los estados usan los mismos códigos que el historial del dominio
+_TYPE_NAMES = ("STANDARD", "FRAGILE", "EXPRESS")
+_TYPE_CODES = {name: code for code, name in enumerate(_TYPE_NAMES)}
+
+# Referencia de ruta para envíos sin ruta asignada
+_NO_ROUTE = -1
+
+
+class _ColumnView:
+    """
+    Mixin que redirige el estado interno de Shipment a las columnas del repositorio.
+
+    Sobrescribe los slots de Shipment con propiedades del mismo nombre, de modo que
+    todos los métodos del dominio (update_status, assign_route, increase_priority...)
+    operan sobre las columnas sin modificarse.
+    """
+
+    __slots__ = ()
+
+    @property
+    def _Shipment__tracking_code(self):
+        return self._store._codes[self._row]
+
+    @property
+    def _Shipment__sender(self):
+        return self._store._senders[self._row]
+
+    @property
+    def _Shipment__recipient(self):
+        return self._store._recipients[self._row]
+
+    @property
+    def _current_status(self):
+        return STATUS_NAMES[self._store._status[self._row]]
+
+    @_current_status.setter
+    def _current_status(self, value):
+        self._store._status[self._row] = STATUS_CODES[value]
+
+    @property
+    def _status_log(self):
+        return self._store._history[self._row]
+
+    @_status_log.setter
+    def _status_log(self, value):
+        self._store._history[self._row] = value
+
+    @property
+    def _priority(self):
+        return self._store._priority[self._row]
+
+    @_priority.setter
+    def _priority(self, value):
+        self._store._priority[self._row] = value
+
+    @property
+    def _assigned_route(self):
+        ref = self._store._route[self._row]
+        return None if ref == _NO_ROUTE else self._store._route_ids[ref]
+
+    @_assigned_route.setter
+    def _assigned_route(self, value):
+        self._store._route[self._row] = self._store._route_ref(value)
+
+
+class _StandardView(_ColumnView, Shipment):
+    __slots__ = ("_store", "_row")
+
+
+class _FragileView(_ColumnView, FragileShipment):
+    __slots__ = ("_store", "_row")
+
+
+class _ExpressView(_ColumnView, ExpressShipment):
+    __slots__ = ("_store", "_row")
+
+
+# Clase de vista por código de tipo (mismo orden que _TYPE_NAMES)
+_VIEW_CLASSES = (_StandardView, _FragileView, _ExpressView)
+
+
+def _equals_mask(column, code):
+    """Máscara de bytes (1/0) de las filas de una columna int8 iguales a code."""
+    table = bytearray(256)
+    table[code & 0xFF] = 1
+    return column.tobytes().translate(table)
+
+
+def _and_masks(left, right):
+    """AND bit a bit de dos máscaras de igual longitud, resuelto en C vía enteros."""
+    size = len(left)
+    combined = int.from_bytes(left, "little") & int.from_bytes(right, "little")
+    return combined.to_bytes(size, "little")
+
+
+class ShipmentRepositoryColumnar(ShipmentRepository):
+    """
+    Implementación columnar en memoria del repositorio de envíos.
+
+    Cumple el contrato ShipmentRepository, por lo que puede sustituir a
+    ShipmentRepositoryMemory sin cambios en los servicios.
+
+    Características:
+        - Un array por atributo en lugar de un objeto por envío
+        - Búsquedas insensibles a mayúsculas/minúsculas
+        - Filtros y conteos vectorizados sobre las columnas
+
+    Notes:
+        add() copia el estado del envío recibido a las columnas. Las modificaciones
+        posteriores deben hacerse sobre la vista devuelta por get_by_tracking_code(),
+        que es lo que hacen los servicios. Las filas eliminadas quedan marcadas como
+        inactivas y no se reutilizan, de modo que ninguna vista antigua apunte nunca
+        a otro envío.
+    """
+
+    def __init__(self):
+        """
+        Inicializa un repositorio columnar vacío.
+        """
+        self._index = {}
+
+        self._codes = []
+        self._senders = []
+        self._recipients = []
+        self._history = []
+        self._status = array("b")
+        self._priority = array("b")
+        self._type = array("b")
+        self._route = array("i")
+        self._alive = array("b")
+
+        # Tabla de IDs de ruta: la columna _route guarda la posición en esta lista
+        self._route_ids = []
+        self._route_refs = {}
+
+        # Vistas vivas por fila, para devolver siempre el mismo objeto por envío
+        self._views = weakref.WeakValueDictionary()
+
+    def add(self, shipment):
+        """
+        Almacena o actualiza un envío en el repositorio.
+
+        Si el envío ya es una vista de este repositorio no hay nada que copiar: sus
+        cambios ya están en las columnas. En otro caso se copia su estado, sobrescribiendo
+        la fila existente con el mismo código (ignorando mayúsculas/minúsculas).
+
+        Args:
+            shipment (Shipment): Instancia del envío a almacenar. Puede ser Shipment, FragileShipment o ExpressShipment.
+        """
+        if isinstance(shipment, _ColumnView) and shipment._store is self:
+            return
+
+        key = shipment.tracking_code.lower()
+        row = self._index.get(key)
+        if row is None:
+            row = len(self._codes)
+            self._index[key] = row
+            self._codes.append(None)
+            self._senders.append(None)
+            self._recipients.append(None)
+            self._history.append(None)
+            self._status.append(0)
+            self._priority.append(0)
+            self._type.append(0)
+            self._route.append(_NO_ROUTE)
+            self._alive.append(1)
+
+        # Cadenas internadas: remitentes y destinatarios se repiten muchísimo entre envíos
+        self._codes[row] = sys.intern(shipment.tracking_code)
+        self._senders[row] = sys.intern(shipment.sender)
+        self._recipients[row] = sys.intern(shipment.recipient)
+        # El historial empaquetado es inmutable (bytes): se comparte sin copiarlo
+        self._history[row] = shipment.export_status_log()
+        self._status[row] = STATUS_CODES[shipment.current_status]
+        self._priority[row] = shipment.priority
+        self._type[row] = _TYPE_CODES[shipment.shipment_type]
+        self._route[row] = self._route_ref(shipment.assigned_route)
+
+    def remove(self, tracking_code):
+        """
+        Elimina un envío del repositorio por su código de seguimiento.
+
+        Args:
+            tracking_code (str): Código de seguimiento del envío a eliminar.
+
+        Returns:
+            True si el envío existía y fue eliminado exitosamente, False si el código está vacío o el envío no existe.
+        """
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return False
+
+        row = self._index.pop(tracking_code.lower(), None)
+        if row is None:
+            return False
+
+        self._alive[row] = 0
+        self._views.pop(row, None)
+        return True
+
+    def get_by_tracking_code(self, tracking_code):
+        """
+        Recupera un envío por su código de seguimiento único.
+
+        Args:
+            tracking_code (str): Código de seguimiento del envío a buscar.
+
+        Returns:
+            Una vista del envío si se encuentra, None si no existe o el código está vacío.
+            La vista es instancia del tipo concreto (Shipment, FragileShipment o ExpressShipment).
+        """
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return None
+
+        row = self._index.get(tracking_code.lower())
+        if row is None:
+            return None
+        return self._view(row)
+
+    def list_all(self):
+        """
+        Obtiene todos los envíos almacenados en el repositorio.
+
+        Returns:
+            Lista de vistas de todos los envíos, en orden de inserción.
+        """
+        return [self._view(row) for row in self._index.values()]
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Devuelve los envíos que cumplen todos los filtros indicados.
+
+        Args:
+            status (str, opcional): Estado actual (REGISTERED, IN_TRANSIT, DELIVERED).
+            route_id (str, opcional): ID de la ruta asignada.
+            priority (int, opcional): Prioridad (1, 2 o 3).
+            shipment_type (str, opcional): Tipo de envío (STANDARD, FRAGILE, EXPRESS).
+
+        Returns:
+            Lista de vistas de los envíos que cumplen los filtros, en orden de inserción.
+        """
+        mask = self._mask(status, route_id, priority, shipment_type)
+        return [self._view(row) for row in compress(range(len(mask)), mask)]
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Cuenta los envíos que cumplen todos los filtros indicados, sin materializarlos.
+
+        Args:
+            Los mismos que find().
+
+        Returns:
+            int: Número de envíos que cumplen los filtros.
+        """
+        return self._mask(status, route_id, priority, shipment_type).count(1)
+
+    def _mask(self, status, route_id, priority, shipment_type):
+        """
+        Construye la máscara de filas (bytes 1/0) que cumplen los filtros.
+
+        Cada filtro sobre una columna int8 se resuelve con bytes.translate; los
+        filtros se combinan con un AND sobre la máscara de filas activas.
+        """
+        mask = self._alive.tobytes()
+
+        if status is not None:
+            code = STATUS_CODES.get(status.upper())
+            if code is None:
+                return bytes(len(mask))
+            mask = _and_masks(mask, _equals_mask(self._status, code))
+
+        if priority is not None:
+            mask = _and_masks(mask, _equals_mask(self._priority, priority))
+
+        if shipment_type is not None:
+            code = _TYPE_CODES.get(shipment_type.upper())
+            if code is None:
+                return bytes(len(mask))
+            mask = _and_masks(mask, _equals_mask(self._type, code))
+
+        if route_id is not None:
+            ref = self._route_refs.get(route_id)
+            if ref is None:
+                return bytes(len(mask))
+            # La columna es int32: la comparación se hace con un método builtin sobre
+            # el array, sin ejecutar bytecode Python por fila
+            mask = _and_masks(mask, bytes(map(ref.__eq__, self._route)))
+
+        return mask
+
+    def _view(self, row):
+        """Devuelve la vista viva de la fila o crea una nueva del tipo adecuado."""
+        view = self._views.get(row)
+        if view is None:
+            view_class = _VIEW_CLASSES[self._type[row]]
+            view = view_class.__new__(view_class)
+            view._store = self
+            view._row = row
+            # Las consultas leen las columnas directamente: no hace falta observar cambios
+            view._observers = ()
+            self._views[row] = view
+        return view
+
+    def _route_ref(self, route_id):
+        """Traduce un ID de ruta a su referencia entera, registrándolo si es nuevo."""
+        if route_id is None:
+            return _NO_ROUTE
+        ref = self._route_refs.get(route_id)
+        if ref is None:
+            ref = len(self._route_ids)
+            self._route_ids.append(sys.intern(route_id))
+            self._route_refs[route_id] = ref
+        return ref
@@ -0,0 +1,213 @@
+# infrastructure/concurrent_memory.py
+"""
+Repositorios en memoria seguros para usar desde varios hilos.
+
+- ShipmentRepositoryStriped: los envíos se reparten en tantas particiones como
+  franjas tenga el StripedLock, y cada partición es un ShipmentRepositoryMemory
+  protegido por su franja. Escribir envíos de franjas distintas no compite, y como
+  los servicios toman la misma franja antes de modificar un envío, los índices de
+  la partición (que se actualizan por observador) cambian siempre bajo ella.
+- CenterRepositoryConcurrent y RouteRepositoryConcurrent: hay pocos centros y rutas
+  y se escriben poco, así que basta un cerrojo de escritura. Las lecturas no se
+  bloquean gracias al copy-on-write de los repositorios en memoria.
+
+Las lecturas por clave no toman cerrojos: la consulta de un dict es atómica en
+CPython. Los recorridos (find, count, list_all) toman las franjas de una en una.
+Las instantáneas (snapshot) toman todas las franjas a la vez, solo mientras se
+captura cada partición, para que reflejen un único instante.
+
+Los agregados (Center, Route, Shipment) no llevan cerrojos propios: los servicios
+toman las franjas de todos los agregados de una operación antes de modificarlos
+(ver el parámetro locks de los servicios).
+"""
+
+import heapq
+import threading
+from itertools import chain, islice
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.snapshot import Snapshot
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+
+
+class ShipmentRepositoryStriped(ShipmentRepository):
+    """
+    Repositorio de envíos particionado por franjas de bloqueo.
+
+    Cumple el contrato ShipmentRepository, por lo que puede sustituir a
+    ShipmentRepositoryMemory sin cambios en los servicios.
+    """
+
+    def __init__(self, locks):
+        """
+        Args:
+            locks (StripedLock): Franjas compartidas con los servicios.
+        """
+        self._locks = locks
+        self._partitions = tuple(ShipmentRepositoryMemory() for _ in range(locks.stripes))
+
+    def add(self, shipment):
+        index = self._locks.shipment_stripe(shipment.tracking_code)
+        with self._locks.stripe(index):
+            self._partitions[index].add(shipment)
+
+    def add_many(self, shipments):
+        groups = {}
+        for shipment in shipments:
+            groups.setdefault(self._locks.shipment_stripe(shipment.tracking_code), []).append(shipment)
+
+        with self._locks.hold_stripes(groups):
+            for index, group in groups.items():
+                self._partitions[index].add_many(group)
+
+    def remove(self, tracking_code):
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return False
+        index = self._locks.shipment_stripe(tracking_code)
+        with self._locks.stripe(index):
+            return self._partitions[index].remove(tracking_code)
+
+    def get_by_tracking_code(self, tracking_code):
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return None
+        return self._partitions[self._locks.shipment_stripe(tracking_code)].get_by_tracking_code(tracking_code)
+
+    def list_all(self):
+        shipments = []
+        for index, partition in enumerate(self._partitions):
+            with self._locks.stripe(index):
+                shipments.extend(partition.iter_all())
+        return shipments
+
+    def iter_all(self):
+        # Cada partición entrega su instantánea copy-on-write, tomada ahora bajo su franja
+        snapshots = []
+        for index, partition in enumerate(self._partitions):
+            with self._locks.stripe(index):
+                snapshots.append(partition.iter_all())
+        return chain.from_iterable(snapshots)
+
+    def iter_sorted(self, after=None, limit=None):
+        """
+        Itera en orden alfabético de código mezclando los índices ordenados de las particiones.
+
+        Cada partición sirve como mucho limit envíos desde el cursor, así que una
+        página cuesta O(particiones · log n + limit · log particiones).
+        """
+        merged = heapq.merge(
+            *(partition.iter_sorted(after, limit) for partition in self._partitions),
+            key=lambda shipment: shipment.tracking_code.lower(),
+        )
+        return islice(merged, limit)
+
+    def snapshot(self):
+        with self._locks.hold_stripes(range(len(self._partitions))):
+            snapshots = [partition.snapshot() for partition in self._partitions]
+        return _StripedSnapshot(self._locks, snapshots)
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        found = []
+        for index, partition in enumerate(self._partitions):
+            with self._locks.stripe(index):
+                found.extend(partition.find(status, route_id, priority, shipment_type))
+        return found
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        total = 0
+        for index, partition in enumerate(self._partitions):
+            with self._locks.stripe(index):
+                total += partition.count(status, route_id, priority, shipment_type)
+        return total
+
+
+class _StripedSnapshot(Snapshot):
+    """Instantánea de ShipmentRepositoryStriped: una instantánea por partición."""
+
+    def __init__(self, locks, snapshots):
+        # La suma de versiones de las particiones también crece con cada cambio
+        super().__init__(sum(snapshot.version for snapshot in snapshots), None)
+        self._locks = locks
+        self._snapshots = snapshots
+
+    def get(self, key):
+        key = (key or "").strip()
+        if not key:
+            return None
+        return self._snapshots[self._locks.shipment_stripe(key)].get(key)
+
+    def iter_all(self):
+        return chain.from_iterable(snapshot.iter_all() for snapshot in self._snapshots)
+
+    def __len__(self):
+        return sum(len(snapshot) for snapshot in self._snapshots)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def close(self):
+        for snapshot in self._snapshots:
+            snapshot.close()
+
+
+class CenterRepositoryConcurrent(CenterRepositoryMemory):
+    """Repositorio de centros en memoria con escrituras serializadas."""
+
+    def __init__(self):
+        super().__init__()
+        self._write_lock = threading.Lock()
+
+    def add(self, center):
+        with self._write_lock:
+            super().add(center)
+
+    def remove(self, center_id):
+        with self._write_lock:
+            return super().remove(center_id)
+
+    def iter_all(self):
+        # Marcar el dict como compartido sin que un escritor lo esté modificando a la vez
+        with self._write_lock:
+            return super().iter_all()
+
+    def list_all(self):
+        return list(self.iter_all())
+
+    def snapshot(self):
+        with self._write_lock:
+            return super().snapshot()
+
+
+class RouteRepositoryConcurrent(RouteRepositoryMemory):
+    """Repositorio de rutas en memoria con escrituras serializadas."""
+
+    def __init__(self):
+        super().__init__()
+        self._write_lock = threading.Lock()
+
+    def add(self, route):
+        with self._write_lock:
+            super().add(route)
+
+    def remove(self, route_id):
+        with self._write_lock:
+            return super().remove(route_id)
+
+    def iter_all(self):
+        with self._write_lock:
+            return super().iter_all()
+
+    def list_all(self):
+        return list(self.iter_all())
+
+    def snapshot(self):
+        with self._write_lock:
+            return super().snapshot()
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        # Los cubos de los índices no tienen copy-on-write: se recorren sin escritores a la vez
+        with self._write_lock:
+            return super().find(origin_id, destination_id, cargo_class, active)
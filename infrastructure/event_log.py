@@ -0,0 +1,559 @@
+# infrastructure/event_log.py
+"""
+Registro de eventos (event sourcing) con instantáneas para los repositorios en memoria.
+
+Cada cambio del dominio (alta o baja de un agregado, cambio de estado, ruta o
+prioridad de un envío, entradas y salidas de un centro, asignaciones y cierre de
+una ruta) se añade a un fichero binario de solo escritura al final. Cada registro
+tiene la forma:
+
+    longitud (uint32) | CRC32 del cuerpo (uint32) | tipo (1 byte) | datos (JSON UTF-8)
+
+Periódicamente se guarda una instantánea del estado completo junto con la posición
+del log que cubre. Al arrancar se carga la última instantánea y solo se reproduce
+la cola del log posterior a ella. Un registro final incompleto o corrupto (p. ej.
+tras una caída a mitad de escritura) se descarta y el log se trunca en ese punto.
+
+Los eventos se capturan con los observadores del dominio, sin que este dependa del
+registro: EventSourcedStore envuelve los repositorios en memoria y se suscribe a
+cada agregado que entra en ellos.
+"""
+
+import base64
+import json
+import os
+import struct
+import zlib
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.center_repository import CenterRepository
+from logistica.domain.route_repository import RouteRepository
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+
+_HEADER = struct.Struct("<II")
+
+# Tipos de evento (primer byte del cuerpo)
+_SHIPMENT_ADDED = 1
+_SHIPMENT_REMOVED = 2
+_SHIPMENT_CHANGED = 3
+_CENTER_ADDED = 4
+_CENTER_REMOVED = 5
+_CENTER_CHANGED = 6
+_ROUTE_ADDED = 7
+_ROUTE_REMOVED = 8
+_ROUTE_CHANGED = 9
+
+_TYPE_CLASSES = {
+    "STANDARD": Shipment,
+    "FRAGILE": FragileShipment,
+    "EXPRESS": ExpressShipment,
+}
+
+# Posición en el estado de un envío (ver _shipment_state) de cada atributo observado
+# El cambio de estado guarda el historial completo: así el instante registrado se conserva
+_SHIPMENT_FIELDS = {"priority": 4, "current_status": 5, "assigned_route": 6}
+
+
+def _encode_log(status_log):
+    return base64.b64encode(status_log).decode("ascii")
+
+
+def _shipment_state(shipment):
+    """Estado serializable de un envío: datos de SHIPMENT_ADDED y de la instantánea."""
+    return [
+        shipment.tracking_code,
+        shipment.shipment_type,
+        shipment.sender,
+        shipment.recipient,
+        shipment.priority,
+        _encode_log(shipment.export_status_log()),
+        shipment.assigned_route,
+    ]
+
+
+def _center_state(center):
+    """Estado serializable de un centro, con los códigos de su inventario en orden de llegada."""
+    return [
+        center.center_id,
+        center.name,
+        center.location,
+        [shipment.tracking_code for shipment in center.iter_shipments()],
+    ]
+
+
+def _route_state(route):
+    """Estado serializable de una ruta, con los códigos de sus envíos en orden de asignación."""
+    return [
+        route.route_id,
+        route.origin_center.center_id,
+        route.destination_center.center_id,
+        [shipment.tracking_code for shipment in route.iter_shipments()],
+        route.is_active,
+    ]
+
+
+class EventLog:
+    """
+    Fichero binario de eventos con registros prefijados por su longitud.
+
+    Attributes:
+        end (int): Posición (en bytes) tras el último registro válido conocido.
+    """
+
+    def __init__(self, path, durable=False):
+        """
+        Args:
+            path (str): Ruta del fichero de log.
+            durable (bool, opcional): Si es True, cada evento se sincroniza a disco
+                (fsync). Por defecto solo se entrega al sistema operativo, lo que
+                sobrevive a una caída del proceso pero no a una del sistema.
+        """
+        self._path = path
+        self._durable = durable
+        self._file = None
+        self.end = 0
+
+    def replay(self, offset=0):
+        """
+        Itera los eventos guardados a partir de una posición.
+
+        Se detiene en el primer registro incompleto o con CRC incorrecto. Al
+        terminar, end apunta al final del último registro válido.
+
+        Args:
+            offset (int, opcional): Posición desde la que leer (p. ej. la de una instantánea).
+
+        Yields:
+            Tuple[int, list]: (tipo de evento, datos).
+        """
+        self.end = offset
+        if not os.path.exists(self._path):
+            return
+
+        with open(self._path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+
+        position = 0
+        size = len(data)
+        header_size = _HEADER.size
+        while position + header_size <= size:
+            length, crc = _HEADER.unpack_from(data, position)
+            start = position + header_size
+            stop = start + length
+            if stop > size:
+                break
+            body = data[start:stop]
+            if zlib.crc32(body) != crc:
+                break
+            yield body[0], json.loads(body[1:])
+            position = stop
+            self.end = offset + position
+
+    def open(self):
+        """Abre el log para añadir eventos, descartando lo que haya tras end."""
+        self._file = open(self._path, "ab")
+        self._file.truncate(self.end)
+
+    def append(self, kind, data):
+        """
+        Añade un evento al final del log.
+
+        Args:
+            kind (int): Tipo de evento.
+            data (list): Datos del evento, serializables como JSON.
+        """
+        body = bytes((kind,)) + json.dumps(data, separators=(",", ":")).encode("utf-8")
+        self._file.write(_HEADER.pack(len(body), zlib.crc32(body)) + body)
+        self._file.flush()
+        if self._durable:
+            os.fsync(self._file.fileno())
+        self.end += _HEADER.size + len(body)
+
+    def close(self):
+        """Cierra el fichero si está abierto."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class EventSourcedStore:
+    """
+    Persistencia por eventos de los repositorios de envíos, centros y rutas.
+
+    Al crearse reconstruye el estado en los repositorios recibidos (que deben estar
+    vacíos) a partir de la última instantánea y la cola del log. Después expone
+    versiones de esos repositorios que registran cada cambio: los servicios deben
+    usar los atributos shipments, centers y routes.
+
+    Attributes:
+        shipments (ShipmentRepository): Repositorio de envíos con registro de eventos.
+        centers (CenterRepository): Repositorio de centros con registro de eventos.
+        routes (RouteRepository): Repositorio de rutas con registro de eventos.
+        replayed (int): Eventos reproducidos al arrancar (sin contar la instantánea).
+
+    Notes:
+        La instantánea automática se toma al guardar un agregado en un repositorio,
+        nunca en mitad de una operación del dominio, de modo que siempre corresponde
+        a un estado coherente.
+    """
+
+    def __init__(self, directory, shipment_repo, center_repo, route_repo, snapshot_every=10_000, durable=False):
+        """
+        Args:
+            directory (str): Directorio del log y de la instantánea (se crea si no existe).
+            shipment_repo (ShipmentRepository): Repositorio de envíos vacío.
+            center_repo (CenterRepository): Repositorio de centros vacío.
+            route_repo (RouteRepository): Repositorio de rutas vacío.
+            snapshot_every (int, opcional): Eventos entre instantáneas automáticas; 0 las desactiva.
+            durable (bool, opcional): Sincronizar cada evento a disco (ver EventLog).
+        """
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, "snapshot.json")
+        self._log = EventLog(os.path.join(directory, "events.log"), durable)
+        self._snapshot_every = snapshot_every
+        self._since_snapshot = 0
+
+        # Agregados observados por clave, para suscribirse y darse de baja una sola vez
+        self._tracked_shipments = {}
+        self._tracked_centers = {}
+        self._tracked_routes = {}
+
+        self._shipment_repo = shipment_repo
+        self._center_repo = center_repo
+        self._route_repo = route_repo
+
+        self.replayed = self._load()
+        self._log.open()
+
+        self.shipments = _RecordingShipmentRepository(self, shipment_repo)
+        self.centers = _RecordingCenterRepository(self, center_repo)
+        self.routes = _RecordingRouteRepository(self, route_repo)
+
+    def snapshot(self):
+        """
+        Guarda el estado completo y la posición del log que cubre.
+
+        La escritura es atómica (fichero temporal + os.replace): una caída durante la
+        instantánea deja intacta la anterior.
+        """
+        state = {
+            "offset": self._log.end,
+            "shipments": [_shipment_state(s) for s in self._shipment_repo.iter_all()],
+            "centers": [_center_state(c) for c in self._center_repo.iter_all()],
+            "routes": [_route_state(r) for r in self._route_repo.iter_all()],
+        }
+        temporary = self._snapshot_path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump(state, f, separators=(",", ":"))
+        os.replace(temporary, self._snapshot_path)
+        self._since_snapshot = 0
+
+    def close(self):
+        """Cierra el log. Los repositorios dejan de poder registrar cambios."""
+        self._log.close()
+
+    # --- Arranque: instantánea + cola del log ---
+
+    def _load(self):
+        """Reconstruye el estado en los repositorios y devuelve los eventos reproducidos."""
+        offset = 0
+        shipments, centers, routes = {}, {}, {}
+
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            offset = snapshot["offset"]
+            for row in snapshot["shipments"]:
+                shipments[row[0].lower()] = row
+            for row in snapshot["centers"]:
+                centers[row[0].lower()] = row[:3] + [dict.fromkeys(row[3])]
+            for row in snapshot["routes"]:
+                routes[row[0].lower()] = row
+
+        replayed = 0
+        for kind, data in self._log.replay(offset):
+            _apply(shipments, centers, routes, kind, data)
+            replayed += 1
+
+        self._build(shipments, centers, routes)
+        return replayed
+
+    def _build(self, shipments, centers, routes):
+        """Crea los agregados a partir del estado reproducido y los guarda en los repositorios."""
+        shipment_objects = {}
+        for key, (code, shipment_type, sender, recipient, priority, status_log, route_id) in shipments.items():
+            shipment_objects[key] = _TYPE_CLASSES[shipment_type].restore(
+                code, sender, recipient, priority, base64.b64decode(status_log), route_id
+            )
+
+        center_objects = {}
+        for key, (center_id, name, location, inventory) in centers.items():
+            center = Center(center_id, name, location)
+            center.receive_many(shipment_objects[c.lower()] for c in inventory if c.lower() in shipment_objects)
+            center_objects[key] = center
+
+        route_objects = []
+        for route_id, origin_id, destination_id, codes, active in routes.values():
+            origin = center_objects.get(origin_id.lower())
+            destination = center_objects.get(destination_id.lower())
+            if origin is None or destination is None:
+                continue
+            members = [shipment_objects[c.lower()] for c in codes if c.lower() in shipment_objects]
+            route_objects.append(Route.restore(route_id, origin, destination, members, active))
+
+        self._shipment_repo.add_many(shipment_objects.values())
+        self._center_repo.add_many(center_objects.values())
+        self._route_repo.add_many(route_objects)
+
+        for shipment in shipment_objects.values():
+            self._track(self._tracked_shipments, shipment.tracking_code, shipment, self._on_shipment_changed)
+        for center in center_objects.values():
+            self._track(self._tracked_centers, center.center_id, center, self._on_center_changed)
+        for route in route_objects:
+            self._track(self._tracked_routes, route.route_id, route, self._on_route_changed)
+
+    # --- Registro de cambios ---
+
+    def _append(self, kind, data):
+        self._log.append(kind, data)
+        self._since_snapshot += 1
+
+    def _maybe_snapshot(self):
+        """Toma una instantánea si se ha alcanzado el umbral de eventos."""
+        if self._snapshot_every and self._since_snapshot >= self._snapshot_every:
+            self.snapshot()
+
+    def _track(self, tracked, key, aggregate, observer):
+        """
+        Empieza a observar un agregado. Devuelve False si ya se observaba ese mismo objeto.
+
+        Si la clave pertenecía a otro objeto (sustitución), deja de observar el anterior.
+        """
+        key = key.lower()
+        previous = tracked.get(key)
+        if previous is aggregate:
+            return False
+        if previous is not None:
+            previous.remove_observer(observer)
+        aggregate.add_observer(observer)
+        tracked[key] = aggregate
+        return True
+
+    def _untrack(self, tracked, key, observer):
+        previous = tracked.pop(key.strip().lower(), None)
+        if previous is not None:
+            previous.remove_observer(observer)
+
+    def _shipment_added(self, shipment):
+        if self._track(self._tracked_shipments, shipment.tracking_code, shipment, self._on_shipment_changed):
+            self._append(_SHIPMENT_ADDED, _shipment_state(shipment))
+
+    def _shipment_removed(self, tracking_code):
+        self._untrack(self._tracked_shipments, tracking_code, self._on_shipment_changed)
+        self._append(_SHIPMENT_REMOVED, [tracking_code.strip()])
+
+    def _center_added(self, center):
+        if self._track(self._tracked_centers, center.center_id, center, self._on_center_changed):
+            self._append(_CENTER_ADDED, _center_state(center))
+
+    def _center_removed(self, center_id):
+        self._untrack(self._tracked_centers, center_id, self._on_center_changed)
+        self._append(_CENTER_REMOVED, [center_id.strip()])
+
+    def _route_added(self, route):
+        if self._track(self._tracked_routes, route.route_id, route, self._on_route_changed):
+            self._append(_ROUTE_ADDED, _route_state(route))
+
+    def _route_removed(self, route_id):
+        self._untrack(self._tracked_routes, route_id, self._on_route_changed)
+        self._append(_ROUTE_REMOVED, [route_id.strip()])
+
+    def _on_shipment_changed(self, shipment, attribute, old, new):
+        if attribute == "current_status":
+            new = _encode_log(shipment.export_status_log())
+        self._append(_SHIPMENT_CHANGED, [shipment.tracking_code, attribute, new])
+
+    def _on_center_changed(self, center, attribute, old, new):
+        self._append(_CENTER_CHANGED, [center.center_id, old, new])
+
+    def _on_route_changed(self, route, attribute, old, new):
+        self._append(_ROUTE_CHANGED, [route.route_id, attribute, old, new])
+
+
+def _apply(shipments, centers, routes, kind, data):
+    """
+    Aplica un evento sobre el estado serializable (mismas filas que la instantánea).
+
+    La reproducción trabaja sobre listas y dicts, no sobre agregados: no repite
+    validaciones ni dispara observadores, y los agregados se crean una sola vez al final.
+    """
+    if kind == _SHIPMENT_CHANGED:
+        row = shipments.get(data[0].lower())
+        if row is not None:
+            row[_SHIPMENT_FIELDS[data[1]]] = data[2]
+    elif kind == _CENTER_CHANGED:
+        row = centers.get(data[0].lower())
+        if row is not None:
+            center_id, old, new = data
+            if old is not None:
+                row[3].pop(old, None)
+            if new is not None:
+                row[3][new] = None
+    elif kind == _ROUTE_CHANGED:
+        row = routes.get(data[0].lower())
+        if row is not None:
+            route_id, attribute, old, new = data
+            if attribute == "active":
+                # Completar la ruta la desactiva y vacía su lista de envíos
+                row[4] = new
+                row[3] = []
+            elif old is not None:
+                row[3].remove(old)
+            else:
+                row[3].append(new)
+    elif kind == _SHIPMENT_ADDED:
+        shipments[data[0].lower()] = data
+    elif kind == _CENTER_ADDED:
+        centers[data[0].lower()] = data[:3] + [dict.fromkeys(data[3])]
+    elif kind == _ROUTE_ADDED:
+        routes[data[0].lower()] = data
+    elif kind == _SHIPMENT_REMOVED:
+        shipments.pop(data[0].lower(), None)
+    elif kind == _CENTER_REMOVED:
+        centers.pop(data[0].lower(), None)
+    elif kind == _ROUTE_REMOVED:
+        routes.pop(data[0].lower(), None)
+
+
+class _RecordingShipmentRepository(ShipmentRepository):
+    """Repositorio de envíos que registra altas y bajas y delega el resto."""
+
+    def __init__(self, store, inner):
+        self._store = store
+        self._inner = inner
+
+    def add(self, shipment):
+        self._store._shipment_added(shipment)
+        self._inner.add(shipment)
+        self._store._maybe_snapshot()
+
+    def add_many(self, shipments):
+        shipments = list(shipments)
+        for shipment in shipments:
+            self._store._shipment_added(shipment)
+        self._inner.add_many(shipments)
+        self._store._maybe_snapshot()
+
+    def remove(self, tracking_code):
+        removed = self._inner.remove(tracking_code)
+        if removed:
+            self._store._shipment_removed(tracking_code)
+        return removed
+
+    def get_by_tracking_code(self, tracking_code):
+        return self._inner.get_by_tracking_code(tracking_code)
+
+    def get_many(self, tracking_codes):
+        return self._inner.get_many(tracking_codes)
+
+    def list_all(self):
+        return self._inner.list_all()
+
+    def iter_all(self):
+        return self._inner.iter_all()
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return self._inner.find(status, route_id, priority, shipment_type)
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        return self._inner.count(status, route_id, priority, shipment_type)
+
+    def iter_sorted(self, after=None, limit=None):
+        return self._inner.iter_sorted(after, limit)
+
+    def snapshot(self):
+        return self._inner.snapshot()
+
+
+class _RecordingCenterRepository(CenterRepository):
+    """Repositorio de centros que registra altas y bajas y delega el resto."""
+
+    def __init__(self, store, inner):
+        self._store = store
+        self._inner = inner
+
+    def add(self, center):
+        self._store._center_added(center)
+        self._inner.add(center)
+        self._store._maybe_snapshot()
+
+    def add_many(self, centers):
+        centers = list(centers)
+        for center in centers:
+            self._store._center_added(center)
+        self._inner.add_many(centers)
+        self._store._maybe_snapshot()
+
+    def remove(self, center_id):
+        removed = self._inner.remove(center_id)
+        if removed:
+            self._store._center_removed(center_id)
+        return removed
+
+    def get_by_center_id(self, center_id):
+        return self._inner.get_by_center_id(center_id)
+
+    def list_all(self):
+        return self._inner.list_all()
+
+    def iter_all(self):
+        return self._inner.iter_all()
+
+    def snapshot(self):
+        return self._inner.snapshot()
+
+
+class _RecordingRouteRepository(RouteRepository):
+    """Repositorio de rutas que registra altas y bajas y delega el resto."""
+
+    def __init__(self, store, inner):
+        self._store = store
+        self._inner = inner
+
+    def add(self, route):
+        self._store._route_added(route)
+        self._inner.add(route)
+        self._store._maybe_snapshot()
+
+    def add_many(self, routes):
+        routes = list(routes)
+        for route in routes:
+            self._store._route_added(route)
+        self._inner.add_many(routes)
+        self._store._maybe_snapshot()
+
+    def remove(self, route_id):
+        removed = self._inner.remove(route_id)
+        if removed:
+            self._store._route_removed(route_id)
+        return removed
+
+    def get_by_route_id(self, route_id):
+        return self._inner.get_by_route_id(route_id)
+
+    def list_all(self):
+        return self._inner.list_all()
+
+    def iter_all(self):
+        return self._inner.iter_all()
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        return self._inner.find(origin_id, destination_id, cargo_class, active)
+
+    def snapshot(self):
+        return self._inner.snapshot()
@@ -16,6 +16,7 @@ Attributes:
 """
 
 from logistica.domain.center_repository import CenterRepository
+from logistica.domain.snapshot import CenterState, Snapshot
 
 class CenterRepositoryMemory(CenterRepository):
     """
@@ -43,6 +44,14 @@ class CenterRepositoryMemory(CenterRepository):
         """
         self._by_center_id = {}
 
+        # Copy-on-write para iteración: iter_all() marca el dict como compartido y la
+        # siguiente escritura trabaja sobre una copia, así los iteradores abiertos ven
+        # una instantánea estable sin que cada lectura tenga que copiar
+        self._shared = False
+
+        # Versión: aumenta con cada escritura (los servicios guardan el agregado tras modificarlo)
+        self._version = 0
+
     def add(self, center):
         """
         Almacena o actualiza un centro logístico en el repositorio.
@@ -57,7 +66,8 @@ class CenterRepositoryMemory(CenterRepository):
         TypeError: Si el parámetro `center` no es una instancia válida de Center.
         """
         key = center.center_id.lower()
-        self._by_center_id[key] = center
+        self._version += 1
+        self._writable()[key] = center
 
     def remove(self, center_id):
         """
@@ -79,7 +89,8 @@ class CenterRepositoryMemory(CenterRepository):
 
         key = center_id.lower()
         if key in self._by_center_id:
-            del self._by_center_id[key]
+            self._version += 1
+            del self._writable()[key]
             return True
         return False
 
@@ -109,4 +120,40 @@ class CenterRepositoryMemory(CenterRepository):
             La lista devuelta es una copia superficial. Modificar los objetos
             en la lista afectará a los objetos almacenados en el repositorio.
         """
-        return list(self._by_center_id.values())
\ No newline at end of file
+        return list(self._by_center_id.values())
+
+    def iter_all(self):
+        """
+        Itera todos los centros logísticos sin copiar el almacenamiento.
+
+        Returns:
+            Iterador sobre los centros almacenados, en orden de inserción. Ve una
+            instantánea del momento de la llamada: las altas y bajas posteriores no
+            le afectan ni lo invalidan.
+        """
+        self._shared = True
+        return iter(self._by_center_id.values())
+
+    @property
+    def version(self):
+        """Versión actual: aumenta con cada alta, actualización o baja."""
+        return self._version
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de los centros en la versión actual.
+
+        Cada elemento se captura como un CenterState inmutable en O(1), sin copiar
+        el almacén ni los inventarios (son copy-on-write).
+
+        Returns:
+            Snapshot: Vista con version, get(), iter_all() y list_all().
+        """
+        return Snapshot(self._version, {key: CenterState.of(center) for key, center in self._by_center_id.items()})
+
+    def _writable(self):
+        """Devuelve el dict listo para escribir, copiándolo si hay iteradores que lo comparten."""
+        if self._shared:
+            self._by_center_id = dict(self._by_center_id)
+            self._shared = False
+        return self._by_center_id
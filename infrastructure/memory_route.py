@@ -8,9 +8,20 @@ Esta implementación es case-insensitive para las consultas por ID de ruta, norm
 
 Attributes:
     _by_route_id (dict): Diccionario que mapea IDs de rutas (en minúsculas) a objetos Route.
+    _indexes (dict): Índices secundarios por centro de origen, centro de destino y clase
+        de carga: atributo -> valor -> {clave: Route}. Son atributos inmutables de la
+        ruta, así que basta con mantenerlos en add() y remove().
 """
 
 from logistica.domain.route_repository import RouteRepository
+from logistica.domain.snapshot import RouteState, Snapshot
+
+# Atributo indexado -> cómo se obtiene de la ruta
+_INDEXED_ATTRIBUTES = {
+    "origin": lambda route: route.origin_center.center_id,
+    "destination": lambda route: route.destination_center.center_id,
+    "cargo_class": lambda route: route.cargo_class,
+}
 
 class RouteRepositoryMemory(RouteRepository):
     """
@@ -30,6 +41,15 @@ class RouteRepositoryMemory(RouteRepository):
         Inicializa un nuevo repositorio en memoria vacío.
         """
         self._by_route_id = {}
+        self._indexes = {attribute: {} for attribute in _INDEXED_ATTRIBUTES}
+
+        # Copy-on-write para iteración: iter_all() marca el dict como compartido y la
+        # siguiente escritura trabaja sobre una copia, así los iteradores abiertos ven
+        # una instantánea estable sin que cada lectura tenga que copiar
+        self._shared = False
+
+        # Versión: aumenta con cada escritura (los servicios guardan el agregado tras modificarlo)
+        self._version = 0
 
     def add(self, route):
         """
@@ -44,7 +64,13 @@ class RouteRepositoryMemory(RouteRepository):
             TypeError: Si el parámetro `route` no es una instancia de Route.
         """
         key = route.route_id.lower()
-        self._by_route_id[key] = route
+        self._version += 1
+        previous = self._by_route_id.get(key)
+        if previous is not route:
+            if previous is not None:
+                self._unindex(key, previous)
+            self._index(key, route)
+        self._writable()[key] = route
 
     def remove(self, route_id):
         """
@@ -62,7 +88,9 @@ class RouteRepositoryMemory(RouteRepository):
 
         key = route_id.lower()
         if key in self._by_route_id:
-            del self._by_route_id[key]
+            self._version += 1
+            self._unindex(key, self._by_route_id[key])
+            del self._writable()[key]
             return True
         return False
 
@@ -88,4 +116,90 @@ class RouteRepositoryMemory(RouteRepository):
         Returns:
             Lista con todas las instancias de Route almacenadas, en el orden de inserción (dependiente del dict).
         """
-        return list(self._by_route_id.values())
\ No newline at end of file
+        return list(self._by_route_id.values())
+
+    def iter_all(self):
+        """
+        Itera todas las rutas sin copiar el almacenamiento.
+
+        Returns:
+            Iterador sobre las rutas almacenadas, en orden de inserción. Ve una
+            instantánea del momento de la llamada: las altas y bajas posteriores no
+            le afectan ni lo invalidan.
+        """
+        self._shared = True
+        return iter(self._by_route_id.values())
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        """
+        Devuelve las rutas que cumplen todos los filtros indicados usando los índices.
+
+        Recorre solo el cubo más pequeño de los filtros indexados y comprueba el resto
+        por pertenencia; el estado (active) se comprueba sobre ese cubo. El coste es
+        proporcional al resultado y no al número de rutas.
+
+        Args:
+            origin_id (str, opcional): ID del centro de origen.
+            destination_id (str, opcional): ID del centro de destino.
+            cargo_class (str, opcional): Clase de carga (STD, FRG, EXP).
+            active (bool, opcional): True para solo activas, False para solo completadas.
+
+        Returns:
+            Lista de rutas que cumplen los filtros. Sin filtros, todas las rutas.
+        """
+        filters = {"origin": origin_id, "destination": destination_id, "cargo_class": cargo_class}
+        buckets = [
+            self._indexes[attribute].get(value.strip().upper(), {})
+            for attribute, value in filters.items()
+            if value is not None
+        ]
+        if not buckets:
+            candidates = self._by_route_id.items()
+        else:
+            smallest = min(buckets, key=len)
+            others = [bucket for bucket in buckets if bucket is not smallest]
+            candidates = [
+                (key, route) for key, route in smallest.items()
+                if all(key in bucket for bucket in others)
+            ]
+        return [route for _, route in candidates if active is None or route.is_active == active]
+
+    @property
+    def version(self):
+        """Versión actual: aumenta con cada alta, actualización o baja."""
+        return self._version
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de las rutas en la versión actual.
+
+        Cada elemento se captura como un RouteState inmutable en O(1), sin copiar
+        el almacén.
+
+        Returns:
+            Snapshot: Vista con version, get(), iter_all() y list_all().
+        """
+        return Snapshot(self._version, {key: RouteState.of(route) for key, route in self._by_route_id.items()})
+
+    def _index(self, key, route):
+        """Registra la ruta en los índices secundarios."""
+        for attribute, value_of in _INDEXED_ATTRIBUTES.items():
+            self._indexes[attribute].setdefault(value_of(route), {})[key] = route
+
+    def _unindex(self, key, route):
+        """Retira la ruta de los índices secundarios, borrando los cubos que quedan vacíos."""
+        for attribute, value_of in _INDEXED_ATTRIBUTES.items():
+            index = self._indexes[attribute]
+            value = value_of(route)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del index[value]
+
+    def _writable(self):
+        """Devuelve el dict listo para escribir, copiándolo si hay iteradores que lo comparten."""
+        if self._shared:
+            self._by_route_id = dict(self._by_route_id)
+            self._shared = False
+        return self._by_route_id
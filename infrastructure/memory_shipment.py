@@ -10,13 +10,138 @@ Este repositorio soporta todos los tipos de envíos (STANDARD, FRAGILE, EXPRESS)
 y normaliza los códigos de seguimiento a minúsculas para garantizar búsquedas
 case-insensitive. No persiste los datos entre ejecuciones del programa.
 
+Mantiene un índice ordenado de códigos para servir listados alfabéticos paginados
+sin reordenar en cada consulta. El índice se guarda por bloques ordenados, así que
+un alta cuesta O(log n + tamaño de bloque) y no O(n) como en una lista plana, y las
+altas en lote se ordenan una vez y se mezclan en una sola pasada.
+
+Además mantiene índices secundarios por estado, ruta asignada, prioridad y tipo,
+que se actualizan solos cuando un envío almacenado cambia (el repositorio se
+suscribe como observador de cada envío).
+
+Lleva un contador de versión (cada alta, baja o cambio de un envío la incrementa)
+y sirve instantáneas versionadas con snapshot() sin copiar el almacén: comparten el
+dict copy-on-write, y mientras haya instantáneas abiertas el observador guarda una
+copia del estado anterior de cada envío que cambia (control de concurrencia
+multiversión). Sin instantáneas abiertas no se guarda nada.
+
 Attributes:
     _by_tracking_code (dict): Diccionario que mapea códigos de seguimiento
     (en minúsculas) a objetos Shipment o sus subtipos.
+    _indexes (dict): Por atributo indexado, diccionario valor -> {código: envío}.
+    _sorted_keys (_SortedKeys): Códigos (en minúsculas) ordenados alfabéticamente.
+    _history (dict): Código -> [(versión del cambio, envío, copia anterior)], solo
+    mientras haya instantáneas abiertas.
 """
 
+import weakref
+from bisect import bisect_left, bisect_right, insort
+
 from logistica.domain.shipment_repository import ShipmentRepository
 from logistica.domain.shipment import Shipment
+from logistica.domain.snapshot import Snapshot
+
+# Atributos de Shipment con índice secundario
+_INDEXED_ATTRIBUTES = ("current_status", "assigned_route", "priority", "shipment_type")
+
+
+class _SortedKeys:
+    """
+    Lista ordenada de claves repartida en bloques ordenados.
+
+    Insertar en una lista plana desplaza todos los elementos posteriores (O(n)), y
+    una carga masiva se vuelve cuadrática. Aquí cada clave se coloca con búsqueda
+    binaria sobre el máximo de cada bloque y solo se desplaza su bloque, que se
+    divide al doblar el tamaño objetivo.
+
+    Attributes:
+        chunks (list): Bloques ordenados y no vacíos, cada uno posterior al anterior.
+        maxes (list): Última clave de cada bloque, para localizar el bloque por bisección.
+    """
+
+    # Tamaño objetivo de bloque: un bloque se divide en dos al superar el doble
+    LOAD = 512
+
+    def __init__(self):
+        self.chunks = []
+        self.maxes = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def __iter__(self):
+        for chunk in self.chunks:
+            yield from chunk
+
+    def add(self, key):
+        """Inserta una clave que aún no está. O(log n + LOAD)."""
+        chunks, maxes = self.chunks, self.maxes
+        self._len += 1
+        if not maxes:
+            chunks.append([key])
+            maxes.append(key)
+            return
+
+        i = bisect_left(maxes, key)
+        if i == len(maxes):
+            # Mayor que todas: va al final del último bloque
+            i -= 1
+            chunks[i].append(key)
+            maxes[i] = key
+        else:
+            insort(chunks[i], key)
+        self._split(i)
+
+    def update(self, keys):
+        """
+        Inserta un lote de claves que aún no están.
+
+        Un lote pequeño se inserta clave a clave; uno grande se ordena y se mezcla con
+        las claves actuales en una sola pasada (sort detecta las dos secuencias ya
+        ordenadas y las funde en tiempo lineal) antes de volver a partir en bloques.
+        """
+        keys = sorted(keys)
+        if len(keys) * 8 < self._len:
+            for key in keys:
+                self.add(key)
+            return
+
+        merged = list(self)
+        merged.extend(keys)
+        merged.sort()
+        load = self.LOAD
+        self.chunks = [merged[i:i + load] for i in range(0, len(merged), load)]
+        self.maxes = [chunk[-1] for chunk in self.chunks]
+        self._len = len(merged)
+
+    def remove(self, key):
+        """Elimina una clave presente. O(log n + LOAD)."""
+        i = bisect_left(self.maxes, key)
+        chunk = self.chunks[i]
+        del chunk[bisect_left(chunk, key)]
+        self._len -= 1
+        if chunk:
+            self.maxes[i] = chunk[-1]
+        else:
+            del self.chunks[i]
+            del self.maxes[i]
+
+    def locate_after(self, key):
+        """Posición (bloque, índice en el bloque) de la primera clave mayor que key."""
+        i = bisect_right(self.maxes, key)
+        if i == len(self.maxes):
+            return i, 0
+        return i, bisect_right(self.chunks[i], key)
+
+    def _split(self, i):
+        """Divide el bloque i en dos mitades si ha superado el doble del tamaño objetivo."""
+        chunk = self.chunks[i]
+        if len(chunk) > 2 * self.LOAD:
+            half = len(chunk) // 2
+            self.chunks[i:i + 1] = [chunk[:half], chunk[half:]]
+            self.maxes[i:i + 1] = [chunk[half - 1], chunk[-1]]
+
 
 class ShipmentRepositoryMemory(ShipmentRepository):
     """
@@ -30,6 +155,8 @@ class ShipmentRepositoryMemory(ShipmentRepository):
         - Búsquedas insensibles a mayúsculas/minúsculas
         - Soporte para polimorfismo (todos los subtipos de Shipment)
         - Operaciones de tiempo constante O(1) para acceso por código
+        - Consultas por estado, ruta, prioridad y tipo en tiempo proporcional al resultado
+        - Listado ordenado por código con paginación por cursor, sin reordenar
 
     Notes:
         La eliminación de envíos no valida si están asignados a rutas activas o si se encuentran en centros logísticos.
@@ -43,6 +170,28 @@ class ShipmentRepositoryMemory(ShipmentRepository):
         """
         self._by_tracking_code = {}
 
+        # Copy-on-write para iteración: iter_all() marca el dict como compartido y la
+        # siguiente escritura trabaja sobre una copia, así los iteradores abiertos ven
+        # una instantánea estable sin que cada lectura tenga que copiar
+        self._shared = False
+
+        # Índices secundarios: atributo -> valor -> {código: envío}
+        # Los cubos son dicts para que mover un envío entre valores sea O(1)
+        self._indexes = {attribute: {} for attribute in _INDEXED_ATTRIBUTES}
+
+        # Índice ordenado de claves para listados alfabéticos (RN-022)
+        # La versión cambia con cada inserción/borrado para que los iteradores abiertos
+        # detecten desplazamientos y se recoloquen por búsqueda binaria
+        self._sorted_keys = _SortedKeys()
+        self._sorted_version = 0
+
+        # Instantáneas versionadas: versión actual, instantáneas abiertas (referencias
+        # débiles, por si no se cierran) y estados anteriores que aún pueden necesitar
+        self._version = 0
+        self._snapshots = weakref.WeakSet()
+        self._newest_snapshot = -1
+        self._history = {}
+
     def add(self, shipment):
         """
         Almacena o actualiza un envío en el repositorio.
@@ -54,7 +203,49 @@ class ShipmentRepositoryMemory(ShipmentRepository):
             shipment (Shipment): Instancia del envío a almacenar. Puede ser Shipment, FragileShipment o ExpressShipment.
         """
         key = shipment.tracking_code.lower()
-        self._by_tracking_code[key] = shipment
+        current = self._by_tracking_code.get(key)
+        if current is shipment:
+            # Ya almacenado: los índices se mantienen al día mediante el observador
+            return
+        if current is not None:
+            self._unindex(key, current)
+        else:
+            self._sorted_keys.add(key)
+            self._sorted_version += 1
+
+        self._version += 1
+        self._writable()[key] = shipment
+        self._index(key, shipment)
+
+    def add_many(self, shipments):
+        """
+        Almacena o actualiza varios envíos en una sola operación.
+
+        Igual que llamar a add() por cada envío, pero los códigos nuevos se ordenan
+        una vez y se mezclan con el índice ordenado en una sola pasada.
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos a almacenar.
+        """
+        new_keys = []
+        for shipment in shipments:
+            key = shipment.tracking_code.lower()
+            current = self._by_tracking_code.get(key)
+            if current is shipment:
+                continue
+            if current is not None:
+                # También cubre un código repetido dentro del propio lote
+                self._unindex(key, current)
+            else:
+                new_keys.append(key)
+
+            self._version += 1
+            self._writable()[key] = shipment
+            self._index(key, shipment)
+
+        if new_keys:
+            self._sorted_keys.update(new_keys)
+            self._sorted_version += 1
 
     def remove(self, tracking_code):
         """
@@ -71,10 +262,14 @@ class ShipmentRepositoryMemory(ShipmentRepository):
             return False
 
         key = tracking_code.lower()
-        if key in self._by_tracking_code:
-            del self._by_tracking_code[key]
-            return True
-        return False
+        if key not in self._by_tracking_code:
+            return False
+        self._version += 1
+        shipment = self._writable().pop(key)
+        self._unindex(key, shipment)
+        self._sorted_keys.remove(key)
+        self._sorted_version += 1
+        return True
 
     def get_by_tracking_code(self, tracking_code):
         """
@@ -105,4 +300,212 @@ class ShipmentRepositoryMemory(ShipmentRepository):
             a los objetos almacenados en el repositorio. Para obtener una copia profunda, implemente
             la lógica en la capa de aplicación según sea necesario.
         """
-        return list(self._by_tracking_code.values())
\ No newline at end of file
+        return list(self._by_tracking_code.values())
+
+    def iter_all(self):
+        """
+        Itera todos los envíos sin copiar el almacenamiento.
+
+        Returns:
+            Iterador sobre los envíos almacenados, en orden de inserción. Ve una
+            instantánea del momento de la llamada: las altas y bajas posteriores no
+            le afectan ni lo invalidan.
+        """
+        self._shared = True
+        return iter(self._by_tracking_code.values())
+
+    @property
+    def version(self):
+        """Versión actual: aumenta con cada alta, baja o cambio de un envío almacenado."""
+        return self._version
+
+    def snapshot(self):
+        """
+        Vista de solo lectura de los envíos en la versión actual, sin copiar el almacén.
+
+        La instantánea comparte el dict de envíos (la siguiente alta o baja trabaja
+        sobre una copia) y resuelve cada envío a su estado en la versión capturada:
+        los que han cambiado desde entonces se devuelven como copias desvinculadas,
+        el resto son los objetos almacenados.
+
+        Debe cerrarse (o usarse en un bloque with) para que el repositorio deje de
+        guardar estados anteriores para ella; no debe consultarse después de cerrarla.
+
+        Returns:
+            Snapshot: Vista con version, get(), get_many(), iter_all() y list_all().
+        """
+        self._shared = True
+        version = self._version
+        self._newest_snapshot = version
+        snapshot = Snapshot(version, self._by_tracking_code, self._resolver(version), self._release)
+        self._snapshots.add(snapshot)
+        return snapshot
+
+    def iter_sorted(self, after=None, limit=None):
+        """
+        Itera los envíos en orden alfabético (case-insensitive) de código de seguimiento.
+
+        Usa el índice ordenado: localiza el cursor por búsqueda binaria y avanza sin
+        copiar ni reordenar, así que una página cuesta O(log n + limit).
+
+        Args:
+            after (str, opcional): Último código ya servido; se empieza justo después.
+            limit (int, opcional): Número máximo de envíos a devolver.
+
+        Yields:
+            Shipment: Envíos en orden alfabético de código.
+        """
+        keys = self._sorted_keys
+        last = (after or "").strip().lower()
+        block, position = keys.locate_after(last)
+        version = self._sorted_version
+        served = 0
+
+        while limit is None or served < limit:
+            if version != self._sorted_version:
+                # El índice cambió mientras se iteraba: recolocar tras el último servido
+                block, position = keys.locate_after(last)
+                version = self._sorted_version
+            if block >= len(keys.chunks):
+                break
+            chunk = keys.chunks[block]
+            if position >= len(chunk):
+                block, position = block + 1, 0
+                continue
+            last = chunk[position]
+            yield self._by_tracking_code[last]
+            served += 1
+            position += 1
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Devuelve los envíos que cumplen todos los filtros indicados usando los índices.
+
+        Recorre solo el cubo más pequeño de los filtros indicados y comprueba el resto
+        por pertenencia, por lo que el coste es proporcional al resultado y no al
+        tamaño del repositorio.
+
+        Args:
+            status (str, opcional): Estado actual (REGISTERED, IN_TRANSIT, DELIVERED).
+            route_id (str, opcional): ID de la ruta asignada.
+            priority (int, opcional): Prioridad (1, 2 o 3).
+            shipment_type (str, opcional): Tipo de envío (STANDARD, FRAGILE, EXPRESS).
+
+        Returns:
+            Lista de envíos que cumplen los filtros. Sin filtros, todos los envíos.
+        """
+        buckets = self._buckets(status, route_id, priority, shipment_type)
+        if buckets is None:
+            return list(self._by_tracking_code.values())
+
+        smallest = min(buckets, key=len)
+        others = [bucket for bucket in buckets if bucket is not smallest]
+        return [
+            shipment for key, shipment in smallest.items()
+            if all(key in bucket for bucket in others)
+        ]
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Cuenta los envíos que cumplen todos los filtros indicados (ver find()).
+
+        Con un único filtro la respuesta es O(1): el tamaño del cubo correspondiente.
+        """
+        buckets = self._buckets(status, route_id, priority, shipment_type)
+        if buckets is None:
+            return len(self._by_tracking_code)
+        if len(buckets) == 1:
+            return len(buckets[0])
+        return len(self.find(status, route_id, priority, shipment_type))
+
+    def _buckets(self, status, route_id, priority, shipment_type):
+        """Cubos de índice de los filtros indicados, o None si no hay ningún filtro."""
+        filters = {
+            "current_status": status.upper() if status is not None else None,
+            "assigned_route": route_id,
+            "priority": priority,
+            "shipment_type": shipment_type.upper() if shipment_type is not None else None,
+        }
+        buckets = [
+            self._indexes[attribute].get(value, {})
+            for attribute, value in filters.items()
+            if value is not None
+        ]
+        return buckets or None
+
+    def _index(self, key, shipment):
+        """Registra el envío en todos los índices y se suscribe a sus cambios."""
+        for attribute in _INDEXED_ATTRIBUTES:
+            value = getattr(shipment, attribute)
+            self._indexes[attribute].setdefault(value, {})[key] = shipment
+        shipment.add_observer(self._on_shipment_changed)
+
+    def _unindex(self, key, shipment):
+        """Retira el envío de todos los índices y cancela la suscripción."""
+        shipment.remove_observer(self._on_shipment_changed)
+        for attribute in _INDEXED_ATTRIBUTES:
+            self._discard(attribute, getattr(shipment, attribute), key)
+
+    def _discard(self, attribute, value, key):
+        """Quita una clave de un cubo, eliminando el cubo si queda vacío."""
+        index = self._indexes[attribute]
+        bucket = index.get(value)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del index[value]
+
+    def _on_shipment_changed(self, shipment, attribute, old, new):
+        """Observador: mueve el envío de cubo cuando cambia un atributo indexado."""
+        if attribute not in self._indexes:
+            return
+        key = shipment.tracking_code.lower()
+        self._version += 1
+        if self._snapshots:
+            self._remember(key, shipment, attribute, old)
+        elif self._history:
+            # Las instantáneas se descartaron sin cerrarlas
+            self._history.clear()
+        self._discard(attribute, old, key)
+        # Se lee el valor a través de la propiedad pública (p. ej. la prioridad fija de express)
+        self._indexes[attribute].setdefault(getattr(shipment, attribute), {})[key] = shipment
+
+    def _remember(self, key, shipment, attribute, old):
+        """Guarda el estado anterior de un envío que acaba de cambiar, si alguna instantánea puede necesitarlo."""
+        entries = self._history.setdefault(key, [])
+        # Un estado anterior posterior a la instantánea más reciente ya sirve a todas
+        if entries and entries[-1][1] is shipment and entries[-1][0] > self._newest_snapshot:
+            return
+        entries.append((self._version, shipment, shipment.copy_before(attribute, old)))
+
+    def _resolver(self, version):
+        """Función que devuelve cada envío tal como era en la versión indicada."""
+        def resolve(key, shipment):
+            # El primer cambio posterior a la versión guarda el estado de esa versión
+            for changed_at, original, before in self._history.get(key, ()):
+                if changed_at > version and original is shipment:
+                    return before
+            return shipment
+        return resolve
+
+    def _release(self, snapshot):
+        """Cierra una instantánea y descarta los estados anteriores que ya nadie necesita."""
+        self._snapshots.discard(snapshot)
+        if not self._snapshots:
+            self._history.clear()
+            return
+
+        oldest = min(open_snapshot.version for open_snapshot in self._snapshots)
+        for key, entries in list(self._history.items()):
+            kept = [entry for entry in entries if entry[0] > oldest]
+            if kept:
+                self._history[key] = kept
+            else:
+                del self._history[key]
+
+    def _writable(self):
+        """Devuelve el dict listo para escribir, copiándolo si hay iteradores que lo comparten."""
+        if self._shared:
+            self._by_tracking_code = dict(self._by_tracking_code)
+            self._shared = False
+        return self._by_tracking_code
@@ -0,0 +1,201 @@
+# infrastructure/sqlite_center.py
+"""
+Repositorio persistente de centros logísticos sobre SQLite.
+
+Los datos del centro se guardan en la tabla centers y su inventario en
+center_inventory, una fila por envío con un número de secuencia que conserva el
+orden de llegada. Al guardar un centro solo se escriben las altas y bajas del
+inventario desde el último guardado, que el almacén anota a medida que ocurren
+(observador del centro): guardar tras recibir un envío no recorre el inventario.
+
+Los envíos del inventario se resuelven a través del mapa de identidad del
+SqliteStore, de modo que el centro comparte objetos con el repositorio de envíos.
+"""
+
+from logistica.domain.center_repository import CenterRepository
+from logistica.domain.center import Center
+from logistica.infrastructure.sqlite_shipment import _COLUMNS, _hydrate
+
+_UPSERT = """
+INSERT INTO centers (key, center_id, name, location) VALUES (?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    center_id = excluded.center_id,
+    name = excluded.name,
+    location = excluded.location
+"""
+_DELETE = "DELETE FROM centers WHERE key = ?"
+_SELECT_BY_KEY = "SELECT center_id, name, location FROM centers WHERE key = ?"
+_SELECT_KEYS = "SELECT key FROM centers ORDER BY key"
+
+_INSERT_MEMBER = "INSERT OR REPLACE INTO center_inventory (center_key, shipment_key, seq) VALUES (?, ?, ?)"
+_DELETE_MEMBER = "DELETE FROM center_inventory WHERE center_key = ? AND shipment_key = ?"
+_DELETE_MEMBERS = "DELETE FROM center_inventory WHERE center_key = ?"
+_SELECT_MEMBERS = f"""
+SELECT i.shipment_key, i.seq, {", ".join("s." + column for column in _COLUMNS.split(", "))}
+FROM center_inventory i JOIN shipments s ON s.key = i.shipment_key
+WHERE i.center_key = ? ORDER BY i.seq
+"""
+
+
+class CenterRepositorySqlite(CenterRepository):
+    """
+    Implementación SQLite del repositorio de centros logísticos.
+
+    Cumple el contrato CenterRepository, por lo que puede sustituir a
+    CenterRepositoryMemory sin cambios en los servicios.
+
+    Características:
+        - Búsquedas insensibles a mayúsculas/minúsculas
+        - El inventario se guarda por diferencias, en la misma transacción que el centro
+        - Un centro cargado se devuelve siempre como el mismo objeto mientras siga vivo
+
+    Notes:
+        Igual que en memoria, `remove()` no valida si el centro contiene envíos.
+    """
+
+    def __init__(self, store):
+        """
+        Inicializa el repositorio sobre un almacén SQLite.
+
+        Args:
+            store (SqliteStore): Almacén compartido con los repositorios de envíos y rutas.
+        """
+        self._store = store
+
+    def add(self, center):
+        """
+        Almacena o actualiza un centro logístico y su inventario.
+
+        Args:
+            center (Center): Instancia del centro a almacenar.
+        """
+        self.add_many((center,))
+
+    def add_many(self, centers):
+        """
+        Almacena o actualiza varios centros en una única transacción.
+
+        Args:
+            centers (Iterable[Center]): Centros a almacenar.
+        """
+        rows = []
+        members = []
+        with self._store.lock:
+            for center in centers:
+                key = center.center_id.lower()
+                rows.append((key, center.center_id, center.name, center.location))
+                # Solo si aún no se sigue: lista una copia, sin marcar la colección como compartida
+                keys = lambda: [shipment.tracking_code.lower() for shipment in center.list_shipments()]
+                members.append((key, center, self._store.member_changes(center, keys)))
+                self._store.centers[key] = center
+
+        if not rows:
+            return
+
+        with self._store.transaction() as conn:
+            conn.executemany(_UPSERT, rows)
+            for key, _, (cleared, added, removed, _) in members:
+                if cleared:
+                    conn.execute(_DELETE_MEMBERS, (key,))
+                conn.executemany(_DELETE_MEMBER, [(key, code) for code in removed])
+                conn.executemany(_INSERT_MEMBER, [(key, code, seq) for code, seq in added])
+
+        with self._store.lock:
+            for _, center, (_, _, _, state) in members:
+                self._store.remember_members(center, state)
+
+    def remove(self, center_id):
+        """
+        Elimina un centro logístico y su inventario persistido.
+
+        Args:
+            center_id (str): Identificador del centro a eliminar.
+
+        Returns:
+            True si el centro existía y fue eliminado exitosamente, False si el ID está vacío o el centro no existe.
+        """
+        center_id = (center_id or "").strip()
+        if not center_id:
+            return False
+
+        key = center_id.lower()
+        with self._store.transaction() as conn:
+            removed = conn.execute(_DELETE, (key,)).rowcount > 0
+            conn.execute(_DELETE_MEMBERS, (key,))
+
+        with self._store.lock:
+            center = self._store.centers.pop(key, None)
+            if center is not None:
+                self._store.forget_members(center)
+        return removed
+
+    def get_by_center_id(self, center_id):
+        """
+        Recupera un centro logístico por su identificador único.
+
+        Args:
+            center_id (str): ID del centro a buscar.
+
+        Returns:
+            La instancia del centro si se encuentra, None si no existe o el ID está vacío.
+        """
+        center_id = (center_id or "").strip()
+        if not center_id:
+            return None
+
+        key = center_id.lower()
+        center = self._store.centers.get(key)
+        if center is not None:
+            return center
+        return self._load(key)
+
+    def list_all(self):
+        """
+        Obtiene todos los centros logísticos almacenados en el repositorio.
+
+        Returns:
+            Lista con todos los centros, ordenados por ID.
+        """
+        return list(self.iter_all())
+
+    def iter_all(self):
+        """
+        Itera todos los centros logísticos, cargándolos uno a uno.
+
+        Returns:
+            Iterador sobre los centros, ordenados por ID. Las claves se leen al
+            empezar: los centros eliminados después se omiten.
+        """
+        with self._store.connection() as conn:
+            keys = [row[0] for row in conn.execute(_SELECT_KEYS)]
+
+        for key in keys:
+            center = self._store.centers.get(key)
+            if center is None:
+                center = self._load(key)
+            if center is not None:
+                yield center
+
+    def _load(self, key):
+        """Reconstruye un centro y su inventario desde la base, o None si no existe."""
+        with self._store.connection() as conn:
+            row = conn.execute(_SELECT_BY_KEY, (key,)).fetchone()
+            if row is None:
+                return None
+            members = conn.execute(_SELECT_MEMBERS, (key,)).fetchall()
+
+        with self._store.lock:
+            # Otro hilo pudo cargarlo mientras leíamos
+            center = self._store.centers.get(key)
+            if center is not None:
+                return center
+
+            center = Center(*row)
+            shipments = [_hydrate(self._store, member[0], member[2:]) for member in members]
+            # El inventario persistido ya cumple las reglas del centro: no puede haber rechazos
+            center.receive_many(shipments)
+
+            next_seq = members[-1][1] + 1 if members else 0
+            self._store.track_members(center, next_seq)
+            self._store.centers[key] = center
+            return center
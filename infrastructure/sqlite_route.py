@@ -0,0 +1,255 @@
+# infrastructure/sqlite_route.py
+"""
+Repositorio persistente de rutas de transporte sobre SQLite.
+
+Los datos de la ruta se guardan en la tabla routes (con referencias a los
+centros de origen y destino) y sus envíos en route_shipments, conservando el
+orden de asignación. Al guardar una ruta solo se escriben las altas y bajas de
+envíos desde el último guardado, que el almacén anota a medida que ocurren
+(observador de la ruta).
+
+Los centros y envíos de una ruta se resuelven a través de los mapas de identidad
+del SqliteStore, así que la ruta comparte objetos con los otros dos repositorios.
+"""
+
+from logistica.domain.route_repository import RouteRepository
+from logistica.domain.route import Route
+from logistica.infrastructure.sqlite_center import CenterRepositorySqlite
+from logistica.infrastructure.sqlite_shipment import _COLUMNS, _hydrate
+
+_UPSERT = """
+INSERT INTO routes (key, route_id, origin_key, destination_key, active) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    route_id = excluded.route_id,
+    origin_key = excluded.origin_key,
+    destination_key = excluded.destination_key,
+    active = excluded.active
+"""
+_DELETE = "DELETE FROM routes WHERE key = ?"
+_SELECT_BY_KEY = "SELECT route_id, origin_key, destination_key, active FROM routes WHERE key = ?"
+_SELECT_KEYS = "SELECT key FROM routes ORDER BY key"
+_SELECT_KEYS_WHERE = "SELECT key FROM routes WHERE {} ORDER BY key"
+
+_INSERT_MEMBER = "INSERT OR REPLACE INTO route_shipments (route_key, shipment_key, seq) VALUES (?, ?, ?)"
+_DELETE_MEMBER = "DELETE FROM route_shipments WHERE route_key = ? AND shipment_key = ?"
+_DELETE_MEMBERS = "DELETE FROM route_shipments WHERE route_key = ?"
+_SELECT_MEMBERS = f"""
+SELECT r.shipment_key, r.seq, {", ".join("s." + column for column in _COLUMNS.split(", "))}
+FROM route_shipments r JOIN shipments s ON s.key = r.shipment_key
+WHERE r.route_key = ? ORDER BY r.seq
+"""
+
+
+class RouteRepositorySqlite(RouteRepository):
+    """
+    Implementación SQLite del repositorio de rutas.
+
+    Cumple el contrato RouteRepository, por lo que puede sustituir a
+    RouteRepositoryMemory sin cambios en los servicios.
+
+    Características:
+        - Búsquedas insensibles a mayúsculas/minúsculas
+        - Los envíos de la ruta se guardan por diferencias, en la misma transacción
+        - Una ruta cargada se devuelve siempre como el mismo objeto mientras siga viva
+
+    Notes:
+        Los centros de origen y destino deben estar guardados en el mismo almacén.
+    """
+
+    def __init__(self, store):
+        """
+        Inicializa el repositorio sobre un almacén SQLite.
+
+        Args:
+            store (SqliteStore): Almacén compartido con los repositorios de envíos y centros.
+        """
+        self._store = store
+        # Solo lee centros: comparte almacén y mapas de identidad con el repositorio de centros
+        self._centers = CenterRepositorySqlite(store)
+
+    def add(self, route):
+        """
+        Almacena o actualiza una ruta y sus envíos.
+
+        Args:
+            route (Route): Instancia de la ruta a almacenar.
+        """
+        self.add_many((route,))
+
+    def add_many(self, routes):
+        """
+        Almacena o actualiza varias rutas en una única transacción.
+
+        Args:
+            routes (Iterable[Route]): Rutas a almacenar.
+        """
+        rows = []
+        members = []
+        with self._store.lock:
+            for route in routes:
+                key = route.route_id.lower()
+                rows.append((
+                    key,
+                    route.route_id,
+                    route.origin_center.center_id.lower(),
+                    route.destination_center.center_id.lower(),
+                    int(route.is_active),
+                ))
+                # Solo si aún no se sigue: lista una copia, sin marcar la colección como compartida
+                keys = lambda: [shipment.tracking_code.lower() for shipment in route.list_shipment()]
+                members.append((key, route, self._store.member_changes(route, keys)))
+                self._store.routes[key] = route
+
+        if not rows:
+            return
+
+        with self._store.transaction() as conn:
+            conn.executemany(_UPSERT, rows)
+            for key, _, (cleared, added, removed, _) in members:
+                if cleared:
+                    conn.execute(_DELETE_MEMBERS, (key,))
+                conn.executemany(_DELETE_MEMBER, [(key, code) for code in removed])
+                conn.executemany(_INSERT_MEMBER, [(key, code, seq) for code, seq in added])
+
+        with self._store.lock:
+            for _, route, (_, _, _, state) in members:
+                self._store.remember_members(route, state)
+
+    def remove(self, route_id):
+        """
+        Elimina una ruta y sus asignaciones persistidas.
+
+        Args:
+            route_id (str): Identificador de la ruta a eliminar.
+
+        Returns:
+            True si la ruta existía y fue eliminada exitosamente, False si el ID está vacío o la ruta no existe.
+        """
+        route_id = (route_id or "").strip()
+        if not route_id:
+            return False
+
+        key = route_id.lower()
+        with self._store.transaction() as conn:
+            removed = conn.execute(_DELETE, (key,)).rowcount > 0
+            conn.execute(_DELETE_MEMBERS, (key,))
+
+        with self._store.lock:
+            route = self._store.routes.pop(key, None)
+            if route is not None:
+                self._store.forget_members(route)
+        return removed
+
+    def get_by_route_id(self, route_id):
+        """
+        Recupera una ruta por su identificador único.
+
+        Args:
+            route_id (str): ID de la ruta a buscar.
+
+        Returns:
+            La instancia de la ruta si se encuentra, None si no existe o el ID está vacío.
+        """
+        route_id = (route_id or "").strip()
+        if not route_id:
+            return None
+
+        key = route_id.lower()
+        route = self._store.routes.get(key)
+        if route is not None:
+            return route
+        return self._load(key)
+
+    def list_all(self):
+        """
+        Obtiene todas las rutas almacenadas en el repositorio.
+
+        Returns:
+            Lista con todas las rutas, ordenadas por ID.
+        """
+        return list(self.iter_all())
+
+    def iter_all(self):
+        """
+        Itera todas las rutas, cargándolas una a una.
+
+        Returns:
+            Iterador sobre las rutas, ordenadas por ID. Las claves se leen al
+            empezar: las rutas eliminadas después se omiten.
+        """
+        with self._store.connection() as conn:
+            keys = [row[0] for row in conn.execute(_SELECT_KEYS)]
+        return self._iter_keys(keys)
+
+    def find(self, origin_id=None, destination_id=None, cargo_class=None, active=None):
+        """
+        Devuelve las rutas que cumplen todos los filtros indicados.
+
+        Los filtros se resuelven en SQL con los índices routes_by_origin y
+        routes_by_destination; solo se cargan las rutas del resultado.
+
+        Args:
+            origin_id (str, opcional): ID del centro de origen.
+            destination_id (str, opcional): ID del centro de destino.
+            cargo_class (str, opcional): Clase de carga (STD, FRG, EXP).
+            active (bool, opcional): True para solo activas, False para solo completadas.
+
+        Returns:
+            Lista de rutas que cumplen los filtros, ordenadas por ID.
+        """
+        clauses = []
+        params = []
+        if origin_id is not None:
+            clauses.append("origin_key = ?")
+            params.append(origin_id.strip().lower())
+        if destination_id is not None:
+            clauses.append("destination_key = ?")
+            params.append(destination_id.strip().lower())
+        if cargo_class is not None:
+            # La clase es el tercer componente del ID: ORIGEN-DESTINO-CLASE-999
+            clauses.append("route_id LIKE ?")
+            params.append(f"%-%-{cargo_class.strip().upper()}-%")
+        if active is not None:
+            clauses.append("active = ?")
+            params.append(int(active))
+        if not clauses:
+            return self.list_all()
+
+        with self._store.connection() as conn:
+            keys = [row[0] for row in conn.execute(_SELECT_KEYS_WHERE.format(" AND ".join(clauses)), params)]
+        return list(self._iter_keys(keys))
+
+    def _iter_keys(self, keys):
+        """Rutas de las claves indicadas, desde el mapa de identidad o cargándolas."""
+        for key in keys:
+            route = self._store.routes.get(key)
+            if route is None:
+                route = self._load(key)
+            if route is not None:
+                yield route
+
+    def _load(self, key):
+        """Reconstruye una ruta y sus envíos desde la base, o None si no existe."""
+        with self._store.connection() as conn:
+            row = conn.execute(_SELECT_BY_KEY, (key,)).fetchone()
+            if row is None:
+                return None
+            members = conn.execute(_SELECT_MEMBERS, (key,)).fetchall()
+
+        route_id, origin_key, destination_key, active = row
+        origin = self._centers.get_by_center_id(origin_key)
+        destination = self._centers.get_by_center_id(destination_key)
+
+        with self._store.lock:
+            # Otro hilo pudo cargarla mientras leíamos
+            route = self._store.routes.get(key)
+            if route is not None:
+                return route
+
+            shipments = [_hydrate(self._store, member[0], member[2:]) for member in members]
+            route = Route.restore(route_id, origin, destination, shipments, bool(active))
+
+            next_seq = members[-1][1] + 1 if members else 0
+            self._store.track_members(route, next_seq)
+            self._store.routes[key] = route
+            return route
@@ -0,0 +1,330 @@
+# infrastructure/sqlite_shipment.py
+"""
+Repositorio persistente de envíos sobre SQLite.
+
+Cada envío es una fila de la tabla shipments; el historial de estados se guarda
+tal cual, como el BLOB empaquetado que genera el dominio. Los filtros de find(),
+count() e iter_sorted() se resuelven en SQL apoyándose en los índices del esquema.
+
+Las instancias cargadas se registran en el mapa de identidad del SqliteStore:
+mientras un envío siga vivo en memoria, todas las lecturas devuelven el mismo
+objeto, igual que hacen los repositorios en memoria.
+
+Notes:
+    Como en cualquier repositorio persistente, los cambios hechos sobre un envío
+    no llegan a la base hasta que se vuelve a llamar a add() (o add_many()). Las
+    consultas filtradas ven el estado persistido.
+"""
+
+from logistica.domain.shipment_repository import ShipmentRepository
+from logistica.domain.shipment import Shipment, STATUS_CODES
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+_TYPE_CLASSES = {
+    "STANDARD": Shipment,
+    "FRAGILE": FragileShipment,
+    "EXPRESS": ExpressShipment,
+}
+
+# Filas por lote al recorrer la tabla con iter_all()/iter_sorted()
+_PAGE_SIZE = 500
+
+_COLUMNS = "tracking_code, sender, recipient, shipment_type, priority, status_log, assigned_route"
+
+_UPSERT = """
+INSERT INTO shipments (key, tracking_code, sender, recipient, shipment_type, priority, status, assigned_route, status_log)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (key) DO UPDATE SET
+    tracking_code = excluded.tracking_code,
+    sender = excluded.sender,
+    recipient = excluded.recipient,
+    shipment_type = excluded.shipment_type,
+    priority = excluded.priority,
+    status = excluded.status,
+    assigned_route = excluded.assigned_route,
+    status_log = excluded.status_log
+"""
+_DELETE = "DELETE FROM shipments WHERE key = ?"
+_SELECT_BY_KEY = f"SELECT {_COLUMNS} FROM shipments WHERE key = ?"
+_SELECT_PAGE = f"SELECT key, {_COLUMNS} FROM shipments WHERE key > ? ORDER BY key LIMIT ?"
+
+
+def _to_row(shipment):
+    """Convierte un envío en la tupla de parámetros de _UPSERT."""
+    return (
+        shipment.tracking_code.lower(),
+        shipment.tracking_code,
+        shipment.sender,
+        shipment.recipient,
+        shipment.shipment_type,
+        shipment.priority,
+        STATUS_CODES[shipment.current_status],
+        shipment.assigned_route,
+        shipment.export_status_log(),
+    )
+
+
+def _hydrate(store, key, row):
+    """
+    Devuelve el envío vivo para la clave o lo reconstruye a partir de la fila.
+
+    La fila sigue el orden de _COLUMNS. Lo comparten los repositorios de centros y
+    rutas para resolver sus envíos a través del mismo mapa de identidad.
+    """
+    with store.lock:
+        shipment = store.shipments.get(key)
+        if shipment is None:
+            code, sender, recipient, shipment_type, priority, status_log, route_id = row
+            shipment = _TYPE_CLASSES[shipment_type].restore(code, sender, recipient, priority, status_log, route_id)
+            store.shipments[key] = shipment
+        return shipment
+
+
+class ShipmentRepositorySqlite(ShipmentRepository):
+    """
+    Implementación SQLite del repositorio de envíos.
+
+    Cumple el contrato ShipmentRepository, por lo que puede sustituir a
+    ShipmentRepositoryMemory sin cambios en los servicios.
+
+    Características:
+        - Búsquedas insensibles a mayúsculas/minúsculas (clave en minúsculas)
+        - add_many() escribe el lote con executemany en una sola transacción
+        - iter_all() e iter_sorted() leen por páginas, sin cargar toda la tabla
+    """
+
+    def __init__(self, store):
+        """
+        Inicializa el repositorio sobre un almacén SQLite.
+
+        Args:
+            store (SqliteStore): Almacén compartido con los repositorios de centros y rutas.
+        """
+        self._store = store
+
+    def add(self, shipment):
+        """
+        Almacena o actualiza un envío en el repositorio.
+
+        Args:
+            shipment (Shipment): Instancia del envío a almacenar. Puede ser Shipment, FragileShipment o ExpressShipment.
+        """
+        self.add_many((shipment,))
+
+    def add_many(self, shipments):
+        """
+        Almacena o actualiza varios envíos en una única transacción.
+
+        Args:
+            shipments (Iterable[Shipment]): Envíos a almacenar.
+        """
+        rows = []
+        with self._store.lock:
+            for shipment in shipments:
+                rows.append(_to_row(shipment))
+                self._store.shipments[rows[-1][0]] = shipment
+
+        if rows:
+            with self._store.transaction() as conn:
+                conn.executemany(_UPSERT, rows)
+
+    def remove(self, tracking_code):
+        """
+        Elimina un envío del repositorio por su código de seguimiento.
+
+        Args:
+            tracking_code (str): Código de seguimiento del envío a eliminar.
+
+        Returns:
+            True si el envío existía y fue eliminado exitosamente, False si el código está vacío o el envío no existe.
+        """
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return False
+
+        key = tracking_code.lower()
+        with self._store.transaction() as conn:
+            removed = conn.execute(_DELETE, (key,)).rowcount > 0
+
+        with self._store.lock:
+            self._store.shipments.pop(key, None)
+        return removed
+
+    def get_by_tracking_code(self, tracking_code):
+        """
+        Recupera un envío por su código de seguimiento único.
+
+        Args:
+            tracking_code (str): Código de seguimiento del envío a buscar.
+
+        Returns:
+            La instancia del envío si se encuentra, None si no existe o el código está vacío.
+        """
+        tracking_code = (tracking_code or "").strip()
+        if not tracking_code:
+            return None
+
+        key = tracking_code.lower()
+        shipment = self._store.shipments.get(key)
+        if shipment is not None:
+            return shipment
+
+        with self._store.connection() as conn:
+            row = conn.execute(_SELECT_BY_KEY, (key,)).fetchone()
+        if row is None:
+            return None
+        return _hydrate(self._store, key, row)
+
+    def get_many(self, tracking_codes):
+        """
+        Recupera varios envíos por su código de seguimiento.
+
+        Los que no están ya en memoria se leen con una consulta IN por cada
+        _PAGE_SIZE códigos, en lugar de una consulta por envío.
+
+        Args:
+            tracking_codes (Iterable[str]): Códigos de seguimiento a buscar.
+
+        Returns:
+            Lista alineada con tracking_codes con el envío encontrado o None.
+        """
+        keys = [(code or "").strip().lower() for code in tracking_codes]
+        found = {}
+        missing = []
+        for key in keys:
+            shipment = self._store.shipments.get(key) if key else None
+            if shipment is not None:
+                found[key] = shipment
+            elif key:
+                missing.append(key)
+
+        for start in range(0, len(missing), _PAGE_SIZE):
+            page = missing[start:start + _PAGE_SIZE]
+            placeholders = ", ".join("?" * len(page))
+            with self._store.connection() as conn:
+                rows = conn.execute(f"SELECT key, {_COLUMNS} FROM shipments WHERE key IN ({placeholders})", page).fetchall()
+            for row in rows:
+                found[row[0]] = _hydrate(self._store, row[0], row[1:])
+
+        return [found.get(key) for key in keys]
+
+    def list_all(self):
+        """
+        Obtiene todos los envíos almacenados en el repositorio.
+
+        Returns:
+            Lista con todos los envíos, ordenados por código de seguimiento.
+        """
+        return list(self.iter_all())
+
+    def iter_all(self):
+        """
+        Itera todos los envíos leyendo la tabla por páginas.
+
+        Returns:
+            Iterador sobre los envíos, ordenados por código de seguimiento. Cada
+            página se lee en una consulta independiente, así que las altas y bajas
+            posteriores al cursor sí se reflejan.
+        """
+        return self.iter_sorted()
+
+    def iter_sorted(self, after=None, limit=None):
+        """
+        Itera los envíos en orden de código de seguimiento (sin distinguir mayúsculas).
+
+        Args:
+            after (str, opcional): Código a partir del cual continuar (excluido).
+            limit (int, opcional): Número máximo de envíos a devolver.
+
+        Returns:
+            Iterador sobre los envíos ordenados; lee la tabla por páginas.
+        """
+        cursor = (after or "").lower()
+        remaining = limit
+
+        while remaining is None or remaining > 0:
+            size = _PAGE_SIZE if remaining is None else min(_PAGE_SIZE, remaining)
+            with self._store.connection() as conn:
+                rows = conn.execute(_SELECT_PAGE, (cursor, size)).fetchall()
+
+            for row in rows:
+                yield _hydrate(self._store, row[0], row[1:])
+
+            if len(rows) < size:
+                return
+            cursor = rows[-1][0]
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def find(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Devuelve los envíos que cumplen todos los filtros indicados.
+
+        Args:
+            status (str, opcional): Estado actual (REGISTERED, IN_TRANSIT, DELIVERED).
+            route_id (str, opcional): ID de la ruta asignada.
+            priority (int, opcional): Prioridad (1, 2 o 3).
+            shipment_type (str, opcional): Tipo de envío (STANDARD, FRAGILE, EXPRESS).
+
+        Returns:
+            Lista de los envíos que cumplen los filtros, ordenados por código.
+        """
+        where, params = self._where(status, route_id, priority, shipment_type)
+        if where is None:
+            return []
+
+        with self._store.connection() as conn:
+            rows = conn.execute(f"SELECT key, {_COLUMNS} FROM shipments{where} ORDER BY key", params).fetchall()
+        return [_hydrate(self._store, row[0], row[1:]) for row in rows]
+
+    def count(self, status=None, route_id=None, priority=None, shipment_type=None):
+        """
+        Cuenta los envíos que cumplen todos los filtros indicados, sin cargarlos.
+
+        Args:
+            Los mismos que find().
+
+        Returns:
+            int: Número de envíos que cumplen los filtros.
+        """
+        where, params = self._where(status, route_id, priority, shipment_type)
+        if where is None:
+            return 0
+
+        with self._store.connection() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM shipments{where}", params).fetchone()[0]
+
+    def _where(self, status, route_id, priority, shipment_type):
+        """
+        Construye la cláusula WHERE y sus parámetros para los filtros indicados.
+
+        Returns:
+            (str, list): Cláusula (vacía si no hay filtros) y parámetros, o (None, None)
+            si algún filtro no puede cumplirse (p. ej. un estado desconocido).
+        """
+        conditions = []
+        params = []
+
+        if status is not None:
+            code = STATUS_CODES.get(status.upper())
+            if code is None:
+                return None, None
+            conditions.append("status = ?")
+            params.append(code)
+
+        if route_id is not None:
+            conditions.append("assigned_route = ?")
+            params.append(route_id)
+
+        if priority is not None:
+            conditions.append("priority = ?")
+            params.append(priority)
+
+        if shipment_type is not None:
+            conditions.append("shipment_type = ?")
+            params.append(shipment_type.upper())
+
+        if not conditions:
+            return "", params
+        return " WHERE " + " AND ".join(conditions), params
@@ -0,0 +1,340 @@
+# infrastructure/sqlite_store.py
+"""
+Almacén SQLite compartido por los repositorios persistentes.
+
+Agrupa lo que los tres repositorios SQLite (envíos, centros y rutas) necesitan
+compartir para que los agregados sigan siendo coherentes entre sí:
+
+- Un pool pequeño de conexiones para llamadas desde varios hilos
+- El esquema (tablas e índices) y la configuración (WAL, synchronous=NORMAL)
+- Mapas de identidad: cada envío, centro o ruta cargado existe una sola vez en
+  memoria, de modo que una ruta, su centro de origen y el repositorio de envíos
+  comparten el mismo objeto Shipment (igual que con los repositorios en memoria)
+- Las altas y bajas de inventarios y rutas desde el último guardado, anotadas por
+  un observador del agregado, para escribir solo esas diferencias al guardarlo
+
+Las sentencias SQL son constantes de módulo: sqlite3 las compila una vez por
+conexión y las reutiliza desde su caché de sentencias preparadas.
+
+Attributes:
+    shipments, centers, routes (WeakValueDictionary): Mapas de identidad por clave
+    en minúsculas. Son débiles para no retener en memoria lo que nadie usa.
+"""
+
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shipments (
+    key TEXT PRIMARY KEY,
+    tracking_code TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    shipment_type TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    status INTEGER NOT NULL,
+    assigned_route TEXT,
+    status_log BLOB NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shipments_by_status ON shipments (status, priority);
+CREATE INDEX IF NOT EXISTS shipments_by_route ON shipments (assigned_route);
+CREATE INDEX IF NOT EXISTS shipments_by_type ON shipments (shipment_type, status);
+
+CREATE TABLE IF NOT EXISTS centers (
+    key TEXT PRIMARY KEY,
+    center_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    location TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS center_inventory (
+    center_key TEXT NOT NULL,
+    shipment_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (center_key, shipment_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS center_inventory_by_seq ON center_inventory (center_key, seq);
+
+CREATE TABLE IF NOT EXISTS routes (
+    key TEXT PRIMARY KEY,
+    route_id TEXT NOT NULL,
+    origin_key TEXT NOT NULL,
+    destination_key TEXT NOT NULL,
+    active INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS routes_by_origin ON routes (origin_key);
+CREATE INDEX IF NOT EXISTS routes_by_destination ON routes (destination_key);
+
+CREATE TABLE IF NOT EXISTS route_shipments (
+    route_key TEXT NOT NULL,
+    shipment_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (route_key, shipment_key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS route_shipments_by_seq ON route_shipments (route_key, seq);
+"""
+
+
+
+class _Membership:
+    """
+    Pertenencia de un centro o ruta a la base: siguiente seq y cambios sin escribir.
+
+    Attributes:
+        next_seq (int): Siguiente número de secuencia libre para el agregado.
+        pending (dict): Clave de envío -> (presente, marca), en orden de cambio. La
+            marca distingue dos cambios del mismo envío al confirmar la escritura.
+        cleared (bool): La ruta se completó y vació su lista: hay que borrar toda la
+            pertenencia persistida antes de aplicar lo pendiente.
+    """
+
+    __slots__ = ("next_seq", "pending", "cleared", "_stamp")
+
+    def __init__(self, next_seq=0, keys=()):
+        self.next_seq = next_seq
+        self.pending = {}
+        self.cleared = False
+        self._stamp = 0
+        for key in keys:
+            self._mark(key, True)
+
+    def observe(self, aggregate, attribute, old, new):
+        """Observador del agregado: anota entradas y salidas de envíos."""
+        if attribute in ("inventory", "shipments"):
+            if old is not None:
+                self._mark(old.lower(), False)
+            if new is not None:
+                self._mark(new.lower(), True)
+        elif attribute == "active" and not new:
+            # complete_route() sustituye la lista sin notificar cada envío
+            self.pending.clear()
+            self.cleared = True
+
+    def _mark(self, key, present):
+        self._stamp += 1
+        # Al final del orden: una nueva entrada recibe la siguiente seq
+        self.pending.pop(key, None)
+        self.pending[key] = (present, self._stamp)
+
+class SqliteStore:
+    """
+    Base de datos SQLite con pool de conexiones y mapas de identidad compartidos.
+
+    Una misma instancia debe pasarse a los tres repositorios SQLite.
+
+    Características:
+        - Modo WAL: los lectores no bloquean al escritor ni viceversa
+        - Pool de conexiones reutilizables entre hilos
+        - Transacciones anidables: dentro de transaction(), las llamadas del mismo
+          hilo reutilizan la conexión abierta y se confirman juntas
+
+    Notes:
+        Con path=":memory:" cada conexión vería una base distinta, así que el pool
+        se limita a una única conexión compartida.
+    """
+
+    def __init__(self, path, pool_size=4):
+        """
+        Abre (o crea) la base de datos y garantiza el esquema.
+
+        Args:
+            path (str): Ruta del fichero de base de datos, o ":memory:".
+            pool_size (int, opcional): Número máximo de conexiones abiertas. Por defecto 4.
+
+        Raises:
+            ValueError: Si pool_size es menor que 1.
+        """
+        if pool_size < 1:
+            raise ValueError("El pool debe tener al menos una conexión.")
+
+        self._path = path
+        self._pool_size = 1 if path == ":memory:" else pool_size
+        self._pool = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self._local = threading.local()
+
+        # Protege mapas de identidad y pertenencias persistidas frente a hilos concurrentes
+        self.lock = threading.RLock()
+        self.shipments = weakref.WeakValueDictionary()
+        self.centers = weakref.WeakValueDictionary()
+        self.routes = weakref.WeakValueDictionary()
+
+        # Agregado -> _Membership: siguiente seq y cambios de pertenencia sin escribir
+        self.saved_members = weakref.WeakKeyDictionary()
+
+        with self.connection() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def connection(self):
+        """
+        Presta una conexión del pool durante el bloque with.
+
+        Si el hilo está dentro de transaction(), devuelve la conexión de esa
+        transacción para que las lecturas vean sus propias escrituras.
+        """
+        current = getattr(self._local, "conn", None)
+        if current is not None:
+            yield current
+            return
+
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    @contextmanager
+    def transaction(self):
+        """
+        Ejecuta el bloque with en una transacción (todo o nada).
+
+        Las transacciones anidadas en el mismo hilo se unen a la exterior, de modo
+        que varias escrituras de distintos repositorios pueden confirmarse juntas.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield self._local.conn
+            return
+
+        with self.connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+            finally:
+                self._local.conn = None
+
+    def track_members(self, aggregate, next_seq=0, keys=()):
+        """
+        Empieza a anotar los cambios de pertenencia de un centro o ruta.
+
+        Se suscribe como observador del agregado: cada entrada o salida de un envío
+        queda anotada en O(1), y guardar el agregado escribe solo esas anotaciones
+        en lugar de recorrer y comparar todos sus envíos.
+
+        Args:
+            aggregate (Center | Route): Agregado cargado de la base o guardado por primera vez.
+            next_seq (int, opcional): Siguiente número de secuencia libre en la base.
+            keys (Iterable[str], opcional): Claves de envíos que aún no están en la base.
+
+        Returns:
+            _Membership: Las anotaciones del agregado.
+        """
+        membership = _Membership(next_seq, keys)
+        self.forget_members(aggregate)
+        self.saved_members[aggregate] = membership
+        aggregate.add_observer(membership.observe)
+        return membership
+
+    def forget_members(self, aggregate):
+        """Deja de anotar los cambios de pertenencia de un agregado."""
+        membership = self.saved_members.pop(aggregate, None)
+        if membership is not None:
+            aggregate.remove_observer(membership.observe)
+
+    def member_changes(self, aggregate, members):
+        """
+        Calcula qué filas de pertenencia hay que insertar y borrar para un agregado.
+
+        Solo recorre los cambios anotados desde el último guardado: guardar un centro
+        con miles de envíos tras recibir uno cuesta O(1). Un agregado que aún no se
+        sigue (nuevo) se recorre entero una vez con members().
+
+        Args:
+            aggregate (Center | Route): Agregado a guardar.
+            members (Callable): Devuelve las claves de sus envíos actuales, en orden;
+                solo se llama si el agregado aún no se sigue.
+
+        Returns:
+            Tuple[bool, list, list, tuple]: (borrar antes toda la pertenencia, altas como
+            pares (clave, seq), bajas como claves, estado a registrar con
+            remember_members() tras confirmar la escritura).
+        """
+        membership = self.saved_members.get(aggregate)
+        if membership is None:
+            membership = self.track_members(aggregate, 0, members())
+
+        next_seq = membership.next_seq
+        written = list(membership.pending.items())
+        added = []
+        removed = []
+        for key, entry in written:
+            if entry[0]:
+                added.append((key, next_seq))
+                next_seq += 1
+            else:
+                removed.append(key)
+        return membership.cleared, added, removed, (membership, written, next_seq)
+
+    def remember_members(self, aggregate, state):
+        """Da por escritos los cambios devueltos por member_changes() (ver member_changes())."""
+        membership, written, next_seq = state
+        membership.next_seq = next_seq
+        membership.cleared = False
+        pending = membership.pending
+        for key, entry in written:
+            # Un cambio posterior del mismo envío sigue pendiente
+            if pending.get(key) is entry:
+                del pending[key]
+
+    def clear_identity(self):
+        """
+        Olvida los agregados cargados y su pertenencia persistida.
+
+        Tras deshacer una transacción, los objetos en memoria pueden tener cambios
+        que ya no están en la base; vaciar los mapas de identidad obliga a que la
+        siguiente lectura los cargue de nuevo tal como quedaron persistidos.
+        """
+        with self.lock:
+            self.shipments.clear()
+            self.centers.clear()
+            self.routes.clear()
+            for aggregate in list(self.saved_members.keys()):
+                self.forget_members(aggregate)
+
+    def close(self):
+        """Cierra las conexiones libres del pool."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+
+    def _acquire(self):
+        """Obtiene una conexión libre, abriendo una nueva si el pool no está completo."""
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if self._opened < self._pool_size:
+                self._opened += 1
+                return self._connect()
+
+        # Pool completo: esperar a que otro hilo devuelva una conexión
+        return self._pool.get()
+
+    def _connect(self):
+        """Abre y configura una conexión nueva."""
+        # isolation_level=None: las transacciones se controlan explícitamente con transaction()
+        conn = sqlite3.connect(
+            self._path,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
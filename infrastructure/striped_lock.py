@@ -0,0 +1,155 @@
+# infrastructure/striped_lock.py
+"""
+Bloqueo por franjas (lock striping) para envíos, centros y rutas.
+
+En lugar de un cerrojo global o uno por objeto, hay un número fijo de cerrojos
+(franjas) y cada agregado usa el de la franja que le toca por el hash de su
+clave. Dos hilos que escriben en envíos distintos casi nunca comparten franja,
+así que no compiten, y la memoria no depende del número de agregados.
+
+Las operaciones que tocan varios agregados (despachar una ruta toca la ruta, sus
+centros y todos sus envíos) toman todas sus franjas de una vez con hold(), siempre
+en orden creciente de índice. Como todos los hilos respetan el mismo orden, no
+puede formarse un ciclo de espera: no hay interbloqueos.
+
+Los cerrojos son reentrantes: un repositorio puede tomar la franja de un envío
+que el servicio que lo llama ya tiene tomada.
+
+AsyncStripedLock aplica el mismo reparto con cerrojos de asyncio para los
+servicios asíncronos, que comparten un único hilo pero se intercalan en cada await.
+"""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+
+
+class _Striping:
+    """Reparto de claves en franjas, común a las variantes con hilos y con asyncio."""
+
+    def __init__(self, stripes, make_lock):
+        if stripes < 1:
+            raise ValueError("Debe haber al menos una franja de bloqueo.")
+        self._locks = tuple(make_lock() for _ in range(stripes))
+
+    @property
+    def stripes(self):
+        """Número de franjas."""
+        return len(self._locks)
+
+    def shipment_stripe(self, tracking_code):
+        """Índice de la franja de un envío (código sin distinguir mayúsculas)."""
+        return hash(("shipment", str(tracking_code or "").strip().lower())) % len(self._locks)
+
+    def center_stripe(self, center_id):
+        """Índice de la franja de un centro."""
+        return hash(("center", str(center_id or "").strip().lower())) % len(self._locks)
+
+    def route_stripe(self, route_id):
+        """Índice de la franja de una ruta."""
+        return hash(("route", str(route_id or "").strip().lower())) % len(self._locks)
+
+    def stripe(self, index):
+        """Cerrojo de una franja."""
+        return self._locks[index]
+
+    def _indexes(self, shipments, centers, routes):
+        """Índices de franja de los agregados indicados, sin repetir y en orden creciente."""
+        indexes = {self.shipment_stripe(code) for code in shipments}
+        indexes.update(self.center_stripe(center_id) for center_id in centers)
+        indexes.update(self.route_stripe(route_id) for route_id in routes)
+        return sorted(indexes)
+
+
+class StripedLock(_Striping):
+    """
+    Conjunto fijo de cerrojos reentrantes repartidos por hash de clave.
+
+    Una misma instancia debe compartirse entre los servicios y el repositorio de
+    envíos por franjas (ver concurrent_memory.py) para que ambos usen las mismas
+    franjas.
+
+    Notes:
+        hold() anidados en el mismo hilo solo son seguros si el bloque interior no
+        añade franjas nuevas: una franja tomada después de otras de índice mayor
+        rompería el orden global.
+    """
+
+    def __init__(self, stripes=64):
+        """
+        Args:
+            stripes (int, opcional): Número de franjas. Por defecto 64.
+
+        Raises:
+            ValueError: Si stripes es menor que 1.
+        """
+        super().__init__(stripes, threading.RLock)
+
+    @contextmanager
+    def hold(self, shipments=(), centers=(), routes=()):
+        """
+        Toma las franjas de todos los agregados indicados durante el bloque with.
+
+        Args:
+            shipments (Iterable[str]): Códigos de seguimiento.
+            centers (Iterable[str]): IDs de centros.
+            routes (Iterable[str]): IDs de rutas.
+        """
+        yield from self._hold_indexes(self._indexes(shipments, centers, routes))
+
+    @contextmanager
+    def hold_stripes(self, indexes):
+        """Toma un conjunto de franjas por índice, en orden creciente."""
+        yield from self._hold_indexes(sorted(set(indexes)))
+
+    def _hold_indexes(self, indexes):
+        """Generador común: adquiere en orden, cede el control y libera en orden inverso."""
+        acquired = []
+        try:
+            for index in indexes:
+                lock = self._locks[index]
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+
+
+class AsyncStripedLock(_Striping):
+    """
+    Franjas de cerrojos de asyncio para los servicios asíncronos.
+
+    Protegen las secciones de comprobar y modificar que incluyen un await (p. ej.
+    leer un envío del repositorio, validarlo y guardarlo): otra corrutina podría
+    intercalarse entre la lectura y la escritura. Se toman en orden creciente de
+    índice, igual que StripedLock.
+
+    Notes:
+        Los cerrojos de asyncio no son reentrantes: una corrutina no debe volver a
+        pedir una franja que ya tiene.
+    """
+
+    def __init__(self, stripes=64):
+        """
+        Args:
+            stripes (int, opcional): Número de franjas. Por defecto 64.
+
+        Raises:
+            ValueError: Si stripes es menor que 1.
+        """
+        super().__init__(stripes, asyncio.Lock)
+
+    @asynccontextmanager
+    async def hold(self, shipments=(), centers=(), routes=()):
+        """Toma las franjas de todos los agregados indicados durante el bloque async with."""
+        acquired = []
+        try:
+            for index in self._indexes(shipments, centers, routes):
+                lock = self._locks[index]
+                await lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
@@ -3,6 +3,7 @@
 from logistica.application.shipment_service import ShipmentService
 from logistica.application.route_service import RouteService
 from logistica.application.center_service import CenterService
+from logistica.application.unit_of_work import UnitOfWork
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
 from logistica.infrastructure.seed_data import seed_repository
 
@@ -28,21 +29,27 @@ def mostrar_menu():
     print("14. Asignar varios envíos a una ruta")
     print("15. Despachar ruta")
     print("16. Completar ruta")
-    print("\n17. Salir")
+    print("17. Buscar camino entre centros")
+    print("\n18. Salir")
 
 
 def main():
     repos = seed_repository()
 
-    shipment_service = ShipmentService(repos["shipments"])
+    # Unidad de trabajo compartida: cada opción del menú escribe una vez al terminar
+    uow = UnitOfWork(repos["shipments"], repos["centers"], repos["routes"])
+
+    shipment_service = ShipmentService(uow.shipments, uow=uow)
     route_service = RouteService(
-        repos["routes"],
-        repos["shipments"],
-        repos["centers"]
+        uow.routes,
+        uow.shipments,
+        uow.centers,
+        uow=uow
     )
     center_service = CenterService(
-        repos["centers"],
-        repos["routes"]
+        uow.centers,
+        uow.shipments,
+        uow=uow
     )
 
     while True:
@@ -98,8 +105,7 @@ def main():
 
 
             elif opcion == "7":
-                envios = shipment_service.list_shipments()
-                for code, status, priority, s_type, route in envios:
+                for code, status, priority, s_type, route in shipment_service.iter_shipments():
                     route_str = route or "(sin ruta)"
                     print(f"- {code:<10} | {status:^13} | P:{priority:<2} | {s_type:<10} | Ruta: {route_str}")
 
@@ -132,15 +138,13 @@ def main():
 
 
             elif opcion == "10":
-                centers = center_service.list_centers()
-
-                for c_id, c_name, c_location in centers:
+                for c_id, c_name, c_location in center_service.iter_centers():
                     print(f"- {c_id:<8} | {c_name:^30} | Ubicación: {c_location}")
 
 
             elif opcion == "11":
                 center_id = input("Identificador del centro logístico: ").strip()
-                shipments_in_center = center_service.list_shipments_in_center(center_id)
+                shipments_in_center = center_service.iter_shipments_in_center(center_id)
 
                 print(f"\n=== Envios en el Centro {center_id.upper()} ===")
 
@@ -158,9 +162,7 @@ def main():
 
 
             elif opcion == "13":
-                routes = route_service.list_routes()
-
-                for route_id, origin_center_id, destination_center_id, status in routes:
+                for route_id, origin_center_id, destination_center_id, status in route_service.iter_routes():
                     print(f"- {route_id:<18} | Origen: {origin_center_id:<8} | Destino: {destination_center_id:<8} | Estado: {status:^13}")
 
 
@@ -173,14 +175,7 @@ def main():
                     if code.strip()
                 ]
 
-                assigned, failed = [], []
-
-                for tracking_code in tracking_codes:
-                    try:
-                        route_service.assign_shipment_to_route(tracking_code, route_id)
-                        assigned.append(tracking_code)
-                    except ValueError as e:
-                        failed.append((tracking_code, str(e)))
+                assigned, failed = route_service.assign_shipments_to_route(route_id, tracking_codes)
 
                 print("\n=== Resumen de asignación ===")
 
@@ -207,6 +202,16 @@ def main():
 
 
             elif opcion == "17":
+                origin_center_id = input("Identificador del centro de origen: ").strip()
+                destination_center_id = input("Identificador del centro de destino: ").strip()
+
+                cost, route_ids = route_service.find_path(origin_center_id, destination_center_id)
+                print(f"✔ Camino de {len(route_ids)} tramo(s), coste {cost}:")
+                for i, route_id in enumerate(route_ids, start=1):
+                    print(f"  {i}. {route_id}")
+
+
+            elif opcion == "18":
                 print("Hasta luego.")
                 break
 
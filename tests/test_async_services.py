@@ -0,0 +1,96 @@
+# tests/test_async_services.py
+
+import asyncio
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from logistica.application.async_services import AsyncShipmentService, AsyncCenterService, AsyncRouteService
+from logistica.infrastructure.async_memory import (
+    AsyncShipmentRepositoryAdapter, AsyncCenterRepositoryAdapter, AsyncRouteRepositoryAdapter,
+)
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.striped_lock import AsyncStripedLock
+
+
+class _SlowShipments(AsyncShipmentRepositoryAdapter):
+    """Adaptador que cede el bucle en cada lectura, como un almacén remoto."""
+
+    async def get_by_tracking_code(self, tracking_code):
+        shipment = await super().get_by_tracking_code(tracking_code)
+        await asyncio.sleep(0)
+        return shipment
+
+
+class TestAsyncServices(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.shipment_repo = ShipmentRepositoryMemory()
+        self.center_repo = CenterRepositoryMemory()
+        self.route_repo = RouteRepositoryMemory()
+        self.locks = AsyncStripedLock(16)
+        shipments = _SlowShipments(self.shipment_repo)
+        centers = AsyncCenterRepositoryAdapter(self.center_repo)
+        routes = AsyncRouteRepositoryAdapter(self.route_repo)
+        self.shipments = AsyncShipmentService(shipments, locks=self.locks)
+        self.centers = AsyncCenterService(centers, shipments, locks=self.locks)
+        self.routes = AsyncRouteService(routes, shipments, centers, locks=self.locks)
+
+    async def test_register_and_lookup(self):
+        await self.shipments.register_shipment("ABC123", "A", "B", 2, "fragile")
+
+        shipment = await self.shipments.get_shipment("abc123")
+        self.assertEqual(shipment.shipment_type, "FRAGILE")
+        self.assertEqual(await self.shipments.list_shipments(), [("ABC123", "REGISTERED", 2, "FRAGILE", None)])
+        with self.assertRaises(ValueError) as cm:
+            await self.shipments.get_shipment("XYZ789")
+        self.assertIn("No existe el envío", str(cm.exception))
+
+    async def test_concurrent_duplicate_registration_keeps_one(self):
+        results = await asyncio.gather(
+            *(self.shipments.register_shipment("ABC123", f"R{i}", "D") for i in range(5)),
+            return_exceptions=True,
+        )
+
+        self.assertEqual(sum(result is None for result in results), 1)
+        self.assertTrue(all(isinstance(r, ValueError) for r in results if r is not None))
+        self.assertEqual(self.shipment_repo.count(), 1)
+
+    async def test_concurrent_priority_updates_are_not_lost(self):
+        for code in ("ABC123", "XYZ789"):
+            await self.shipments.register_shipment(code, "A", "B")
+
+        await asyncio.gather(*(self.shipments.increase_shipment_priority(code) for code in ("ABC123", "XYZ789") * 2))
+
+        self.assertEqual(self.shipment_repo.count(priority=3), 2)
+
+    async def test_route_lifecycle(self):
+        await self.centers.register_center("MAD01", "Madrid", "Calle A")
+        await self.centers.register_center("BCN02", "Barcelona", "Calle B")
+        await self.routes.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        await asyncio.gather(*(self.shipments.register_shipment(f"ABC{i:03d}", "A", "B") for i in range(10)))
+
+        await asyncio.gather(*(self.routes.assign_shipment_to_route(f"ABC{i:03d}", "MAD01-BCN02-STD-001") for i in range(10)))
+        self.assertEqual(len(await self.centers.list_shipments_in_center("MAD01")), 10)
+
+        await self.routes.dispatch_route("MAD01-BCN02-STD-001")
+        await self.routes.complete_route("MAD01-BCN02-STD-001")
+
+        self.assertEqual(self.shipment_repo.count(status="DELIVERED"), 10)
+        self.assertEqual(len(await self.centers.list_shipments_in_center("BCN02")), 10)
+        self.assertEqual(await self.routes.list_routes(), [("MAD01-BCN02-STD-001", "MAD01", "BCN02", "Finalizada")])
+        with self.assertRaises(ValueError) as cm:
+            await self.routes.complete_route("MAD01-BCN02-STD-001")
+        self.assertIn("ya se encuentra finalizada", str(cm.exception))
+
+    async def test_adapter_runs_blocking_repositories_in_executor(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            service = AsyncShipmentService(AsyncShipmentRepositoryAdapter(self.shipment_repo, executor))
+            await service.register_shipment("ABC123", "A", "B")
+            found = await service.get_shipments(["ABC123", "XYZ789"])
+
+        self.assertEqual(found[0].tracking_code, "ABC123")
+        self.assertIsNone(found[1])
+
+if __name__ == '__main__':
+    unittest.main()
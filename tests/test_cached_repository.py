@@ -0,0 +1,121 @@
+# tests/test_cached_repository.py
+
+import unittest
+from logistica.application.shipment_service import ShipmentService
+from logistica.domain.center import Center
+from logistica.domain.shipment import Shipment
+from logistica.infrastructure.cached_repository import CachedShipmentRepository, CachedCenterRepository
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+
+
+class _CountingShipments(ShipmentRepositoryMemory):
+    """Repositorio en memoria que cuenta las lecturas por código."""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+
+    def get_by_tracking_code(self, tracking_code):
+        self.reads += 1
+        return super().get_by_tracking_code(tracking_code)
+
+    def get_many(self, tracking_codes):
+        self.reads += 1
+        return [super(_CountingShipments, self).get_by_tracking_code(code) for code in tracking_codes]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachedShipmentRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.inner = _CountingShipments()
+        self.inner.add(Shipment("ABC123", "A", "B"))
+        self.inner.add(Shipment("XYZ789", "C", "D"))
+        self.clock = _Clock()
+        self.repo = CachedShipmentRepository(self.inner, maxsize=2, ttl=60, negative_ttl=5, clock=self.clock)
+
+    def test_read_through_and_counters(self):
+        first = self.repo.get_by_tracking_code("ABC123")
+        second = self.repo.get_by_tracking_code(" abc123 ")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.inner.reads, 1)
+        self.assertEqual((self.repo.hits, self.repo.misses), (1, 1))
+
+    def test_negative_caching_with_its_own_ttl(self):
+        self.assertIsNone(self.repo.get_by_tracking_code("NOP000"))
+        self.assertIsNone(self.repo.get_by_tracking_code("NOP000"))
+        self.assertEqual(self.inner.reads, 1)
+
+        self.clock.now = 6
+        self.repo.get_by_tracking_code("NOP000")
+        self.assertEqual(self.inner.reads, 2)
+
+    def test_ttl_expires_entries(self):
+        self.repo.get_by_tracking_code("ABC123")
+        self.clock.now = 61
+        self.repo.get_by_tracking_code("ABC123")
+        self.assertEqual(self.inner.reads, 2)
+
+    def test_lru_evicts_least_recently_used(self):
+        self.repo.get_by_tracking_code("ABC123")
+        self.repo.get_by_tracking_code("XYZ789")
+        self.repo.get_by_tracking_code("ABC123")
+        self.repo.get_by_tracking_code("NOP000")
+
+        self.assertEqual(self.repo.evictions, 1)
+        self.repo.get_by_tracking_code("ABC123")
+        self.assertEqual(self.inner.reads, 3)
+        self.repo.get_by_tracking_code("XYZ789")
+        self.assertEqual(self.inner.reads, 4)
+
+    def test_write_through_replaces_negative_entry_and_remove_invalidates(self):
+        self.assertIsNone(self.repo.get_by_tracking_code("NEW123"))
+        shipment = Shipment("NEW123", "A", "B")
+        self.repo.add(shipment)
+        self.assertIs(self.repo.get_by_tracking_code("NEW123"), shipment)
+
+        self.assertTrue(self.repo.remove("new123"))
+        self.assertIsNone(self.repo.get_by_tracking_code("NEW123"))
+        self.assertEqual(self.inner.reads, 2)
+
+    def test_get_many_loads_only_missing_codes(self):
+        self.repo.get_by_tracking_code("ABC123")
+        found = self.repo.get_many(["ABC123", "XYZ789", "NOP000"])
+
+        self.assertEqual([s and s.tracking_code for s in found], ["ABC123", "XYZ789", None])
+        self.assertEqual(self.inner.reads, 2)
+
+    def test_service_works_over_cache(self):
+        service = ShipmentService(CachedShipmentRepository(ShipmentRepositoryMemory()))
+        service.register_shipment("DEF456", "A", "B")
+        service.update_shipment_status("DEF456", "IN_TRANSIT")
+        self.assertEqual(service.get_shipment("DEF456").current_status, "IN_TRANSIT")
+
+        with self.assertRaises(ValueError):
+            CachedShipmentRepository(ShipmentRepositoryMemory(), maxsize=0)
+
+
+class TestCachedCenterRepository(unittest.TestCase):
+
+    def test_center_read_through(self):
+        inner = CenterRepositoryMemory()
+        repo = CachedCenterRepository(inner)
+        self.assertIsNone(repo.get_by_center_id("MAD01"))
+
+        center = Center("MAD01", "Madrid", "Calle A")
+        repo.add(center)
+        self.assertIs(repo.get_by_center_id("mad01"), center)
+        self.assertEqual((repo.hits, repo.misses), (1, 1))
+        self.assertEqual(repo.list_all(), [center])
+
+if __name__ == '__main__':
+    unittest.main()
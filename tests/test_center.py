@@ -1,9 +1,10 @@
 # tests/test_center.py
 
 import unittest
-from logistica.domain.center import Center
+from logistica.domain.center import Center, QUEUE
 from logistica.domain.shipment import Shipment
 from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
 
 class TestCenter(unittest.TestCase):
 
@@ -60,11 +61,215 @@ class TestCenter(unittest.TestCase):
         self.assertTrue(self.center.has_shipment("ABC123"))
         self.assertFalse(self.center.has_shipment("NONEXISTENT"))
 
+    def test_receive_many(self):
+        accepted, rejected = self.center.receive_many([self.shipment1, self.shipment2])
+        self.assertEqual(accepted, ["ABC123", "FRG123"])
+        self.assertEqual(rejected, [])
+        self.assertEqual(self.center.list_shipments(), [self.shipment1, self.shipment2])
+
+    def test_receive_many_rejects_whole_batch(self):
+        self.center.receive_shipment(self.shipment1)
+        accepted, rejected = self.center.receive_many([self.shipment2, self.shipment1, "not a shipment"])
+        self.assertEqual(accepted, [])
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(rejected[0][0], "ABC123")
+        # Nada del lote se aplica
+        self.assertFalse(self.center.has_shipment("FRG123"))
+
+    def test_receive_many_duplicate_in_batch(self):
+        accepted, rejected = self.center.receive_many([self.shipment1, self.shipment1])
+        self.assertEqual(accepted, [])
+        self.assertEqual(rejected, [("ABC123", "El envío ya se encuentra en el centro.")])
+
+    def test_dispatch_many(self):
+        self.center.receive_many([self.shipment1, self.shipment2])
+        accepted, rejected = self.center.dispatch_many([self.shipment1, self.shipment2])
+        self.assertEqual(accepted, ["ABC123", "FRG123"])
+        self.assertEqual(rejected, [])
+        self.assertEqual(self.shipment2.current_status, "IN_TRANSIT")
+        self.assertEqual(self.center.list_shipments(), [])
+
+    def test_dispatch_many_rejects_whole_batch(self):
+        self.center.receive_shipment(self.shipment1)
+        accepted, rejected = self.center.dispatch_many([self.shipment1, self.shipment2])
+        self.assertEqual(accepted, [])
+        self.assertEqual([code for code, _ in rejected], ["FRG123"])
+        # El envío válido no cambia de estado ni sale del centro
+        self.assertEqual(self.shipment1.current_status, "REGISTERED")
+        self.assertTrue(self.center.has_shipment("ABC123"))
+
+    def test_dispatch_many_invalid_transition(self):
+        self.shipment1.update_status("IN_TRANSIT")
+        self.center.receive_shipment(self.shipment1)
+        accepted, rejected = self.center.dispatch_many([self.shipment1])
+        self.assertEqual(accepted, [])
+        self.assertIn("Transición no permitida", rejected[0][1])
+
+    def test_list_shipments_keeps_arrival_order(self):
+        shipment3 = Shipment("XYZ789", "E", "F", 1)
+        self.center.receive_shipment(self.shipment2)
+        self.center.receive_shipment(self.shipment1)
+        self.center.receive_shipment(shipment3)
+        self.center.dispatch_shipment(self.shipment1)
+        codes = [s.tracking_code for s in self.center.list_shipments()]
+        self.assertEqual(codes, ["FRG123", "XYZ789"])
+
+    def test_iter_shipments_is_snapshot(self):
+        self.center.receive_shipment(self.shipment1)
+        iterator = self.center.iter_shipments()
+        # Cambios durante la iteración no afectan a la instantánea ni la invalidan
+        self.center.receive_shipment(self.shipment2)
+        self.center.dispatch_shipment(self.shipment1)
+        self.assertEqual(list(iterator), [self.shipment1])
+        self.assertEqual(list(self.center.iter_shipments()), [self.shipment2])
+
     def test_list_shipments_returns_copy(self):
         self.center.receive_shipment(self.shipment1)
         lista = self.center.list_shipments()
         lista.append(self.shipment2)  # modificar copia
         self.assertEqual(len(self.center.list_shipments()), 1)  # original no se afecta
 
+
+class TestCenterCapacity(unittest.TestCase):
+
+    def shipments(self, n, cls=Shipment, prefix="STD"):
+        return [cls(f"{prefix}{i:03d}", "A", "B") for i in range(n)]
+
+    def test_reject_when_full_and_counters(self):
+        center = Center("MAD01", "Madrid", "Calle A", capacity=2, type_capacity={"fragile": 1})
+        standard = self.shipments(2)
+        fragile = FragileShipment("FRG001", "A", "B", 2)
+
+        center.receive_shipment(fragile)
+        with self.assertRaises(ValueError) as cm:
+            center.receive_shipment(FragileShipment("FRG002", "A", "B", 2))
+        self.assertEqual(str(cm.exception), "El centro 'MAD01' no tiene plazas libres para envíos FRAGILE.")
+        center.receive_shipment(standard[0])
+        with self.assertRaises(ValueError):
+            center.receive_shipment(standard[1])
+
+        self.assertEqual((center.occupancy, center.free_slots(), center.utilization()), (2, 0, 1.0))
+        self.assertEqual(center.occupancy_by_type(), {"STANDARD": 1, "FRAGILE": 1, "EXPRESS": 0})
+
+        center.dispatch_shipment(fragile)
+        self.assertEqual((center.free_slots("FRAGILE"), center.utilization("fragile")), (1, 0.0))
+
+    def test_receive_many_rejects_only_overflow_and_applies_nothing(self):
+        center = Center("MAD01", "Madrid", "Calle A", capacity=2)
+        accepted, rejected = center.receive_many(self.shipments(3))
+
+        self.assertEqual(accepted, [])
+        self.assertEqual([code for code, _ in rejected], ["STD002"])
+        self.assertEqual(center.occupancy, 0)
+
+    def test_queue_admits_in_arrival_order_when_slots_free(self):
+        center = Center("MAD01", "Madrid", "Calle A", capacity=2, type_capacity={"EXPRESS": 1}, admission=QUEUE)
+        express = self.shipments(2, ExpressShipment, "EXP")
+        standard = self.shipments(2)
+
+        accepted, _ = center.receive_many([express[0], express[1], standard[0], standard[1]])
+        self.assertEqual(len(accepted), 4)
+        self.assertEqual([s.tracking_code for s in center.list_shipments()], ["EXP000", "STD000"])
+        self.assertEqual([s.tracking_code for s in center.list_waiting()], ["EXP001", "STD001"])
+        self.assertTrue(center.is_waiting("STD001"))
+
+        # El express en cola no cabe por su límite de tipo, pero no bloquea al estándar
+        center.dispatch_shipment(standard[0])
+        self.assertEqual([s.tracking_code for s in center.list_waiting()], ["EXP001"])
+        self.assertTrue(center.has_shipment("STD001"))
+        # Al salir el otro express, entra el que esperaba
+        center.dispatch_shipment(express[0])
+        self.assertEqual(center.waiting, 0)
+        self.assertEqual(center.occupancy_by_type()["EXPRESS"], 1)
+
+        # Ampliar la capacidad admite a los que esperan
+        center.receive_shipment(Shipment("STD009", "A", "B"))
+        self.assertEqual(center.waiting, 1)
+        center.configure_capacity(3, admission=QUEUE)
+        self.assertEqual((center.occupancy, center.waiting), (3, 0))
+
+    def test_queue_rejects_repeats_within_batch(self):
+        center = Center("MAD01", "Madrid", "Calle A", capacity=1, admission=QUEUE)
+        first, second = self.shipments(2)
+
+        accepted, rejected = center.receive_many([first, second, second])
+        self.assertEqual(accepted, [])
+        self.assertEqual(rejected, [("STD001", "El envío ya se encuentra en el centro.")])
+        self.assertEqual((center.occupancy, center.waiting), (0, 0))
+
+        accepted, rejected = center.receive_many([first, second])
+        self.assertEqual((accepted, rejected), (["STD000", "STD001"], []))
+        self.assertEqual(center.waiting, 1)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            Center("MAD01", "Madrid", "Calle A", capacity=0)
+        with self.assertRaises(ValueError):
+            Center("MAD01", "Madrid", "Calle A", type_capacity={"HEAVY": 1})
+        with self.assertRaises(ValueError):
+            Center("MAD01", "Madrid", "Calle A", admission="drop")
+
+
+class TestCenterDock(unittest.TestCase):
+
+    def setUp(self):
+        self.center = Center("MAD01", "Madrid", "Calle A")
+        self.low = Shipment("LOW001", "A", "B", 1)
+        self.high = Shipment("HIG001", "A", "B", 3)
+        self.first = Shipment("MID001", "A", "B", 2)
+        self.second = Shipment("MID002", "A", "B", 2)
+
+    def codes(self, shipments):
+        return [s.tracking_code for s in shipments]
+
+    def test_pop_next_by_priority_then_arrival(self):
+        self.center.receive_shipment(self.low)
+        self.center.receive_many([self.first, self.high, self.second])
+
+        popped = [self.center.pop_next() for _ in range(4)]
+        self.assertEqual(self.codes(popped), ["HIG001", "MID001", "MID002", "LOW001"])
+        self.assertTrue(all(s.current_status == "IN_TRANSIT" for s in popped))
+        self.assertEqual(self.center.occupancy, 0)
+        self.assertIsNone(self.center.pop_next())
+
+    def test_peek_next_does_not_dispatch(self):
+        self.center.receive_many([self.low, self.first, self.high])
+
+        self.assertEqual(self.codes(self.center.peek_next(2)), ["HIG001", "MID001"])
+        self.assertEqual(self.codes(self.center.peek_next(5)), ["HIG001", "MID001", "LOW001"])
+        self.assertEqual(self.center.occupancy, 3)
+        self.assertIs(self.center.pop_next(), self.high)
+
+    def test_priority_change_reorders_dock(self):
+        self.center.receive_many([self.first, self.low])
+        self.low.increase_priority()
+        self.low.increase_priority()
+
+        self.assertEqual(self.codes(self.center.peek_next(2)), ["LOW001", "MID001"])
+        # Subir y volver a bajar no duplica el envío en el muelle
+        self.first.increase_priority()
+        self.first.decrease_priority()
+        self.assertEqual(self.codes(self.center.peek_next(5)), ["LOW001", "MID001"])
+        # Tras salir del centro, sus cambios ya no afectan al muelle
+        self.center.pop_next()
+        self.low.decrease_priority()
+        self.assertEqual(self.codes(self.center.peek_next(5)), ["MID001"])
+
+    def test_dispatch_out_of_order_and_reentry(self):
+        self.center.receive_many([self.high, self.first, self.second])
+        self.center.dispatch_shipment(self.high)
+        self.center.dispatch_many([self.second])
+        self.assertEqual(self.codes(self.center.peek_next(5)), ["MID001"])
+
+        # Al volver a entrar, el envío ocupa su nuevo puesto de llegada
+        self.high.update_status("DELIVERED")
+        self.center.receive_shipment(self.high)
+        self.center.receive_shipment(self.low)
+        self.assertEqual(self.codes(self.center.peek_next(5)), ["MID001", "LOW001"])
+        self.center.pop_next()
+        self.center.pop_next()
+        self.assertIsNone(self.center.pop_next())
+        self.assertTrue(self.center.has_shipment("HIG001"))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
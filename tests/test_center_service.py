@@ -3,6 +3,7 @@ from logistica.application.center_service import CenterService
 from logistica.infrastructure.memory_center import CenterRepositoryMemory
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
 from logistica.domain.shipment import Shipment
+from logistica.infrastructure.striped_lock import StripedLock
 
 class TestCenterService(unittest.TestCase):
 
@@ -133,6 +134,59 @@ class TestCenterService(unittest.TestCase):
             self.service.dispatch_shipment("NOEXIST", "MAD01")
 
 
+    # Test receive_shipments / dispatch_shipments (lotes)
+    def test_receive_shipments_batch(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        self.shipment_repo.add(Shipment("ABC123", "A", "B"))
+        self.shipment_repo.add(Shipment("XYZ789", "C", "D"))
+
+        accepted, rejected = self.service.receive_shipments(["ABC123", "XYZ789"], "MAD01")
+        self.assertEqual(accepted, ["ABC123", "XYZ789"])
+        self.assertEqual(rejected, [])
+        center = self.center_repo.get_by_center_id("MAD01")
+        self.assertTrue(center.has_shipment("XYZ789"))
+
+    def test_receive_shipments_unknown_code_applies_nothing(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        self.shipment_repo.add(Shipment("ABC123", "A", "B"))
+
+        accepted, rejected = self.service.receive_shipments(["ABC123", "NOE999"], "MAD01")
+        self.assertEqual(accepted, [])
+        self.assertEqual([code for code, _ in rejected], ["NOE999"])
+        self.assertFalse(self.center_repo.get_by_center_id("MAD01").has_shipment("ABC123"))
+
+    def test_receive_shipments_center_not_found_raises(self):
+        with self.assertRaises(ValueError):
+            self.service.receive_shipments(["ABC123"], "NOEXIST")
+
+    def test_dispatch_shipments_batch(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        s1 = Shipment("ABC123", "A", "B")
+        s2 = Shipment("XYZ789", "C", "D")
+        self.shipment_repo.add(s1)
+        self.shipment_repo.add(s2)
+        self.service.receive_shipments(["ABC123", "XYZ789"], "MAD01")
+
+        accepted, rejected = self.service.dispatch_shipments(["ABC123", "XYZ789"], "MAD01")
+        self.assertEqual(accepted, ["ABC123", "XYZ789"])
+        self.assertEqual(rejected, [])
+        self.assertEqual(s1.current_status, "IN_TRANSIT")
+        self.assertEqual(self.service.list_shipments_in_center("MAD01"), [])
+
+    def test_dispatch_shipments_not_in_center_applies_nothing(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        s1 = Shipment("ABC123", "A", "B")
+        self.shipment_repo.add(s1)
+        self.shipment_repo.add(Shipment("XYZ789", "C", "D"))
+        self.service.receive_shipment("ABC123", "MAD01")
+
+        accepted, rejected = self.service.dispatch_shipments(["ABC123", "XYZ789"], "MAD01")
+        self.assertEqual(accepted, [])
+        self.assertEqual([code for code, _ in rejected], ["XYZ789"])
+        self.assertEqual(s1.current_status, "REGISTERED")
+        self.assertTrue(self.center_repo.get_by_center_id("MAD01").has_shipment("ABC123"))
+
+
     # Test list_shipments_in_center
     def test_list_shipments_in_center(self):
         self.service.register_center("MAD01", "Madrid", "Calle A")
@@ -149,10 +203,86 @@ class TestCenterService(unittest.TestCase):
         self.assertIn("ABC123", codes)
         self.assertIn("XYZ789", codes)
 
+    def test_iter_shipments_in_center_validates_eagerly(self):
+        with self.assertRaises(ValueError):
+            self.service.iter_shipments_in_center("NOEXIST")
+
+    def test_iter_shipments_in_center_sees_point_in_time(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        for code in ("ABC123", "XYZ789"):
+            self.shipment_repo.add(Shipment(code, "A", "B"))
+            self.service.receive_shipment(code, "MAD01")
+
+        iterator = self.service.iter_shipments_in_center("MAD01")
+        first = next(iterator)
+        self.service.dispatch_shipment("XYZ789", "MAD01")
+        self.shipment_repo.add(Shipment("NEW123", "A", "B"))
+        self.service.receive_shipment("NEW123", "MAD01")
+        second = next(iterator)
+
+        self.assertEqual(first.tracking_code, "ABC123")
+        self.assertEqual(second.tracking_code, "XYZ789")
+        self.assertEqual(second.current_status, "REGISTERED")
+        self.assertEqual(list(iterator), [])
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("XYZ789").current_status, "IN_TRANSIT")
+
+    def test_iter_shipments_in_center_falls_back_to_inventory(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A")
+        removed = Shipment("ABC123", "A", "B")
+        self.shipment_repo.add(removed)
+        self.service.receive_shipment("ABC123", "MAD01")
+        self.shipment_repo.remove("ABC123")
+        unsaved = Shipment("XYZ789", "C", "D")
+        self.center_repo.get_by_center_id("MAD01").receive_shipment(unsaved)
+
+        # Sin None: los envíos que no están en el repositorio salen del propio inventario
+        self.assertEqual(list(self.service.iter_shipments_in_center("MAD01")), [removed, unsaved])
+        self.assertEqual(len(self.service.list_shipments_in_center("MAD01")), 2)
+
     def test_list_shipments_in_center_center_not_found_raises(self):
         with self.assertRaises(ValueError):
             self.service.list_shipments_in_center("NOEXIST")
 
     def test_list_shipments_in_center_empty_id_raises(self):
         with self.assertRaises(ValueError):
-            self.service.list_shipments_in_center("   ")
\ No newline at end of file
+            self.service.list_shipments_in_center("   ")
+
+    # Test utilización
+    def test_utilization_lists_least_loaded_first(self):
+        self.service.register_center("MAD01", "Madrid", "Calle A", capacity=4)
+        self.service.register_center("BCN02", "Barcelona", "Calle B", capacity=2)
+        self.service.register_center("VLC03", "Valencia", "Calle C")
+        for code in ("ABC123", "XYZ789"):
+            self.shipment_repo.add(Shipment(code, "A", "B"))
+        self.service.receive_shipments(["ABC123"], "MAD01")
+        self.service.receive_shipments(["XYZ789"], "BCN02")
+
+        self.assertEqual(self.service.list_center_utilization(), [
+            ("MAD01", 1, 4, 0.25, 0),
+            ("BCN02", 1, 2, 0.5, 0),
+            ("VLC03", 0, None, None, 0),
+        ])
+
+        self.service.configure_center_capacity("BCN02", 1)
+        with self.assertRaises(ValueError) as cm:
+            self.service.receive_shipment("ABC123", "BCN02")
+        self.assertIn("no tiene plazas libres", str(cm.exception))
+        self.assertEqual(self.service.get_center_utilization("bcn02"), ("BCN02", 1, 1, 1.0, 0))
+
+    # Test muelle de carga
+    def test_dispatch_next_shipment_by_priority(self):
+        service = CenterService(self.center_repo, self.shipment_repo, locks=StripedLock(4))
+        service.register_center("MAD01", "Madrid", "Calle A")
+        for code, priority in (("ABC123", 1), ("XYZ789", 3), ("DEF456", 1)):
+            self.shipment_repo.add(Shipment(code, "A", "B", priority))
+        service.receive_shipments(["ABC123", "XYZ789", "DEF456"], "MAD01")
+
+        self.assertEqual([s.tracking_code for s in service.peek_next_shipments("MAD01", 2)], ["XYZ789", "ABC123"])
+        self.assertEqual(service.dispatch_next_shipment("MAD01").tracking_code, "XYZ789")
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("XYZ789").current_status, "IN_TRANSIT")
+        self.assertEqual(service.dispatch_next_shipment("mad01").tracking_code, "ABC123")
+        self.assertEqual(service.dispatch_next_shipment("MAD01").tracking_code, "DEF456")
+        self.assertIsNone(service.dispatch_next_shipment("MAD01"))
+
+        with self.assertRaises(ValueError):
+            service.dispatch_next_shipment("NOP00")
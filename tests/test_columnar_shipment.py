@@ -0,0 +1,107 @@
+# tests/test_columnar_shipment.py
+
+import unittest
+from logistica.infrastructure.columnar_shipment import ShipmentRepositoryColumnar
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+class TestShipmentRepositoryColumnar(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryColumnar()
+        self.repo.add(Shipment("ABC123", "A", "B", 1))
+        self.repo.add(FragileShipment("FRG123", "C", "D", 3))
+        self.repo.add(ExpressShipment("EXP123", "E", "F"))
+
+    def test_get_returns_view_of_right_type(self):
+        fragile = self.repo.get_by_tracking_code("frg123")
+        self.assertIsInstance(fragile, FragileShipment)
+        self.assertEqual(fragile.tracking_code, "FRG123")
+        self.assertEqual(fragile.sender, "C")
+        self.assertEqual(fragile.priority, 3)
+        self.assertEqual(fragile.shipment_type, "FRAGILE")
+        self.assertEqual(fragile.current_status, "REGISTERED")
+
+    def test_get_unknown_or_empty_returns_none(self):
+        self.assertIsNone(self.repo.get_by_tracking_code("NOE999"))
+        self.assertIsNone(self.repo.get_by_tracking_code("   "))
+
+    def test_same_view_while_alive(self):
+        first = self.repo.get_by_tracking_code("ABC123")
+        self.assertIs(first, self.repo.get_by_tracking_code("ABC123"))
+
+    def test_view_mutations_write_columns(self):
+        shipment = self.repo.get_by_tracking_code("ABC123")
+        shipment.update_status("IN_TRANSIT")
+        shipment.increase_priority()
+        shipment.assign_route("MAD01-BCN02-STD-001")
+        del shipment
+
+        shipment = self.repo.get_by_tracking_code("ABC123")
+        self.assertEqual(shipment.current_status, "IN_TRANSIT")
+        self.assertEqual(shipment.get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(shipment.priority, 2)
+        self.assertEqual(shipment.assigned_route, "MAD01-BCN02-STD-001")
+
+    def test_subtype_rules_still_apply(self):
+        fragile = self.repo.get_by_tracking_code("FRG123")
+        fragile.decrease_priority()
+        with self.assertRaises(ValueError):
+            fragile.decrease_priority()
+        with self.assertRaises(ValueError):
+            self.repo.get_by_tracking_code("EXP123").increase_priority()
+
+    def test_remove(self):
+        self.assertTrue(self.repo.remove("abc123"))
+        self.assertFalse(self.repo.remove("abc123"))
+        self.assertIsNone(self.repo.get_by_tracking_code("ABC123"))
+        self.assertEqual(len(self.repo.list_all()), 2)
+        self.assertEqual(self.repo.count(), 2)
+
+    def test_find_and_count(self):
+        self.repo.get_by_tracking_code("FRG123").update_status("IN_TRANSIT")
+        self.repo.get_by_tracking_code("EXP123").update_status("IN_TRANSIT")
+
+        in_transit_p3 = self.repo.find(status="IN_TRANSIT", priority=3)
+        self.assertEqual([s.tracking_code for s in in_transit_p3], ["FRG123", "EXP123"])
+        self.assertEqual(self.repo.count(status="in_transit", shipment_type="express"), 1)
+        self.assertEqual(self.repo.count(status="REGISTERED"), 1)
+        self.assertEqual(self.repo.count(status="UNKNOWN"), 0)
+
+    def test_find_by_route(self):
+        self.repo.get_by_tracking_code("ABC123").assign_route("MAD01-BCN02-STD-001")
+        self.assertEqual([s.tracking_code for s in self.repo.find(route_id="MAD01-BCN02-STD-001")], ["ABC123"])
+        self.assertEqual(self.repo.count(route_id="MAD01-BCN02-EXP-001"), 0)
+
+
+class TestServicesWithColumnarRepository(unittest.TestCase):
+
+    def test_route_lifecycle(self):
+        shipment_repo = ShipmentRepositoryColumnar()
+        center_repo = CenterRepositoryMemory()
+        route_repo = RouteRepositoryMemory()
+        shipment_service = ShipmentService(shipment_repo)
+        center_service = CenterService(center_repo, shipment_repo)
+        route_service = RouteService(route_repo, shipment_repo, center_repo)
+
+        center_service.register_center("MAD01", "Madrid", "Calle A")
+        center_service.register_center("BCN02", "Barcelona", "Calle B")
+        route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        shipment_service.register_shipment("ABC123", "A", "B")
+        route_service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+        route_service.dispatch_route("MAD01-BCN02-STD-001")
+        route_service.complete_route("MAD01-BCN02-STD-001")
+
+        shipment = shipment_service.get_shipment("ABC123")
+        self.assertEqual(shipment.current_status, "DELIVERED")
+        self.assertEqual(shipment_repo.count(status="DELIVERED"), 1)
+        self.assertTrue(center_service.get_center("BCN02").has_shipment("ABC123"))
+
+if __name__ == '__main__':
+    unittest.main()
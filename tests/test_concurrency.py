@@ -0,0 +1,136 @@
+# tests/test_concurrency.py
+
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+from logistica.infrastructure.striped_lock import StripedLock
+from logistica.infrastructure.concurrent_memory import (
+    ShipmentRepositoryStriped, CenterRepositoryConcurrent, RouteRepositoryConcurrent,
+)
+
+ROUTES = 16
+SHIPMENTS = 480
+WORKERS = 8
+
+
+class TestStripedLock(unittest.TestCase):
+
+    def test_hold_acquires_in_ascending_order(self):
+        locks = StripedLock(8)
+        with locks.hold(shipments=["ABC123", "abc123 "], centers=["MAD01"], routes=["MAD01-BCN02-STD-001"]):
+            held = [i for i in range(locks.stripes) if locks.stripe(i)._is_owned()]
+        expected = {locks.shipment_stripe("ABC123"), locks.center_stripe("MAD01"), locks.route_stripe("MAD01-BCN02-STD-001")}
+        self.assertEqual(held, sorted(expected))
+        self.assertFalse(any(locks.stripe(i)._is_owned() for i in range(locks.stripes)))
+
+
+class TestConcurrentServices(unittest.TestCase):
+
+    def setUp(self):
+        # Cambios de hilo muy frecuentes para forzar intercalados
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+
+        self.locks = StripedLock(16)
+        self.shipment_repo = ShipmentRepositoryStriped(self.locks)
+        self.center_repo = CenterRepositoryConcurrent()
+        self.route_repo = RouteRepositoryConcurrent()
+        self.shipments = ShipmentService(self.shipment_repo, locks=self.locks)
+        self.centers = CenterService(self.center_repo, self.shipment_repo, locks=self.locks)
+        self.routes = RouteService(self.route_repo, self.shipment_repo, self.center_repo, locks=self.locks)
+
+        self.centers.register_center("MAD01", "Madrid", "Calle A")
+        self.centers.register_center("BCN02", "Barcelona", "Calle B")
+        # Rutas en los dos sentidos: las operaciones toman los centros en órdenes opuestos
+        self.route_ids = [
+            f"MAD01-BCN02-STD-{i:03d}" if i % 2 == 0 else f"BCN02-MAD01-STD-{i:03d}"
+            for i in range(ROUTES)
+        ]
+        for route_id in self.route_ids:
+            origin, destination = route_id.split("-")[:2]
+            self.routes.create_route(route_id, origin, destination)
+        self.codes = [f"CON{i:03d}" for i in range(SHIPMENTS)]
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def run_parallel(self, tasks):
+        with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+            for future in [pool.submit(task) for task in tasks]:
+                future.result(timeout=60)
+
+    def test_concurrent_lifecycle_keeps_invariants(self):
+        def register(chunk):
+            def task():
+                for code in chunk:
+                    try:
+                        self.shipments.register_shipment(code, "A", "B")
+                    except ValueError:
+                        pass
+            return task
+
+        # Cada código se intenta registrar dos veces desde hilos distintos
+        half = SHIPMENTS // 2
+        self.run_parallel([register(self.codes[i::WORKERS // 2]) for i in range(WORKERS // 2)] * 2)
+        self.assertEqual(self.shipment_repo.count(), SHIPMENTS)
+
+        def route_lifecycle(index):
+            route_id = self.route_ids[index]
+
+            def task():
+                # Cada envío lo disputan dos rutas: solo una puede quedárselo (RN-016)
+                for i in range(SHIPMENTS):
+                    if i % ROUTES in (index, (index + 1) % ROUTES):
+                        try:
+                            self.routes.assign_shipment_to_route(self.codes[i], route_id)
+                        except ValueError:
+                            pass
+                self.routes.dispatch_route(route_id)
+                self.routes.complete_route(route_id)
+            return task
+
+        def scanner():
+            for code in self.codes[:half]:
+                try:
+                    self.shipments.increase_shipment_priority(code)
+                except ValueError:
+                    pass
+
+        self.run_parallel([route_lifecycle(i) for i in range(ROUTES)] + [scanner])
+
+        madrid = self.centers.get_center("MAD01")
+        barcelona = self.centers.get_center("BCN02")
+        in_madrid = {s.tracking_code for s in madrid.iter_shipments()}
+        in_barcelona = {s.tracking_code for s in barcelona.iter_shipments()}
+
+        # Todos los envíos se entregaron exactamente una vez, en el destino de su ruta
+        self.assertEqual(self.shipment_repo.count(status="DELIVERED"), SHIPMENTS)
+        self.assertFalse(in_madrid & in_barcelona)
+        self.assertEqual(len(in_madrid) + len(in_barcelona), SHIPMENTS)
+        for code in self.codes:
+            shipment = self.shipment_repo.get_by_tracking_code(code)
+            destination = shipment.assigned_route.split("-")[1]
+            self.assertIn(code, in_madrid if destination == "MAD01" else in_barcelona)
+            self.assertEqual(shipment.priority, 2 if code in self.codes[:half] else 1)
+        for route_id in self.route_ids:
+            route = self.routes.get_route(route_id)
+            self.assertFalse(route.is_active)
+            self.assertEqual(route.list_shipment(), [])
+        # Los índices de las particiones siguieron a los envíos
+        self.assertEqual(self.shipment_repo.count(priority=2), half)
+        self.assertEqual(len(self.shipment_repo.find(status="REGISTERED")), 0)
+
+    def test_striped_repository_lists_in_order(self):
+        for code in reversed(self.codes[:50]):
+            self.shipments.register_shipment(code, "A", "B")
+
+        page = [s.tracking_code for s in self.shipment_repo.iter_sorted(after="CON010", limit=5)]
+
+        self.assertEqual(page, ["CON011", "CON012", "CON013", "CON014", "CON015"])
+        self.assertEqual(len(self.shipment_repo.list_all()), 50)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,126 @@
+# tests/test_event_log.py
+
+import os
+import tempfile
+import unittest
+from logistica.infrastructure.event_log import EventSourcedStore
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+
+class TestEventSourcedStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.open()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def open(self, snapshot_every=0):
+        self.store = EventSourcedStore(
+            self.tmp.name,
+            ShipmentRepositoryMemory(),
+            CenterRepositoryMemory(),
+            RouteRepositoryMemory(),
+            snapshot_every=snapshot_every,
+        )
+        self.shipment_service = ShipmentService(self.store.shipments)
+        self.center_service = CenterService(self.store.centers, self.store.shipments)
+        self.route_service = RouteService(self.store.routes, self.store.shipments, self.store.centers)
+
+    def reopen(self, snapshot_every=0):
+        self.store.close()
+        self.open(snapshot_every)
+
+    def prepare_route(self):
+        self.center_service.register_center("MAD01", "Madrid", "Calle A")
+        self.center_service.register_center("BCN02", "Barcelona", "Calle B")
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.shipment_service.register_shipment("XYZ789", "C", "D", 2, "fragile")
+        self.route_service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+        self.route_service.assign_shipment_to_route("XYZ789", "MAD01-BCN02-STD-001")
+
+    def test_replay_rebuilds_assignments(self):
+        self.prepare_route()
+        self.shipment_service.increase_shipment_priority("ABC123")
+        self.reopen()
+
+        self.assertGreater(self.store.replayed, 0)
+        route = self.route_service.get_route("MAD01-BCN02-STD-001")
+        self.assertEqual([s.tracking_code for s in route.list_shipment()], ["ABC123", "XYZ789"])
+        self.assertIs(route.origin_center, self.center_service.get_center("MAD01"))
+        self.assertTrue(route.origin_center.has_shipment("XYZ789"))
+        shipment = self.shipment_service.get_shipment("ABC123")
+        self.assertEqual(shipment.priority, 2)
+        self.assertEqual(shipment.assigned_route, "MAD01-BCN02-STD-001")
+        self.assertEqual(self.shipment_service.get_shipment("XYZ789").shipment_type, "FRAGILE")
+
+    def test_wrappers_delegate_snapshots_and_route_find(self):
+        self.prepare_route()
+
+        # Las instantáneas versionadas son las del repositorio envuelto, no la copia por defecto
+        for repo in (self.store.shipments, self.store.centers, self.store.routes):
+            with repo.snapshot() as snapshot:
+                self.assertIsNotNone(snapshot.version)
+        with self.store.shipments.snapshot() as snapshot:
+            self.assertEqual(snapshot.get("abc123").tracking_code, "ABC123")
+        routes = self.store.routes.find(origin_id="MAD01", cargo_class="STD", active=True)
+        self.assertEqual([route.route_id for route in routes], ["MAD01-BCN02-STD-001"])
+
+    def test_replay_keeps_status_timestamps(self):
+        self.prepare_route()
+        self.route_service.dispatch_route("MAD01-BCN02-STD-001")
+        self.route_service.complete_route("MAD01-BCN02-STD-001")
+        timeline = self.shipment_service.get_shipment("ABC123").get_status_timeline()
+        self.reopen()
+
+        self.assertEqual(self.shipment_service.get_shipment("ABC123").get_status_timeline(), timeline)
+        self.assertFalse(self.route_service.get_route("MAD01-BCN02-STD-001").is_active)
+        self.assertEqual(self.route_service.get_route("MAD01-BCN02-STD-001").list_shipment(), [])
+        self.assertFalse(self.center_service.get_center("MAD01").has_shipment("ABC123"))
+        self.assertTrue(self.center_service.get_center("BCN02").has_shipment("ABC123"))
+        self.assertEqual(self.store.shipments.count(status="DELIVERED"), 2)
+
+    def test_changes_after_replay_are_recorded(self):
+        self.prepare_route()
+        self.reopen()
+        self.route_service.remove_shipment_from_route("XYZ789", "MAD01-BCN02-STD-001")
+        self.reopen()
+
+        route = self.route_service.get_route("MAD01-BCN02-STD-001")
+        self.assertEqual([s.tracking_code for s in route.list_shipment()], ["ABC123"])
+        self.assertIsNone(self.shipment_service.get_shipment("XYZ789").assigned_route)
+
+    def test_snapshot_replays_only_tail(self):
+        self.reopen(snapshot_every=5)
+        self.prepare_route()
+        self.shipment_service.register_shipment("DEF456", "E", "F")
+        self.reopen()
+
+        self.assertLess(self.store.replayed, 5)
+        self.assertIsNotNone(self.shipment_service.get_shipment("DEF456"))
+        self.assertEqual(len(self.route_service.get_route("MAD01-BCN02-STD-001").list_shipment()), 2)
+
+    def test_torn_tail_is_discarded(self):
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.store.close()
+        log_path = os.path.join(self.tmp.name, "events.log")
+        with open(log_path, "ab") as f:
+            f.write(b"\x40\x00\x00\x00\x00")  # cabecera cortada a mitad
+        size = os.path.getsize(log_path)
+
+        self.open()
+        self.assertEqual(self.store.replayed, 1)
+        self.assertLess(os.path.getsize(log_path), size)
+        self.shipment_service.register_shipment("XYZ789", "C", "D")
+        self.reopen()
+        self.assertEqual(self.store.shipments.count(), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_memory_route.py
+
+import unittest
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.domain.center import Center
+from logistica.domain.route import Route
+from logistica.domain.route_repository import RouteRepository
+
+class TestRouteRepositoryMemoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = RouteRepositoryMemory()
+        mad = Center("MAD01", "Madrid", "Calle A")
+        bcn = Center("BCN02", "Barcelona", "Calle B")
+        vlc = Center("VLC03", "Valencia", "Calle C")
+        self.routes = [
+            Route("MAD01-BCN02-EXP-001", mad, bcn),
+            Route("MAD01-BCN02-STD-001", mad, bcn),
+            Route("MAD01-VLC03-EXP-001", mad, vlc),
+            Route("BCN02-MAD01-EXP-001", bcn, mad),
+        ]
+        self.repo.add_many(self.routes)
+
+    def ids(self, routes):
+        return sorted(r.route_id for r in routes)
+
+    def test_find_by_origin_destination_and_cargo_class(self):
+        self.assertEqual(self.ids(self.repo.find(origin_id="MAD01", cargo_class="exp")), ["MAD01-BCN02-EXP-001", "MAD01-VLC03-EXP-001"])
+        self.assertEqual(self.ids(self.repo.find(destination_id=" bcn02 ")), ["MAD01-BCN02-EXP-001", "MAD01-BCN02-STD-001"])
+        self.assertEqual(self.repo.find(origin_id="VLC03"), [])
+        self.assertEqual(len(self.repo.find()), 4)
+
+    def test_find_active_and_remove_updates_indexes(self):
+        self.routes[0].complete_route()
+        self.assertEqual(self.ids(self.repo.find(origin_id="MAD01", active=True)), ["MAD01-BCN02-STD-001", "MAD01-VLC03-EXP-001"])
+
+        self.repo.remove("mad01-vlc03-exp-001")
+        self.assertEqual(self.ids(self.repo.find(cargo_class="EXP", active=True)), ["BCN02-MAD01-EXP-001"])
+        self.assertNotIn("VLC03", self.repo._indexes["destination"])
+
+    def test_matches_default_contract(self):
+        contract = RouteRepository.find
+        self.routes[1].complete_route()
+        for filters in ({"origin_id": "MAD01"}, {"cargo_class": "EXP", "active": True}, {"destination_id": "MAD01"}):
+            self.assertEqual(self.ids(self.repo.find(**filters)), self.ids(contract(self.repo, **filters)))
+
+if __name__ == '__main__':
+    unittest.main()
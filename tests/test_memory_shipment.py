@@ -0,0 +1,178 @@
+# tests/test_memory_shipment.py
+
+import unittest
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+class TestShipmentRepositoryMemoryIndexes(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+        self.standard = Shipment("ABC123", "A", "B", 1)
+        self.fragile = FragileShipment("FRG123", "C", "D", 2)
+        self.express = ExpressShipment("EXP123", "E", "F")
+        for shipment in (self.standard, self.fragile, self.express):
+            self.repo.add(shipment)
+
+    def codes(self, shipments):
+        return sorted(s.tracking_code for s in shipments)
+
+    def test_find_by_each_index(self):
+        self.assertEqual(self.codes(self.repo.find(status="registered")), ["ABC123", "EXP123", "FRG123"])
+        self.assertEqual(self.codes(self.repo.find(priority=3)), ["EXP123"])
+        self.assertEqual(self.codes(self.repo.find(shipment_type="FRAGILE")), ["FRG123"])
+        self.assertEqual(self.repo.find(route_id="MAD01-BCN02-STD-001"), [])
+        self.assertEqual(len(self.repo.find()), 3)
+
+    def test_update_status_moves_shipment(self):
+        self.express.update_status("IN_TRANSIT")
+        self.assertEqual(self.codes(self.repo.find(status="IN_TRANSIT", shipment_type="EXPRESS")), ["EXP123"])
+        self.assertEqual(self.repo.count(status="REGISTERED"), 2)
+
+    def test_assign_and_remove_route_move_shipment(self):
+        self.standard.assign_route("MAD01-BCN02-STD-001")
+        self.assertEqual(self.codes(self.repo.find(route_id="MAD01-BCN02-STD-001")), ["ABC123"])
+        self.assertEqual(self.repo.count(route_id=None, status="REGISTERED"), 3)
+
+        self.standard.remove_route()
+        self.assertEqual(self.repo.count(route_id="MAD01-BCN02-STD-001"), 0)
+
+    def test_priority_changes_move_shipment(self):
+        self.standard.increase_priority()
+        self.fragile.increase_priority()
+        self.assertEqual(self.codes(self.repo.find(priority=2)), ["ABC123"])
+        self.assertEqual(self.codes(self.repo.find(priority=3)), ["EXP123", "FRG123"])
+
+        self.fragile.decrease_priority()
+        self.assertEqual(self.repo.count(priority=2), 2)
+
+    def test_remove_drops_from_indexes(self):
+        self.repo.remove("FRG123")
+        self.assertEqual(self.repo.count(shipment_type="FRAGILE"), 0)
+        # El envío eliminado ya no actualiza los índices
+        self.fragile.update_status("IN_TRANSIT")
+        self.assertEqual(self.repo.count(status="IN_TRANSIT"), 0)
+
+    def test_replacing_shipment_reindexes(self):
+        replacement = Shipment("ABC123", "X", "Y", 3)
+        self.repo.add(replacement)
+        self.assertEqual(self.codes(self.repo.find(priority=3)), ["ABC123", "EXP123"])
+        self.assertEqual(self.repo.count(priority=1), 0)
+        # El objeto sustituido deja de estar observado
+        self.standard.increase_priority()
+        self.assertEqual(self.repo.count(priority=2), 1)
+
+
+class TestShipmentRepositoryMemorySortedIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+        for code in ("MNO456", "ABC123", "XYZ789", "DEF321"):
+            self.repo.add(Shipment(code, "A", "B"))
+
+    def codes(self, shipments):
+        return [s.tracking_code for s in shipments]
+
+    def test_iter_all_is_snapshot(self):
+        iterator = self.repo.iter_all()
+        self.repo.add(Shipment("AAA111", "A", "B"))
+        self.repo.remove("MNO456")
+        self.assertEqual(self.codes(iterator), ["MNO456", "ABC123", "XYZ789", "DEF321"])
+        self.assertEqual(len(list(self.repo.iter_all())), 4)
+
+    def test_iter_sorted(self):
+        self.assertEqual(self.codes(self.repo.iter_sorted()), ["ABC123", "DEF321", "MNO456", "XYZ789"])
+
+    def test_iter_sorted_cursor_and_limit(self):
+        self.assertEqual(self.codes(self.repo.iter_sorted(after="abc123", limit=2)), ["DEF321", "MNO456"])
+        self.assertEqual(self.codes(self.repo.iter_sorted(after="ZZZ999")), [])
+
+    def test_iter_sorted_after_remove(self):
+        self.repo.remove("DEF321")
+        self.assertEqual(self.codes(self.repo.iter_sorted()), ["ABC123", "MNO456", "XYZ789"])
+
+    def test_iter_sorted_tolerates_changes_while_iterating(self):
+        iterator = self.repo.iter_sorted()
+        self.assertEqual(next(iterator).tracking_code, "ABC123")
+        self.repo.add(Shipment("AAA111", "A", "B"))  # antes del cursor: no se sirve
+        self.repo.add(Shipment("CCC111", "A", "B"))  # después del cursor: sí se sirve
+        self.repo.remove("MNO456")
+        self.assertEqual(self.codes(iterator), ["CCC111", "DEF321", "XYZ789"])
+
+    def test_sorted_index_across_blocks(self):
+        # Suficientes códigos para repartir el índice en varios bloques
+        codes = [f"{a}{b}Z{n:03d}" for a in "QWERTY" for b in "ASDF" for n in range(0, 1000, 7)]
+        self.repo.add_many(Shipment(code, "A", "B") for code in codes[::2])
+        for code in codes[1::2]:
+            self.repo.add(Shipment(code, "A", "B"))
+        for code in codes[::5]:
+            self.repo.remove(code)
+
+        expected = sorted(set(codes) - set(codes[::5]) | {"ABC123", "DEF321", "MNO456", "XYZ789"})
+        self.assertEqual(self.codes(self.repo.iter_sorted()), expected)
+        page = self.codes(self.repo.iter_sorted(after=expected[999], limit=600))
+        self.assertEqual(page, expected[1000:1600])
+
+    def test_add_many_replaces_and_indexes(self):
+        replacement = FragileShipment("ABC123", "A", "B", 2)
+        self.repo.add_many([replacement, Shipment("AAA111", "A", "B"), Shipment("AAA111", "C", "D")])
+
+        self.assertIs(self.repo.get_by_tracking_code("abc123"), replacement)
+        self.assertEqual(self.repo.get_by_tracking_code("AAA111").sender, "C")
+        self.assertEqual(self.codes(self.repo.iter_sorted(limit=2)), ["AAA111", "ABC123"])
+        self.assertEqual(self.repo.count(shipment_type="FRAGILE"), 1)
+        self.assertEqual(self.repo.count(), 5)
+
+class TestShipmentRepositoryMemorySnapshots(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+        self.standard = Shipment("ABC123", "A", "B", 1)
+        self.express = ExpressShipment("EXP123", "E", "F")
+        self.repo.add(self.standard)
+        self.repo.add(self.express)
+
+    def test_snapshot_keeps_point_in_time_state(self):
+        with self.repo.snapshot() as snapshot:
+            self.standard.update_status("IN_TRANSIT")
+            self.standard.increase_priority()
+            self.standard.assign_route("MAD01-BCN02-STD-001")
+            self.repo.add(Shipment("NEW123", "C", "D"))
+            self.repo.remove("EXP123")
+
+            before = snapshot.get("abc123")
+            self.assertIsNot(before, self.standard)
+            self.assertEqual(before.current_status, "REGISTERED")
+            self.assertEqual(before.priority, 1)
+            self.assertIsNone(before.assigned_route)
+            self.assertEqual(before.get_status_history(), ["REGISTERED"])
+            self.assertEqual(sorted(s.tracking_code for s in snapshot.iter_all()), ["ABC123", "EXP123"])
+            self.assertIsNone(snapshot.get("NEW123"))
+            self.assertLess(snapshot.version, self.repo.version)
+
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").current_status, "IN_TRANSIT")
+
+    def test_snapshots_resolve_their_own_version(self):
+        first = self.repo.snapshot()
+        self.standard.update_status("IN_TRANSIT")
+        second = self.repo.snapshot()
+        self.standard.update_status("DELIVERED")
+
+        self.assertEqual(first.get("ABC123").current_status, "REGISTERED")
+        self.assertEqual(second.get("ABC123").current_status, "IN_TRANSIT")
+        self.assertIs(second.get("EXP123"), self.express)
+
+        first.close()
+        self.assertEqual(second.get("ABC123").current_status, "IN_TRANSIT")
+        second.close()
+        self.assertEqual(self.repo._history, {})
+
+    def test_no_history_without_open_snapshots(self):
+        self.standard.update_status("IN_TRANSIT")
+        self.assertEqual(self.repo._history, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
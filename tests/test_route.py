@@ -1,7 +1,7 @@
 # tests/test_route.py
 
 import unittest
-from logistica.domain.center import Center
+from logistica.domain.center import Center, QUEUE
 from logistica.domain.shipment import Shipment
 from logistica.domain.route import Route
 
@@ -15,6 +15,10 @@ class TestRoute(unittest.TestCase):
 
     def test_create_route(self):
         self.assertEqual(self.route.route_id, "MAD01-BCN02-STD-001")
+        self.assertEqual(
+            (self.route.origin_code, self.route.destination_code, self.route.cargo_class, self.route.sequence),
+            ("MAD01", "BCN02", "STD", 1),
+        )
         self.assertIs(self.route.origin_center, self.origin)
         self.assertIs(self.route.destination_center, self.dest)
         self.assertTrue(self.route.is_active)
@@ -38,6 +42,7 @@ class TestRoute(unittest.TestCase):
         self.assertEqual(self.shipment.assigned_route, self.route.route_id)
         # Verificar que el envío se ha registrado en el centro de origen
         self.assertTrue(self.origin.has_shipment("ABC123"))
+        self.assertEqual(self.route.shipment_count, 1)
 
     def test_add_shipment_to_inactive_route_raises(self):
         # Preparamos la ruta para que quede inactiva
@@ -50,6 +55,20 @@ class TestRoute(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.route.add_shipment(new_shipment)
 
+    def test_add_many_applies_valid_shipments(self):
+        # Retirado de la ruta pero todavía en el centro de origen
+        self.route.add_shipment(self.shipment)
+        self.route.remove_shipment(self.shipment)
+        other = Shipment("XYZ789", "C", "D", 2)
+
+        assigned, rejected = self.route.add_many([self.shipment, other])
+
+        self.assertEqual(assigned, ["XYZ789"])
+        self.assertEqual(rejected, [("ABC123", "El envío ya se encuentra en el centro.")])
+        self.assertEqual(self.route.list_shipment(), [other])
+        self.assertEqual(other.assigned_route, self.route.route_id)
+        self.assertIsNone(self.shipment.assigned_route)
+
     def test_remove_shipment(self):
         self.route.add_shipment(self.shipment)
         self.route.remove_shipment(self.shipment)
@@ -79,11 +98,68 @@ class TestRoute(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.route.complete_route()  # segunda vez debe fallar
 
+    def test_complete_route_with_undispatched_shipment_leaves_route_intact(self):
+        self.route.add_shipment(self.shipment)
+        with self.assertRaises(ValueError):
+            self.route.complete_route()
+
+        self.assertTrue(self.route.is_active)
+        self.assertEqual(self.route.list_shipment(), [self.shipment])
+        self.assertFalse(self.dest.has_shipment("ABC123"))
+        self.assertEqual(self.shipment.current_status, "REGISTERED")
+
+    def test_iter_shipments_is_snapshot(self):
+        self.route.add_shipment(self.shipment)
+        iterator = self.route.iter_shipments()
+        self.route.add_shipment(Shipment("XYZ789", "C", "D", 2))
+        self.assertEqual(list(iterator), [self.shipment])
+        self.assertEqual(len(list(self.route.iter_shipments())), 2)
+
     def test_list_shipment_returns_copy(self):
         self.route.add_shipment(self.shipment)
         lista = self.route.list_shipment()
         lista.append(self.shipment)  # modificar copia (aunque sea el mismo objeto)
         self.assertEqual(len(self.route.list_shipment()), 1)
 
+    def test_load_from_origin_uses_shipments_already_in_center(self):
+        self.origin.receive_shipment(self.shipment)
+        outside = Shipment("XYZ789", "C", "D")
+
+        assigned, rejected = self.route.load_from_origin([self.shipment, outside])
+
+        self.assertEqual(assigned, ["ABC123"])
+        self.assertEqual(rejected, [("XYZ789", "El envío no se encuentra en el centro de origen.")])
+        self.assertEqual(self.shipment.assigned_route, self.route.route_id)
+        self.assertEqual(self.origin.list_shipments(), [self.shipment])
+
+    def test_full_origin_center_leaves_route_unchanged(self):
+        self.origin.configure_capacity(1)
+        others = [Shipment("XYZ789", "C", "D"), Shipment("DEF456", "E", "F")]
+
+        assigned, rejected = self.route.add_many([self.shipment] + others)
+
+        self.assertEqual(assigned, ["ABC123"])
+        self.assertEqual([code for code, _ in rejected], ["XYZ789", "DEF456"])
+        with self.assertRaises(ValueError):
+            self.route.add_shipment(others[0])
+        self.assertEqual(self.route.list_shipment(), [self.shipment])
+        self.assertIsNone(others[0].assigned_route)
+
+    def test_full_queue_origin_center_does_not_queue_route_shipments(self):
+        self.origin.configure_capacity(1, admission=QUEUE)
+        waiting = Shipment("GHI012", "G", "H")
+        self.origin.receive_shipment(Shipment("JKL345", "J", "K"))
+        self.origin.receive_shipment(waiting)
+        others = [Shipment("XYZ789", "C", "D"), waiting]
+
+        assigned, rejected = self.route.add_many(others)
+
+        self.assertEqual(assigned, [])
+        self.assertEqual([code for code, _ in rejected], ["XYZ789", "GHI012"])
+        with self.assertRaises(ValueError):
+            self.route.add_shipment(self.shipment)
+        self.assertEqual(self.route.list_shipment(), [])
+        self.assertEqual([s.tracking_code for s in self.origin.list_waiting()], ["GHI012"])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
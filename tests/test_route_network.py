@@ -0,0 +1,84 @@
+# tests/test_route_network.py
+
+import random
+import unittest
+from logistica.domain.route_network import RouteNetwork
+
+
+def _brute_force(edges, origin, destination):
+    """Coste mínimo por Bellman-Ford, para contrastar con la red."""
+    dist = {origin: 0}
+    for _ in range(len(edges) + 1):
+        for _, (u, v, cost) in edges.items():
+            if u in dist and dist[u] + cost < dist.get(v, float("inf")):
+                dist[v] = dist[u] + cost
+    return dist.get(destination)
+
+
+class TestRouteNetwork(unittest.TestCase):
+
+    def setUp(self):
+        self.network = RouteNetwork()
+        self.network.add_route("R1", "A", "B", 1)
+        self.network.add_route("R2", "B", "C", 1)
+        self.network.add_route("R3", "A", "C", 5)
+
+    def test_cheapest_path_and_unreachable(self):
+        self.assertEqual(self.network.shortest_path("A", "C"), (2, ["R1", "R2"]))
+        self.assertEqual(self.network.shortest_path("A", "A"), (0, []))
+        self.assertIsNone(self.network.shortest_path("C", "A"))
+        self.assertIsNone(self.network.shortest_path("Z", "A"))
+
+    def test_incremental_add_and_remove(self):
+        self.assertEqual(self.network.shortest_path("A", "C")[0], 2)
+
+        self.network.add_route("R4", "A", "C", 1)
+        self.assertEqual(self.network.shortest_path("A", "C"), (1, ["R4"]))
+
+        self.assertTrue(self.network.remove_route("R4"))
+        self.assertEqual(self.network.shortest_path("A", "C"), (2, ["R1", "R2"]))
+        self.assertFalse(self.network.remove_route("R4"))
+
+        self.network.remove_route("R2")
+        self.assertEqual(self.network.shortest_path("A", "C"), (5, ["R3"]))
+
+    def test_invalid_routes(self):
+        with self.assertRaises(ValueError):
+            self.network.add_route("R1", "A", "B")
+        with self.assertRaises(ValueError):
+            self.network.add_route("R9", "A", "B", -1)
+
+    def test_matches_brute_force_under_random_changes(self):
+        rng = random.Random(3)
+        nodes = [f"N{i}" for i in range(30)]
+        network = RouteNetwork(max_sources=8)
+        edges = {}
+        for step in range(400):
+            if edges and rng.random() < 0.3:
+                route_id = rng.choice(sorted(edges))
+                del edges[route_id]
+                network.remove_route(route_id)
+            else:
+                u, v = rng.sample(nodes, 2)
+                edges[f"E{step}"] = (u, v, rng.randint(0, 9))
+                network.add_route(f"E{step}", u, v, edges[f"E{step}"][2])
+
+            origin, destination = rng.sample(nodes, 2)
+            path = network.shortest_path(origin, destination)
+            expected = _brute_force(edges, origin, destination)
+            if expected is None:
+                self.assertIsNone(path)
+                continue
+            cost, legs = path
+            self.assertEqual(cost, expected)
+            # El camino encadena rutas existentes de origen a destino y suma su coste
+            node = origin
+            for route_id in legs:
+                u, v, leg_cost = edges[route_id]
+                self.assertEqual(u, node)
+                node = v
+                expected -= leg_cost
+            self.assertEqual((node, expected), (destination, 0))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,6 +6,7 @@ from logistica.infrastructure.memory_route import RouteRepositoryMemory
 from logistica.infrastructure.memory_center import CenterRepositoryMemory
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
 from logistica.domain.shipment import Shipment
+from logistica.domain.center import QUEUE
 
 class TestRouteService(unittest.TestCase):
 
@@ -71,6 +72,24 @@ class TestRouteService(unittest.TestCase):
         self.assertEqual(routes[0][3], "Activa")
 
 
+    def test_iter_routes_is_lazy(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        routes = self.service.iter_routes()
+        self.assertEqual(next(routes), ("MAD01-BCN02-STD-001", "MAD01", "BCN02", "Activa"))
+        self.assertIsNone(next(routes, None))
+
+    def test_iter_routes_reports_one_instant(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.service.create_route("BCN02-MAD01-STD-002", "BCN02", "MAD01")
+        routes = self.service.iter_routes()
+        next(routes)
+        self.service.complete_route("BCN02-MAD01-STD-002")
+        self.service.create_route("MAD01-BCN02-STD-003", "MAD01", "BCN02")
+
+        self.assertEqual(list(routes), [("BCN02-MAD01-STD-002", "BCN02", "MAD01", "Activa")])
+        self.assertEqual(len(self.service.list_routes()), 3)
+
+
     # Test get_route
     def test_get_route_existing(self):
         route_id = "MAD01-BCN02-STD-001"
@@ -140,6 +159,33 @@ class TestRouteService(unittest.TestCase):
             self.service.assign_shipment_to_route("ABC123", route_id)
         self.assertIn("ya está asignado", str(cm.exception))
 
+    def test_assign_shipments_reports_each_code(self):
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        for code in ("ABC123", "ABC124", "ABC125"):
+            self.shipment_service.register_shipment(code, "A", "B")
+        self.service.assign_shipment_to_route("ABC125", route_id)
+
+        assigned, rejected = self.service.assign_shipments_to_route(
+            route_id, ["ABC123", "NOEXIST", "ABC124", "ABC125", "ABC123"]
+        )
+
+        self.assertEqual(assigned, ["ABC123", "ABC124"])
+        self.assertEqual([code for code, _ in rejected], ["NOEXIST", "ABC125", "ABC123"])
+        route = self.service.get_route(route_id)
+        self.assertEqual([s.tracking_code for s in route.list_shipment()], ["ABC125", "ABC123", "ABC124"])
+        self.assertEqual(self.shipment_service.get_shipment("ABC124").assigned_route, route_id)
+        self.assertTrue(self.center_service.get_center("MAD01").has_shipment("ABC124"))
+
+    def test_assign_shipments_invalid_route_rejects_all(self):
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+
+        assigned, rejected = self.service.assign_shipments_to_route("MAD01-BCN02-STD-999", ["ABC123"])
+
+        self.assertEqual(assigned, [])
+        self.assertIn("No existe una ruta", rejected[0][1])
+        self.assertFalse(self.shipment_service.get_shipment("ABC123").is_assigned_to_route())
+
     # Test remove_shipment_from_route
     def test_remove_shipment_valid(self):
         route_id = "MAD01-BCN02-STD-001"
@@ -186,6 +232,27 @@ class TestRouteService(unittest.TestCase):
         center = self.center_service.get_center("MAD01")
         self.assertFalse(center.has_shipment("ABC123"))
 
+    def test_dispatch_route_with_full_queue_origin(self):
+        route_id = "MAD01-BCN02-STD-001"
+        self.service.create_route(route_id, "MAD01", "BCN02")
+        self.center_service.configure_center_capacity("MAD01", 1, admission=QUEUE)
+        for code in ("ABC123", "XYZ789", "DEF456"):
+            self.shipment_service.register_shipment(code, "A", "B")
+        self.service.assign_shipment_to_route("ABC123", route_id)
+
+        # Sin plaza en el origen, la ruta no acepta envíos que solo quedarían en cola
+        with self.assertRaises(ValueError) as cm:
+            self.service.assign_shipment_to_route("XYZ789", route_id)
+        self.assertIn("no tiene plazas libres", str(cm.exception))
+        assigned, rejected = self.service.assign_shipments_to_route(route_id, ["XYZ789", "DEF456"])
+        self.assertEqual(assigned, [])
+        self.assertEqual([code for code, _ in rejected], ["XYZ789", "DEF456"])
+        self.assertEqual(self.center_service.get_center("MAD01").waiting, 0)
+
+        self.service.dispatch_route(route_id)
+        self.assertEqual(self.shipment_service.get_shipment("ABC123").current_status, "IN_TRANSIT")
+        self.assertIsNone(self.shipment_service.get_shipment("XYZ789").assigned_route)
+
     def test_dispatch_route_already_dispatched_raises(self):
         route_id = "MAD01-BCN02-STD-001"
         self.service.create_route(route_id, "MAD01", "BCN02")
@@ -257,4 +324,81 @@ class TestRouteService(unittest.TestCase):
 
     def test_complete_route_route_not_found_raises(self):
         with self.assertRaises(ValueError):
-            self.service.complete_route("MAD01-BCN02-STD-999")
\ No newline at end of file
+            self.service.complete_route("MAD01-BCN02-STD-999")
+    # Test find_path
+    def test_find_path_multi_hop_follows_route_changes(self):
+        self.center_service.register_center("VLC03", "Valencia", "Calle C")
+        self.center_service.register_center("SEV04", "Sevilla", "Calle D")
+        self.service.create_route("SEV04-MAD01-STD-001", "SEV04", "MAD01")
+        self.service.create_route("MAD01-VLC03-STD-001", "MAD01", "VLC03")
+        self.service.create_route("VLC03-BCN02-STD-001", "VLC03", "BCN02")
+
+        self.assertEqual(
+            self.service.find_path("sev04", "BCN02"),
+            (3, ["SEV04-MAD01-STD-001", "MAD01-VLC03-STD-001", "VLC03-BCN02-STD-001"]),
+        )
+
+        # Una ruta nueva acorta el camino; al completarla, se vuelve al anterior
+        self.service.create_route("MAD01-BCN02-EXP-001", "MAD01", "BCN02")
+        self.assertEqual(self.service.find_path("SEV04", "BCN02"), (2, ["SEV04-MAD01-STD-001", "MAD01-BCN02-EXP-001"]))
+        self.service.complete_route("MAD01-BCN02-EXP-001")
+        self.assertEqual(self.service.find_path("SEV04", "BCN02")[0], 3)
+
+        with self.assertRaises(ValueError) as cm:
+            self.service.find_path("BCN02", "SEV04")
+        self.assertIn("No hay ningún camino", str(cm.exception))
+        with self.assertRaises(ValueError) as cm:
+            self.service.find_path("SEV04", "NOEXIST")
+        self.assertEqual(str(cm.exception), "El centro de destino no existe.")
+
+    def test_find_path_with_route_cost(self):
+        cost = {"EXP": 5, "STD": 1}
+        service = RouteService(
+            self.route_repo, self.shipment_repo, self.center_repo,
+            route_cost=lambda route: cost[route.cargo_class],
+        )
+        self.center_service.register_center("VLC03", "Valencia", "Calle C")
+        service.create_route("MAD01-BCN02-EXP-001", "MAD01", "BCN02")
+        service.create_route("MAD01-VLC03-STD-001", "MAD01", "VLC03")
+        service.create_route("VLC03-BCN02-STD-001", "VLC03", "BCN02")
+
+        self.assertEqual(service.find_path("MAD01", "BCN02"), (2, ["MAD01-VLC03-STD-001", "VLC03-BCN02-STD-001"]))
+
+    # Test assign_center_shipments
+    def test_assign_center_shipments_matches_cargo_class_and_balances(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        self.service.create_route("MAD01-BCN02-STD-002", "MAD01", "BCN02")
+        self.service.create_route("MAD01-BCN02-EXP-001", "MAD01", "BCN02")
+        self.shipment_service.register_shipment("EXP001", "A", "B", 1, "express")
+        self.shipment_service.register_shipment("FRG001", "A", "B", 2, "fragile")
+        for i in range(4):
+            self.shipment_service.register_shipment(f"STD00{i}", "A", "B")
+        codes = ["EXP001", "FRG001", "STD000", "STD001", "STD002", "STD003"]
+        self.center_service.receive_shipments(codes, "MAD01")
+
+        assigned, rejected = self.service.assign_center_shipments("mad01")
+
+        routes = dict(assigned)
+        self.assertEqual(routes["EXP001"], "MAD01-BCN02-EXP-001")
+        self.assertEqual(
+            sorted(routes[f"STD00{i}"] for i in range(4)),
+            ["MAD01-BCN02-STD-001"] * 2 + ["MAD01-BCN02-STD-002"] * 2,
+        )
+        self.assertEqual(rejected, [("FRG001", "No hay rutas FRG activas desde el centro.")])
+        self.assertEqual(self.shipment_repo.count(route_id="MAD01-BCN02-EXP-001"), 1)
+
+        # Los envíos ya estaban en el centro: la ruta se despacha sin volver a recibirlos
+        self.service.dispatch_route("MAD01-BCN02-EXP-001")
+        self.assertEqual(self.shipment_service.get_shipment("EXP001").current_status, "IN_TRANSIT")
+
+    def test_assign_center_shipments_capacity_keeps_highest_priority(self):
+        self.service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        for i, priority in enumerate((1, 3, 2)):
+            self.shipment_service.register_shipment(f"STD00{i}", "A", "B", priority)
+        self.center_service.receive_shipments(["STD000", "STD001", "STD002"], "MAD01")
+
+        assigned, rejected = self.service.assign_center_shipments("MAD01", capacity=2)
+
+        self.assertEqual(assigned, [("STD001", "MAD01-BCN02-STD-001"), ("STD002", "MAD01-BCN02-STD-001")])
+        self.assertEqual([code for code, _ in rejected], ["STD000"])
+        self.assertIn("plazas libres", rejected[0][1])
@@ -1,5 +1,6 @@
 # tests/test_shipment.py
 
+import time
 import unittest
 from logistica.domain.shipment import Shipment
 
@@ -43,6 +44,24 @@ class TestShipment(unittest.TestCase):
         self.assertEqual(s.current_status, "DELIVERED")
         self.assertEqual(s.get_status_history(), ["REGISTERED", "IN_TRANSIT", "DELIVERED"])
 
+    def test_status_timeline_has_timestamps(self):
+        before = time.time()
+        s = Shipment("ABC123", "A", "B", 1)
+        s.update_status("IN_TRANSIT")
+        after = time.time()
+
+        timeline = s.get_status_timeline()
+        self.assertEqual([status for status, _ in timeline], ["REGISTERED", "IN_TRANSIT"])
+        self.assertTrue(before <= timeline[0][1] <= timeline[1][1] <= after)
+
+    def test_export_status_log_round_trips_through_restore(self):
+        s = Shipment("ABC123", "A", "B", 2)
+        s.update_status("IN_TRANSIT")
+
+        restored = Shipment.restore("ABC123", "A", "B", 2, s.export_status_log())
+        self.assertEqual(restored.current_status, "IN_TRANSIT")
+        self.assertEqual(restored.get_status_timeline(), s.get_status_timeline())
+
     def test_update_status_invalid_transition(self):
         s = Shipment("ABC123", "A", "B", 1)
         with self.assertRaises(ValueError):
@@ -0,0 +1,30 @@
+# tests/test_shipment_lifecycle.py
+
+import unittest
+from logistica.domain.shipment_lifecycle import (
+    STATUS_CODES, REGISTERED, IN_TRANSIT, DELIVERED,
+    can_transition, transition_error, check_transitions,
+)
+
+class TestShipmentLifecycle(unittest.TestCase):
+
+    def test_can_transition_follows_rn007(self):
+        self.assertTrue(can_transition(REGISTERED, IN_TRANSIT))
+        self.assertTrue(can_transition(IN_TRANSIT, DELIVERED))
+        self.assertFalse(can_transition(REGISTERED, DELIVERED))
+        self.assertFalse(can_transition(DELIVERED, REGISTERED))
+        self.assertFalse(can_transition(IN_TRANSIT, IN_TRANSIT))
+
+    def test_transition_error_names_the_states(self):
+        self.assertIsNone(transition_error("REGISTERED", "IN_TRANSIT"))
+        self.assertEqual(transition_error("REGISTERED", "DELIVERED"), "Transición no permitida: de REGISTERED a DELIVERED")
+        self.assertIsNotNone(transition_error("REGISTERED", "LOST"))
+
+    def test_check_transitions_pairs_and_common_destination(self):
+        origins = bytes([REGISTERED, IN_TRANSIT, DELIVERED])
+        self.assertEqual(check_transitions(origins, [IN_TRANSIT, DELIVERED, DELIVERED]), b"\x01\x01\x00")
+        self.assertEqual(check_transitions(origins, STATUS_CODES["IN_TRANSIT"]), b"\x01\x00\x00")
+        self.assertEqual(check_transitions(b"", DELIVERED), b"")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,3 +1,7 @@
+import csv
+import json
+import os
+import tempfile
 import unittest
 from logistica.application.shipment_service import ShipmentService
 from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
@@ -141,6 +145,15 @@ class TestShipmentService(unittest.TestCase):
         # Orden alfabético por código
         self.assertEqual([item[0] for item in lista], ["ABC123", "MNO456", "XYZ789"])
 
+    def test_list_shipments_paginated(self):
+        for code in ("XYZ789", "ABC123", "MNO456", "DEF321"):
+            self.service.register_shipment(code, "A", "B")
+        first_page = self.service.list_shipments(limit=2)
+        self.assertEqual([item[0] for item in first_page], ["ABC123", "DEF321"])
+        second_page = self.service.list_shipments(after=first_page[-1][0], limit=2)
+        self.assertEqual([item[0] for item in second_page], ["MNO456", "XYZ789"])
+        self.assertEqual(self.service.list_shipments(after="xyz789"), [])
+
     def test_list_shipments_content(self):
         self.service.register_shipment("ABC123", "A", "B", priority=2)
         lista = self.service.list_shipments()
@@ -161,4 +174,125 @@ class TestShipmentService(unittest.TestCase):
 
     def test_get_shipment_non_existing_raises(self):
         with self.assertRaises(ValueError):
-            self.service.get_shipment("NOEXIST")
\ No newline at end of file
+            self.service.get_shipment("NOEXIST")
+
+
+    def test_update_shipments_status_applies_batch(self):
+        self.service.register_shipment("ABC123", "A", "B")
+        self.service.register_shipment("ABC124", "A", "B")
+
+        self.assertEqual(self.service.update_shipments_status(["ABC123", "abc124"], "in_transit"), (["ABC123", "ABC124"], []))
+        self.assertEqual(self.service.get_shipment("ABC124").current_status, "IN_TRANSIT")
+
+    def test_update_shipments_status_is_all_or_nothing(self):
+        self.service.register_shipment("ABC123", "A", "B")
+        self.service.register_shipment("ABC124", "A", "B")
+        self.service.update_shipment_status("ABC124", "IN_TRANSIT")
+
+        updated, rejected = self.service.update_shipments_status(["ABC123", "ABC124", "NOP999", "ABC123"], "IN_TRANSIT")
+
+        self.assertEqual(updated, [])
+        self.assertCountEqual([code for code, _ in rejected], ["ABC124", "NOP999", "ABC123"])
+        self.assertIn("Transición no permitida", dict(rejected)["ABC124"])
+        self.assertEqual(self.service.get_shipment("ABC123").current_status, "REGISTERED")
+
+    def test_update_shipments_status_unknown_status_raises(self):
+        with self.assertRaises(ValueError):
+            self.service.update_shipments_status(["ABC123"], "LOST")
+
+
+class TestShipmentServiceIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = ShipmentRepositoryMemory()
+        self.service = ShipmentService(self.repo)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rejects_path = os.path.join(self.tmp.name, "rejects.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+        return path
+
+    def rejects(self):
+        with open(self.rejects_path, newline="", encoding="utf-8") as f:
+            return [(int(row["line"]), row["tracking_code"]) for row in csv.DictReader(f)]
+
+    def test_ingest_csv_builds_types_and_rejects_rows(self):
+        self.service.register_shipment("OLD111", "A", "B")
+        path = self.write("manifest.csv", (
+            "tracking_code,sender,recipient,priority,shipment_type\n"
+            "ABC123,A,B,2,standard\n"
+            "FRG123,C,D,3,FRAGILE\n"
+            "EXP123,E,F,,express\n"
+            "BAD123,G,H,1,fragile\n"
+            "ABC123,I,J,1,standard\n"
+            "OLD111,K,L,1,standard\n"
+            "XYZ789,M,N,alta,standard\n"
+            "MNO456,,O,1,standard\n"
+        ))
+
+        # Bloques pequeños: los duplicados cruzan bloques
+        accepted, rejected = self.service.ingest_manifest(path, self.rejects_path, chunk_size=2)
+
+        self.assertEqual((accepted, rejected), (3, 5))
+        self.assertIsInstance(self.repo.get_by_tracking_code("FRG123"), FragileShipment)
+        self.assertEqual(self.repo.get_by_tracking_code("EXP123").priority, 3)
+        self.assertEqual(self.repo.get_by_tracking_code("ABC123").sender, "A")
+        self.assertEqual(self.rejects(), [(5, "BAD123"), (6, "ABC123"), (7, "OLD111"), (8, "XYZ789"), (9, "MNO456")])
+
+    def test_ingest_jsonl_skips_malformed_lines(self):
+        lines = [
+            json.dumps({"tracking_code": "ABC123", "sender": "A", "recipient": "B"}),
+            "{no es json",
+            "",
+            json.dumps(["ABC124"]),
+            json.dumps({"tracking_code": "ABC125", "sender": "A", "recipient": "B", "priority": 3}),
+        ]
+        path = self.write("manifest.jsonl", "\n".join(lines) + "\n")
+
+        self.assertEqual(self.service.ingest_manifest(path, self.rejects_path), (2, 2))
+        self.assertEqual(self.repo.get_by_tracking_code("ABC125").priority, 3)
+        self.assertEqual(self.rejects(), [(2, ""), (4, "")])
+
+    def test_ingest_rejects_non_integer_priorities(self):
+        rows = [("ABC123", 2.7), ("ABC124", True), ("ABC125", "2.0"), ("ABC126", "2"), ("ABC127", 2)]
+        lines = [
+            json.dumps({"tracking_code": code, "sender": "A", "recipient": "B", "priority": priority})
+            for code, priority in rows
+        ]
+        path = self.write("manifest.jsonl", "\n".join(lines) + "\n")
+
+        self.assertEqual(self.service.ingest_manifest(path, self.rejects_path), (2, 3))
+        self.assertEqual(self.rejects(), [(1, "ABC123"), (2, "ABC124"), (3, "ABC125")])
+        self.assertEqual(self.repo.get_by_tracking_code("ABC126").priority, 2)
+
+    def test_parallel_ingest_matches_sequential(self):
+        lines = ["tracking_code,sender,recipient,priority,shipment_type"]
+        for i in range(60):
+            code = f"PAR{i - 1 if i % 10 == 9 else i:03d}"
+            priority = 9 if i % 10 == 4 else 2
+            lines.append(f"{code},Remitente,Destinatario,{priority},{('standard', 'fragile', 'express')[i % 3]}")
+        path = self.write("manifest.csv", "\n".join(lines) + "\n")
+
+        expected = self.service.ingest_manifest(path, self.rejects_path, chunk_size=7)
+        expected_rejects = self.rejects()
+
+        repo = ShipmentRepositoryMemory()
+        result = ShipmentService(repo).ingest_manifest(path, self.rejects_path, chunk_size=7, workers=2)
+
+        self.assertEqual(result, expected)
+        self.assertEqual(self.rejects(), expected_rejects)
+        self.assertEqual(
+            [(s.tracking_code, s.shipment_type, s.priority) for s in repo.list_all()],
+            [(s.tracking_code, s.shipment_type, s.priority) for s in self.repo.list_all()],
+        )
+
+    def test_ingest_unknown_extension_raises(self):
+        path = self.write("manifest.txt", "")
+        with self.assertRaises(ValueError):
+            self.service.ingest_manifest(path)
\ No newline at end of file
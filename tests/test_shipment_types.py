@@ -12,6 +12,12 @@ class TestFragileShipment(unittest.TestCase):
         self.assertEqual(f.shipment_type, "FRAGILE")
         self.assertTrue(f.is_fragile())
 
+    def test_fragile_has_no_instance_dict(self):
+        f = FragileShipment("FRG123", "A", "B", 2)
+        self.assertFalse(hasattr(f, "__dict__"))
+        with self.assertRaises(AttributeError):
+            f.extra = True
+
     def test_create_fragile_priority_below_2_raises(self):
         with self.assertRaises(ValueError):
             FragileShipment("FRG123", "A", "B", 1)
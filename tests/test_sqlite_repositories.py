@@ -0,0 +1,174 @@
+# tests/test_sqlite_repositories.py
+
+import os
+import tempfile
+import unittest
+from logistica.infrastructure.sqlite_store import SqliteStore
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySqlite
+from logistica.infrastructure.sqlite_center import CenterRepositorySqlite
+from logistica.infrastructure.sqlite_route import RouteRepositorySqlite
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+from logistica.domain.shipment import Shipment
+from logistica.domain.fragile_shipment import FragileShipment
+from logistica.domain.express_shipment import ExpressShipment
+
+class SqliteTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "logistica.db")
+        self.open()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def open(self):
+        self.store = SqliteStore(self.path)
+        self.shipments = ShipmentRepositorySqlite(self.store)
+        self.centers = CenterRepositorySqlite(self.store)
+        self.routes = RouteRepositorySqlite(self.store)
+
+    def reopen(self):
+        # Un almacén nuevo no comparte mapas de identidad: todo se lee de disco
+        self.store.close()
+        self.open()
+
+
+class TestShipmentRepositorySqlite(SqliteTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.shipments.add_many([
+            Shipment("MNO456", "A", "B", 1),
+            FragileShipment("FRG123", "C", "D", 3),
+            ExpressShipment("EXP123", "E", "F"),
+        ])
+
+    def codes(self, shipments):
+        return [s.tracking_code for s in shipments]
+
+    def test_round_trip_keeps_type_state_and_history(self):
+        shipment = self.shipments.get_by_tracking_code("FRG123")
+        shipment.update_status("IN_TRANSIT")
+        shipment.assign_route("MAD01-BCN02-FRG-001")
+        self.shipments.add(shipment)
+        self.reopen()
+
+        loaded = self.shipments.get_by_tracking_code("frg123")
+        self.assertIsNot(loaded, shipment)
+        self.assertIsInstance(loaded, FragileShipment)
+        self.assertEqual(loaded.current_status, "IN_TRANSIT")
+        self.assertEqual(loaded.get_status_history(), ["REGISTERED", "IN_TRANSIT"])
+        self.assertEqual(loaded.assigned_route, "MAD01-BCN02-FRG-001")
+        self.assertEqual(loaded.priority, 3)
+
+    def test_same_object_while_alive(self):
+        self.reopen()
+        first = self.shipments.get_by_tracking_code("EXP123")
+        self.assertIs(first, self.shipments.get_by_tracking_code("EXP123"))
+        self.assertIn(first, self.shipments.list_all())
+
+    def test_remove(self):
+        self.assertTrue(self.shipments.remove("mno456"))
+        self.assertFalse(self.shipments.remove("mno456"))
+        self.reopen()
+        self.assertIsNone(self.shipments.get_by_tracking_code("MNO456"))
+        self.assertIsNone(self.shipments.get_by_tracking_code("  "))
+
+    def test_find_count_and_sorted_pages(self):
+        self.assertEqual(self.codes(self.shipments.find(priority=3)), ["EXP123", "FRG123"])
+        self.assertEqual(self.shipments.count(shipment_type="fragile", status="registered"), 1)
+        self.assertEqual(self.shipments.count(status="UNKNOWN"), 0)
+        self.assertEqual(self.codes(self.shipments.iter_sorted(after="exp123", limit=1)), ["FRG123"])
+        self.assertEqual(self.codes(self.shipments.iter_all()), ["EXP123", "FRG123", "MNO456"])
+
+    def test_failed_transaction_is_rolled_back(self):
+        with self.assertRaises(RuntimeError):
+            with self.store.transaction():
+                self.shipments.add(Shipment("ZZZ999", "A", "B"))
+                raise RuntimeError("fallo")
+        self.reopen()
+        self.assertIsNone(self.shipments.get_by_tracking_code("ZZZ999"))
+
+
+class TestServicesWithSqliteRepositories(SqliteTestCase):
+
+    def services(self):
+        return (
+            ShipmentService(self.shipments),
+            CenterService(self.centers, self.shipments),
+            RouteService(self.routes, self.shipments, self.centers),
+        )
+
+    def test_route_lifecycle_survives_reopen(self):
+        shipment_service, center_service, route_service = self.services()
+        center_service.register_center("MAD01", "Madrid", "Calle A")
+        center_service.register_center("BCN02", "Barcelona", "Calle B")
+        route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+        shipment_service.register_shipment("ABC123", "A", "B")
+        shipment_service.register_shipment("XYZ789", "C", "D")
+        route_service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+        route_service.assign_shipment_to_route("XYZ789", "MAD01-BCN02-STD-001")
+
+        self.reopen()
+        shipment_service, center_service, route_service = self.services()
+        route = route_service.get_route("MAD01-BCN02-STD-001")
+        self.assertEqual([s.tracking_code for s in route.list_shipment()], ["ABC123", "XYZ789"])
+        # Ruta, centro y repositorio comparten los mismos objetos
+        self.assertIs(route.origin_center, center_service.get_center("MAD01"))
+        self.assertIs(route.list_shipment()[0], shipment_service.get_shipment("ABC123"))
+        self.assertEqual([s.tracking_code for s in center_service.iter_shipments_in_center("MAD01")], ["ABC123", "XYZ789"])
+
+        route_service.dispatch_route("MAD01-BCN02-STD-001")
+        self.reopen()
+        shipment_service, center_service, route_service = self.services()
+        self.assertEqual(list(center_service.iter_shipments_in_center("MAD01")), [])
+        self.assertEqual(self.shipments.count(status="IN_TRANSIT"), 2)
+
+        route_service.complete_route("MAD01-BCN02-STD-001")
+        self.reopen()
+        shipment_service, center_service, route_service = self.services()
+        self.assertFalse(route_service.get_route("MAD01-BCN02-STD-001").is_active)
+        self.assertTrue(center_service.get_center("BCN02").has_shipment("ABC123"))
+        self.assertEqual(shipment_service.get_shipment("XYZ789").current_status, "DELIVERED")
+        self.assertEqual(route_service.get_route("MAD01-BCN02-STD-001").list_shipment(), [])
+
+    def test_center_saves_only_inventory_changes(self):
+        shipment_service, center_service, _ = self.services()
+        center_service.register_center("MAD01", "Madrid", "Calle A")
+        for code in ("ABC123", "DEF456", "XYZ789"):
+            shipment_service.register_shipment(code, "A", "B")
+        center_service.receive_shipments(["ABC123", "DEF456"], "MAD01")
+
+        # Guardar tras una entrada o salida no recorre el inventario
+        center = self.centers.get_by_center_id("MAD01")
+        center.iter_shipments = center.list_shipments = lambda: self.fail("Se ha recorrido el inventario")
+        center_service.dispatch_shipment("ABC123", "MAD01")
+        center_service.receive_shipment("XYZ789", "MAD01")
+        center_service.receive_shipment("ABC123", "MAD01")
+        del center.iter_shipments, center.list_shipments
+
+        self.reopen()
+        _, center_service, _ = self.services()
+        codes = [s.tracking_code for s in center_service.iter_shipments_in_center("MAD01")]
+        self.assertEqual(codes, ["DEF456", "XYZ789", "ABC123"])
+
+    def test_route_find_filters_in_sql(self):
+        _, center_service, route_service = self.services()
+        for center_id in ("MAD01", "BCN02", "VLC03"):
+            center_service.register_center(center_id, "Centro", "Calle A")
+        route_service.create_route("MAD01-BCN02-EXP-001", "MAD01", "BCN02")
+        route_service.create_route("MAD01-VLC03-STD-001", "MAD01", "VLC03")
+        route_service.create_route("BCN02-MAD01-EXP-001", "BCN02", "MAD01")
+        route_service.complete_route("MAD01-VLC03-STD-001")
+
+        self.reopen()
+        self.assertEqual([r.route_id for r in self.routes.find(origin_id="mad01")], ["MAD01-BCN02-EXP-001", "MAD01-VLC03-STD-001"])
+        self.assertEqual([r.route_id for r in self.routes.find(cargo_class="exp", destination_id="MAD01")], ["BCN02-MAD01-EXP-001"])
+        self.assertEqual([r.route_id for r in self.routes.find(origin_id="MAD01", active=True)], ["MAD01-BCN02-EXP-001"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+# tests/test_unit_of_work.py
+
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from logistica.application.unit_of_work import UnitOfWork
+from logistica.application.shipment_service import ShipmentService
+from logistica.application.center_service import CenterService
+from logistica.application.route_service import RouteService
+from logistica.infrastructure.memory_shipment import ShipmentRepositoryMemory
+from logistica.infrastructure.memory_center import CenterRepositoryMemory
+from logistica.infrastructure.memory_route import RouteRepositoryMemory
+from logistica.infrastructure.concurrent_memory import ShipmentRepositoryStriped
+from logistica.infrastructure.striped_lock import StripedLock
+from logistica.infrastructure.sqlite_store import SqliteStore
+from logistica.infrastructure.sqlite_shipment import ShipmentRepositorySqlite
+from logistica.infrastructure.sqlite_center import CenterRepositorySqlite
+from logistica.infrastructure.sqlite_route import RouteRepositorySqlite
+
+
+class _CountingShipments(ShipmentRepositoryMemory):
+    """Repositorio en memoria que cuenta las escrituras recibidas."""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def add_many(self, shipments):
+        self.writes += 1
+        super().add_many(shipments)
+
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.shipment_repo = _CountingShipments()
+        self.uow = UnitOfWork(self.shipment_repo, CenterRepositoryMemory(), RouteRepositoryMemory())
+        self.shipment_service = ShipmentService(self.uow.shipments, uow=self.uow)
+        self.center_service = CenterService(self.uow.centers, self.uow.shipments, uow=self.uow)
+        self.route_service = RouteService(self.uow.routes, self.uow.shipments, self.uow.centers, uow=self.uow)
+
+        self.center_service.register_center("MAD01", "Madrid", "Calle A")
+        self.center_service.register_center("BCN02", "Barcelona", "Calle B")
+        self.route_service.create_route("MAD01-BCN02-STD-001", "MAD01", "BCN02")
+
+    def test_operation_flushes_once(self):
+        self.shipment_service.register_shipment("ABC123", "A", "B")
+        self.shipment_repo.writes = 0
+        flushes = self.uow.flushes
+
+        self.route_service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+
+        self.assertEqual(self.uow.flushes, flushes + 1)
+        self.assertEqual(self.shipment_repo.writes, 1)
+
+    def test_nested_operations_join_the_outer_one(self):
+        with self.uow:
+            self.shipment_service.register_shipment("ABC123", "A", "B")
+            self.shipment_service.increase_shipment_priority("ABC123")
+            self.route_service.assign_shipment_to_route("ABC123", "MAD01-BCN02-STD-001")
+            # Las lecturas dentro de la operación ven lo ya escrito en ella
+            self.assertEqual(self.shipment_service.get_shipment("ABC123").priority, 2)
+
+        self.assertEqual(self.shipment_repo.get_by_tracking_code("ABC123").assigned_route, "MAD01-BCN02-STD-001")
+
+    def test_flush_counter_is_exact_across_threads(self):
+        locks = StripedLock(16)
+        uow = UnitOfWork(ShipmentRepositoryStriped(locks), CenterRepositoryMemory(), RouteRepositoryMemory())
+        service = ShipmentService(uow.shipments, uow=uow, locks=locks)
+        codes = [f"THR{i:03d}" for i in range(400)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda code: service.register_shipment(code, "A", "B"), codes))
+
+        self.assertEqual(uow.flushes, len(codes))
+
+    def test_failed_operation_discards_pending_writes(self):
+        with self.assertRaises(ValueError):
+            with self.uow:
+                self.shipment_service.register_shipment("ABC123", "A", "B")
+                raise ValueError("fallo")
+
+        self.assertIsNone(self.shipment_repo.get_by_tracking_code("ABC123"))
+
+
+class TestUnitOfWorkSqlite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = SqliteStore(os.path.join(self.tmp.name, "logistica.db"))
+        self.uow = UnitOfWork(
+            ShipmentRepositorySqlite(self.store),
+            CenterRepositorySqlite(self.store),
+            RouteRepositorySqlite(self.store),
+            transaction=self.store.transaction,
+            on_rollback=self.store.clear_identity,
+        )
+        self.service = ShipmentService(self.uow.shipments, uow=self.uow)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_failure_after_flush_rolls_back_transaction(self):
+        self.service.register_shipment("OLD111", "A", "B")
+
+        with self.assertRaises(ValueError):
+            with self.uow:
+                self.service.register_shipment("ABC123", "A", "B")
+                self.service.increase_shipment_priority("OLD111")
+                # La lectura vuelca lo anterior dentro de la transacción y luego falla
+                self.service.register_shipment("ABC123", "A", "B")
+
+        repo = ShipmentRepositorySqlite(self.store)
+        self.assertIsNone(repo.get_by_tracking_code("ABC123"))
+        self.assertEqual(repo.get_by_tracking_code("OLD111").priority, 1)
+
+    def test_rollback_forgets_modified_objects(self):
+        self.service.register_shipment("OLD111", "A", "B")
+        stale = self.service.get_shipment("OLD111")
+
+        with self.assertRaises(ValueError):
+            with self.uow:
+                self.service.increase_shipment_priority("OLD111")
+                raise ValueError("fallo")
+
+        # El objeto modificado no se restaura; el repositorio entrega uno recargado
+        self.assertEqual(stale.priority, 2)
+        reloaded = self.service.get_shipment("OLD111")
+        self.assertIsNot(reloaded, stale)
+        self.assertEqual(reloaded.priority, 1)
+
+if __name__ == '__main__':
+    unittest.main()